@@ -0,0 +1,142 @@
+"""
+Count strategies for paginated list totals.
+
+- `exact`: `SELECT COUNT(*)` on every request.
+- `cached`: exact count stored in the cache under a hash of the normalized
+  filter SQL. Every write to the model bumps a per-model generation number
+  that is part of the key, so stale entries are never read again.
+- `estimate`: the query planner's row estimate (PostgreSQL). Small results,
+  and databases without a usable estimate, fall back to an exact count.
+
+The strategy reported back is the one that actually produced the total:
+a cache miss reports `exact`, a small estimated result reports `exact`.
+
+Other caches derived from a model (e.g. the project calendar) can put
+`write_generation(model)` in their keys to be invalidated the same way.
+"""
+import hashlib
+import json
+import time
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+from django.db.models.signals import post_delete, post_save
+from .exceptions import BadRequestError
+
+EXACT = 'exact'
+CACHED = 'cached'
+ESTIMATE = 'estimate'
+COUNT_STRATEGIES = (EXACT, CACHED, ESTIMATE)
+
+
+class InvalidCountStrategy(BadRequestError):
+    """Unknown `count` parameter."""
+    default_message = f"count must be one of: {', '.join(COUNT_STRATEGIES)}"
+
+
+def check_strategy(strategy: str) -> str:
+    """Validate a strategy name; None means `exact`."""
+    strategy = strategy or EXACT
+    if strategy not in COUNT_STRATEGIES:
+        raise InvalidCountStrategy()
+    return strategy
+
+
+def _cache():
+    return caches[settings.LIST_COUNT_CACHE_ALIAS]
+
+
+def _generation_key(model) -> str:
+    return f'list-count-gen:{model._meta.label_lower}'
+
+
+def _count_key(queryset, generation) -> str:
+    sql, params = queryset.order_by().query.sql_with_params()
+    digest = hashlib.blake2b(
+        json.dumps([sql, [str(param) for param in params]]).encode(), digest_size=16
+    ).hexdigest()
+    return f'list-count:{queryset.model._meta.label_lower}:{generation}:{digest}'
+
+
+def _new_generation() -> int:
+    # Seeded from the clock: if the generation key is evicted, the new one
+    # cannot collide with keys written under the old generation.
+    return time.time_ns()
+
+
+def invalidate_counts(model) -> None:
+    """Make every cached count of `model` stale. Call after bulk writes."""
+    cache = _cache()
+    try:
+        cache.incr(_generation_key(model))
+    except ValueError:
+        cache.set(_generation_key(model), _new_generation(), None)
+
+
+def write_generation(model) -> int:
+    """Current write generation of `model`; changes on every tracked write."""
+    return _cache().get_or_set(_generation_key(model), _new_generation, None)
+
+
+def _invalidate_on_write(sender, **kwargs):
+    invalidate_counts(sender)
+
+
+def track_counts(model) -> None:
+    """Invalidate cached counts of `model` on every save/delete."""
+    uid = f'list-count:{model._meta.label_lower}'
+    post_save.connect(_invalidate_on_write, sender=model, dispatch_uid=uid)
+    post_delete.connect(_invalidate_on_write, sender=model, dispatch_uid=uid)
+
+
+def _planner_estimate(queryset):
+    """Row estimate from EXPLAIN, or None when the backend gives none."""
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def count_total(queryset, strategy: str = EXACT) -> tuple[int, str]:
+    """Return `(total, strategy used)` for a filtered queryset."""
+    if strategy == ESTIMATE:
+        estimate = _planner_estimate(queryset)
+        if estimate is not None and estimate >= settings.LIST_COUNT_ESTIMATE_THRESHOLD:
+            return estimate, ESTIMATE
+    elif strategy == CACHED:
+        cache = _cache()
+        generation = cache.get_or_set(_generation_key(queryset.model), _new_generation, None)
+        key = _count_key(queryset, generation)
+        total = cache.get(key)
+        if total is not None:
+            return total, CACHED
+        total = queryset.count()
+        cache.set(key, total, settings.LIST_COUNT_CACHE_TTL)
+        return total, EXACT
+    return queryset.count(), EXACT
+
+
+async def acount_total(queryset, strategy: str = EXACT) -> tuple[int, str]:
+    """Async variant of `count_total`."""
+    if strategy == ESTIMATE:
+        estimate = await sync_to_async(_planner_estimate)(queryset)
+        if estimate is not None and estimate >= settings.LIST_COUNT_ESTIMATE_THRESHOLD:
+            return estimate, ESTIMATE
+    elif strategy == CACHED:
+        cache = _cache()
+        generation = await cache.aget_or_set(_generation_key(queryset.model), _new_generation, None)
+        key = _count_key(queryset, generation)
+        total = await cache.aget(key)
+        if total is not None:
+            return total, CACHED
+        total = await queryset.acount()
+        await cache.aset(key, total, settings.LIST_COUNT_CACHE_TTL)
+        return total, EXACT
+    return await queryset.acount(), EXACT
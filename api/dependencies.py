@@ -2,31 +2,101 @@
 Common dependencies for API endpoints.
 """
 from typing import Optional
-from ninja.security import HttpBearer
+from ninja.security import APIKeyQuery, HttpBearer
 from apps.users.models import User
-from apps.users.services import verify_jwt_token
+from apps.users.principal import Principal
+from apps.users.services import adecode_jwt_token, aresolve_principal, decode_jwt_token, resolve_principal
 from .exceptions import UnauthorizedError
 
+_UNSET = object()
+
 
 class AuthBearer(HttpBearer):
-    """JWT Bearer token authentication."""
+    """
+    JWT Bearer token authentication.
+
+    The token is decoded and validated once per request; the claims and
+    the resolved principal are memoized on the request (`request.auth_claims`)
+    so later auth checks on the same request reuse them.
+    """
 
     def authenticate(self, request, token: str) -> Optional[User]:
         """Authenticate user from JWT token."""
-        user = verify_jwt_token(token)
-        if not user:
-            raise UnauthorizedError("Invalid or expired token")
-        return user
+        principal = getattr(request, '_auth_principal', _UNSET)
+        if principal is not _UNSET:
+            return principal
+
+        payload = decode_jwt_token(token)
+        principal = resolve_principal(payload) if payload is not None else None
+
+        request.auth_claims = payload
+        request._auth_principal = principal
+        return principal
+
+
+class AsyncAuthBearer(HttpBearer):
+    """
+    JWT Bearer token authentication for async (ASGI) views.
+
+    Same contract as `AuthBearer`, but the principal is resolved with the
+    async ORM (`User.objects.aget`) and the async cache API. Signature checks
+    run inline (CPU only); the denylist's cache reads are awaited, and a due
+    Bloom filter refresh runs in a worker thread.
+    """
+
+    async def authenticate(self, request, token: str) -> Optional[User]:
+        """Authenticate user from JWT token."""
+        principal = getattr(request, '_auth_principal', _UNSET)
+        if principal is not _UNSET:
+            return principal
+
+        payload = await adecode_jwt_token(token)
+        principal = await aresolve_principal(payload) if payload is not None else None
+
+        request.auth_claims = payload
+        request._auth_principal = principal
+        return principal
+
+
+class ScopedTokenQuery(APIKeyQuery):
+    """
+    `?token=` authentication with a short-lived scoped JWT
+    (`create_scoped_token`), for clients that cannot send an Authorization
+    header, such as the browser's EventSource.
+
+    Only tokens of `scope` are accepted: an access token in a URL (and so
+    in proxy / access logs) is rejected.
+    """
+
+    param_name = 'token'
+
+    def __init__(self, scope: str):
+        self.scope = scope
+        super().__init__()
+
+    def authenticate(self, request, key: Optional[str]) -> Optional[User]:
+        """Authenticate user from a scoped token."""
+        payload = decode_jwt_token(key, scope=self.scope) if key else None
+        principal = resolve_principal(payload) if payload is not None else None
+
+        request.auth_claims = payload
+        return principal
 
 
-# Create auth instance
+# Shared auth instances (routers and routes)
 auth_bearer = AuthBearer()
+async_auth_bearer = AsyncAuthBearer()
 
 
 def get_current_user(request) -> User:
-    """Get current authenticated user."""
+    """
+    Get current authenticated user as a `User` model.
+    In stateless mode the claims-only principal is resolved lazily here.
+    """
     if not hasattr(request, 'auth') or not request.auth:
         raise UnauthorizedError("Authentication required")
+    if isinstance(request.auth, Principal):
+        return request.auth.user
     return request.auth
 
 
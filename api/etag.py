@@ -0,0 +1,32 @@
+"""
+ETag / If-Match helpers for resources with an integer `version` column.
+
+The ETag is the quoted version number. Writes that carry `If-Match` only
+succeed while the row still has one of the listed versions; the check is
+part of the UPDATE itself (see `Project.save_versioned`), so no row lock
+is taken.
+"""
+from typing import Optional
+
+
+def format_etag(version: int) -> str:
+    """Strong ETag for a version number."""
+    return f'"{version}"'
+
+
+def parse_if_match(header: Optional[str]) -> Optional[frozenset]:
+    """
+    Versions listed in an If-Match header.
+
+    Returns None when the header is absent or `*` (any version). If-Match
+    uses strong comparison, so weak validators (W/"3") and tags that are not
+    versions are ignored: a header with no usable tag matches nothing.
+    """
+    if header is None or header.strip() == '*':
+        return None
+    versions = set()
+    for tag in header.split(','):
+        tag = tag.strip()
+        if len(tag) > 2 and tag[0] == tag[-1] == '"' and tag[1:-1].isdigit():
+            versions.add(int(tag[1:-1]))
+    return frozenset(versions)
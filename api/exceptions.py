@@ -61,6 +61,12 @@ class BadRequestError(APIException):
     default_message = "Bad request"
 
 
+class PreconditionFailedError(APIException):
+    """If-Match did not match the current version of the resource."""
+    status_code = 412
+    default_message = "Precondition failed"
+
+
 def api_exception_handler(request, exc):
     """
     Global exception handler for API.
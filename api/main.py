@@ -2,17 +2,10 @@
 Main API instance configuration for Django Ninja.
 """
 from ninja import NinjaAPI
-from ninja.security import HttpBearer
 from django.http import JsonResponse
+from .dependencies import auth_bearer
 from .exceptions import api_exception_handler
 
-# JWT Auth class
-class AuthBearer(HttpBearer):
-    def authenticate(self, request, token):
-        from apps.users.services import verify_jwt_token
-        user = verify_jwt_token(token)
-        return user
-
 # Create API instance
 api = NinjaAPI(
     title="Studio Management API",
@@ -45,8 +38,8 @@ from apps.partners.api import router as partners_router
 from apps.salaries.api import router as salaries_router
 from apps.finance.api import router as finance_router
 
-# Auth instance
-auth = AuthBearer()
+# Auth instance (shared with route-level `auth=` declarations)
+auth = auth_bearer
 
 # Add routers with authentication
 api.add_router("/auth/", users_router, tags=["Authentication"])
@@ -0,0 +1,57 @@
+"""
+Routing-aware variants of Django's browser middleware.
+
+The Ninja API authenticates with bearer tokens only, so session loading,
+CSRF checks, the `request.user` lookup and message storage are pure
+overhead there. These subclasses pass requests under
+`LEAN_MIDDLEWARE_PATHS` (default `/api/`) straight through and behave
+exactly like the stock middleware everywhere else (e.g. `/admin/`).
+
+They subclass the stock classes so the admin system checks, which look
+for those middleware in `MIDDLEWARE`, keep passing.
+"""
+from django.conf import settings
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.messages.middleware import MessageMiddleware
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.middleware.csrf import CsrfViewMiddleware
+
+
+def is_lean_path(path: str) -> bool:
+    """True if browser middleware should be skipped for this path."""
+    return path.startswith(tuple(settings.LEAN_MIDDLEWARE_PATHS))
+
+
+class LeanPathMixin:
+    """
+    Skip the wrapped middleware's request/response work for lean paths.
+
+    The handler registers `process_view` separately from `__call__`, so
+    subclasses with that hook skip it themselves (LeanCsrfViewMiddleware).
+    """
+
+    def __call__(self, request):
+        if is_lean_path(request.path_info):
+            # In async mode this returns the coroutine the caller awaits
+            return self.get_response(request)
+        return super().__call__(request)
+
+
+class LeanSessionMiddleware(LeanPathMixin, SessionMiddleware):
+    pass
+
+
+class LeanCsrfViewMiddleware(LeanPathMixin, CsrfViewMiddleware):
+
+    def process_view(self, request, callback, callback_args, callback_kwargs):
+        if is_lean_path(request.path_info):
+            return None
+        return super().process_view(request, callback, callback_args, callback_kwargs)
+
+
+class LeanAuthenticationMiddleware(LeanPathMixin, AuthenticationMiddleware):
+    pass
+
+
+class LeanMessageMiddleware(LeanPathMixin, MessageMiddleware):
+    pass
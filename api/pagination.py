@@ -0,0 +1,155 @@
+"""
+Keyset (cursor) pagination for list endpoints.
+
+A cursor is an opaque token holding the ordering-key values of the last row
+of the previous page. The next page is fetched with a range predicate on
+those keys (`WHERE (created_at, id) < (...)`), which an index answers
+directly no matter how deep the page is, unlike OFFSET.
+
+`skip`/`limit` keep working as a compatibility mode; both modes return a
+`next_cursor` so clients can switch to cursors at any point.
+
+`total` is produced by the requested count strategy (see `api.counting`).
+A first page that holds every row needs no COUNT at all.
+"""
+import base64
+import functools
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from uuid import UUID
+from django.db.models import Q
+from .counting import EXACT, acount_total, check_strategy, count_total
+from .exceptions import BadRequestError
+
+# Ordering used by the lists: the model's Meta.ordering plus a unique tiebreak
+CREATED_ORDERING = ('-created_at', '-id')
+
+
+class InvalidCursor(BadRequestError):
+    """Cursor could not be decoded."""
+    default_message = "Invalid cursor"
+
+
+class Page(tuple):
+    """
+    One page of results. Unpacks as `(items, total)` like the previous
+    service return value; `next_cursor` is None on the last page and
+    `count_strategy` names the strategy that produced `total`.
+    """
+
+    def __new__(cls, items: list, total: int, next_cursor=None, count_strategy=EXACT):
+        page = super().__new__(cls, (items, total))
+        page.next_cursor = next_cursor
+        page.count_strategy = count_strategy
+        return page
+
+    @property
+    def items(self) -> list:
+        return self[0]
+
+    @property
+    def total(self) -> int:
+        return self[1]
+
+
+def _json_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (UUID, Decimal)):
+        return str(value)
+    return value
+
+
+def _key_value(obj, name):
+    if isinstance(obj, dict):
+        return obj[name]
+    # Related keys (`employee__created_at`) follow the loaded relation
+    return functools.reduce(getattr, name.split('__'), obj)
+
+
+def encode_cursor(obj, ordering) -> str:
+    """Build the cursor pointing just after `obj` (a model or a `.values()` row)."""
+    values = [_json_value(_key_value(obj, field.lstrip('-'))) for field in ordering]
+    raw = json.dumps(values, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, ordering) -> list:
+    """Return the key values stored in a cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError):
+        raise InvalidCursor()
+    if not isinstance(values, list) or len(values) != len(ordering):
+        raise InvalidCursor()
+    return values
+
+
+def _after(ordering, values) -> Q:
+    """
+    Rows strictly after `values` in `ordering` (row-value comparison).
+
+    The OR-expansion alone is not sargable, so it is ANDed with an inclusive
+    bound on the leading key that lets the index seek to the cursor position.
+    """
+    condition = Q()
+    for i, field in enumerate(ordering):
+        name = field.lstrip('-')
+        lookup = 'lt' if field.startswith('-') else 'gt'
+        branch = Q(**{f'{name}__{lookup}': values[i]})
+        for prev_field, prev_value in zip(ordering[:i], values[:i]):
+            branch &= Q(**{prev_field.lstrip('-'): prev_value})
+        condition |= branch
+    leading = ordering[0]
+    bound = 'lte' if leading.startswith('-') else 'gte'
+    return Q(**{f'{leading.lstrip("-")}__{bound}': values[0]}) & condition
+
+
+def page_queryset(queryset, ordering, skip: int, limit: int, cursor: str = None):
+    """
+    Ordered, sliced queryset for one page. Fetches `limit + 1` rows: the
+    extra row only tells whether a next page exists.
+    """
+    queryset = queryset.order_by(*ordering)
+    if cursor:
+        return queryset.filter(_after(ordering, decode_cursor(cursor, ordering)))[:limit + 1]
+    return queryset[skip:skip + limit + 1]
+
+
+def _complete_first_page(rows, skip, limit, cursor) -> bool:
+    return not cursor and not skip and len(rows) <= limit
+
+
+def _page(rows, total, strategy, ordering, limit) -> Page:
+    items = rows[:limit]
+    next_cursor = encode_cursor(items[-1], ordering) if len(rows) > limit else None
+    return Page(items, total, next_cursor, strategy)
+
+
+def paginate(queryset, ordering=CREATED_ORDERING, skip: int = 0, limit: int = 20,
+             cursor: str = None, count: str = EXACT) -> Page:
+    """
+    Page a queryset by `cursor` (keyset) or, without one, by `skip`/`limit`.
+    `total` counts the whole filtered queryset using the `count` strategy.
+    """
+    strategy = check_strategy(count)
+    rows = list(page_queryset(queryset, ordering, skip, limit, cursor))
+    if _complete_first_page(rows, skip, limit, cursor):
+        total, strategy = len(rows), EXACT
+    else:
+        total, strategy = count_total(queryset, strategy)
+    return _page(rows, total, strategy, ordering, limit)
+
+
+async def apaginate(queryset, ordering=CREATED_ORDERING, skip: int = 0, limit: int = 20,
+                    cursor: str = None, count: str = EXACT) -> Page:
+    """Async variant of `paginate`."""
+    strategy = check_strategy(count)
+    rows = [row async for row in page_queryset(queryset, ordering, skip, limit, cursor)]
+    if _complete_first_page(rows, skip, limit, cursor):
+        total, strategy = len(rows), EXACT
+    else:
+        total, strategy = await acount_total(queryset, strategy)
+    return _page(rows, total, strategy, ordering, limit)
@@ -4,28 +4,35 @@ Permission decorators for role-based access control.
 from functools import wraps
 from ninja.errors import HttpError
 
+# Precomputed role sets for membership checks
+ADMIN_ROLES = frozenset({'admin'})
+MANAGER_ROLES = frozenset({'admin', 'manager'})
+
+
+def has_role(request, roles: frozenset) -> bool:
+    """Check if the authenticated principal's role is in `roles`."""
+    principal = getattr(request, 'auth', None)
+    return principal is not None and principal.role in roles
+
 
 def require_roles(*allowed_roles):
     """
     Decorator to check if user has required role.
     Usage: @require_roles('admin', 'manager')
     """
+    allowed = frozenset(allowed_roles)
+    denied_message = f"Permission denied. Required roles: {', '.join(allowed_roles)}"
+
     def decorator(func):
         @wraps(func)
         def wrapper(request, *args, **kwargs):
-            # Check both request.auth (Django Ninja) and request.user (Django)
-            user = getattr(request, 'auth', None) or getattr(request, 'user', None)
-
-            if not user:
-                raise HttpError(401, "Authentication required")
-
-            # Check if user is authenticated (for Django User objects)
-            if hasattr(user, 'is_authenticated') and not user.is_authenticated:
+            # request.auth is the principal set by AuthBearer
+            principal = getattr(request, 'auth', None)
+            if principal is None:
                 raise HttpError(401, "Authentication required")
 
-            user_role = getattr(user, 'role', None)
-            if user_role not in allowed_roles:
-                raise HttpError(403, f"Permission denied. Required roles: {', '.join(allowed_roles)}")
+            if principal.role not in allowed:
+                raise HttpError(403, denied_message)
 
             return func(request, *args, **kwargs)
         return wrapper
@@ -39,17 +46,11 @@ def require_admin(func):
     """
     @wraps(func)
     def wrapper(request, *args, **kwargs):
-        # Check both request.auth (Django Ninja) and request.user (Django)
-        user = getattr(request, 'auth', None) or getattr(request, 'user', None)
-
-        if not user:
-            raise HttpError(401, "Authentication required")
-
-        # Check if user is authenticated (for Django User objects)
-        if hasattr(user, 'is_authenticated') and not user.is_authenticated:
+        principal = getattr(request, 'auth', None)
+        if principal is None:
             raise HttpError(401, "Authentication required")
 
-        if getattr(user, 'role', None) != 'admin':
+        if principal.role not in ADMIN_ROLES:
             raise HttpError(403, "Admin access required")
 
         return func(request, *args, **kwargs)
@@ -63,14 +64,7 @@ def require_auth(func):
     """
     @wraps(func)
     def wrapper(request, *args, **kwargs):
-        # Check both request.auth (Django Ninja) and request.user (Django)
-        user = getattr(request, 'auth', None) or getattr(request, 'user', None)
-
-        if not user:
-            raise HttpError(401, "Authentication required")
-
-        # Check if user is authenticated (for Django User objects)
-        if hasattr(user, 'is_authenticated') and not user.is_authenticated:
+        if getattr(request, 'auth', None) is None:
             raise HttpError(401, "Authentication required")
 
         return func(request, *args, **kwargs)
@@ -3,20 +3,21 @@ API endpoints cho Employee management.
 """
 from typing import Optional
 from uuid import UUID
+from datetime import date
 from ninja import Router, Query
 from ninja.errors import HttpError
-from api.main import AuthBearer
+from api.dependencies import async_auth_bearer, get_current_user
 from api.permissions import require_roles, require_auth
 from .schemas import (
     EmployeeCreate, EmployeeUpdate, EmployeeRead,
-    EmployeeList, EmployeeFilter
+    EmployeeList, EmployeeFilter, EmployeeScheduleItem, EmployeeWorkload
 )
 from .services import EmployeeService
 
 router = Router(tags=["Employees"])
 
 
-@router.post("/debug", auth=AuthBearer(), summary="Debug endpoint")
+@router.post("/debug", summary="Debug endpoint")
 def debug_create(request):
     """Debug endpoint to see raw request body."""
     import json
@@ -25,7 +26,7 @@ def debug_create(request):
     return {"received": body}
 
 
-@router.post("/", response={201: EmployeeRead}, auth=AuthBearer(), summary="Tạo nhân viên mới")
+@router.post("/", response={201: EmployeeRead}, summary="Tạo nhân viên mới")
 @require_roles('admin', 'manager')
 def create_employee(request, payload: EmployeeCreate):
     """
@@ -42,7 +43,7 @@ def create_employee(request, payload: EmployeeCreate):
         # request.auth contains the authenticated user from AuthBearer
         import json
         print(f"Received payload: {json.dumps(payload.model_dump(), indent=2, default=str)}")
-        employee = EmployeeService.create_employee(payload, created_by=request.auth)
+        employee = EmployeeService.create_employee(payload, created_by=get_current_user(request))
         return 201, employee
     except Exception as e:
         import traceback
@@ -51,8 +52,8 @@ def create_employee(request, payload: EmployeeCreate):
         raise HttpError(400, f"Không thể tạo nhân viên: {str(e)}")
 
 
-@router.get("/", response=EmployeeList, summary="Lấy danh sách nhân viên")
-def list_employees(request):
+@router.get("/", response=EmployeeList, summary="Lấy danh sách nhân viên", auth=async_auth_bearer)
+async def list_employees(request):
     """
     Lấy danh sách nhân viên với các filter options.
 
@@ -61,6 +62,8 @@ def list_employees(request):
     - **search**: Tìm kiếm theo tên, email hoặc số điện thoại
     - **skip**: Phân trang - bỏ qua
     - **limit**: Phân trang - giới hạn
+    - **cursor**: Phân trang keyset - `next_cursor` của trang trước (thay cho skip)
+    - **count**: Cách tính total - exact (mặc định), cached, estimate
     """
     # Extract parameters manually from request.GET
     role = request.GET.get('role', None)
@@ -68,15 +71,24 @@ def list_employees(request):
     search = request.GET.get('search', None)
     skip = int(request.GET.get('skip', 0))
     limit = int(request.GET.get('limit', 20))
+    cursor = request.GET.get('cursor', None)
+    count = request.GET.get('count', None)
 
-    employees, total = EmployeeService.list_employees(
+    page = await EmployeeService.alist_employees(
         role=role,
         is_active=is_active,
         search=search,
         skip=skip,
-        limit=limit
+        limit=limit,
+        cursor=cursor,
+        count=count
     )
-    return {"total": total, "items": employees}
+    return {
+        "total": page.total,
+        "items": page.items,
+        "next_cursor": page.next_cursor,
+        "count_strategy": page.count_strategy,
+    }
 
 
 @router.get("/{employee_id}", response=EmployeeRead, summary="Lấy thông tin nhân viên")
@@ -92,6 +104,52 @@ def get_employee(request, employee_id: UUID):
     return employee
 
 
+@router.get("/{employee_id}/schedule", response=list[EmployeeScheduleItem], summary="Lịch chụp của nhân viên")
+def get_employee_schedule(
+    request,
+    employee_id: UUID,
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None
+):
+    """
+    Các show nhân viên được phân công trong khoảng ngày (không tính dự án đã hủy).
+
+    - **employee_id**: UUID của nhân viên
+    - **from_date**: Từ ngày (mặc định đầu tháng hiện tại)
+    - **to_date**: Đến ngày (mặc định cuối tháng của from_date)
+    """
+    try:
+        schedule = EmployeeService.get_schedule(employee_id, from_date, to_date)
+    except ValueError as e:
+        raise HttpError(400, str(e))
+    if schedule is None:
+        raise HttpError(404, "Không tìm thấy nhân viên")
+    return schedule
+
+
+@router.get("/{employee_id}/workload", response=EmployeeWorkload, summary="Khối lượng công việc của nhân viên")
+def get_employee_workload(
+    request,
+    employee_id: UUID,
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None
+):
+    """
+    Tổng số show, số ngày chụp, lương và thưởng của nhân viên trong khoảng ngày.
+
+    - **employee_id**: UUID của nhân viên
+    - **from_date**: Từ ngày (mặc định đầu tháng hiện tại)
+    - **to_date**: Đến ngày (mặc định cuối tháng của from_date)
+    """
+    try:
+        workload = EmployeeService.get_workload(employee_id, from_date, to_date)
+    except ValueError as e:
+        raise HttpError(400, str(e))
+    if workload is None:
+        raise HttpError(404, "Không tìm thấy nhân viên")
+    return workload
+
+
 @router.put("/{employee_id}", response=EmployeeRead, summary="Cập nhật nhân viên")
 @require_roles('admin', 'manager')
 def update_employee(request, employee_id: UUID, payload: EmployeeUpdate):
@@ -121,7 +179,7 @@ def partial_update_employee(request, employee_id: UUID, payload: EmployeeUpdate)
     return employee
 
 
-@router.delete("/{employee_id}", response={200: dict}, auth=AuthBearer(), summary="Xóa nhân viên")
+@router.delete("/{employee_id}", response={200: dict}, summary="Xóa nhân viên")
 @require_roles('admin')
 def delete_employee(request, employee_id: UUID):
     """
@@ -136,7 +194,7 @@ def delete_employee(request, employee_id: UUID):
     return {"success": True, "message": "Đã xóa nhân viên thành công"}
 
 
-@router.patch("/{employee_id}/deactivate", response=EmployeeRead, auth=AuthBearer(), summary="Cho nhân viên nghỉ việc")
+@router.patch("/{employee_id}/deactivate", response=EmployeeRead, summary="Cho nhân viên nghỉ việc")
 @require_roles('admin', 'manager')
 def deactivate_employee(request, employee_id: UUID):
     """
@@ -151,7 +209,7 @@ def deactivate_employee(request, employee_id: UUID):
     return employee
 
 
-@router.patch("/{employee_id}/activate", response=EmployeeRead, auth=AuthBearer(), summary="Cho nhân viên quay lại làm việc")
+@router.patch("/{employee_id}/activate", response=EmployeeRead, summary="Cho nhân viên quay lại làm việc")
 @require_roles('admin', 'manager')
 def activate_employee(request, employee_id: UUID):
     """
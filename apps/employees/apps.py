@@ -5,3 +5,7 @@ class EmployeesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.employees'
     verbose_name = 'Employees'
+
+    def ready(self):
+        from api.counting import track_counts
+        track_counts(self.get_model('Employee'))
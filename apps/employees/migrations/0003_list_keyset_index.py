@@ -0,0 +1,23 @@
+# Generated by Django 5.0.1 on 2026-10-17 01:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='employee',
+            options={'ordering': ['-created_at', '-id'], 'verbose_name': 'Nhân viên', 'verbose_name_plural': 'Nhân viên'},
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['-created_at', '-id'], name='employees_created_8a847d_idx'),
+        ),
+    ]
@@ -94,8 +94,9 @@ class Employee(models.Model):
         db_table = 'employees'
         verbose_name = 'Nhân viên'
         verbose_name_plural = 'Nhân viên'
-        ordering = ['-created_at']
+        ordering = ['-created_at', '-id']
         indexes = [
+            models.Index(fields=['-created_at', '-id']),
             models.Index(fields=['name', 'role']),
             models.Index(fields=['is_active']),
         ]
@@ -1,7 +1,7 @@
 """
 Pydantic schemas cho Employee API.
 """
-from datetime import datetime, date
+from datetime import datetime, date, time
 from typing import Optional, List, Dict
 from pydantic import BaseModel, Field, field_validator, EmailStr
 from uuid import UUID
@@ -102,6 +102,8 @@ class EmployeeList(BaseModel):
     """Schema cho danh sách nhân viên."""
     total: int
     items: List[EmployeeRead]
+    next_cursor: Optional[str] = None
+    count_strategy: str = 'exact'
 
 
 class EmployeeFilter(BaseModel):
@@ -111,3 +113,39 @@ class EmployeeFilter(BaseModel):
     search: Optional[str] = Field(None, description="Tìm kiếm theo tên")
     skip: int = Field(default=0, ge=0)
     limit: int = Field(default=20, ge=1, le=100)
+
+
+class EmployeeScheduleItem(BaseModel):
+    """Schema cho một show trong lịch của nhân viên."""
+    project_id: UUID
+    project_code: str
+    customer_name: str
+    shoot_date: date
+    shoot_time: Optional[str] = None
+    start_time: time
+    end_time: time
+    location: Optional[str] = None
+    status: str
+    role: str
+    salary: float
+    bonus: float
+
+
+class RoleWorkload(BaseModel):
+    """Schema cho khối lượng công việc theo vai trò."""
+    role: str
+    shoots: int
+    salary: float
+    bonus: float
+
+
+class EmployeeWorkload(BaseModel):
+    """Schema cho khối lượng công việc của nhân viên."""
+    employee_id: UUID
+    from_date: date
+    to_date: date
+    total_shoots: int
+    shoot_days: int
+    total_salary: float
+    total_bonus: float
+    by_role: List[RoleWorkload]
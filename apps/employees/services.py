@@ -1,11 +1,18 @@
 """
 Business logic services cho Employee.
 """
-from typing import Optional, List, Dict
+import calendar
+from datetime import date
+from typing import Optional, List, Dict, Tuple
 from uuid import UUID
-from django.db.models import Q
+from django.db.models import Count, F, Q, Sum
 from .models import Employee
 from .schemas import EmployeeCreate, EmployeeUpdate
+from api.pagination import CREATED_ORDERING, Page, apaginate, paginate
+
+
+# Khoảng ngày tối đa của lịch / khối lượng công việc
+MAX_SCHEDULE_DAYS = 366
 
 
 class EmployeeService:
@@ -108,8 +115,10 @@ class EmployeeService:
         is_active: Optional[bool] = None,
         search: Optional[str] = None,
         skip: int = 0,
-        limit: int = 20
-    ) -> tuple[List[Employee], int]:
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        count: Optional[str] = None
+    ) -> Page:
         """
         Lấy danh sách nhân viên với filter.
 
@@ -117,12 +126,37 @@ class EmployeeService:
             role: Filter theo vai trò
             is_active: Filter theo trạng thái
             search: Tìm kiếm theo tên
-            skip: Số bản ghi bỏ qua
+            skip: Số bản ghi bỏ qua (bỏ qua nếu có cursor)
             limit: Số bản ghi tối đa
+            cursor: Cursor trang tiếp theo (keyset trên created_at, id)
+            count: Cách tính tổng số (exact, cached, estimate)
 
         Returns:
-            Tuple (danh sách nhân viên, tổng số)
+            Page (danh sách nhân viên, tổng số) kèm next_cursor
+        """
+        queryset = EmployeeService._filter_employees(role, is_active, search)
+        return paginate(queryset, CREATED_ORDERING, skip, limit, cursor, count)
+
+    @staticmethod
+    async def alist_employees(
+        role: Optional[str] = None,
+        is_active: Optional[bool] = None,
+        search: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        count: Optional[str] = None
+    ) -> Page:
         """
+        Lấy danh sách nhân viên với filter (async ORM, dùng cho view async).
+        Tham số và kết quả giống `list_employees`.
+        """
+        queryset = EmployeeService._filter_employees(role, is_active, search)
+        return await apaginate(queryset, CREATED_ORDERING, skip, limit, cursor, count)
+
+    @staticmethod
+    def _filter_employees(role, is_active, search):
+        """Dựng queryset nhân viên theo các filter của danh sách."""
         queryset = Employee.objects.all()
 
         # Apply filters
@@ -137,10 +171,7 @@ class EmployeeService:
                 Q(name__icontains=search) | Q(email__icontains=search) | Q(phone__icontains=search)
             )
 
-        total = queryset.count()
-        employees = list(queryset[skip:skip + limit])
-
-        return employees, total
+        return queryset
 
     @staticmethod
     def delete_employee(employee_id: UUID) -> bool:
@@ -239,3 +270,108 @@ class EmployeeService:
                 Q(phone__icontains=query)
             )
         )
+
+    @staticmethod
+    def _schedule_range(from_date: Optional[date], to_date: Optional[date]) -> Tuple[date, date]:
+        """Khoảng ngày của lịch; mặc định là tháng hiện tại."""
+        today = date.today()
+        from_date = from_date or today.replace(day=1)
+        to_date = to_date or from_date.replace(day=calendar.monthrange(from_date.year, from_date.month)[1])
+        if from_date > to_date:
+            raise ValueError("from_date phải trước hoặc bằng to_date")
+        if (to_date - from_date).days >= MAX_SCHEDULE_DAYS:
+            raise ValueError(f"Khoảng ngày tối đa {MAX_SCHEDULE_DAYS} ngày")
+        return from_date, to_date
+
+    @staticmethod
+    def _assignments(employee_id: UUID, from_date: date, to_date: date):
+        """Phân công của nhân viên trong khoảng ngày (index employee, shoot_date), bỏ dự án đã hủy."""
+        from apps.projects.models import ProjectAssignment
+
+        return ProjectAssignment.objects.filter(
+            employee_id=employee_id, shoot_date__range=(from_date, to_date)
+        ).exclude(project__status='cancelled')
+
+    @staticmethod
+    def get_schedule(
+        employee_id: UUID,
+        from_date: Optional[date] = None,
+        to_date: Optional[date] = None
+    ) -> Optional[List[Dict]]:
+        """
+        Lịch chụp của nhân viên: các dự án được phân công trong khoảng ngày.
+
+        Args:
+            employee_id: ID nhân viên
+            from_date: Từ ngày (mặc định đầu tháng hiện tại)
+            to_date: Đến ngày (mặc định cuối tháng của from_date)
+
+        Returns:
+            Danh sách phân công theo ngày chụp, None nếu không có nhân viên
+
+        Raises:
+            ValueError: Khoảng ngày không hợp lệ
+        """
+        from_date, to_date = EmployeeService._schedule_range(from_date, to_date)
+        if not Employee.objects.filter(id=employee_id).exists():
+            return None
+
+        return list(
+            EmployeeService._assignments(employee_id, from_date, to_date)
+            .order_by('shoot_date', 'start_time', 'project_id')
+            .values(
+                'project_id', 'role', 'shoot_date', 'start_time', 'end_time', 'salary', 'bonus',
+                project_code=F('project__project_code'),
+                customer_name=F('project__customer_name'),
+                shoot_time=F('project__shoot_time'),
+                location=F('project__location'),
+                status=F('project__status'),
+            )
+        )
+
+    @staticmethod
+    def get_workload(
+        employee_id: UUID,
+        from_date: Optional[date] = None,
+        to_date: Optional[date] = None
+    ) -> Optional[Dict]:
+        """
+        Khối lượng công việc của nhân viên trong khoảng ngày: số show, số
+        ngày chụp, lương/thưởng, chia theo vai trò (tính bằng GROUP BY).
+
+        Args:
+            employee_id: ID nhân viên
+            from_date: Từ ngày (mặc định đầu tháng hiện tại)
+            to_date: Đến ngày (mặc định cuối tháng của from_date)
+
+        Returns:
+            Dict tổng hợp, None nếu không có nhân viên
+
+        Raises:
+            ValueError: Khoảng ngày không hợp lệ
+        """
+        from_date, to_date = EmployeeService._schedule_range(from_date, to_date)
+        if not Employee.objects.filter(id=employee_id).exists():
+            return None
+
+        assignments = EmployeeService._assignments(employee_id, from_date, to_date)
+        totals = assignments.aggregate(
+            shoots=Count('project', distinct=True),
+            shoot_days=Count('shoot_date', distinct=True),
+            salary=Sum('salary'),
+            bonus=Sum('bonus'),
+        )
+        by_role = (
+            assignments.order_by('role').values('role')
+            .annotate(shoots=Count('project', distinct=True), salary=Sum('salary'), bonus=Sum('bonus'))
+        )
+        return {
+            'employee_id': employee_id,
+            'from_date': from_date,
+            'to_date': to_date,
+            'total_shoots': totals['shoots'],
+            'shoot_days': totals['shoot_days'],
+            'total_salary': totals['salary'] or 0,
+            'total_bonus': totals['bonus'] or 0,
+            'by_role': list(by_role),
+        }
@@ -12,6 +12,28 @@ from apps.partners.models import Partner
 class FinanceService:
     """Service class cho xử lý logic tài chính."""
 
+    @staticmethod
+    def _projects_in_month(month: str):
+        """
+        Dự án có ngày chụp trong tháng (YYYY-MM).
+
+        Lọc theo khoảng [ngày 1, ngày 1 tháng sau) thay vì __year/__month
+        để dùng được index trên shoot_date.
+        """
+        year, month_num = map(int, month.split('-'))
+        start = date(year, month_num, 1)
+        end = date(year + month_num // 12, month_num % 12 + 1, 1)
+        return Project.objects.filter(shoot_date__gte=start, shoot_date__lt=end)
+
+    @staticmethod
+    def _partner_costs(projects) -> float:
+        """Tổng chi phí đối tác (partners.total_cost) của các dự án, chỉ đọc cột partners."""
+        return sum(
+            float(partners.get('total_cost', 0))
+            for partners in projects.values_list('partners', flat=True)
+            if partners
+        )
+
     @staticmethod
     def monthly_overview(month: str) -> Dict:
         """
@@ -23,40 +45,27 @@ class FinanceService:
         Returns:
             Dict chứa tổng quan tài chính
         """
-        # Parse month
-        year, month_num = map(int, month.split('-'))
-
-        # Get projects in month
-        projects = Project.objects.filter(
-            shoot_date__year=year,
-            shoot_date__month=month_num
+        projects = FinanceService._projects_in_month(month)
+
+        # Doanh thu và số dự án: một câu aggregate
+        totals = projects.aggregate(
+            total_revenue=Sum('package_final_price'),
+            completed_revenue=Sum('package_final_price', filter=Q(status='completed')),
+            project_count=Count('id'),
+            completed_project_count=Count('id', filter=Q(status='completed')),
         )
-
-        # Calculate revenue
-        total_revenue = 0
-        completed_revenue = 0
-        pending_revenue = 0
-
-        for project in projects:
-            revenue = float(project.package_final_price)
-            total_revenue += revenue
-
-            if project.status == 'completed':
-                completed_revenue += revenue
-            else:
-                pending_revenue += revenue
+        total_revenue = float(totals['total_revenue'] or 0)
+        completed_revenue = float(totals['completed_revenue'] or 0)
+        pending_revenue = total_revenue - completed_revenue
 
         # Calculate costs
         # 1. Salary costs
         salary_costs = MonthlySalary.objects.filter(month=month).aggregate(
-            total=Sum('total_salary')
+            total=Sum('total_amount')
         )['total'] or 0
 
         # 2. Partner costs
-        partner_costs = 0
-        for project in projects:
-            if project.partners and 'total_cost' in project.partners:
-                partner_costs += float(project.partners.get('total_cost', 0))
+        partner_costs = FinanceService._partner_costs(projects)
 
         total_costs = float(salary_costs) + partner_costs
 
@@ -84,8 +93,8 @@ class FinanceService:
             'total_profit': total_profit,
             'revenue_breakdown': revenue_breakdown,
             'cost_breakdown': cost_breakdown,
-            'project_count': projects.count(),
-            'completed_project_count': projects.filter(status='completed').count()
+            'project_count': totals['project_count'],
+            'completed_project_count': totals['completed_project_count']
         }
 
     @staticmethod
@@ -244,30 +253,18 @@ class FinanceService:
         Returns:
             Dict chứa thông tin dòng tiền
         """
-        year, month_num = map(int, month.split('-'))
-
-        # Get projects in month
-        projects = Project.objects.filter(
-            shoot_date__year=year,
-            shoot_date__month=month_num
-        )
+        projects = FinanceService._projects_in_month(month)
 
         # Calculate inflow (payments received)
-        total_inflow = 0
-        for project in projects:
-            if project.payment and 'paid' in project.payment:
-                total_inflow += float(project.payment['paid'])
+        total_inflow = float(projects.aggregate(total=Sum('paid_amount'))['total'] or 0)
 
         # Calculate outflow (salaries + partner costs)
         salary_outflow = MonthlySalary.objects.filter(
             month=month,
-            is_paid=True
-        ).aggregate(total=Sum('total_salary'))['total'] or 0
+            status='paid'
+        ).aggregate(total=Sum('total_amount'))['total'] or 0
 
-        partner_outflow = 0
-        for project in projects:
-            if project.partners:
-                partner_outflow += float(project.partners.get('total_cost', 0))
+        partner_outflow = FinanceService._partner_costs(projects)
 
         total_outflow = float(salary_outflow) + partner_outflow
 
@@ -342,19 +339,10 @@ class FinanceService:
         overview = FinanceService.monthly_overview(month)
 
         # Calculate pending payments
-        year, month_num = map(int, month.split('-'))
-        projects = Project.objects.filter(
-            shoot_date__year=year,
-            shoot_date__month=month_num
+        pending_payments = float(
+            FinanceService._projects_in_month(month).aggregate(total=Sum('balance_due'))['total'] or 0
         )
 
-        pending_payments = 0
-        for project in projects:
-            if project.payment and 'paid' in project.payment:
-                paid = float(project.payment['paid'])
-                total = float(project.package_final_price)
-                pending_payments += (total - paid)
-
         return {
             'period': month,
             'revenue': overview['total_revenue'],
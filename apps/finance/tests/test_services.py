@@ -0,0 +1,66 @@
+"""
+Unit tests cho FinanceService.
+"""
+import pytest
+from datetime import date
+from decimal import Decimal
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from apps.employees.models import Employee
+from apps.finance.services import FinanceService
+from apps.packages.models import Package
+from apps.projects.models import Project
+from apps.salaries.models import MonthlySalary
+
+
+@pytest.mark.django_db
+class TestFinanceService(TestCase):
+    """Test cases for FinanceService."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.package = Package.objects.create(
+            name='Wedding', category='wedding', price=Decimal('5000000'), description='Test'
+        )
+        self._create_project(date(2025, 3, 1), paid=5000000, status='completed', payment_status='paid')
+        self._create_project(date(2025, 3, 31), paid=2000000, payment_status='deposit',
+                             partners={'total_cost': 300000})
+        self._create_project(date(2025, 4, 1), paid=1000000, payment_status='deposit')
+        employee = Employee.objects.create(name='Photographer', role='Photo/Retouch', email='p@example.com')
+        MonthlySalary.objects.create(employee=employee, month='2025-03', total_amount=Decimal('1500000'), status='paid')
+
+    def _create_project(self, shoot_date, paid, payment_status, status='pending', partners=None):
+        return Project.objects.create(
+            customer_name='Customer', customer_phone='0123456789', package_type=self.package,
+            package_name='Wedding', package_price=Decimal('5000000'), package_discount=Decimal('0'),
+            package_final_price=Decimal('5000000'), shoot_date=shoot_date, status=status,
+            # Totals as left by add_payment; the payment JSON does not drive the columns
+            paid_amount=Decimal(paid),
+            payment={'status': payment_status, 'paid': paid, 'deposit': 0, 'final': 0, 'payment_history': []},
+            partners=partners or {},
+        )
+
+    def test_cash_flow_sums_paid_amount_in_month(self):
+        """Test inflow sums the typed paid_amount column for the month only."""
+        result = FinanceService.cash_flow('2025-03')
+
+        self.assertEqual(result['total_inflow'], 7000000)
+        self.assertEqual(result['outflow_details'], {'salaries': 1500000, 'partners': 300000})
+
+    def test_financial_summary_pending_payments(self):
+        """Test receivables come from the balance_due column."""
+        result = FinanceService.financial_summary('2025-03')
+
+        self.assertEqual(result['pending_payments'], 3000000)
+        self.assertEqual(result['revenue'], 10000000)
+        self.assertEqual((result['project_count'], result['completed_projects']), (2, 1))
+
+    def test_cash_flow_does_not_load_projects(self):
+        """Test payment totals are a SQL SUM, not a scan of project rows."""
+        with CaptureQueriesContext(connection) as queries:
+            FinanceService.cash_flow('2025-03')
+
+        project_queries = [q['sql'] for q in queries.captured_queries if 'FROM "projects"' in q['sql']]
+        self.assertTrue(any('SUM("projects"."paid_amount")' in sql for sql in project_queries))
+        self.assertFalse(any('"projects"."payment"' in sql for sql in project_queries))
@@ -5,6 +5,7 @@ from typing import Optional
 from uuid import UUID
 from ninja import Router, Query
 from ninja.errors import HttpError
+from api.dependencies import async_auth_bearer, get_current_user
 from .schemas import PackageCreate, PackageUpdate, PackageRead, PackageList
 from .services import PackageService
 
@@ -23,16 +24,15 @@ def create_package(request, payload: PackageCreate):
     - **includes**: Danh sách dịch vụ bao gồm
     """
     try:
-        # Only pass created_by if user is authenticated
-        created_by = request.user if request.user.is_authenticated else None
+        created_by = get_current_user(request)
         package = PackageService.create_package(payload, created_by=created_by)
         return 201, package
     except Exception as e:
         raise HttpError(400, f"Không thể tạo gói chụp: {str(e)}")
 
 
-@router.get("/", response=PackageList, summary="Lấy danh sách gói chụp")
-def list_packages(request):
+@router.get("/", response=PackageList, summary="Lấy danh sách gói chụp", auth=async_auth_bearer)
+async def list_packages(request):
     """
     Lấy danh sách gói chụp với các filter options.
 
@@ -43,6 +43,8 @@ def list_packages(request):
     - **search**: Tìm kiếm theo tên hoặc mô tả
     - **skip**: Phân trang - bỏ qua
     - **limit**: Phân trang - giới hạn
+    - **cursor**: Phân trang keyset - `next_cursor` của trang trước (thay cho skip)
+    - **count**: Cách tính total - exact (mặc định), cached, estimate
     """
     # Extract parameters manually from request.GET
     category = request.GET.get('category', None)
@@ -52,17 +54,26 @@ def list_packages(request):
     search = request.GET.get('search', None)
     skip = int(request.GET.get('skip', 0))
     limit = int(request.GET.get('limit', 20))
+    cursor = request.GET.get('cursor', None)
+    count = request.GET.get('count', None)
 
-    packages, total = PackageService.list_packages(
+    page = await PackageService.alist_packages(
         category=category,
         is_active=is_active,
         min_price=min_price,
         max_price=max_price,
         search=search,
         skip=skip,
-        limit=limit
+        limit=limit,
+        cursor=cursor,
+        count=count
     )
-    return {"total": total, "items": packages}
+    return {
+        "total": page.total,
+        "items": page.items,
+        "next_cursor": page.next_cursor,
+        "count_strategy": page.count_strategy,
+    }
 
 
 @router.get("/{package_id}", response=PackageRead, summary="Lấy thông tin gói chụp")
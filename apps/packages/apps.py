@@ -5,3 +5,7 @@ class PackagesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.packages'
     verbose_name = 'Packages'
+
+    def ready(self):
+        from api.counting import track_counts
+        track_counts(self.get_model('Package'))
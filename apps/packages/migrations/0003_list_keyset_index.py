@@ -0,0 +1,23 @@
+# Generated by Django 5.0.1 on 2026-10-17 01:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('packages', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='package',
+            options={'ordering': ['-created_at', '-id'], 'verbose_name': 'Gói chụp', 'verbose_name_plural': 'Gói chụp'},
+        ),
+        migrations.AddIndex(
+            model_name='package',
+            index=models.Index(fields=['-created_at', '-id'], name='packages_created_881eb6_idx'),
+        ),
+    ]
@@ -2,8 +2,9 @@
 Models cho quản lý gói chụp.
 """
 import uuid
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth import get_user_model
+from apps.sequences.services import SequenceService
 
 User = get_user_model()
 
@@ -76,8 +77,9 @@ class Package(models.Model):
         db_table = 'packages'
         verbose_name = 'Gói chụp'
         verbose_name_plural = 'Gói chụp'
-        ordering = ['-created_at']
+        ordering = ['-created_at', '-id']
         indexes = [
+            models.Index(fields=['-created_at', '-id']),
             models.Index(fields=['is_active', 'category']),
             models.Index(fields=['name']),
         ]
@@ -87,8 +89,11 @@ class Package(models.Model):
 
     def save(self, *args, **kwargs):
         """Override save để tự động tạo package_id."""
-        if not self.package_id:
-            # Tạo package_id tự động: PKG + 5 chữ số
-            count = Package.objects.count()
-            self.package_id = f"PKG{str(count + 1).zfill(5)}"
-        super().save(*args, **kwargs)
+        if self.package_id:
+            super().save(*args, **kwargs)
+            return
+
+        # Tạo package_id tự động: PKG + 5 chữ số, cấp cùng transaction với INSERT
+        with transaction.atomic():
+            self.package_id = SequenceService.next_code('PKG', 5, Package, 'package_id')
+            super().save(*args, **kwargs)
@@ -76,6 +76,8 @@ class PackageList(BaseModel):
     """Schema cho danh sách gói."""
     total: int
     items: List[PackageRead]
+    next_cursor: Optional[str] = None
+    count_strategy: str = 'exact'
 
 
 class PackageFilter(BaseModel):
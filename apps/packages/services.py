@@ -6,6 +6,7 @@ from uuid import UUID
 from django.db.models import Q
 from .models import Package
 from .schemas import PackageCreate, PackageUpdate
+from api.pagination import CREATED_ORDERING, Page, apaginate, paginate
 
 
 class PackageService:
@@ -99,8 +100,10 @@ class PackageService:
         max_price: Optional[float] = None,
         search: Optional[str] = None,
         skip: int = 0,
-        limit: int = 20
-    ) -> tuple[List[Package], int]:
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        count: Optional[str] = None
+    ) -> Page:
         """
         Lấy danh sách gói chụp với filter.
 
@@ -110,12 +113,43 @@ class PackageService:
             min_price: Giá tối thiểu
             max_price: Giá tối đa
             search: Tìm kiếm theo tên
-            skip: Số bản ghi bỏ qua
+            skip: Số bản ghi bỏ qua (bỏ qua nếu có cursor)
             limit: Số bản ghi tối đa
+            cursor: Cursor trang tiếp theo (keyset trên created_at, id)
+            count: Cách tính tổng số (exact, cached, estimate)
 
         Returns:
-            Tuple (danh sách gói, tổng số)
+            Page (danh sách gói, tổng số) kèm next_cursor
         """
+        queryset = PackageService._filter_packages(
+            category, is_active, min_price, max_price, search
+        )
+        return paginate(queryset, CREATED_ORDERING, skip, limit, cursor, count)
+
+    @staticmethod
+    async def alist_packages(
+        category: Optional[str] = None,
+        is_active: Optional[bool] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        search: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        count: Optional[str] = None
+    ) -> Page:
+        """
+        Lấy danh sách gói chụp với filter (async ORM, dùng cho view async).
+        Tham số và kết quả giống `list_packages`.
+        """
+        queryset = PackageService._filter_packages(
+            category, is_active, min_price, max_price, search
+        )
+        return await apaginate(queryset, CREATED_ORDERING, skip, limit, cursor, count)
+
+    @staticmethod
+    def _filter_packages(category, is_active, min_price, max_price, search):
+        """Dựng queryset gói chụp theo các filter của danh sách."""
         queryset = Package.objects.all()
 
         # Apply filters
@@ -136,10 +170,7 @@ class PackageService:
                 Q(name__icontains=search) | Q(description__icontains=search)
             )
 
-        total = queryset.count()
-        packages = list(queryset[skip:skip + limit])
-
-        return packages, total
+        return queryset
 
     @staticmethod
     def delete_package(package_id: UUID) -> bool:
@@ -5,6 +5,7 @@ from typing import Optional
 from uuid import UUID
 from ninja import Router, Query
 from ninja.errors import HttpError
+from api.dependencies import get_current_user
 from .schemas import PartnerCreate, PartnerUpdate, PartnerRead, PartnerList
 from .services import PartnerService
 
@@ -24,7 +25,7 @@ def create_partner(request, payload: PartnerCreate):
     - **business_info**: Thông tin doanh nghiệp
     """
     try:
-        partner = PartnerService.create_partner(payload, created_by=request.user)
+        partner = PartnerService.create_partner(payload, created_by=get_current_user(request))
         return 201, partner
     except Exception as e:
         raise HttpError(400, f"Không thể tạo đối tác: {str(e)}")
@@ -41,6 +42,8 @@ def list_partners(request):
     - **search**: Tìm kiếm theo tên
     - **skip**: Phân trang - bỏ qua
     - **limit**: Phân trang - giới hạn
+    - **cursor**: Phân trang keyset - `next_cursor` của trang trước (thay cho skip)
+    - **count**: Cách tính total - exact (mặc định), cached, estimate
     """
     # Extract parameters manually from request.GET
     type_param = request.GET.get('type', None)
@@ -49,16 +52,25 @@ def list_partners(request):
     search = request.GET.get('search', None)
     skip = int(request.GET.get('skip', 0))
     limit = int(request.GET.get('limit', 20))
+    cursor = request.GET.get('cursor', None)
+    count = request.GET.get('count', None)
 
-    partners, total = PartnerService.list_partners(
+    page = PartnerService.list_partners(
         type=type_param,
         is_active=is_active,
         min_rating=min_rating,
         search=search,
         skip=skip,
-        limit=limit
+        limit=limit,
+        cursor=cursor,
+        count=count
     )
-    return {"total": total, "items": partners}
+    return {
+        "total": page.total,
+        "items": page.items,
+        "next_cursor": page.next_cursor,
+        "count_strategy": page.count_strategy,
+    }
 
 
 @router.get("/{partner_id}", response=PartnerRead, summary="Lấy thông tin đối tác")
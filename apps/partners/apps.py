@@ -5,3 +5,7 @@ class PartnersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.partners'
     verbose_name = 'Partners'
+
+    def ready(self):
+        from api.counting import track_counts
+        track_counts(self.get_model('Partner'))
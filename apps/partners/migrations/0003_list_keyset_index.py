@@ -0,0 +1,23 @@
+# Generated by Django 5.0.1 on 2026-10-17 01:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('partners', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='partner',
+            options={'ordering': ['-created_at', '-id'], 'verbose_name': 'Đối tác', 'verbose_name_plural': 'Đối tác'},
+        ),
+        migrations.AddIndex(
+            model_name='partner',
+            index=models.Index(fields=['-created_at', '-id'], name='partners_created_21ba11_idx'),
+        ),
+    ]
@@ -2,8 +2,9 @@
 Models cho quản lý đối tác.
 """
 import uuid
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth import get_user_model
+from apps.sequences.services import SequenceService
 
 User = get_user_model()
 
@@ -106,8 +107,9 @@ class Partner(models.Model):
         db_table = 'partners'
         verbose_name = 'Đối tác'
         verbose_name_plural = 'Đối tác'
-        ordering = ['-created_at']
+        ordering = ['-created_at', '-id']
         indexes = [
+            models.Index(fields=['-created_at', '-id']),
             models.Index(fields=['type', 'is_active']),
             models.Index(fields=['name']),
         ]
@@ -117,8 +119,11 @@ class Partner(models.Model):
 
     def save(self, *args, **kwargs):
         """Override save để tự động tạo partner_id."""
-        if not self.partner_id:
-            # Tạo partner_id tự động: PTN + 5 chữ số
-            count = Partner.objects.count()
-            self.partner_id = f"PTN{str(count + 1).zfill(5)}"
-        super().save(*args, **kwargs)
+        if self.partner_id:
+            super().save(*args, **kwargs)
+            return
+
+        # Tạo partner_id tự động: PTN + 5 chữ số, cấp cùng transaction với INSERT
+        with transaction.atomic():
+            self.partner_id = SequenceService.next_code('PTN', 5, Partner, 'partner_id')
+            super().save(*args, **kwargs)
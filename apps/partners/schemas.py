@@ -102,6 +102,8 @@ class PartnerList(BaseModel):
     """Schema cho danh sách đối tác."""
     total: int
     items: List[PartnerRead]
+    next_cursor: Optional[str] = None
+    count_strategy: str = 'exact'
 
 
 class PartnerFilter(BaseModel):
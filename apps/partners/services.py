@@ -6,6 +6,7 @@ from uuid import UUID
 from django.db.models import Q
 from .models import Partner
 from .schemas import PartnerCreate, PartnerUpdate
+from api.pagination import CREATED_ORDERING, Page, paginate
 
 
 class PartnerService:
@@ -111,8 +112,10 @@ class PartnerService:
         min_rating: Optional[float] = None,
         search: Optional[str] = None,
         skip: int = 0,
-        limit: int = 20
-    ) -> tuple[List[Partner], int]:
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        count: Optional[str] = None
+    ) -> Page:
         """
         Lấy danh sách đối tác với filter.
 
@@ -121,11 +124,13 @@ class PartnerService:
             is_active: Filter theo trạng thái
             min_rating: Đánh giá tối thiểu
             search: Tìm kiếm theo tên
-            skip: Số bản ghi bỏ qua
+            skip: Số bản ghi bỏ qua (bỏ qua nếu có cursor)
             limit: Số bản ghi tối đa
+            cursor: Cursor trang tiếp theo (keyset trên created_at, id)
+            count: Cách tính tổng số (exact, cached, estimate)
 
         Returns:
-            Tuple (danh sách đối tác, tổng số)
+            Page (danh sách đối tác, tổng số) kèm next_cursor
         """
         queryset = Partner.objects.all()
 
@@ -142,10 +147,7 @@ class PartnerService:
         if search:
             queryset = queryset.filter(Q(name__icontains=search))
 
-        total = queryset.count()
-        partners = list(queryset[skip:skip + limit])
-
-        return partners, total
+        return paginate(queryset, CREATED_ORDERING, skip, limit, cursor, count)
 
     @staticmethod
     def delete_partner(partner_id: UUID) -> bool:
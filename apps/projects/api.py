@@ -1,23 +1,32 @@
 """
 API endpoints cho Project management.
 """
+import codecs
 from typing import Optional
 from uuid import UUID
-from datetime import date
-from ninja import Router, Query
+from datetime import date, timedelta
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, StreamingHttpResponse
+from ninja import File, Router, Query
+from ninja.files import UploadedFile
 from ninja.errors import HttpError
-from api.main import AuthBearer
-from api.permissions import require_roles, require_auth
+from api.dependencies import ScopedTokenQuery, async_auth_bearer, auth_bearer, get_current_user
+from api.etag import format_etag, parse_if_match
+from api.permissions import MANAGER_ROLES, has_role, require_roles, require_auth
+from apps.users.services import create_scoped_token
 from .schemas import (
-    ProjectCreate, ProjectUpdate, ProjectRead, ProjectList,
-    AddMilestoneRequest, UpdateProgressRequest, AddPaymentRequest
+    ProjectCreate, ProjectUpdate, ProjectRead, ProjectList, ProjectSummaryList, ProjectSearchHit,
+    BookingConflict, ProjectCalendar, ProjectHistory, EventStreamToken, AddMilestoneRequest, UpdateProgressRequest, AddPaymentRequest, PROJECT_SUMMARY_FIELDS
 )
+from . import events
+from .importing import ImportFormatError, detect_format, import_from_lines
 from .services import ProjectService
 
 router = Router(tags=["Projects"])
 
 
-@router.post("/", response={201: ProjectRead}, auth=AuthBearer(), summary="Tạo dự án mới")
+@router.post("/", response={201: ProjectRead}, summary="Tạo dự án mới")
 def create_project(request, payload: ProjectCreate):
     """
     Tạo dự án mới.
@@ -31,9 +40,7 @@ def create_project(request, payload: ProjectCreate):
     - **payment**: Thông tin thanh toán
     """
     try:
-        # Only pass created_by if user is authenticated
-        created_by = request.user if request.user.is_authenticated else None
-        project = ProjectService.create_project(payload, created_by=created_by)
+        project = ProjectService.create_project(payload, created_by=get_current_user(request))
         return 201, project
     except ValueError as e:
         # Validation errors - return clear message
@@ -43,8 +50,8 @@ def create_project(request, payload: ProjectCreate):
         raise HttpError(400, f"Không thể tạo dự án: {str(e)}")
 
 
-@router.get("/", response=ProjectList, auth=AuthBearer(), summary="Lấy danh sách dự án")
-def list_projects(request):
+@router.get("/", response=ProjectList, summary="Lấy danh sách dự án", auth=async_auth_bearer)
+async def list_projects(request):
     """
     Lấy danh sách dự án với các filter options.
 
@@ -55,6 +62,8 @@ def list_projects(request):
     - **customer_name**: Tìm kiếm theo tên hoặc số điện thoại khách hàng
     - **skip**: Phân trang - bỏ qua
     - **limit**: Phân trang - giới hạn
+    - **cursor**: Phân trang keyset - `next_cursor` của trang trước (thay cho skip)
+    - **count**: Cách tính total - exact (mặc định), cached, estimate
     """
     # Extract parameters manually from request.GET
     status = request.GET.get('status', None)
@@ -64,78 +73,301 @@ def list_projects(request):
     customer_name = request.GET.get('customer_name', None)
     skip = int(request.GET.get('skip', 0))
     limit = int(request.GET.get('limit', 20))
+    cursor = request.GET.get('cursor', None)
+    count = request.GET.get('count', None)
 
-    projects, total = ProjectService.list_projects(
+    page = await ProjectService.alist_projects(
         status=status,
         payment_status=payment_status,
         from_date=from_date,
         to_date=to_date,
         customer_name=customer_name,
         skip=skip,
-        limit=limit
+        limit=limit,
+        cursor=cursor,
+        count=count
     )
-    return {"total": total, "items": projects}
+    return {
+        "total": page.total,
+        "items": page.items,
+        "next_cursor": page.next_cursor,
+        "count_strategy": page.count_strategy,
+    }
+
+
+def _parse_fields(value: Optional[str]) -> tuple:
+    """Đọc tham số `fields=a,b,c`; `id` luôn được trả về."""
+    if not value:
+        return PROJECT_SUMMARY_FIELDS
+    fields = [field.strip() for field in value.split(',') if field.strip()]
+    unknown = [field for field in fields if field not in PROJECT_SUMMARY_FIELDS]
+    if unknown:
+        raise HttpError(
+            400, f"Field không hợp lệ: {', '.join(unknown)}. Cho phép: {', '.join(PROJECT_SUMMARY_FIELDS)}"
+        )
+    return tuple(dict.fromkeys(['id', *fields]))
+
+
+@router.get(
+    "/summary", response=ProjectSummaryList, exclude_unset=True,
+    summary="Lấy danh sách dự án rút gọn", auth=async_auth_bearer
+)
+async def list_project_summaries(request):
+    """
+    Lấy danh sách dự án rút gọn cho bảng danh sách: chỉ các cột scalar,
+    không có các cột JSON (milestones, team, files, update_history, ...).
+
+    - **fields**: Các cột cần lấy, phân tách bằng dấu phẩy (mặc định toàn bộ ProjectSummary)
+    - Các filter, **skip**, **limit**, **cursor**, **count** giống `GET /projects/`
+    """
+    fields = _parse_fields(request.GET.get('fields', None))
+    status = request.GET.get('status', None)
+    payment_status = request.GET.get('payment_status', None)
+    from_date = request.GET.get('from_date', None)
+    to_date = request.GET.get('to_date', None)
+    customer_name = request.GET.get('customer_name', None)
+    skip = int(request.GET.get('skip', 0))
+    limit = int(request.GET.get('limit', 20))
+    cursor = request.GET.get('cursor', None)
+    count = request.GET.get('count', None)
+
+    page = await ProjectService.alist_project_summaries(
+        status=status,
+        payment_status=payment_status,
+        from_date=from_date,
+        to_date=to_date,
+        customer_name=customer_name,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        count=count,
+        fields=fields
+    )
+    return {
+        "total": page.total,
+        "items": page.items,
+        "next_cursor": page.next_cursor,
+        "count_strategy": page.count_strategy,
+    }
 
 
-@router.get("/{project_id}", response=ProjectRead, summary="Lấy thông tin dự án")
-def get_project(request, project_id: UUID):
+@router.post("/import", response={200: dict}, summary="Import dự án từ CSV/JSONL")
+@require_roles('admin', 'manager')
+def import_projects(request, file: UploadedFile = File(...), format: str = None):
+    """
+    Tạo dự án hàng loạt từ file CSV hoặc JSONL (chỉ admin/manager).
+
+    - Mỗi dòng có các trường của ProjectCreate; cột JSON (team, partners,
+      payment, additional_packages) ghi dạng chuỗi JSON trong CSV
+    - File được đọc dạng stream, ghi theo lô
+    - Dòng lỗi được báo theo số dòng; các dòng còn lại vẫn được tạo
+    """
+    fmt = format or detect_format(file.name)
+    lines = codecs.iterdecode(file, 'utf-8-sig')
+    try:
+        result = import_from_lines(lines, fmt, created_by=get_current_user(request))
+    except ImportFormatError as e:
+        raise HttpError(400, str(e))
+    except UnicodeDecodeError:
+        raise HttpError(400, "File phải mã hóa UTF-8")
+    return result.as_dict()
+
+
+@router.get("/search", response=list[ProjectSearchHit], summary="Tìm dự án theo khách hàng")
+def search_projects(request, q: str, limit: int = 20):
+    """
+    Tìm dự án theo tên hoặc số điện thoại khách hàng, kết quả xếp theo độ khớp.
+
+    - **q**: Từ khóa; số điện thoại có thể có khoảng trắng, dấu chấm, +84
+    - **limit**: Số kết quả tối đa (1-100)
+    """
+    if not 1 <= limit <= 100:
+        raise HttpError(400, "limit phải trong khoảng 1-100")
+    return ProjectService.search_projects(q, limit)
+
+
+@router.get("/calendar", response=ProjectCalendar, summary="Lịch chụp theo ngày")
+def get_calendar(request, from_date: date, to_date: date):
+    """
+    Dữ liệu cho màn hình lịch: số dự án mỗi ngày theo trạng thái và danh
+    sách lịch rút gọn (tuple theo `fields`), mọi trạng thái.
+
+    - **from_date**: Từ ngày
+    - **to_date**: Đến ngày (tối đa 366 ngày)
+    """
+    try:
+        return ProjectService.get_calendar(from_date, to_date)
+    except ValueError as e:
+        raise HttpError(400, str(e))
+
+
+@router.get("/conflicts", response=list[BookingConflict], summary="Lịch chụp bị trùng")
+def list_conflicts(request, from_date: date, to_date: date):
+    """
+    Các nhân viên bị đặt trùng giờ trong khoảng ngày, mỗi nhóm là các lịch
+    giao nhau của một người trong một ngày. Dự án đã hủy không tính.
+
+    - **from_date**: Từ ngày
+    - **to_date**: Đến ngày (tối đa 366 ngày)
+    """
+    try:
+        return ProjectService.list_conflicts(from_date, to_date)
+    except ValueError as e:
+        raise HttpError(400, str(e))
+
+
+@router.post("/events/token", response=EventStreamToken, summary="Token mở luồng sự kiện (EventSource)")
+def create_events_token(request):
+    """
+    Token ngắn hạn (PROJECT_EVENTS_TOKEN_TTL giây) để mở
+    `GET /projects/events?token=...` từ EventSource, vốn không gửi được
+    header Authorization. Token chỉ dùng được cho luồng sự kiện.
+    """
+    ttl = settings.PROJECT_EVENTS_TOKEN_TTL
+    token = create_scoped_token(get_current_user(request), events.STREAM_TOKEN_SCOPE, timedelta(seconds=ttl))
+    return {'token': token, 'expires_in': ttl}
+
+
+@router.get(
+    "/events", summary="Luồng sự kiện thay đổi dự án (SSE)",
+    auth=[auth_bearer, ScopedTokenQuery(events.STREAM_TOKEN_SCOPE)],
+)
+def project_events(request):
+    """
+    Server-Sent Events: mỗi lần dự án được tạo, cập nhật, cập nhật tiến độ
+    hoặc thanh toán, một sự kiện `data: {id, type, project_id, project_code,
+    fields, status, paid_amount}` được gửi tới client.
+
+    - Xác thực: header Bearer (client fetch) hoặc `?token=` lấy từ
+      `POST /projects/events/token` (EventSource)
+    - Header **Last-Event-ID** (hoặc `?last_event_id=`): gửi lại các sự kiện
+      sau id này trước; EventSource tự gửi header khi kết nối lại
+    - Sự kiện `reset`: id quá cũ đã bị xóa, client tải lại danh sách một lần
+    - Stream tự đóng sau PROJECT_EVENTS_STREAM_TIMEOUT giây để client kết nối lại
+    - Chỉ phục vụ dưới ASGI; dưới WSGI trả 503 (trừ khi PROJECT_EVENTS_ALLOW_WSGI)
+    """
+    asgi = isinstance(request, ASGIRequest)
+    if not asgi and not settings.PROJECT_EVENTS_ALLOW_WSGI:
+        # Mỗi stream giữ một thread worker WSGI tới PROJECT_EVENTS_STREAM_TIMEOUT giây
+        raise HttpError(503, "Luồng sự kiện cần server ASGI")
+    last_event_id = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+    if last_event_id is not None:
+        try:
+            last_event_id = int(last_event_id)
+        except ValueError:
+            raise HttpError(400, "Last-Event-ID không hợp lệ")
+    # WSGI đọc iterator sync, ASGI đọc async iterator
+    if asgi:
+        frames = events.astream(last_event_id)
+    else:
+        frames = events.stream(last_event_id)
+    response = StreamingHttpResponse(frames, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Proxy (nginx) không được gom response
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@router.get("/{project_id}", response=ProjectRead, summary="Lấy thông tin dự án", auth=async_auth_bearer)
+async def get_project(request, project_id: UUID, response: HttpResponse):
     """
     Lấy thông tin chi tiết của một dự án.
 
     - **project_id**: UUID của dự án
+
+    Header `ETag` là version hiện tại, gửi lại trong `If-Match` khi cập nhật.
     """
-    project = ProjectService.get_project(project_id)
+    project = await ProjectService.aget_project(project_id)
     if not project:
         raise HttpError(404, "Không tìm thấy dự án")
+    response['ETag'] = format_etag(project.version)
     return project
 
 
+@router.get("/{project_id}/history", response=ProjectHistory, summary="Lịch sử thay đổi dự án")
+def get_project_history(
+    request,
+    project_id: UUID,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None
+):
+    """
+    Các lần cập nhật dự án (field nào đổi, giá trị trước / sau), mới nhất trước.
+
+    - **project_id**: UUID của dự án
+    - **skip** / **limit**: Phân trang
+    - **cursor**: Phân trang keyset - `next_cursor` của trang trước (thay cho skip)
+
+    Thay đổi từ process khác có thể hiện ra chậm vài giây (nhật ký được ghi theo lô).
+    """
+    page = ProjectService.get_history(project_id, skip=skip, limit=limit, cursor=cursor)
+    if page is None:
+        raise HttpError(404, "Không tìm thấy dự án")
+    return {
+        "total": page.total,
+        "items": page.items,
+        "next_cursor": page.next_cursor,
+        "count_strategy": page.count_strategy,
+    }
+
+
 @router.put("/{project_id}", response=ProjectRead, summary="Cập nhật dự án")
-def update_project(request, project_id: UUID, payload: ProjectUpdate):
+def update_project(request, project_id: UUID, payload: ProjectUpdate, response: HttpResponse):
     """
     Cập nhật thông tin dự án.
 
     - **project_id**: UUID của dự án
     - **payload**: Dữ liệu cần cập nhật
+    - Header **If-Match**: ETag từ lần GET trước; trả về 412 nếu dự án đã bị sửa sau đó
     """
-    project = ProjectService.update_project(project_id, payload, updated_by=request.user)
+    project = ProjectService.update_project(
+        project_id, payload, updated_by=get_current_user(request),
+        if_match=parse_if_match(request.headers.get('If-Match'))
+    )
     if not project:
         raise HttpError(404, "Không tìm thấy dự án")
+    response['ETag'] = format_etag(project.version)
     return project
 
 
-@router.patch("/{project_id}", response=ProjectRead, auth=AuthBearer(), summary="Cập nhật một phần dự án")
-def partial_update_project(request, project_id: UUID, payload: ProjectUpdate):
+@router.patch("/{project_id}", response=ProjectRead, summary="Cập nhật một phần dự án")
+def partial_update_project(request, project_id: UUID, payload: ProjectUpdate, response: HttpResponse):
     """
     Cập nhật một phần thông tin dự án.
 
     - **project_id**: UUID của dự án
     - **payload**: Dữ liệu cần cập nhật (chỉ cần truyền fields muốn cập nhật)
+    - Header **If-Match**: ETag từ lần GET trước; trả về 412 nếu dự án đã bị sửa sau đó
 
     Permissions:
     - Status updates to 'confirmed': Requires admin or Manager role
     - Other updates: Requires authentication
     """
+    if_match = parse_if_match(request.headers.get('If-Match'))
+
     # Check if trying to confirm project (set status to 'confirmed')
     if payload.status == 'confirmed':
-        # Get user from auth
-        user = request.auth
-        user_role = getattr(user, 'role', None) if user else None
-        if user_role not in ['admin', 'manager']:
+        if not has_role(request, MANAGER_ROLES):
             raise HttpError(403, "Chỉ admin hoặc Manager mới có thể xác nhận dự án")
 
         # Use the authenticated user for update
-        project = ProjectService.update_project(project_id, payload, updated_by=user)
+        project = ProjectService.update_project(
+            project_id, payload, updated_by=get_current_user(request), if_match=if_match
+        )
     else:
         # For non-confirmation updates, use request.auth
-        project = ProjectService.update_project(project_id, payload, updated_by=request.auth)
+        project = ProjectService.update_project(
+            project_id, payload, updated_by=get_current_user(request), if_match=if_match
+        )
 
     if not project:
         raise HttpError(404, "Không tìm thấy dự án")
+    response['ETag'] = format_etag(project.version)
     return project
 
 
-@router.delete("/{project_id}", response={200: dict}, auth=AuthBearer(), summary="Xóa dự án")
+@router.delete("/{project_id}", response={200: dict}, summary="Xóa dự án")
 @require_roles('admin', 'manager')
 def delete_project(request, project_id: UUID):
     """
@@ -153,44 +385,56 @@ def delete_project(request, project_id: UUID):
 
 
 @router.post("/{project_id}/milestones", response=ProjectRead, summary="Thêm milestone")
-def add_milestone(request, project_id: UUID, payload: AddMilestoneRequest):
+def add_milestone(request, project_id: UUID, payload: AddMilestoneRequest, response: HttpResponse):
     """
     Thêm milestone vào dự án.
 
     - **project_id**: UUID của dự án
     - **milestone**: Thông tin milestone
+
+    Header `ETag` là version mới của dự án.
     """
     project = ProjectService.add_milestone(project_id, payload.milestone)
     if not project:
         raise HttpError(404, "Không tìm thấy dự án")
+    response['ETag'] = format_etag(project.version)
     return project
 
 
 @router.put("/{project_id}/progress", response=ProjectRead, summary="Cập nhật tiến độ")
-def update_progress(request, project_id: UUID, payload: UpdateProgressRequest):
+def update_progress(request, project_id: UUID, payload: UpdateProgressRequest, response: HttpResponse):
     """
     Cập nhật tiến độ dự án.
 
     - **project_id**: UUID của dự án
     - **progress**: Thông tin tiến độ (shooting_done, retouch_done, delivered)
+
+    Header `ETag` là version mới của dự án.
     """
-    project = ProjectService.update_progress(project_id, payload.progress)
+    try:
+        project = ProjectService.update_progress(project_id, payload.progress)
+    except ValueError as e:
+        raise HttpError(400, str(e))
     if not project:
         raise HttpError(404, "Không tìm thấy dự án")
+    response['ETag'] = format_etag(project.version)
     return project
 
 
 @router.post("/{project_id}/payments", response=ProjectRead, summary="Thêm thanh toán")
-def add_payment(request, project_id: UUID, payload: AddPaymentRequest):
+def add_payment(request, project_id: UUID, payload: AddPaymentRequest, response: HttpResponse):
     """
     Thêm thanh toán vào dự án.
 
     - **project_id**: UUID của dự án
     - **payment_item**: Thông tin thanh toán (amount, date, method, notes)
+
+    Header `ETag` là version mới của dự án.
     """
-    project = ProjectService.add_payment(project_id, payload.payment_item)
+    project = ProjectService.add_payment(project_id, payload.payment_item, received_by=get_current_user(request))
     if not project:
         raise HttpError(404, "Không tìm thấy dự án")
+    response['ETag'] = format_etag(project.version)
     return project
 
 
@@ -1,7 +1,22 @@
 from django.apps import AppConfig
+from django.db import connections
+from django.db.models.signals import post_migrate
+
+
+def _install_search_index(sender, using, **kwargs):
+    # DB tạo bằng syncdb (test, migrations bị tắt) không chạy migration 0012.
+    # Chỉ bảng FTS5 của SQLite; trigger mất khi migration dựng lại bảng
+    # projects nên được tạo lại ở đây, còn index chỉ rebuild khi vừa tạo.
+    from .search import install_search_index
+    install_search_index(connections[using])
 
 
 class ProjectsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.projects'
     verbose_name = 'Projects'
+
+    def ready(self):
+        from api.counting import track_counts
+        track_counts(self.get_model('Project'))
+        post_migrate.connect(_install_search_index, sender=self)
@@ -0,0 +1,128 @@
+"""
+Phân công nhân viên vào dự án, dẫn xuất từ cột JSON `Project.team`.
+
+`team` lưu UUID nhân viên lồng trong JSON nên không tra được "nhân viên X
+chụp những show nào" bằng index. Bảng ProjectAssignment giữ một dòng cho
+mỗi (dự án, nhân viên, vai trò) và được đồng bộ mỗi khi team hoặc ngày
+chụp thay đổi.
+
+Mỗi dòng cũng là một lịch đặt (booking) của nhân viên: khung giờ
+[start_time, end_time) đọc từ `shoot_time` để phát hiện trùng lịch.
+
+Các hàm ở đây nhận model qua tham số, không import model của app. Data
+migration không import module này: chúng giữ bản sao cố định của phần
+cần dùng.
+"""
+import re
+import uuid
+from datetime import datetime, time, timedelta
+from decimal import Decimal, InvalidOperation
+from typing import Iterable, Iterator, Optional, Tuple
+
+# Khóa trong Project.team -> vai trò phân công
+TEAM_ROLES = {
+    'main_photographer': 'main_photographer',
+    'assist_photographers': 'assist_photographer',
+    'makeup_artists': 'makeup_artist',
+    'retouch_artists': 'retouch_artist',
+}
+
+# shoot_time chỉ có giờ bắt đầu: coi buổi chụp kéo dài chừng này
+DEFAULT_SHOOT_DURATION = timedelta(hours=4)
+# shoot_time trống / không đọc được: coi như bận cả ngày
+WHOLE_DAY = (time.min, time.max)
+# "08:00", "8h", "8h30", "8g30", "08.30"
+_TIME_PATTERN = re.compile(r'(?<!\d)(\d{1,2})(?:\s*[:hHgG.]\s*(\d{2})?)?(?!\d)')
+
+
+def _amount(value) -> Decimal:
+    try:
+        return Decimal(str(value or 0))
+    except InvalidOperation:
+        return Decimal('0')
+
+
+def parse_shoot_time(text: Optional[str]) -> Tuple[time, time]:
+    """
+    Đọc khung giờ chụp từ `shoot_time` (chuỗi nhập tay).
+
+    - "08:00 - 11:30", "8h-11h30" -> (08:00, 11:30)
+    - "08:00" -> (08:00, 12:00) theo DEFAULT_SHOOT_DURATION
+    - Trống / không đọc được -> cả ngày
+
+    Giờ kết thúc không sau giờ bắt đầu (qua đêm, nhập sai) -> đến hết ngày.
+    """
+    times = []
+    for hour, minute in _TIME_PATTERN.findall(text or ''):
+        hour, minute = int(hour), int(minute or 0)
+        if hour < 24 and minute < 60:
+            times.append(time(hour, minute))
+        if len(times) == 2:
+            break
+    if not times:
+        return WHOLE_DAY
+
+    start = times[0]
+    if len(times) == 2:
+        end = times[1]
+    else:
+        end_at = datetime.combine(datetime.min, start) + DEFAULT_SHOOT_DURATION
+        end = end_at.time() if end_at.date() == datetime.min.date() else time.max
+    if end <= start:
+        end = time.max
+    return start, end
+
+
+def team_members(team) -> Iterator[Tuple[str, uuid.UUID, dict]]:
+    """
+    Duyệt các thành viên trong `team`: (vai trò, UUID nhân viên, dict thành viên).
+    Phần tử thiếu hoặc sai UUID nhân viên bị bỏ qua.
+    """
+    if not isinstance(team, dict):
+        return
+    for key, role in TEAM_ROLES.items():
+        members = team.get(key)
+        if isinstance(members, dict):
+            members = [members]
+        for member in members or []:
+            if not isinstance(member, dict) or not member.get('employee'):
+                continue
+            try:
+                employee_id = uuid.UUID(str(member['employee']))
+            except ValueError:
+                continue
+            yield role, employee_id, member
+
+
+def team_employee_ids(projects: Iterable) -> set:
+    """UUID mọi nhân viên xuất hiện trong team của các dự án."""
+    return {employee_id for project in projects for _, employee_id, _ in team_members(project.team)}
+
+
+def build_assignments(assignment_model, projects: Iterable, employee_ids: set) -> list:
+    """
+    Tạo (chưa lưu) các dòng phân công của `projects`.
+
+    Args:
+        assignment_model: Model ProjectAssignment (hoặc model lịch sử trong migration)
+        projects: Dự án đã có id, team, shoot_date, shoot_time
+        employee_ids: UUID nhân viên còn tồn tại (UUID lạ trong JSON bị bỏ qua)
+    """
+    assignments = []
+    for project in projects:
+        start_time, end_time = parse_shoot_time(project.shoot_time)
+        assignments.extend(
+            assignment_model(
+                project_id=project.id,
+                employee_id=employee_id,
+                role=role,
+                shoot_date=project.shoot_date,
+                start_time=start_time,
+                end_time=end_time,
+                salary=_amount(member.get('salary')),
+                bonus=_amount(member.get('bonus')),
+            )
+            for role, employee_id, member in team_members(project.team)
+            if employee_id in employee_ids
+        )
+    return assignments
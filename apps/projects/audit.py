@@ -0,0 +1,148 @@
+"""
+Nhật ký thay đổi dự án (ProjectAuditLog), ghi ngoài luồng request.
+
+`ProjectService.update_project` tính diff theo field và đưa bản ghi vào
+bộ đệm trong process sau khi transaction commit. Bộ đệm được ghi xuống
+bằng một lệnh `bulk_create` khi:
+
+- đủ PROJECT_AUDIT_FLUSH_SIZE bản ghi,
+- sau PROJECT_AUDIT_FLUSH_INTERVAL giây kể từ bản ghi đầu tiên đang chờ
+  (timer nền; 0 = tắt),
+- trước khi đọc lịch sử (đọc được thay đổi của chính process này),
+- khi process thoát.
+
+Process bị kill đột ngột sẽ mất các bản ghi chưa flush; lịch sử do process
+khác ghi hiện ra sau tối đa PROJECT_AUDIT_FLUSH_INTERVAL giây.
+"""
+import atexit
+import json
+import logging
+import threading
+from decimal import Decimal
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DatabaseError, IntegrityError, connection, models, transaction
+
+logger = logging.getLogger(__name__)
+
+# Field không ghi vào nhật ký: tự tăng / dẫn xuất kỹ thuật
+AUDIT_IGNORED_FIELDS = frozenset({'updated_at', 'version', 'customer_phone_digits', 'last_modified_by'})
+
+
+def _value(field, project):
+    value = field.to_python(field.value_from_object(project))
+    if isinstance(field, models.DecimalField) and value is not None:
+        # 5000000 và 5000000.0 là một giá trị; lưu theo số chữ số của cột
+        value = value.quantize(Decimal(1).scaleb(-field.decimal_places))
+    return value
+
+
+def snapshot(project) -> dict:
+    """Giá trị hiện tại của các field được ghi nhật ký (khóa ngoại lấy id)."""
+    return {
+        field.name: _value(field, project)
+        for field in project._meta.concrete_fields
+        if not field.primary_key and field.name not in AUDIT_IGNORED_FIELDS
+    }
+
+
+def _json(value):
+    return json.loads(json.dumps(value, cls=DjangoJSONEncoder))
+
+
+def field_diffs(before: dict, after: dict) -> dict:
+    """{field: {'old': ..., 'new': ...}} cho các field có giá trị khác nhau."""
+    return {
+        name: {'old': _json(before[name]), 'new': _json(value)}
+        for name, value in after.items()
+        if before.get(name) != value
+    }
+
+
+def _without_orphans(entries: list) -> list:
+    """Bỏ bản ghi của dự án không còn tồn tại, bỏ người sửa không còn tồn tại."""
+    from django.contrib.auth import get_user_model
+    from .models import Project
+
+    project_ids = set(
+        Project.objects.filter(id__in={e.project_id for e in entries}).values_list('id', flat=True)
+    )
+    user_ids = set(
+        get_user_model().objects.filter(
+            id__in={e.changed_by_id for e in entries if e.changed_by_id}
+        ).values_list('id', flat=True)
+    )
+    kept = []
+    for entry in entries:
+        if entry.project_id not in project_ids:
+            continue
+        if entry.changed_by_id not in user_ids:
+            entry.changed_by = None
+        kept.append(entry)
+    return kept
+
+
+class AuditBuffer:
+    """Bộ đệm ProjectAuditLog trong process, ghi theo lô."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = []
+        self._timer = None
+
+    def add(self, entry):
+        """Thêm một bản ghi (chưa lưu); flush ngay nếu bộ đệm đầy."""
+        with self._lock:
+            self._entries.append(entry)
+            full = len(self._entries) >= settings.PROJECT_AUDIT_FLUSH_SIZE
+            if not full and self._timer is None and settings.PROJECT_AUDIT_FLUSH_INTERVAL > 0:
+                self._timer = threading.Timer(settings.PROJECT_AUDIT_FLUSH_INTERVAL, self._flush_in_background)
+                self._timer.daemon = True
+                self._timer.start()
+        if full:
+            self.flush()
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def flush(self) -> int:
+        """
+        Ghi mọi bản ghi đang chờ bằng một bulk_create.
+
+        Returns:
+            Số bản ghi đã ghi (0 nếu lỗi DB: lô bị bỏ và ghi log)
+        """
+        from .models import ProjectAuditLog
+
+        with self._lock:
+            entries, self._entries = self._entries, []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if not entries:
+            return 0
+        try:
+            try:
+                with transaction.atomic():
+                    ProjectAuditLog.objects.bulk_create(entries)
+            except IntegrityError:
+                # Dự án / người sửa bị xóa hẳn trước khi flush: không để cả lô hỏng theo
+                entries = _without_orphans(entries)
+                with transaction.atomic():
+                    ProjectAuditLog.objects.bulk_create(entries)
+        except DatabaseError:
+            logger.exception("Không ghi được %d bản ghi nhật ký dự án", len(entries))
+            return 0
+        return len(entries)
+
+    def _flush_in_background(self):
+        try:
+            self.flush()
+        finally:
+            # Thread của timer có kết nối DB riêng
+            connection.close()
+
+
+audit_buffer = AuditBuffer()
+atexit.register(audit_buffer.flush)
@@ -0,0 +1,430 @@
+"""
+Luồng sự kiện thay đổi dự án (Server-Sent Events) thay cho việc poll
+`GET /projects/`.
+
+Ghi: mỗi thao tác tạo / cập nhật / tiến độ / thanh toán ghi một dòng
+ProjectEvent trong cùng transaction với thay đổi (`record`). `id` của dòng
+là Last-Event-ID.
+
+Phát:
+
+- PostgreSQL: `pg_notify` trong cùng transaction, được giao khi commit.
+  Mỗi process có một thread LISTEN (kết nối riêng) chuyển sự kiện vào
+  broker trong process, nên mọi worker đều nhận được.
+- Database khác (SQLite, test): broker trong process nhận sự kiện qua
+  `transaction.on_commit`; chỉ stream cùng process thấy được.
+
+Đọc: stream đăng ký vào broker, gửi lại các sự kiện sau Last-Event-ID từ
+bảng, rồi gửi sự kiện mới. Khi hàng đợi của stream bị đầy hoặc thread
+LISTEN kết nối lại, stream đọc bù từ bảng. Id được cấp lúc INSERT nhưng
+transaction commit không theo thứ tự id, nên đọc bù và dòng `id:` của SSE
+(Last-Event-ID khi kết nối lại) dùng mốc thấp (`_LowWater`) thay vì id lớn
+nhất đã gửi. Sự kiện có thể được gửi lặp (at-least-once, client bỏ trùng
+theo `data.id`); sự kiện sau Last-Event-ID đã bị xóa khỏi bảng -> sự kiện
+`reset` để client tải lại danh sách.
+
+Stream sync (WSGI) giữ một thread cho mỗi client trong suốt
+PROJECT_EVENTS_STREAM_TIMEOUT giây nên chỉ dùng khi
+PROJECT_EVENTS_ALLOW_WSGI (runserver, test); production phục vụ endpoint
+từ process ASGI (`astream`, xem config/asgi.py).
+
+EventSource của trình duyệt không gửi được header Authorization: client lấy
+token ngắn hạn (scope STREAM_TOKEN_SCOPE) qua `POST /projects/events/token`
+rồi mở `/projects/events?token=...`. Token hết hạn thì lần kết nối lại tự
+động của EventSource bị 401: client lấy token mới và mở lại stream với
+`?last_event_id=`. Client dùng fetch() đọc stream thì gửi Bearer như
+thường.
+"""
+import asyncio
+import json
+import logging
+import queue
+import select
+import threading
+import time
+from collections import deque
+from typing import Iterable, Iterator, List, Optional, Sequence
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections, transaction
+from .models import ProjectEvent
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = 'project_events'
+# Scope của token ?token= (users.services.create_scoped_token)
+STREAM_TOKEN_SCOPE = 'project_events'
+# Sự kiện chờ tối đa của một stream trước khi chuyển sang đọc bù từ bảng
+SUBSCRIPTION_QUEUE_SIZE = 1000
+# Số sự kiện mỗi lần đọc bù từ bảng
+REPLAY_BATCH_SIZE = 500
+# Số id đã gửi được nhớ để bỏ sự kiện lặp
+SEEN_IDS = 10000
+# Id còn thiếu (transaction chưa commit) được chờ tối đa chừng này giây trước
+# khi coi là đã rollback
+REORDER_WINDOW_SECONDS = 60
+# Client kết nối lại sau (ms) khi stream đóng
+RETRY_MS = 3000
+# Thread LISTEN: chu kỳ kiểm tra và thời gian chờ trước khi kết nối lại (giây)
+LISTEN_POLL_SECONDS = 5
+LISTEN_RECONNECT_SECONDS = 2
+
+
+def _uses_notify() -> bool:
+    return connections[ProjectEvent.objects.db].vendor == 'postgresql'
+
+
+def record(kind: str, projects: Sequence, fields: Iterable[str] = ()) -> list:
+    """
+    Ghi sự kiện `kind` cho các dự án (đã lưu) và phát sau khi commit.
+
+    Args:
+        kind: created, updated, progress, payment
+        projects: Dự án, hoặc dict có id, project_code, status, paid_amount
+        fields: Các field đã thay đổi
+
+    Returns:
+        Danh sách ProjectEvent đã ghi
+    """
+    fields = sorted(fields)
+    events = [
+        ProjectEvent(
+            kind=kind,
+            project_id=_get(project, 'id'),
+            project_code=_get(project, 'project_code') or '',
+            fields=fields,
+            status=_get(project, 'status'),
+            paid_amount=_get(project, 'paid_amount') or 0,
+        )
+        for project in projects
+    ]
+    if not events:
+        return events
+    with transaction.atomic():
+        ProjectEvent.objects.bulk_create(events)
+        messages = [event.as_message() for event in events]
+        if _uses_notify():
+            # Được giao cho các kết nối LISTEN khi transaction commit
+            with connections[ProjectEvent.objects.db].cursor() as cursor:
+                cursor.execute(
+                    'SELECT pg_notify(%s, payload) FROM unnest(%s::text[]) AS payload',
+                    [NOTIFY_CHANNEL, [json.dumps(message) for message in messages]],
+                )
+        else:
+            transaction.on_commit(lambda: broker.publish(messages))
+    return events
+
+
+def _get(project, name):
+    return project[name] if isinstance(project, dict) else getattr(project, name)
+
+
+class Subscription:
+    """Hàng đợi sự kiện của một stream (đọc từ thread)."""
+
+    def __init__(self):
+        self._queue = queue.Queue(maxsize=SUBSCRIPTION_QUEUE_SIZE)
+        self.lagged = False
+
+    def put(self, messages: list):
+        """Gọi từ broker; hàng đợi đầy -> đánh dấu lagged để stream đọc bù."""
+        try:
+            self._queue.put_nowait(messages)
+        except queue.Full:
+            self.lagged = True
+
+    def mark_lagged(self):
+        self.lagged = True
+        self.put([])
+
+    def take_lagged(self) -> bool:
+        lagged, self.lagged = self.lagged, False
+        return lagged
+
+    def get(self, timeout: float) -> list:
+        """Các sự kiện đang chờ; chờ tối đa `timeout` giây nếu chưa có."""
+        try:
+            messages = list(self._queue.get(timeout=timeout))
+        except queue.Empty:
+            return []
+        while True:
+            try:
+                messages.extend(self._queue.get_nowait())
+            except queue.Empty:
+                return messages
+
+
+class AsyncSubscription(Subscription):
+    """Hàng đợi sự kiện của một stream chạy trên event loop."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=SUBSCRIPTION_QUEUE_SIZE)
+        self.lagged = False
+
+    def put(self, messages: list):
+        # Broker gọi từ thread khác (thread LISTEN, thread của request ghi)
+        self._loop.call_soon_threadsafe(self._put, messages)
+
+    def _put(self, messages: list):
+        try:
+            self._queue.put_nowait(messages)
+        except asyncio.QueueFull:
+            self.lagged = True
+
+    async def get(self, timeout: float) -> list:
+        try:
+            messages = list(await asyncio.wait_for(self._queue.get(), timeout))
+        except asyncio.TimeoutError:
+            return []
+        while not self._queue.empty():
+            messages.extend(self._queue.get_nowait())
+        return messages
+
+
+class EventBroker:
+    """Phân phối sự kiện tới các stream trong process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = set()
+        self._listener = None
+
+    def subscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscriptions.add(subscription)
+            if _uses_notify() and (self._listener is None or not self._listener.is_alive()):
+                self._listener = PostgresListener(self)
+                self._listener.start()
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def publish(self, messages: list):
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            subscription.put(messages)
+
+    def resync(self):
+        """Có thể đã lỡ sự kiện: mọi stream đọc bù từ bảng."""
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            subscription.mark_lagged()
+
+
+class PostgresListener(threading.Thread):
+    """Thread LISTEN trên kết nối riêng, chuyển NOTIFY vào broker."""
+
+    def __init__(self, broker: EventBroker):
+        super().__init__(name='project-events-listener', daemon=True)
+        self.broker = broker
+
+    def run(self):
+        alias = ProjectEvent.objects.db
+        while True:
+            conn = None
+            try:
+                wrapper = connections.create_connection(alias)
+                conn = wrapper.get_new_connection(wrapper.get_connection_params())
+                conn.autocommit = True
+                with conn.cursor() as cursor:
+                    cursor.execute(f'LISTEN {NOTIFY_CHANNEL}')
+                # Sự kiện trước khi LISTEN (lần đầu, hoặc lúc mất kết nối) chỉ còn trong bảng
+                self.broker.resync()
+                while True:
+                    if select.select([conn], [], [], LISTEN_POLL_SECONDS) == ([], [], []):
+                        continue
+                    conn.poll()
+                    messages = [json.loads(notify.payload) for notify in conn.notifies]
+                    conn.notifies.clear()
+                    if messages:
+                        self.broker.publish(messages)
+            except Exception:
+                logger.exception("Mất kết nối LISTEN %s, kết nối lại", NOTIFY_CHANNEL)
+                time.sleep(LISTEN_RECONNECT_SECONDS)
+            finally:
+                if conn is not None:
+                    conn.close()
+
+
+broker = EventBroker()
+
+
+class _Seen:
+    """Các id sự kiện đã gửi gần đây (commit không theo thứ tự id)."""
+
+    def __init__(self, size: int = SEEN_IDS):
+        self._ids = set()
+        self._order = deque()
+        self._size = size
+
+    def add(self, event_id: int) -> bool:
+        """False nếu id đã gửi."""
+        if event_id in self._ids:
+            return False
+        self._ids.add(event_id)
+        self._order.append(event_id)
+        if len(self._order) > self._size:
+            self._ids.discard(self._order.popleft())
+        return True
+
+
+class _LowWater:
+    """
+    Mốc đọc bù của một stream: mọi id nhỏ hơn hoặc bằng mốc đã được gửi,
+    hoặc đã thiếu quá REORDER_WINDOW_SECONDS (transaction rollback không
+    bao giờ commit id của nó).
+
+    Sau khi gửi 11, id 10 của transaction commit chậm vẫn có thể xuất hiện:
+    mốc dừng ở 9 cho tới khi 10 được gửi hoặc hết hạn chờ.
+    """
+
+    def __init__(self, start: int):
+        self.top = start
+        # id -> thời điểm phát hiện thiếu; thứ tự chèn tăng dần theo cả id và thời gian
+        self._missing = {}
+
+    def add(self, event_id: int) -> int:
+        """Ghi nhận id đã gửi; trả về mốc mới."""
+        if event_id > self.top:
+            now = time.monotonic()
+            for missing in range(max(self.top + 1, event_id - SEEN_IDS), event_id):
+                self._missing[missing] = now
+            self.top = event_id
+        else:
+            self._missing.pop(event_id, None)
+        return self.mark()
+
+    def mark(self) -> int:
+        cutoff = time.monotonic() - REORDER_WINDOW_SECONDS
+        while self._missing:
+            oldest = next(iter(self._missing))
+            if self._missing[oldest] > cutoff:
+                return oldest - 1
+            del self._missing[oldest]
+        return self.top
+
+
+def format_event(message: dict, last_id: int) -> str:
+    """Khung SSE của một sự kiện; dòng `id:` là mốc `_LowWater` của stream."""
+    return f"id: {last_id}\ndata: {json.dumps(message, separators=(',', ':'))}\n\n"
+
+
+def _reset_frame(last_id: int) -> str:
+    return f"id: {last_id}\nevent: reset\ndata: {{}}\n\n"
+
+
+def _start(last_event_id: Optional[int]):
+    """
+    Điểm bắt đầu của stream: (id cuối cùng, cần reset).
+
+    Không có Last-Event-ID -> chỉ sự kiện mới. Không còn sự kiện nào có id
+    <= Last-Event-ID -> các sự kiện cũ (xóa theo thứ tự thời gian) có thể đã
+    bị xóa, client phải tải lại. Last-Event-ID là mốc `_LowWater` nên có thể
+    là id của transaction đã rollback.
+    """
+    latest = ProjectEvent.objects.order_by('-id').values_list('id', flat=True).first() or 0
+    if last_event_id is None:
+        return latest, False
+    if last_event_id and not ProjectEvent.objects.filter(id__lte=last_event_id).exists():
+        return latest, True
+    return last_event_id, False
+
+
+def _events_after(last_id: int) -> List[dict]:
+    return [
+        event.as_message()
+        for event in ProjectEvent.objects.filter(id__gt=last_id).order_by('id')[:REPLAY_BATCH_SIZE]
+    ]
+
+
+def _frames(messages: list, seen: _Seen, low_water: _LowWater) -> Iterator[str]:
+    for message in messages:
+        if seen.add(message['id']):
+            yield format_event(message, low_water.add(message['id']))
+
+
+def stream(last_event_id: Optional[int] = None, heartbeat: float = None, timeout: float = None) -> Iterator[str]:
+    """
+    Các khung SSE: sự kiện sau `last_event_id`, rồi sự kiện mới cho đến hết
+    `timeout` giây (client tự kết nối lại với Last-Event-ID).
+    """
+    heartbeat = heartbeat or settings.PROJECT_EVENTS_HEARTBEAT
+    deadline = time.monotonic() + (timeout or settings.PROJECT_EVENTS_STREAM_TIMEOUT)
+    subscription = Subscription()
+    # Đăng ký trước khi đọc bảng: không lỡ sự kiện commit xen giữa
+    broker.subscribe(subscription)
+    try:
+        yield f"retry: {RETRY_MS}\n\n"
+        last_id, reset = _start(last_event_id)
+        if reset:
+            yield _reset_frame(last_id)
+        seen, low_water = _Seen(), _LowWater(last_id)
+        catch_up = not reset and last_event_id is not None
+        while True:
+            if catch_up or subscription.take_lagged():
+                # Từ mốc thấp: gồm cả id nhỏ hơn id đã gửi mà commit muộn
+                after = low_water.mark()
+                while True:
+                    messages = _events_after(after)
+                    yield from _frames(messages, seen, low_water)
+                    if len(messages) < REPLAY_BATCH_SIZE:
+                        break
+                    after = messages[-1]['id']
+                catch_up = False
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            messages = subscription.get(min(heartbeat, remaining))
+            if messages:
+                yield from _frames(messages, seen, low_water)
+            elif not subscription.lagged:
+                yield ": keepalive\n\n"
+    finally:
+        broker.unsubscribe(subscription)
+
+
+async def astream(last_event_id: Optional[int] = None, heartbeat: float = None, timeout: float = None):
+    """Như `stream`, chạy trên event loop (ASGI)."""
+    heartbeat = heartbeat or settings.PROJECT_EVENTS_HEARTBEAT
+    deadline = time.monotonic() + (timeout or settings.PROJECT_EVENTS_STREAM_TIMEOUT)
+    subscription = AsyncSubscription(asyncio.get_running_loop())
+    broker.subscribe(subscription)
+    try:
+        yield f"retry: {RETRY_MS}\n\n"
+        last_id, reset = await sync_to_async(_start)(last_event_id)
+        if reset:
+            yield _reset_frame(last_id)
+        seen, low_water = _Seen(), _LowWater(last_id)
+        catch_up = not reset and last_event_id is not None
+        while True:
+            if catch_up or subscription.take_lagged():
+                after = low_water.mark()
+                while True:
+                    messages = await sync_to_async(_events_after)(after)
+                    for frame in _frames(messages, seen, low_water):
+                        yield frame
+                    if len(messages) < REPLAY_BATCH_SIZE:
+                        break
+                    after = messages[-1]['id']
+                catch_up = False
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            messages = await subscription.get(min(heartbeat, remaining))
+            if messages:
+                for frame in _frames(messages, seen, low_water):
+                    yield frame
+            elif not subscription.lagged:
+                yield ": keepalive\n\n"
+    finally:
+        broker.unsubscribe(subscription)
+
+
+def prune(before) -> int:
+    """Xóa sự kiện cũ hơn `before`; trả về số dòng đã xóa."""
+    deleted, _ = ProjectEvent.objects.filter(created_at__lt=before).delete()
+    return deleted
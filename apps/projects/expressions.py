@@ -0,0 +1,60 @@
+"""
+Biểu thức cập nhật cột JSON ngay trong câu UPDATE.
+
+Thêm phần tử / đổi vài key không cần đọc cả cột lên Python rồi ghi lại:
+câu UPDATE chỉ chạm đúng cột đó, và các request đồng thời không ghi đè
+thay đổi của nhau.
+
+- PostgreSQL: toán tử `||` của jsonb.
+- SQLite: `json_insert` / `json_patch`.
+"""
+import json
+from django.db import NotSupportedError
+from django.db.models import Expression, F, JSONField
+
+
+class _JSONUpdate(Expression):
+    output_field = JSONField()
+
+    def __init__(self, column: str, value):
+        super().__init__()
+        self.column = F(column)
+        self.value = value
+
+    def get_source_expressions(self):
+        return [self.column]
+
+    def set_source_expressions(self, exprs):
+        (self.column,) = exprs
+
+    def as_sql(self, compiler, connection):
+        raise NotSupportedError(f'{type(self).__name__} chỉ hỗ trợ PostgreSQL và SQLite')
+
+
+class JSONAppend(_JSONUpdate):
+    """`column = column || [value]`: thêm một phần tử vào cuối mảng JSON."""
+
+    def as_postgresql(self, compiler, connection):
+        column, params = compiler.compile(self.column)
+        return f"COALESCE({column}, '[]'::jsonb) || %s::jsonb", (*params, json.dumps([self.value]))
+
+    def as_sqlite(self, compiler, connection):
+        column, params = compiler.compile(self.column)
+        return f"json_insert(COALESCE({column}, '[]'), '$[#]', json(%s))", (*params, json.dumps(self.value))
+
+
+class JSONMerge(_JSONUpdate):
+    """
+    `column = column || {...}`: ghi đè các key cấp một của object JSON,
+    giữ nguyên các key khác (tương đương một loạt jsonb_set cấp một).
+
+    Trên SQLite dùng json_patch: giá trị null sẽ xóa key.
+    """
+
+    def as_postgresql(self, compiler, connection):
+        column, params = compiler.compile(self.column)
+        return f"COALESCE({column}, '{{}}'::jsonb) || %s::jsonb", (*params, json.dumps(self.value))
+
+    def as_sqlite(self, compiler, connection):
+        column, params = compiler.compile(self.column)
+        return f"json_patch(COALESCE({column}, '{{}}'), %s)", (*params, json.dumps(self.value))
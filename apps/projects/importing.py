@@ -0,0 +1,231 @@
+"""
+Import dự án hàng loạt từ CSV hoặc JSONL (chuyển lịch chụp từ bảng tính).
+
+Input được đọc dạng stream và xử lý theo lô IMPORT_BATCH_SIZE dòng:
+
+1. Mỗi dòng được validate bằng `ProjectCreate`.
+2. Gói chụp và photographer chính của cả lô được tra bằng một query `IN`
+   cho mỗi bảng, rồi kiểm tra như `create_project` (`build_project`).
+3. project_code được cấp theo khối (một UPDATE bộ đếm cho cả lô) và lô
+   (dự án, thanh toán, phân công, sự kiện thay đổi) được ghi bằng
+   `bulk_create` trong một transaction.
+
+Dòng lỗi được báo theo số dòng và bỏ qua; các dòng còn lại vẫn được tạo.
+"""
+import csv
+import json
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Iterable, Iterator, Optional, Tuple
+from django.db import DatabaseError, transaction
+from pydantic import ValidationError
+from api.counting import invalidate_counts
+from apps.sequences.services import SequenceService
+from .events import record as record_events
+from .models import PROJECT_CODE_WIDTH, Project, ProjectPayment
+from .schemas import ProjectCreate
+from .services import ProjectService
+
+FORMATS = ('csv', 'jsonl')
+IMPORT_BATCH_SIZE = 1000
+BULK_CREATE_BATCH_SIZE = 500
+# Giới hạn số lỗi trả về chi tiết; `failed` vẫn đếm đủ
+MAX_REPORTED_ERRORS = 1000
+# Cột CSV chứa JSON (cấu trúc lồng nhau của ProjectCreate)
+JSON_COLUMNS = ('team', 'partners', 'payment', 'additional_packages')
+
+
+class ImportFormatError(Exception):
+    """Không đọc được input (sai định dạng, thiếu header)."""
+
+
+@dataclass
+class ImportResult:
+    """Kết quả import; `row` là số dòng trong input."""
+    created: int = 0
+    failed: int = 0
+    errors: list = field(default_factory=list)
+
+    def add_error(self, row: int, error: str):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'row': row, 'error': error})
+
+    def as_dict(self) -> dict:
+        return {
+            'created': self.created,
+            'failed': self.failed,
+            'errors': sorted(self.errors, key=lambda e: e['row']),
+        }
+
+
+def detect_format(filename: str) -> Optional[str]:
+    """Đoán định dạng từ tên file ('csv', 'jsonl' hoặc None)."""
+    name = (filename or '').lower()
+    if name.endswith('.csv'):
+        return 'csv'
+    if name.endswith(('.jsonl', '.ndjson')):
+        return 'jsonl'
+    return None
+
+
+def iter_rows(lines: Iterable[str], fmt: str, result: ImportResult) -> Iterator[Tuple[int, dict]]:
+    """
+    Đọc input thành các cặp (số dòng, dict) theo kiểu stream.
+    Dòng không đọc được được ghi lỗi vào `result` và bỏ qua.
+    """
+    if fmt == 'csv':
+        yield from _iter_csv(lines, result)
+    elif fmt == 'jsonl':
+        yield from _iter_jsonl(lines, result)
+    else:
+        raise ImportFormatError(f"Định dạng không hỗ trợ, chỉ nhận: {', '.join(FORMATS)}")
+
+
+def _iter_csv(lines, result):
+    reader = csv.DictReader(lines)
+    if not reader.fieldnames or 'customer_name' not in reader.fieldnames:
+        raise ImportFormatError("Header CSV phải có các cột của ProjectCreate (customer_name, ...)")
+    for row in reader:
+        # Ô trống = không truyền, để ProjectCreate dùng giá trị mặc định
+        data = {key: value.strip() for key, value in row.items() if key and value and value.strip()}
+        try:
+            for name in JSON_COLUMNS:
+                if name in data:
+                    data[name] = json.loads(data[name])
+        except ValueError as e:
+            result.add_error(reader.line_num, f"Cột {name} không phải JSON hợp lệ: {e}")
+            continue
+        # Cột tắt: main_photographer = UUID nhân viên
+        main_photographer = data.pop('main_photographer', None)
+        if main_photographer and 'team' not in data:
+            data['team'] = {'main_photographer': {'employee': main_photographer}}
+        yield reader.line_num, data
+
+
+def _iter_jsonl(lines, result):
+    for line_num, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError as e:
+            result.add_error(line_num, f"JSON không hợp lệ: {e}")
+            continue
+        if not isinstance(data, dict):
+            result.add_error(line_num, "Mỗi dòng phải là một JSON object")
+            continue
+        yield line_num, data
+
+
+def _validation_message(exc: ValidationError) -> str:
+    return '; '.join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+
+def import_projects(rows: Iterable[Tuple[int, dict]], created_by=None, result: ImportResult = None) -> ImportResult:
+    """
+    Tạo dự án từ các dòng đã đọc, theo lô; lỗi từng dòng ghi vào result.
+    """
+    from apps.employees.models import Employee
+    from apps.packages.models import Package
+
+    result = result or ImportResult()
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, IMPORT_BATCH_SIZE))
+        if not batch:
+            break
+
+        # 1. Validate schema
+        valid = []
+        for row_num, data in batch:
+            try:
+                valid.append((row_num, ProjectCreate(**data)))
+            except ValidationError as e:
+                result.add_error(row_num, _validation_message(e))
+
+        # 2. Một query IN cho gói chụp, một cho photographer chính
+        package_ids = {payload.package_type for _, payload in valid}
+        employee_ids = {
+            payload.team.main_photographer.employee
+            for _, payload in valid
+            if payload.team and payload.team.main_photographer
+        }
+        packages = Package.objects.in_bulk(package_ids)
+        employees = Employee.objects.only('id', 'is_active').in_bulk(employee_ids)
+
+        pending = []
+        for row_num, payload in valid:
+            try:
+                project, payments = ProjectService.build_project(payload, packages, employees, created_by)
+            except ValueError as e:
+                result.add_error(row_num, str(e))
+                continue
+            pending.append((row_num, project, payments))
+
+        # 3. Cấp mã theo khối và ghi cả lô
+        _insert(pending, result)
+
+    # bulk_create không phát post_save
+    invalidate_counts(Project)
+    return result
+
+
+def _insert(pending: list, result: ImportResult):
+    """
+    Ghi một lô bằng `bulk_create`. Nếu lô lỗi ở DB hoặc có nhân viên trùng
+    lịch thì ghi lại từng dòng (mỗi dòng một transaction) để chỉ các dòng
+    hỏng bị báo lỗi.
+    """
+    if not pending:
+        return
+
+    for _, project, _ in pending:
+        project._prepare_save(None)
+
+    try:
+        with transaction.atomic():
+            codes = SequenceService.next_codes(
+                Project.code_prefix(), PROJECT_CODE_WIDTH, Project, 'project_code', len(pending)
+            )
+            for (_, project, _), code in zip(pending, codes):
+                project.project_code = code
+            Project.objects.bulk_create([project for _, project, _ in pending], batch_size=BULK_CREATE_BATCH_SIZE)
+            ProjectPayment.objects.bulk_create(
+                [payment for _, _, payments in pending for payment in payments],
+                batch_size=BULK_CREATE_BATCH_SIZE,
+            )
+            ProjectService.sync_assignments(
+                [project for _, project, _ in pending], replace=False, check_conflicts=True
+            )
+            record_events('created', [project for _, project, _ in pending])
+        result.created += len(pending)
+        return
+    except (DatabaseError, ValueError):
+        # Lỗi DB hoặc trùng lịch: ghi lại từng dòng để biết dòng nào hỏng
+        pass
+
+    for row_num, project, payments in pending:
+        project.project_code = ''
+        project._state.adding = True
+        try:
+            with transaction.atomic():
+                project.save()
+                ProjectPayment.objects.bulk_create(payments)
+                ProjectService.sync_assignments([project], replace=False, check_conflicts=True)
+                record_events('created', [project])
+        except DatabaseError as e:
+            result.add_error(row_num, f"Không thể lưu dự án: {e}")
+        except ValueError as e:
+            result.add_error(row_num, str(e))
+        else:
+            result.created += 1
+
+
+def import_from_lines(lines: Iterable[str], fmt: str, created_by=None) -> ImportResult:
+    """Đọc CSV/JSONL dạng stream và import mọi dòng hợp lệ."""
+    result = ImportResult()
+    return import_projects(iter_rows(lines, fmt, result), created_by, result)
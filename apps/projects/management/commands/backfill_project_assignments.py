@@ -0,0 +1,38 @@
+"""
+Management command to rebuild the project_assignments table from
+Project.team, e.g. after editing team JSON outside the API.
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from apps.projects.models import Project
+from apps.projects.services import ProjectService
+
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = 'Rebuild employee-to-project assignments from the team JSON of every project'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help='Projects per transaction')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        projects = created = 0
+        last_pk = None
+        while True:
+            # Keyset over the primary key: each batch is one short transaction
+            rows = Project.objects.only('id', 'team', 'shoot_date', 'shoot_time').order_by('pk')
+            if last_pk is not None:
+                rows = rows.filter(pk__gt=last_pk)
+            batch = list(rows[:batch_size])
+            if not batch:
+                break
+            with transaction.atomic():
+                created += ProjectService.sync_assignments(batch)
+            projects += len(batch)
+            last_pk = batch[-1].pk
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {created} assignments for {projects} projects"
+        ))
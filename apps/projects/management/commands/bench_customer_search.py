@@ -0,0 +1,122 @@
+"""
+Management command to benchmark customer search on the projects table:
+the old `icontains` filter on name and raw phone, the list filter on the
+normalized phone column, and the ranked search (pg_trgm on PostgreSQL,
+FTS5 on SQLite).
+
+The dataset is seeded inside a transaction that is rolled back at the end,
+so the command can run against any database without leaving rows behind.
+"""
+import random
+import statistics
+import time
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+from apps.packages.models import Package
+from apps.projects.models import Project
+from apps.projects.search import install_search_index, normalize_phone, search_backend
+from apps.projects.services import ProjectService
+
+SEED_BATCH_SIZE = 5000
+
+FAMILY_NAMES = ['Nguyễn', 'Trần', 'Lê', 'Phạm', 'Hoàng', 'Huỳnh', 'Phan', 'Vũ', 'Võ', 'Đặng', 'Bùi', 'Đỗ']
+MIDDLE_NAMES = ['Văn', 'Thị', 'Hữu', 'Đức', 'Minh', 'Ngọc', 'Thanh', 'Quốc', 'Gia', 'Bảo']
+GIVEN_NAMES = [
+    'Anh', 'Bình', 'Chi', 'Dũng', 'Giang', 'Hà', 'Hải', 'Hạnh', 'Hiếu', 'Hoa', 'Hùng', 'Khánh',
+    'Lan', 'Linh', 'Long', 'Mai', 'Nam', 'Nga', 'Phong', 'Phúc', 'Quân', 'Sơn', 'Tâm', 'Thảo',
+    'Trang', 'Trung', 'Tuấn', 'Vy', 'Xuân', 'Yến',
+]
+
+
+def _customer(rng, i):
+    name = f'{rng.choice(FAMILY_NAMES)} {rng.choice(MIDDLE_NAMES)} {rng.choice(GIVEN_NAMES)} {i}'
+    digits = f'09{rng.randrange(10 ** 8):08d}'
+    # Same formatting mix as real input: plain, grouped, +84
+    phone = rng.choice([digits, f'{digits[:4]} {digits[4:7]} {digits[7:]}', f'+84 {digits[1:4]} {digits[4:]}'])
+    return name, phone
+
+
+class Command(BaseCommand):
+    help = 'Benchmark customer name/phone search: icontains vs trigram/FTS ranked search'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--projects', type=int, default=1_000_000, help='Projects to seed')
+        parser.add_argument('--limit', type=int, default=20, help='Results per search')
+        parser.add_argument('--repeat', type=int, default=10, help='Timed runs per case')
+
+    def handle(self, *args, **options):
+        limit = options['limit']
+        with transaction.atomic():
+            if search_backend() == 'like':
+                install_search_index(connection)
+            name, phone = self._seed(options['projects'])
+            grouped_phone = f'{phone[:4]} {phone[4:7]} {phone[7:]}'
+            self.stdout.write(
+                f"Dataset: {options['projects']} projects | limit: {limit} | "
+                f"runs/case: {options['repeat']} | db: {connection.vendor} | search: {search_backend()}"
+            )
+            self.stdout.write(f"  {'case':<40} {'rows':>6} {'p50 ms':>10} {'p95 ms':>10}")
+            # One customer by name, a common name, one customer by phone
+            for term in [' '.join(name.split()[-2:]), 'Trần Thị Yến', grouped_phone]:
+                cases = [
+                    ('icontains name/phone', lambda: self._legacy(term, limit)),
+                    ('list filter', lambda: list(
+                        ProjectService._filter_projects(None, None, None, None, term).values('id')[:limit]
+                    )),
+                    ('ranked search', lambda: ProjectService.search_projects(term, limit)),
+                ]
+                for label, run in cases:
+                    rows, p50, p95 = self._time(run, options['repeat'])
+                    self.stdout.write(f'  {label + " " + repr(term):<40} {rows:6d} {p50:10.2f} {p95:10.2f}')
+
+            transaction.set_rollback(True)
+
+    def _legacy(self, term, limit):
+        # The filter before customer_phone_digits and the search indexes
+        return list(
+            Project.objects.filter(Q(customer_name__icontains=term) | Q(customer_phone__icontains=term))
+            .order_by('-created_at', '-id').values('id')[:limit]
+        )
+
+    def _time(self, run, repeat):
+        runs = []
+        rows = 0
+        for _ in range(repeat + 1):
+            started = time.perf_counter()
+            rows = len(run())
+            runs.append((time.perf_counter() - started) * 1000)
+        runs = sorted(runs[1:])  # first run warms the page cache
+        return rows, statistics.median(runs), runs[max(0, int(len(runs) * 0.95) - 1)]
+
+    def _seed(self, project_count):
+        """Seed projects; returns the name and normalized phone of one of them."""
+        rng = random.Random(42)
+        package = Package.objects.create(
+            package_id=f'BN{uuid.uuid4().hex[:6]}', name='Bench Package', category='wedding',
+            price=Decimal('5000000'), description='Bench',
+        )
+        today = date.today()
+        target = None
+        for start in range(0, project_count, SEED_BATCH_SIZE):
+            batch = []
+            for i in range(start, min(start + SEED_BATCH_SIZE, project_count)):
+                name, phone = _customer(rng, i)
+                batch.append(Project(
+                    project_code=f'BN{i:08d}',
+                    customer_name=name,
+                    customer_phone=phone,
+                    customer_phone_digits=normalize_phone(phone),
+                    package_type=package,
+                    package_name=package.name,
+                    package_price=Decimal('5000000'),
+                    package_discount=Decimal('0'),
+                    package_final_price=Decimal('5000000'),
+                    shoot_date=today + timedelta(days=i % 90),
+                ))
+            target = target or batch[len(batch) // 2]
+            Project.objects.bulk_create(batch)
+        return target.customer_name, target.customer_phone_digits
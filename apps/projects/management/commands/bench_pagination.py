@@ -0,0 +1,95 @@
+"""
+Management command to benchmark deep pagination on the projects list:
+OFFSET (skip/limit) versus keyset cursors, on page 1 and on a deep page.
+
+The dataset is seeded inside a transaction that is rolled back at the end,
+so the command can run against any database without leaving rows behind.
+"""
+import statistics
+import time
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from api.pagination import CREATED_ORDERING, encode_cursor, page_queryset
+from apps.packages.models import Package
+from apps.projects.models import Project
+
+SEED_BATCH_SIZE = 5000
+
+
+class Command(BaseCommand):
+    help = 'Benchmark OFFSET vs keyset cursor pagination on the projects list'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--projects', type=int, default=1_000_000, help='Projects to seed')
+        parser.add_argument('--page', type=int, default=5000, help='Deep page number to compare with page 1')
+        parser.add_argument('--limit', type=int, default=20, help='Page size')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed runs per case')
+
+    def handle(self, *args, **options):
+        limit = options['limit']
+        deep_page = options['page']
+        if options['projects'] < deep_page * limit:
+            options['projects'] = deep_page * limit
+            self.stdout.write(self.style.WARNING(
+                f"Raised --projects to {options['projects']} so page {deep_page} exists"
+            ))
+
+        with transaction.atomic():
+            self._seed(options['projects'])
+            queryset = Project.objects.all()
+
+            # Cursor for the deep page: the last row of the page before it
+            skip = (deep_page - 1) * limit
+            anchor = queryset.order_by(*CREATED_ORDERING)[skip - 1] if skip else None
+            deep_cursor = encode_cursor(anchor, CREATED_ORDERING) if anchor else None
+
+            cases = [
+                # Page 1 is the same query in both modes
+                ('page 1', dict(skip=0, cursor=None)),
+                (f'page {deep_page}, offset', dict(skip=skip, cursor=None)),
+                (f'page {deep_page}, cursor', dict(skip=0, cursor=deep_cursor)),
+            ]
+            self.stdout.write(
+                f"Dataset: {options['projects']} projects | limit: {limit} | "
+                f"runs/case: {options['repeat']} | db: {connection.vendor}"
+            )
+            self.stdout.write(f"  {'case':<22} {'p50 ms':>10} {'p95 ms':>10}")
+            for label, params in cases:
+                timings = self._time(queryset, limit, options['repeat'], **params)
+                self.stdout.write(f'  {label:<22} {timings[0]:10.2f} {timings[1]:10.2f}')
+
+            transaction.set_rollback(True)
+
+    def _time(self, queryset, limit, repeat, skip, cursor):
+        runs = []
+        for _ in range(repeat + 1):
+            started = time.perf_counter()
+            list(page_queryset(queryset, CREATED_ORDERING, skip, limit, cursor))
+            runs.append((time.perf_counter() - started) * 1000)
+        runs = sorted(runs[1:])  # first run warms the page cache
+        return statistics.median(runs), runs[max(0, int(len(runs) * 0.95) - 1)]
+
+    def _seed(self, project_count):
+        package = Package.objects.create(
+            package_id=f'BN{uuid.uuid4().hex[:6]}', name='Bench Package', category='wedding',
+            price=Decimal('5000000'), description='Bench',
+        )
+        today = date.today()
+        for start in range(0, project_count, SEED_BATCH_SIZE):
+            Project.objects.bulk_create([
+                Project(
+                    project_code=f'BN{i:08d}',
+                    customer_name=f'Bench Customer {i}',
+                    customer_phone=f'09{i:08d}',
+                    package_type=package,
+                    package_name=package.name,
+                    package_price=Decimal('5000000'),
+                    package_discount=Decimal('0'),
+                    package_final_price=Decimal('5000000'),
+                    shoot_date=today + timedelta(days=i % 90),
+                )
+                for i in range(start, min(start + SEED_BATCH_SIZE, project_count))
+            ])
@@ -0,0 +1,104 @@
+"""
+Management command to benchmark the bulk project import: rows per second
+of the batched import (CSV/JSONL parsing, one IN lookup per batch, block
+code allocation, bulk_create) against creating the same rows one by one
+through `ProjectService.create_project`.
+
+Packages and employees are seeded and everything is written inside a
+transaction that is rolled back, so no rows are left behind.
+"""
+import json
+import time
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from apps.employees.models import Employee
+from apps.packages.models import Package
+from apps.projects.importing import import_from_lines
+from apps.projects.schemas import ProjectCreate
+from apps.projects.services import ProjectService
+
+PACKAGES = 20
+EMPLOYEES = 50
+CSV_HEADER = 'customer_name,customer_phone,customer_email,package_type,package_name,package_price,shoot_date,main_photographer\n'
+
+
+def _rows(count, packages, employees):
+    today = date.today()
+    for i in range(count):
+        yield {
+            'customer_name': f'Khách hàng {i}',
+            'customer_phone': f'09{i:08d}',
+            'customer_email': f'customer{i}@example.com',
+            'package_type': str(packages[i % len(packages)]),
+            'package_name': 'Bench Package',
+            'package_price': '5000000',
+            # One shoot per photographer per day: no row is a double booking
+            'shoot_date': (today + timedelta(days=i // len(employees))).isoformat(),
+            'main_photographer': str(employees[i % len(employees)]),
+        }
+
+
+def _lines(fmt, count, packages, employees):
+    if fmt == 'csv':
+        yield CSV_HEADER
+        for row in _rows(count, packages, employees):
+            yield ','.join(row.values()) + '\n'
+    else:
+        for row in _rows(count, packages, employees):
+            row['team'] = {'main_photographer': {'employee': row.pop('main_photographer')}}
+            yield json.dumps(row, ensure_ascii=False) + '\n'
+
+
+class Command(BaseCommand):
+    help = 'Benchmark bulk project import against one-by-one create_project'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100_000, help='Rows to import')
+        parser.add_argument('--format', choices=['csv', 'jsonl'], default='csv')
+        parser.add_argument('--baseline-rows', type=int, default=1000,
+                            help='Rows created one by one for comparison (0 to skip)')
+
+    def handle(self, *args, **options):
+        rows, fmt = options['rows'], options['format']
+        with transaction.atomic():
+            packages, employees = self._seed()
+            self.stdout.write(f"Rows: {rows} | format: {fmt} | db: {connection.vendor}")
+
+            started = time.perf_counter()
+            result = import_from_lines(_lines(fmt, rows, packages, employees), fmt)
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"  bulk import: {result.created} created, {result.failed} failed in {elapsed:.1f}s "
+                f"({result.created / elapsed:,.0f} rows/s)"
+            )
+
+            baseline = options['baseline_rows']
+            if baseline:
+                started = time.perf_counter()
+                for row in _rows(baseline, packages, employees):
+                    row['team'] = {'main_photographer': {'employee': row.pop('main_photographer')}}
+                    ProjectService.create_project(ProjectCreate(**row))
+                elapsed = time.perf_counter() - started
+                self.stdout.write(
+                    f"  create_project x{baseline}: {elapsed:.1f}s ({baseline / elapsed:,.0f} rows/s, "
+                    f"~{rows * elapsed / baseline:.0f}s for {rows})"
+                )
+
+            transaction.set_rollback(True)
+
+    def _seed(self):
+        packages = [
+            Package.objects.create(
+                package_id=f'BN{uuid.uuid4().hex[:6]}', name=f'Bench Package {i}', category='wedding',
+                price=Decimal('5000000'), description='Bench',
+            ).id
+            for i in range(PACKAGES)
+        ]
+        employees = [
+            Employee.objects.create(name=f'Photographer {i}', role='Photo/Retouch').id
+            for i in range(EMPLOYEES)
+        ]
+        return packages, employees
@@ -0,0 +1,120 @@
+"""
+Management command to compare the full project list (`GET /api/projects/`)
+with the summary projection (`GET /api/projects/summary`): payload size and
+latency percentiles for one page.
+
+Projects are seeded with realistically sized JSON columns (milestones,
+update history, files, team) inside a transaction that is rolled back.
+"""
+import statistics
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import Client, override_settings
+from apps.packages.models import Package
+from apps.projects.models import Project
+from apps.users.models import User
+from apps.users.services import create_jwt_token
+
+
+def _blobs(i):
+    """JSON columns shaped like a project a few weeks into production."""
+    return dict(
+        milestones=[
+            {'id': f'm{n}', 'title': f'Milestone {n}', 'due_date': '2025-01-01', 'completed': n % 2 == 0,
+             'notes': 'Khách yêu cầu chỉnh màu nhẹ, giao bản xem trước qua email.'}
+            for n in range(6)
+        ],
+        update_history=[
+            {'timestamp': '2025-01-01T10:00:00', 'action': 'update', 'field': 'status',
+             'old_value': 'pending', 'new_value': 'in-progress', 'user': 'admin'}
+            for _ in range(12)
+        ],
+        files=[
+            {'name': f'IMG_{i}_{n}.jpg', 'url': f'https://cdn.example.com/projects/{i}/IMG_{n}.jpg',
+             'size': 4_800_000, 'uploaded_at': '2025-01-01T10:00:00'}
+            for n in range(10)
+        ],
+        team={
+            'main_photographer': {'employee': '7d5a3f4e-0000-4000-8000-000000000001', 'salary': 1_500_000},
+            'assistants': [{'employee': '7d5a3f4e-0000-4000-8000-000000000002', 'salary': 500_000}],
+            'retouch_artists': [{'employee': '7d5a3f4e-0000-4000-8000-000000000003', 'quantity': 40}],
+        },
+        partners={'flower': {'partner': 'PTN00001', 'cost': 800_000}, 'makeup': {'partner': 'PTN00002', 'cost': 1_200_000}},
+        additional_packages=[{'id': 'PKG00002', 'name': 'Album 30x30', 'price': 2_000_000}],
+        payment={'deposit': 2_000_000, 'paid': 2_000_000, 'final': 8_000_000, 'status': 'deposit',
+                 'history': [{'amount': 2_000_000, 'date': '2025-01-01', 'method': 'transfer'}]},
+    )
+
+
+class Command(BaseCommand):
+    help = 'Benchmark payload size and latency: full project list vs summary projection'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--projects', type=int, default=2000, help='Projects to seed')
+        parser.add_argument('--limit', type=int, default=100, help='Page size')
+        parser.add_argument('--requests', type=int, default=200, help='Timed requests per case')
+
+    def handle(self, *args, **options):
+        limit = options['limit']
+        # The test client's requests carry the 'testserver' host
+        with transaction.atomic(), override_settings(ALLOWED_HOSTS=['testserver']):
+            user = self._seed(options['projects'])
+            client = Client(HTTP_AUTHORIZATION=f'Bearer {create_jwt_token(user)}')
+
+            cases = [
+                ('full (ProjectRead)', f'/api/projects/?limit={limit}'),
+                ('summary', f'/api/projects/summary?limit={limit}'),
+                ('summary, 4 fields', f'/api/projects/summary?limit={limit}&fields=project_code,customer_name,shoot_date,status'),
+            ]
+            self.stdout.write(
+                f"Dataset: {options['projects']} projects | page size: {limit} | requests/case: {options['requests']}"
+            )
+            self.stdout.write(f"  {'case':<22} {'bytes':>10} {'p50 ms':>10} {'p95 ms':>10}")
+            for label, url in cases:
+                size, p50, p95 = self._time(client, url, options['requests'])
+                self.stdout.write(f'  {label:<22} {size:10d} {p50:10.2f} {p95:10.2f}')
+
+            transaction.set_rollback(True)
+
+    def _time(self, client, url, requests):
+        response = client.get(url)  # warm up
+        if response.status_code != 200:
+            raise CommandError(f'{url} returned {response.status_code}: {response.content[:200]!r}')
+        size = len(response.content)
+        runs = []
+        for _ in range(requests):
+            started = time.perf_counter()
+            client.get(url)
+            runs.append((time.perf_counter() - started) * 1000)
+        runs.sort()
+        return size, statistics.median(runs), runs[max(0, int(len(runs) * 0.95) - 1)]
+
+    def _seed(self, project_count):
+        user = User.objects.create_user(username='__bench_project_list__', password='bench-password', role='admin')
+        package = Package.objects.create(
+            package_id='BNLIST', name='Bench Package', category='wedding',
+            price=Decimal('8000000'), description='Bench',
+        )
+        today = date.today()
+        Project.objects.bulk_create([
+            Project(
+                project_code=f'BN{i:08d}',
+                customer_name=f'Bench Customer {i}',
+                customer_phone=f'09{i:08d}',
+                customer_email=f'customer{i}@example.com',
+                package_type=package,
+                package_name=package.name,
+                package_price=Decimal('8000000'),
+                package_discount=Decimal('0'),
+                package_final_price=Decimal('8000000'),
+                shoot_date=today + timedelta(days=i % 90),
+                shoot_time='08:00',
+                location='Hồ Gươm, Hà Nội',
+                **_blobs(i),
+            )
+            for i in range(project_count)
+        ], batch_size=500)
+        return user
@@ -0,0 +1,237 @@
+"""
+Management command to benchmark gunicorn (sync workers, WSGI) against
+uvicorn (async workers, ASGI) on the same dataset.
+
+Both servers are started as subprocesses with the current settings module,
+hit with the same concurrent load on the read-heavy endpoints, then stopped.
+The dataset is seeded into the configured database and removed afterwards.
+"""
+import http.client
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from decimal import Decimal
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from apps.employees.models import Employee
+from apps.packages.models import Package
+from apps.projects.models import Project
+from apps.users.models import User
+from apps.users.services import create_jwt_token
+
+HOST = '127.0.0.1'
+BENCH_USERNAME = '__bench_servers__'
+
+
+class Command(BaseCommand):
+    help = 'Benchmark gunicorn sync workers vs uvicorn async workers on the same dataset'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--projects', type=int, default=500, help='Projects to seed')
+        parser.add_argument('--requests', type=int, default=2000, help='Requests per endpoint per server')
+        parser.add_argument('--concurrency', type=int, default=64, help='Concurrent client connections')
+        parser.add_argument('--workers', type=int, default=4, help='Worker processes per server')
+        parser.add_argument('--threads', type=int, default=1, help='Threads per gunicorn worker')
+        parser.add_argument('--port', type=int, default=8150, help='First port to bind (two ports are used)')
+
+    def handle(self, *args, **options):
+        servers = self._server_commands(options)
+        if not servers:
+            raise CommandError('Neither gunicorn nor uvicorn is installed')
+
+        token, project_id, cleanup = self._seed(options['projects'])
+        try:
+            endpoints = [
+                ('project list', '/api/projects/?limit=20'),
+                ('project get', f'/api/projects/{project_id}'),
+                ('employee list', '/api/employees/?limit=20'),
+                ('package list', '/api/packages/?limit=20'),
+            ]
+            self.stdout.write(
+                f"Dataset: {options['projects']} projects | requests/endpoint: {options['requests']} "
+                f"| concurrency: {options['concurrency']} | workers: {options['workers']}"
+            )
+
+            results = {}
+            for name, command, port in servers:
+                results[name] = self._run_server(name, command, port, endpoints, token, options)
+
+            self._report(results, endpoints)
+        finally:
+            cleanup()
+
+    def _server_commands(self, options):
+        workers = str(options['workers'])
+        servers = []
+        if shutil.which('gunicorn'):
+            port = options['port']
+            servers.append((
+                'gunicorn (sync)',
+                ['gunicorn', 'config.wsgi:application', '--bind', f'{HOST}:{port}',
+                 '--workers', workers, '--threads', str(options['threads']), '--log-level', 'warning'],
+                port,
+            ))
+        else:
+            self.stdout.write(self.style.WARNING('gunicorn not installed, skipping sync run'))
+
+        if shutil.which('uvicorn'):
+            port = options['port'] + 1
+            servers.append((
+                'uvicorn (async)',
+                ['uvicorn', 'config.asgi:application', '--host', HOST, '--port', str(port),
+                 '--workers', workers, '--log-level', 'warning', '--no-access-log'],
+                port,
+            ))
+        else:
+            self.stdout.write(self.style.WARNING('uvicorn not installed, skipping async run'))
+        return servers
+
+    def _seed(self, project_count):
+        """Seed a dataset visible to the server processes; returns cleanup callback."""
+        suffix = uuid.uuid4().hex[:6]
+        user = User.objects.create_user(
+            username=f'{BENCH_USERNAME}{suffix}', password=uuid.uuid4().hex, role='admin'
+        )
+        employees = Employee.objects.bulk_create([
+            Employee(
+                name=f'Bench Employee {i}', role='Photo/Retouch',
+                email=f'bench{i}@example.com', created_by=user,
+            )
+            for i in range(50)
+        ])
+        packages = Package.objects.bulk_create([
+            Package(
+                package_id=f'BN{suffix}{i:04d}', name=f'Bench Package {i}', category='wedding',
+                price=Decimal('5000000'), created_by=user,
+            )
+            for i in range(50)
+        ])
+        today = date.today()
+        projects = Project.objects.bulk_create([
+            Project(
+                project_code=f'BN{suffix}{i:06d}',
+                customer_name=f'Bench Customer {i}',
+                customer_phone=f'09{i:08d}',
+                customer_email=f'customer{i}@example.com',
+                package_type=packages[i % len(packages)],
+                package_name=packages[i % len(packages)].name,
+                package_price=Decimal('5000000'),
+                package_discount=Decimal('0'),
+                package_final_price=Decimal('5000000'),
+                shoot_date=today + timedelta(days=i % 90),
+                team={'main_photographer': {'employee': str(employees[i % len(employees)].id), 'salary': 1000000}},
+                created_by=user,
+            )
+            for i in range(project_count)
+        ])
+
+        def cleanup():
+            Project.objects.filter(id__in=[p.id for p in projects]).delete()
+            Package.objects.filter(id__in=[p.id for p in packages]).delete()
+            Employee.objects.filter(id__in=[e.id for e in employees]).delete()
+            user.delete()
+
+        return create_jwt_token(user), projects[0].id, cleanup
+
+    def _run_server(self, name, command, port, endpoints, token, options):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get(
+            'DJANGO_SETTINGS_MODULE', settings.SETTINGS_MODULE
+        ))
+        process = subprocess.Popen(
+            command, cwd=settings.BASE_DIR, env=env,
+            stdout=subprocess.DEVNULL, stderr=sys.stderr,
+        )
+        try:
+            self._wait_until_ready(port, process)
+            results = {}
+            for label, path in endpoints:
+                self._load(port, path, token, options['concurrency'], options['concurrency'])  # warm up
+                results[label] = self._load(port, path, token, options['requests'], options['concurrency'])
+            self.stdout.write(f'  finished {name}')
+            return results
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+    def _wait_until_ready(self, port, process, timeout=30):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise CommandError(f'Server on port {port} exited with code {process.returncode}')
+            try:
+                conn = http.client.HTTPConnection(HOST, port, timeout=1)
+                conn.request('GET', '/api/health')
+                if conn.getresponse().status == 200:
+                    return
+            except OSError:
+                pass
+            time.sleep(0.2)
+        raise CommandError(f'Server on port {port} did not start within {timeout}s')
+
+    def _load(self, port, path, token, total, concurrency):
+        """Fire `total` GETs over `concurrency` keep-alive connections."""
+        headers = {'Authorization': f'Bearer {token}'}
+        latencies = []
+        errors = 0
+        lock = threading.Lock()
+        counter = iter(range(total))
+
+        def client():
+            nonlocal errors
+            conn = http.client.HTTPConnection(HOST, port, timeout=30)
+            local, failed = [], 0
+            while True:
+                with lock:
+                    if next(counter, None) is None:
+                        break
+                started = time.perf_counter()
+                try:
+                    conn.request('GET', path, headers=headers)
+                    response = conn.getresponse()
+                    response.read()
+                    if response.status != 200:
+                        failed += 1
+                except (OSError, http.client.HTTPException):
+                    failed += 1
+                    conn.close()
+                    conn = http.client.HTTPConnection(HOST, port, timeout=30)
+                local.append(time.perf_counter() - started)
+            conn.close()
+            with lock:
+                latencies.extend(local)
+                errors += failed
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for _ in range(concurrency):
+                pool.submit(client)
+        elapsed = time.perf_counter() - started
+
+        latencies.sort()
+        return {
+            'rps': len(latencies) / elapsed if elapsed else 0.0,
+            'p50': statistics.median(latencies) * 1000 if latencies else 0.0,
+            'p95': latencies[int(len(latencies) * 0.95) - 1] * 1000 if latencies else 0.0,
+            'errors': errors,
+        }
+
+    def _report(self, results, endpoints):
+        self.stdout.write('')
+        self.stdout.write(f"  {'endpoint':<15} {'server':<17} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'errors':>7}")
+        for label, _ in endpoints:
+            for name, per_endpoint in results.items():
+                row = per_endpoint[label]
+                self.stdout.write(
+                    f"  {label:<15} {name:<17} {row['rps']:9.1f} {row['p50']:9.2f} "
+                    f"{row['p95']:9.2f} {row['errors']:7d}"
+                )
@@ -0,0 +1,42 @@
+"""
+Management command to create projects in bulk from a CSV or JSONL file.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from apps.projects.importing import FORMATS, ImportFormatError, detect_format, import_from_lines
+
+
+class Command(BaseCommand):
+    help = 'Create projects in bulk from a CSV or JSONL file (ProjectCreate fields per row)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or JSONL file')
+        parser.add_argument('--format', choices=FORMATS, help='Input format (default: from file extension)')
+        parser.add_argument('--created-by', help='Username recorded as creator of the projects')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or detect_format(path)
+        if fmt is None:
+            raise CommandError('Cannot tell the format from the file name, pass --format')
+
+        created_by = None
+        if options['created_by']:
+            from apps.users.models import User
+            created_by = User.objects.filter(username=options['created_by']).first()
+            if created_by is None:
+                raise CommandError(f"User '{options['created_by']}' not found")
+
+        try:
+            # Streamed line by line: the file is never loaded whole
+            with open(path, encoding='utf-8-sig', newline='') as f:
+                result = import_from_lines(f, fmt, created_by=created_by).as_dict()
+        except (OSError, UnicodeDecodeError) as e:
+            raise CommandError(str(e))
+        except ImportFormatError as e:
+            raise CommandError(str(e))
+
+        for error in result['errors']:
+            self.stdout.write(self.style.WARNING(f"  row {error['row']}: {error['error']}"))
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {result['created']} projects, {result['failed']} rows failed"
+        ))
@@ -0,0 +1,24 @@
+"""
+Management command to delete project change events older than the
+retention window. Run it daily (cron); clients that resume from a pruned
+Last-Event-ID get a `reset` event and reload.
+"""
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from apps.projects.events import prune
+
+
+class Command(BaseCommand):
+    help = 'Delete project change events older than PROJECT_EVENT_RETENTION_DAYS'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=settings.PROJECT_EVENT_RETENTION_DAYS,
+            help='Keep events from the last N days'
+        )
+
+    def handle(self, *args, **options):
+        deleted = prune(timezone.now() - timedelta(days=options['days']))
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} project events"))
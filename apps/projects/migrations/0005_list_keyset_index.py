@@ -0,0 +1,24 @@
+# Generated by Django 5.0.1 on 2026-10-17 01:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('packages', '0003_list_keyset_index'),
+        ('projects', '0004_alter_project_location_alter_project_shoot_time'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='project',
+            options={'ordering': ['-created_at', '-id'], 'verbose_name': 'Dự án', 'verbose_name_plural': 'Dự án'},
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['-created_at', '-id'], name='projects_created_e4d275_idx'),
+        ),
+    ]
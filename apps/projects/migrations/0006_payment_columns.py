@@ -0,0 +1,39 @@
+# Generated by Django 5.0.1 on 2026-10-17 01:41
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('packages', '0003_list_keyset_index'),
+        ('projects', '0005_list_keyset_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='balance_due',
+            field=models.DecimalField(decimal_places=0, default=0, max_digits=12, verbose_name='Còn phải thu'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='paid_amount',
+            field=models.DecimalField(decimal_places=0, default=0, max_digits=12, verbose_name='Đã thanh toán'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='payment_status',
+            field=models.CharField(choices=[('unpaid', 'Unpaid'), ('deposit', 'Deposit'), ('paid', 'Paid')], default='unpaid', max_length=20, verbose_name='Trạng thái thanh toán'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['payment_status', '-shoot_date'], name='projects_payment_bb8529_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['shoot_date'], name='projects_shoot_d_93dc03_idx'),
+        ),
+    ]
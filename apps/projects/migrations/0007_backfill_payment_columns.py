@@ -0,0 +1,35 @@
+# Backfill payment_status / paid_amount / balance_due from the payment JSON.
+
+from decimal import Decimal
+
+from django.db import migrations
+
+BATCH_SIZE = 1000
+
+
+def backfill_payment_columns(apps, schema_editor):
+    Project = apps.get_model('projects', 'Project')
+    rows = Project.objects.only('id', 'payment', 'package_final_price').order_by('pk')
+    batch = []
+    for project in rows.iterator(chunk_size=BATCH_SIZE):
+        payment = project.payment or {}
+        project.payment_status = payment.get('status') or 'unpaid'
+        project.paid_amount = Decimal(str(payment.get('paid') or 0))
+        project.balance_due = (project.package_final_price or 0) - project.paid_amount
+        batch.append(project)
+        if len(batch) >= BATCH_SIZE:
+            Project.objects.bulk_update(batch, ['payment_status', 'paid_amount', 'balance_due'])
+            batch = []
+    if batch:
+        Project.objects.bulk_update(batch, ['payment_status', 'paid_amount', 'balance_due'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0006_payment_columns'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_payment_columns, migrations.RunPython.noop),
+    ]
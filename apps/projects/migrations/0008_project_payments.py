@@ -0,0 +1,40 @@
+# Generated by Django 5.0.1 on 2026-10-17 01:47
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0007_backfill_payment_columns'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='project',
+            name='payment',
+            field=models.JSONField(blank=True, default=dict, help_text='Format: {status, deposit, final, paid}; lịch sử thanh toán ở bảng project_payments', verbose_name='Thanh toán'),
+        ),
+        migrations.CreateModel(
+            name='ProjectPayment',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('amount', models.DecimalField(decimal_places=0, max_digits=12, verbose_name='Số tiền')),
+                ('date', models.DateField(verbose_name='Ngày thanh toán')),
+                ('method', models.CharField(blank=True, max_length=50, null=True, verbose_name='Hình thức')),
+                ('notes', models.TextField(blank=True, null=True, verbose_name='Ghi chú')),
+                ('received_by', models.UUIDField(blank=True, null=True, verbose_name='Người nhận')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Ngày tạo')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='payments', to='projects.project', verbose_name='Dự án')),
+            ],
+            options={
+                'verbose_name': 'Thanh toán dự án',
+                'verbose_name_plural': 'Thanh toán dự án',
+                'db_table': 'project_payments',
+                'ordering': ['date', 'created_at'],
+                'indexes': [models.Index(fields=['project', 'date'], name='project_pay_project_2b6fda_idx'), models.Index(fields=['date'], name='project_pay_date_18a610_idx')],
+            },
+        ),
+    ]
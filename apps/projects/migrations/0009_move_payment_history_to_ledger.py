@@ -0,0 +1,94 @@
+# Move payment['payment_history'] items into project_payments rows.
+
+import uuid
+from datetime import date
+from decimal import Decimal
+
+from django.db import migrations
+from django.db.models import Case, DecimalField, F, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+
+BATCH_SIZE = 1000
+
+
+def _received_by(value):
+    try:
+        return uuid.UUID(str(value)) if value else None
+    except ValueError:
+        return None
+
+
+def move_history_to_ledger(apps, schema_editor):
+    Project = apps.get_model('projects', 'Project')
+    ProjectPayment = apps.get_model('projects', 'ProjectPayment')
+    projects = Project.objects.filter(payment__has_key='payment_history').only('id', 'payment', 'created_at')
+
+    payments, changed = [], []
+    for project in projects.order_by('pk').iterator(chunk_size=BATCH_SIZE):
+        payment = dict(project.payment)
+        for item in payment.pop('payment_history') or []:
+            payments.append(ProjectPayment(
+                project_id=project.id,
+                amount=Decimal(str(item.get('amount') or 0)),
+                date=date.fromisoformat(str(item['date'])[:10]) if item.get('date') else project.created_at.date(),
+                method=item.get('method'),
+                notes=item.get('notes'),
+                received_by=_received_by(item.get('received_by')),
+            ))
+        project.payment = payment
+        changed.append(project)
+        if len(changed) >= BATCH_SIZE:
+            ProjectPayment.objects.bulk_create(payments)
+            Project.objects.bulk_update(changed, ['payment'])
+            payments, changed = [], []
+    ProjectPayment.objects.bulk_create(payments)
+    Project.objects.bulk_update(changed, ['payment'])
+
+
+def sync_payment_columns_from_ledger(apps, schema_editor):
+    """paid_amount, balance_due and payment_status from Sum(amount) of the ledger rows."""
+    Project = apps.get_model('projects', 'Project')
+    ProjectPayment = apps.get_model('projects', 'ProjectPayment')
+    paid = (
+        ProjectPayment.objects.filter(project_id=OuterRef('pk'))
+        .values('project_id').annotate(total=Sum('amount')).values('total')
+    )
+    Project.objects.update(
+        paid_amount=Coalesce(Subquery(paid), Value(Decimal(0)), output_field=DecimalField())
+    )
+    # Same rule as Project.sync_payment_columns at this migration
+    Project.objects.update(
+        balance_due=F('package_final_price') - F('paid_amount'),
+        payment_status=Case(
+            When(paid_amount__gt=0, paid_amount__gte=F('package_final_price'), then=Value('paid')),
+            When(paid_amount__gt=0, then=Value('deposit')),
+            default=Value('unpaid'),
+        ),
+    )
+
+
+def move_ledger_to_history(apps, schema_editor):
+    Project = apps.get_model('projects', 'Project')
+    ProjectPayment = apps.get_model('projects', 'ProjectPayment')
+    for project in Project.objects.only('id', 'payment').iterator(chunk_size=BATCH_SIZE):
+        history = [
+            {
+                'amount': float(item.amount), 'date': item.date.isoformat(), 'method': item.method,
+                'notes': item.notes, 'received_by': str(item.received_by) if item.received_by else None,
+            }
+            for item in ProjectPayment.objects.filter(project_id=project.id).order_by('date', 'created_at')
+        ]
+        project.payment = {**(project.payment or {}), 'payment_history': history}
+        project.save(update_fields=['payment'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0008_project_payments'),
+    ]
+
+    operations = [
+        migrations.RunPython(move_history_to_ledger, move_ledger_to_history),
+        migrations.RunPython(sync_payment_columns_from_ledger, migrations.RunPython.noop),
+    ]
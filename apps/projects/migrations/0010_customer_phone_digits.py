@@ -0,0 +1,22 @@
+# Generated by Django 5.0.1 on 2026-10-17 01:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0009_move_payment_history_to_ledger'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='project',
+            name='projects_custome_4348d3_idx',
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='customer_phone_digits',
+            field=models.CharField(blank=True, default='', editable=False, help_text='Chỉ chữ số, dùng cho tìm kiếm; tự cập nhật từ customer_phone', max_length=20, verbose_name='Số điện thoại (chuẩn hóa)'),
+        ),
+    ]
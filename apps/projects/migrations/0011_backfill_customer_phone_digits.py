@@ -0,0 +1,32 @@
+# Backfill customer_phone_digits from customer_phone.
+
+from django.db import migrations
+
+from apps.projects.search import normalize_phone
+
+BATCH_SIZE = 1000
+
+
+def backfill_customer_phone_digits(apps, schema_editor):
+    Project = apps.get_model('projects', 'Project')
+    rows = Project.objects.only('id', 'customer_phone').order_by('pk')
+    batch = []
+    for project in rows.iterator(chunk_size=BATCH_SIZE):
+        project.customer_phone_digits = normalize_phone(project.customer_phone)
+        batch.append(project)
+        if len(batch) >= BATCH_SIZE:
+            Project.objects.bulk_update(batch, ['customer_phone_digits'])
+            batch = []
+    if batch:
+        Project.objects.bulk_update(batch, ['customer_phone_digits'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0010_customer_phone_digits'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_customer_phone_digits, migrations.RunPython.noop),
+    ]
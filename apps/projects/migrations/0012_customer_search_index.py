@@ -0,0 +1,73 @@
+# Customer search indexes: pg_trgm GIN indexes on PostgreSQL, an FTS5
+# table kept in sync by triggers on SQLite. Not atomic so PostgreSQL can
+# build the indexes CONCURRENTLY.
+#
+# The trigram indexes are PostgreSQL-only and are left out of the model
+# state (Project.Meta has no GinIndex), so SQLite databases built without
+# migrations never see them.
+
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.operations import AddIndexConcurrently, TrigramExtension
+from django.db import migrations
+from django.db.models.functions import Upper
+
+from apps.projects.search import install_search_index, uninstall_search_index
+
+
+class PostgresOnly:
+    """Run the operation's DDL on PostgreSQL only (Django 5.0 does not guard the reverse)."""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+class PostgresTrigramExtension(PostgresOnly, TrigramExtension):
+    pass
+
+
+class AddPostgresIndexConcurrently(PostgresOnly, AddIndexConcurrently):
+    """AddIndexConcurrently left out of the model state."""
+
+    def state_forwards(self, app_label, state):
+        pass
+
+
+def install(apps, schema_editor):
+    install_search_index(schema_editor.connection)
+
+
+def uninstall(apps, schema_editor):
+    uninstall_search_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('projects', '0011_backfill_customer_phone_digits'),
+    ]
+
+    operations = [
+        PostgresTrigramExtension(),
+        AddPostgresIndexConcurrently(
+            model_name='project',
+            index=GinIndex(
+                OpClass(Upper('customer_name'), name='gin_trgm_ops'),
+                name='projects_customer_name_trgm',
+            ),
+        ),
+        AddPostgresIndexConcurrently(
+            model_name='project',
+            index=GinIndex(
+                OpClass('customer_phone_digits', name='gin_trgm_ops'),
+                name='projects_customer_phone_trgm',
+            ),
+        ),
+        migrations.RunPython(install, uninstall),
+    ]
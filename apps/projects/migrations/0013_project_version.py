@@ -0,0 +1,18 @@
+# Generated by Django 5.0.1 on 2026-10-17 02:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0012_customer_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='version',
+            field=models.PositiveIntegerField(default=1, help_text='Tăng 1 mỗi lần ghi; dùng làm ETag và kiểm tra If-Match', verbose_name='Phiên bản'),
+        ),
+    ]
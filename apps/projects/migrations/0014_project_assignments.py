@@ -0,0 +1,35 @@
+# Generated by Django 5.0.1 on 2026-10-17 02:20
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0003_list_keyset_index'),
+        ('projects', '0013_project_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectAssignment',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('role', models.CharField(choices=[('main_photographer', 'Main Photographer'), ('assist_photographer', 'Assist Photographer'), ('makeup_artist', 'Makeup Artist'), ('retouch_artist', 'Retouch Artist')], max_length=30, verbose_name='Vai trò')),
+                ('shoot_date', models.DateField(verbose_name='Ngày chụp')),
+                ('salary', models.DecimalField(decimal_places=0, default=0, max_digits=12, verbose_name='Lương')),
+                ('bonus', models.DecimalField(decimal_places=0, default=0, max_digits=12, verbose_name='Thưởng')),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='assignments', to='employees.employee', verbose_name='Nhân viên')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='assignments', to='projects.project', verbose_name='Dự án')),
+            ],
+            options={
+                'verbose_name': 'Phân công dự án',
+                'verbose_name_plural': 'Phân công dự án',
+                'db_table': 'project_assignments',
+                'ordering': ['shoot_date'],
+                'indexes': [models.Index(fields=['employee', 'shoot_date'], name='project_ass_employe_6fd3dc_idx')],
+            },
+        ),
+    ]
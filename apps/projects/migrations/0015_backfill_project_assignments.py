@@ -0,0 +1,91 @@
+# Backfill project_assignments from Project.team.
+
+import uuid
+from decimal import Decimal
+
+from django.db import migrations
+
+BATCH_SIZE = 1000
+
+# Frozen copy of apps.projects.assignments as of this migration: later
+# changes to the app code must not change what this backfill writes.
+TEAM_ROLES = {
+    'main_photographer': 'main_photographer',
+    'assist_photographers': 'assist_photographer',
+    'makeup_artists': 'makeup_artist',
+    'retouch_artists': 'retouch_artist',
+}
+
+
+def team_members(team):
+    """Yield (role, employee UUID, member dict), skipping malformed members."""
+    if not isinstance(team, dict):
+        return
+    for key, role in TEAM_ROLES.items():
+        members = team.get(key)
+        if isinstance(members, dict):
+            members = [members]
+        for member in members or []:
+            if not isinstance(member, dict) or not member.get('employee'):
+                continue
+            try:
+                employee_id = uuid.UUID(str(member['employee']))
+            except ValueError:
+                continue
+            yield role, employee_id, member
+
+
+def team_employee_ids(projects):
+    return {employee_id for project in projects for _, employee_id, _ in team_members(project.team)}
+
+
+def backfill_project_assignments(apps, schema_editor):
+    Project = apps.get_model('projects', 'Project')
+    ProjectAssignment = apps.get_model('projects', 'ProjectAssignment')
+    Employee = apps.get_model('employees', 'Employee')
+
+    rows = Project.objects.only('id', 'team', 'shoot_date').order_by('pk')
+    batch = []
+    for project in rows.iterator(chunk_size=BATCH_SIZE):
+        batch.append(project)
+        if len(batch) >= BATCH_SIZE:
+            _insert(batch, ProjectAssignment, Employee)
+            batch = []
+    if batch:
+        _insert(batch, ProjectAssignment, Employee)
+
+
+def _insert(projects, ProjectAssignment, Employee):
+    employee_ids = set(
+        Employee.objects.filter(id__in=team_employee_ids(projects)).values_list('id', flat=True)
+    )
+    # Built against this migration's columns, not build_assignments (which
+    # follows the current model)
+    ProjectAssignment.objects.bulk_create([
+        ProjectAssignment(
+            project_id=project.id,
+            employee_id=employee_id,
+            role=role,
+            shoot_date=project.shoot_date,
+            salary=Decimal(str(member.get('salary') or 0)),
+            bonus=Decimal(str(member.get('bonus') or 0)),
+        )
+        for project in projects
+        for role, employee_id, member in team_members(project.team)
+        if employee_id in employee_ids
+    ])
+
+
+def clear_project_assignments(apps, schema_editor):
+    apps.get_model('projects', 'ProjectAssignment').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0014_project_assignments'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_project_assignments, clear_project_assignments),
+    ]
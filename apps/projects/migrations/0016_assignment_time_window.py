@@ -0,0 +1,35 @@
+# Generated by Django 5.0.1 on 2026-10-17 02:23
+
+import datetime
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0003_list_keyset_index'),
+        ('projects', '0015_backfill_project_assignments'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='projectassignment',
+            name='project_ass_employe_6fd3dc_idx',
+        ),
+        migrations.AddField(
+            model_name='projectassignment',
+            name='end_time',
+            field=models.TimeField(default=datetime.time(23, 59, 59, 999999), verbose_name='Giờ kết thúc'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='projectassignment',
+            name='start_time',
+            field=models.TimeField(default=datetime.time(0, 0), verbose_name='Giờ bắt đầu'),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name='projectassignment',
+            index=models.Index(fields=['employee', 'shoot_date', 'start_time'], name='project_ass_employe_b38887_idx'),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Backfill project_assignments.start_time/end_time from Project.shoot_time.
+
+import re
+from datetime import datetime, time, timedelta
+
+from django.db import migrations
+
+BATCH_SIZE = 1000
+
+# Frozen copy of apps.projects.assignments.parse_shoot_time as of this
+# migration: later changes to the app code must not change this backfill.
+DEFAULT_SHOOT_DURATION = timedelta(hours=4)
+WHOLE_DAY = (time.min, time.max)
+_TIME_PATTERN = re.compile(r'(?<!\d)(\d{1,2})(?:\s*[:hHgG.]\s*(\d{2})?)?(?!\d)')
+
+
+def parse_shoot_time(text):
+    """Read the (start, end) window of a free-text shoot_time."""
+    times = []
+    for hour, minute in _TIME_PATTERN.findall(text or ''):
+        hour, minute = int(hour), int(minute or 0)
+        if hour < 24 and minute < 60:
+            times.append(time(hour, minute))
+        if len(times) == 2:
+            break
+    if not times:
+        return WHOLE_DAY
+
+    start = times[0]
+    if len(times) == 2:
+        end = times[1]
+    else:
+        end_at = datetime.combine(datetime.min, start) + DEFAULT_SHOOT_DURATION
+        end = end_at.time() if end_at.date() == datetime.min.date() else time.max
+    if end <= start:
+        end = time.max
+    return start, end
+
+
+def backfill_assignment_time_window(apps, schema_editor):
+    ProjectAssignment = apps.get_model('projects', 'ProjectAssignment')
+    rows = (
+        ProjectAssignment.objects.select_related('project')
+        .only('id', 'project', 'project__shoot_time').order_by('pk')
+    )
+    batch = []
+    for assignment in rows.iterator(chunk_size=BATCH_SIZE):
+        assignment.start_time, assignment.end_time = parse_shoot_time(assignment.project.shoot_time)
+        batch.append(assignment)
+        if len(batch) >= BATCH_SIZE:
+            ProjectAssignment.objects.bulk_update(batch, ['start_time', 'end_time'])
+            batch = []
+    if batch:
+        ProjectAssignment.objects.bulk_update(batch, ['start_time', 'end_time'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0016_assignment_time_window'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_assignment_time_window, migrations.RunPython.noop),
+    ]
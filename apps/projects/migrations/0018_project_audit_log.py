@@ -0,0 +1,41 @@
+# Generated by Django 5.0.1 on 2026-10-17 02:28
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0017_backfill_assignment_time_window'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='project',
+            name='update_history',
+            field=models.JSONField(blank=True, default=list, help_text='Không còn dùng; lịch sử thay đổi ở bảng project_audit_logs', verbose_name='Lịch sử cập nhật'),
+        ),
+        migrations.CreateModel(
+            name='ProjectAuditLog',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('changes', models.JSONField(help_text='Format: {field: {old, new}}', verbose_name='Thay đổi')),
+                ('version', models.PositiveIntegerField(verbose_name='Phiên bản dự án sau thay đổi')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Thời điểm')),
+                ('changed_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='project_audit_logs', to=settings.AUTH_USER_MODEL, verbose_name='Người sửa')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='audit_logs', to='projects.project', verbose_name='Dự án')),
+            ],
+            options={
+                'verbose_name': 'Nhật ký dự án',
+                'verbose_name_plural': 'Nhật ký dự án',
+                'db_table': 'project_audit_logs',
+                'ordering': ['-created_at', '-id'],
+                'indexes': [models.Index(fields=['project', '-created_at', '-id'], name='project_aud_project_1da83a_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.0.1 on 2026-10-17 02:34
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0018_project_audit_log'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectEvent',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('created', 'Tạo mới'), ('updated', 'Cập nhật'), ('progress', 'Tiến độ'), ('payment', 'Thanh toán')], max_length=20, verbose_name='Loại')),
+                ('project_id', models.UUIDField(verbose_name='Dự án')),
+                ('project_code', models.CharField(blank=True, max_length=20, verbose_name='Mã dự án')),
+                ('fields', models.JSONField(blank=True, default=list, verbose_name='Field thay đổi')),
+                ('status', models.CharField(max_length=20, verbose_name='Trạng thái mới')),
+                ('paid_amount', models.DecimalField(decimal_places=0, default=0, max_digits=12, verbose_name='Đã thanh toán')),
+                ('created_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now, verbose_name='Thời điểm')),
+            ],
+            options={
+                'verbose_name': 'Sự kiện dự án',
+                'verbose_name_plural': 'Sự kiện dự án',
+                'db_table': 'project_events',
+                'ordering': ['id'],
+            },
+        ),
+    ]
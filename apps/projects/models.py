@@ -2,14 +2,27 @@
 Models cho quản lý dự án.
 """
 import uuid
-from django.db import models
+from decimal import Decimal
+from django.db import models, transaction
+from django.db.models import Case, F, Value, When
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 from apps.packages.models import Package
 from apps.employees.models import Employee
 from apps.partners.models import Partner
+from apps.sequences.services import SequenceService
+from .assignments import TEAM_ROLES
+from .search import normalize_phone
 
 User = get_user_model()
 
+# Cột thanh toán dẫn xuất từ sổ ProjectPayment
+PAYMENT_COLUMNS = ('payment_status', 'paid_amount', 'balance_due')
+# project_code: PRJ + YYMM + 4 chữ số
+PROJECT_CODE_WIDTH = 4
+# Field mà thay đổi làm package_final_price (và balance_due) phải tính lại
+PRICE_FIELDS = frozenset({'package_price', 'package_discount'})
+
 class Project(models.Model):
     """Model dự án."""
 
@@ -37,6 +50,14 @@ class Project(models.Model):
     # Thông tin khách hàng
     customer_name = models.CharField(max_length=200, verbose_name="Tên khách hàng")
     customer_phone = models.CharField(max_length=20, verbose_name="Số điện thoại")
+    customer_phone_digits = models.CharField(
+        max_length=20,
+        blank=True,
+        default='',
+        editable=False,
+        verbose_name="Số điện thoại (chuẩn hóa)",
+        help_text="Chỉ chữ số, dùng cho tìm kiếm; tự cập nhật từ customer_phone"
+    )
     customer_email = models.EmailField(max_length=255, blank=True, verbose_name="Email")
 
     # Thông tin gói chụp
@@ -77,7 +98,27 @@ class Project(models.Model):
         default=dict,
         blank=True,
         verbose_name="Thanh toán",
-        help_text="Format: {status, deposit, final, paid, payment_history[{amount, date, method, notes, received_by}]}"
+        help_text="Format: {status, deposit, final, paid}; lịch sử thanh toán ở bảng project_payments"
+    )
+
+    # Cột tính từ `payment` (đồng bộ trong save()) để filter/tổng hợp bằng index và SUM
+    payment_status = models.CharField(
+        max_length=20,
+        choices=PAYMENT_STATUS_CHOICES,
+        default='unpaid',
+        verbose_name="Trạng thái thanh toán"
+    )
+    paid_amount = models.DecimalField(
+        max_digits=12,
+        decimal_places=0,
+        default=0,
+        verbose_name="Đã thanh toán"
+    )
+    balance_due = models.DecimalField(
+        max_digits=12,
+        decimal_places=0,
+        default=0,
+        verbose_name="Còn phải thu"
     )
 
     # Thông tin chụp
@@ -142,7 +183,7 @@ class Project(models.Model):
         default=list,
         blank=True,
         verbose_name="Lịch sử cập nhật",
-        help_text="Format: [{date, user, action, notes, changes}]"
+        help_text="Không còn dùng; lịch sử thay đổi ở bảng project_audit_logs"
     )
 
     # Audit fields
@@ -164,35 +205,102 @@ class Project(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Ngày tạo")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Ngày cập nhật")
+    version = models.PositiveIntegerField(
+        default=1,
+        verbose_name="Phiên bản",
+        help_text="Tăng 1 mỗi lần ghi; dùng làm ETag và kiểm tra If-Match"
+    )
 
     class Meta:
         db_table = 'projects'
         verbose_name = 'Dự án'
         verbose_name_plural = 'Dự án'
-        ordering = ['-created_at']
+        ordering = ['-created_at', '-id']
         indexes = [
+            models.Index(fields=['-created_at', '-id']),
             models.Index(fields=['status', '-shoot_date']),
-            models.Index(fields=['customer_name', 'customer_phone']),
+            models.Index(fields=['payment_status', '-shoot_date']),
+            models.Index(fields=['shoot_date']),
             models.Index(fields=['created_by', '-created_at']),
         ]
 
     def __str__(self):
         return f"{self.project_code} - {self.customer_name}"
 
-    def save(self, *args, **kwargs):
-        """Override save để tự động tạo project_code và tính giá."""
-        if not self.project_code:
-            # Tạo project_code: PRJ + YYMM + 4 chữ số
-            from datetime import datetime
-            count = Project.objects.count()
-            now = datetime.now()
-            year = str(now.year)[2:]
-            month = str(now.month).zfill(2)
-            self.project_code = f"PRJ{year}{month}{str(count + 1).zfill(4)}"
+    def sync_payment_columns(self):
+        """
+        Tính lại payment_status, balance_due từ paid_amount (tổng sổ
+        ProjectPayment) và giá cuối; `paid` / `status` trong JSON `payment`
+        không được dùng.
+        """
+        paid = Decimal(str(self.paid_amount or 0))
+        self.balance_due = Decimal(str(self.package_final_price or 0)) - paid
+        if paid > 0 and self.balance_due <= 0:
+            self.payment_status = 'paid'
+        elif paid > 0:
+            self.payment_status = 'deposit'
+        else:
+            self.payment_status = 'unpaid'
+
+    @staticmethod
+    def payment_column_updates(final_price) -> dict:
+        """
+        Biểu thức UPDATE tính lại balance_due, payment_status theo giá cuối
+        `final_price` từ paid_amount đang có trong DB (cùng quy tắc với
+        sync_payment_columns).
+        """
+        final_price = Value(Decimal(str(final_price or 0)), output_field=models.DecimalField())
+        return {
+            'balance_due': final_price - F('paid_amount'),
+            'payment_status': Case(
+                When(paid_amount__gt=0, paid_amount__gte=final_price, then=Value('paid')),
+                When(paid_amount__gt=0, then=Value('deposit')),
+                default=Value('unpaid'),
+            ),
+        }
+
+    def _resync_payment_columns(self):
+        """Giá cuối vừa đổi: tính lại cột thanh toán trong DB rồi đọc lại."""
+        Project.objects.filter(pk=self.pk).update(**Project.payment_column_updates(self.package_final_price))
+        self.refresh_from_db(fields=list(PAYMENT_COLUMNS))
+        self._loaded_final_price = self.package_final_price
+
+    def _final_price_changed(self, update_fields) -> bool:
+        """Lần ghi vừa rồi đổi package_final_price so với lúc đọc."""
+        return (
+            'package_final_price' in update_fields
+            and getattr(self, '_loaded_final_price', None) != self.package_final_price
+        )
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Giá cuối lúc đọc: đổi giá thì save() tính lại cột thanh toán
+        instance._loaded_final_price = instance.__dict__.get('package_final_price')
+        return instance
+
+    @property
+    def payment_view(self) -> dict:
+        """
+        Dạng JSON `payment` cũ cho API: kế hoạch (deposit, final) từ cột JSON,
+        status/paid từ cột typed, payment_history từ bảng ProjectPayment.
+        """
+        payment = dict(self.payment or {})
+        payment['status'] = self.payment_status
+        payment['paid'] = float(self.paid_amount)
+        payment['payment_history'] = [item.as_history_item() for item in self.payments.all()]
+        return payment
+
+    def _prepare_save(self, update_fields):
+        """
+        Tính các cột dẫn xuất và tăng version trước khi ghi.
 
+        Returns:
+            update_fields đầy đủ (thêm cột dẫn xuất), None khi INSERT
+        """
         # Tính giá cuối cùng
         if self.package_price is not None and self.package_discount is not None:
-            self.package_final_price = self.package_price - self.package_discount
+            self.package_final_price = Decimal(str(self.package_price)) - Decimal(str(self.package_discount))
         else:
             self.package_final_price = self.package_price
 
@@ -210,8 +318,269 @@ class Project(models.Model):
                 'status': 'unpaid',
                 'deposit': 0,
                 'final': 0,
-                'paid': 0,
-                'payment_history': []
+                'paid': 0
             }
 
-        super().save(*args, **kwargs)
+        # Số điện thoại chỉ gồm chữ số cho tìm kiếm
+        self.customer_phone_digits = normalize_phone(self.customer_phone)
+
+        if self._state.adding:
+            self.sync_payment_columns()
+            return update_fields
+
+        if update_fields is None:
+            # Cột thanh toán do add_payment cập nhật bằng F(): save() cả dòng
+            # không được ghi đè chúng bằng giá trị đã đọc trước đó
+            update_fields = {
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in PAYMENT_COLUMNS
+            }
+        else:
+            # Cột dẫn xuất được ghi cùng field nguồn
+            update_fields = set(update_fields)
+            if 'customer_phone' in update_fields:
+                update_fields.add('customer_phone_digits')
+            if not PRICE_FIELDS.isdisjoint(update_fields):
+                update_fields.add('package_final_price')
+
+        # Mỗi lần ghi đổi version (ETag của API)
+        self.version += 1
+        update_fields.add('version')
+        return update_fields
+
+    def save(self, *args, **kwargs):
+        """Override save để tự động tạo project_code, tính giá và cột thanh toán."""
+        kwargs['update_fields'] = self._prepare_save(kwargs.get('update_fields'))
+        adding = self._state.adding
+
+        # Mã được cấp cùng transaction với INSERT.
+        with transaction.atomic():
+            if not self.project_code:
+                self.project_code = SequenceService.next_code(
+                    Project.code_prefix(), PROJECT_CODE_WIDTH, Project, 'project_code'
+                )
+            super().save(*args, **kwargs)
+            # Cột thanh toán không nằm trong update_fields (add_payment ghi bằng F()):
+            # đổi giá thì tính lại trong DB
+            if not adding and self._final_price_changed(kwargs['update_fields']):
+                self._resync_payment_columns()
+        if adding:
+            self._loaded_final_price = self.package_final_price
+
+    @staticmethod
+    def code_prefix() -> str:
+        """Tiền tố project_code của tháng hiện tại: PRJ + YYMM (đánh số lại mỗi tháng)."""
+        from datetime import datetime
+        now = datetime.now()
+        return f"PRJ{str(now.year)[2:]}{str(now.month).zfill(2)}"
+
+    def save_versioned(self, update_fields) -> bool:
+        """
+        Ghi `update_fields` có kiểm tra version (optimistic concurrency).
+
+        Một câu UPDATE ... WHERE id = %s AND version = <version đã đọc>,
+        không khóa trước: nếu dòng đã bị ghi sau lần đọc thì không có dòng
+        nào khớp và không ghi gì.
+
+        Returns:
+            True nếu đã ghi (version tăng 1), False nếu version đã đổi
+        """
+        read_version = self.version
+        update_fields = self._prepare_save(update_fields)
+        self.updated_at = timezone.now()
+        update_fields.add('updated_at')
+
+        with transaction.atomic():
+            updated = Project.objects.filter(pk=self.pk, version=read_version).update(
+                **{name: getattr(self, name) for name in update_fields}
+            )
+            if updated and self._final_price_changed(update_fields):
+                self._resync_payment_columns()
+        if not updated:
+            self.version = read_version
+        return bool(updated)
+
+
+class ProjectPayment(models.Model):
+    """
+    Sổ thanh toán của dự án: mỗi lần thu tiền là một dòng.
+
+    Tổng đã thu nằm ở Project.paid_amount và được cộng dồn nguyên tử
+    (UPDATE ... SET paid_amount = paid_amount + x) cùng transaction với INSERT.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    project = models.ForeignKey(
+        Project,
+        on_delete=models.CASCADE,
+        related_name='payments',
+        verbose_name="Dự án"
+    )
+    amount = models.DecimalField(max_digits=12, decimal_places=0, verbose_name="Số tiền")
+    date = models.DateField(verbose_name="Ngày thanh toán")
+    method = models.CharField(max_length=50, blank=True, null=True, verbose_name="Hình thức")
+    notes = models.TextField(blank=True, null=True, verbose_name="Ghi chú")
+    # Lưu id như trong payment_history cũ, không ràng buộc khóa ngoại
+    received_by = models.UUIDField(null=True, blank=True, verbose_name="Người nhận")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Ngày tạo")
+
+    class Meta:
+        db_table = 'project_payments'
+        verbose_name = 'Thanh toán dự án'
+        verbose_name_plural = 'Thanh toán dự án'
+        ordering = ['date', 'created_at']
+        indexes = [
+            models.Index(fields=['project', 'date']),
+            models.Index(fields=['date']),
+        ]
+
+    def __str__(self):
+        return f"{self.project_id} - {self.amount} ({self.date})"
+
+    def as_history_item(self) -> dict:
+        """Dạng phần tử payment_history cũ."""
+        return {
+            'amount': float(self.amount),
+            'date': self.date.isoformat(),
+            'method': self.method,
+            'notes': self.notes,
+            'received_by': str(self.received_by) if self.received_by else None,
+        }
+
+
+class ProjectAssignment(models.Model):
+    """
+    Phân công: nhân viên X làm vai trò Y trong dự án Z (dẫn xuất từ Project.team).
+
+    Ghi lại toàn bộ mỗi khi team, shoot_date hoặc shoot_time của dự án đổi
+    (ProjectService.sync_assignments); ngày và khung giờ chụp được chép sang
+    để lịch và kiểm tra trùng lịch của nhân viên tra bằng index
+    (employee, shoot_date, start_time).
+    """
+
+    ROLE_CHOICES = [
+        (role, role.replace('_', ' ').title()) for role in TEAM_ROLES.values()
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    project = models.ForeignKey(
+        Project,
+        on_delete=models.CASCADE,
+        related_name='assignments',
+        verbose_name="Dự án"
+    )
+    employee = models.ForeignKey(
+        Employee,
+        on_delete=models.CASCADE,
+        related_name='assignments',
+        verbose_name="Nhân viên"
+    )
+    role = models.CharField(max_length=30, choices=ROLE_CHOICES, verbose_name="Vai trò")
+    shoot_date = models.DateField(verbose_name="Ngày chụp")
+    # Khung giờ [start_time, end_time) đọc từ Project.shoot_time
+    start_time = models.TimeField(verbose_name="Giờ bắt đầu")
+    end_time = models.TimeField(verbose_name="Giờ kết thúc")
+    salary = models.DecimalField(max_digits=12, decimal_places=0, default=0, verbose_name="Lương")
+    bonus = models.DecimalField(max_digits=12, decimal_places=0, default=0, verbose_name="Thưởng")
+
+    class Meta:
+        db_table = 'project_assignments'
+        verbose_name = 'Phân công dự án'
+        verbose_name_plural = 'Phân công dự án'
+        ordering = ['shoot_date']
+        indexes = [
+            models.Index(fields=['employee', 'shoot_date', 'start_time']),
+        ]
+
+    def __str__(self):
+        return f"{self.employee_id} - {self.role} ({self.shoot_date})"
+
+
+class ProjectAuditLog(models.Model):
+    """
+    Nhật ký thay đổi dự án (chỉ thêm, không sửa): mỗi lần update_project
+    ghi một dòng với diff theo field. Được ghi theo lô ngoài luồng request
+    (xem apps.projects.audit).
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    project = models.ForeignKey(
+        Project,
+        on_delete=models.CASCADE,
+        related_name='audit_logs',
+        verbose_name="Dự án"
+    )
+    changed_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='project_audit_logs',
+        verbose_name="Người sửa"
+    )
+    changes = models.JSONField(
+        verbose_name="Thay đổi",
+        help_text="Format: {field: {old, new}}"
+    )
+    version = models.PositiveIntegerField(verbose_name="Phiên bản dự án sau thay đổi")
+    # Thời điểm thay đổi (không phải lúc flush)
+    created_at = models.DateTimeField(default=timezone.now, verbose_name="Thời điểm")
+
+    class Meta:
+        db_table = 'project_audit_logs'
+        verbose_name = 'Nhật ký dự án'
+        verbose_name_plural = 'Nhật ký dự án'
+        ordering = ['-created_at', '-id']
+        indexes = [
+            models.Index(fields=['project', '-created_at', '-id']),
+        ]
+
+    def __str__(self):
+        return f"{self.project_id} v{self.version} ({self.created_at})"
+
+
+class ProjectEvent(models.Model):
+    """
+    Sự kiện thay đổi dự án cho luồng SSE (/projects/events).
+
+    `id` tăng dần là Last-Event-ID mà client gửi lại khi kết nối lại.
+    Không ràng buộc khóa ngoại: sự kiện chỉ là bản tin, được xóa sau
+    PROJECT_EVENT_RETENTION_DAYS (lệnh prune_project_events).
+    """
+
+    KIND_CHOICES = [
+        ('created', 'Tạo mới'),
+        ('updated', 'Cập nhật'),
+        ('progress', 'Tiến độ'),
+        ('payment', 'Thanh toán'),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES, verbose_name="Loại")
+    project_id = models.UUIDField(verbose_name="Dự án")
+    project_code = models.CharField(max_length=20, blank=True, verbose_name="Mã dự án")
+    fields = models.JSONField(default=list, blank=True, verbose_name="Field thay đổi")
+    status = models.CharField(max_length=20, verbose_name="Trạng thái mới")
+    paid_amount = models.DecimalField(max_digits=12, decimal_places=0, default=0, verbose_name="Đã thanh toán")
+    created_at = models.DateTimeField(default=timezone.now, db_index=True, verbose_name="Thời điểm")
+
+    class Meta:
+        db_table = 'project_events'
+        verbose_name = 'Sự kiện dự án'
+        verbose_name_plural = 'Sự kiện dự án'
+        ordering = ['id']
+
+    def __str__(self):
+        return f"#{self.id} {self.kind} {self.project_code or self.project_id}"
+
+    def as_message(self) -> dict:
+        """Nội dung gửi cho client (data của sự kiện SSE)."""
+        return {
+            'id': self.id,
+            'type': self.kind,
+            'project_id': str(self.project_id),
+            'project_code': self.project_code,
+            'fields': self.fields,
+            'status': self.status,
+            'paid_amount': float(self.paid_amount),
+        }
@@ -1,8 +1,8 @@
 """
 Pydantic schemas cho Project API.
 """
-from datetime import datetime, date
-from typing import Optional, List, Dict, Any
+from datetime import datetime, date, time
+from typing import Optional, List, Dict, Any, Tuple
 from pydantic import BaseModel, Field, EmailStr, field_validator
 from uuid import UUID
 
@@ -55,7 +55,12 @@ class PaymentHistorySchema(BaseModel):
 
 
 class PaymentSchema(BaseModel):
-    """Schema cho thanh toán."""
+    """
+    Schema cho thanh toán.
+
+    Khi ghi chỉ deposit, final và payment_history (lúc tạo) được dùng;
+    status và paid luôn tính từ sổ ProjectPayment.
+    """
     status: str = Field(default='unpaid', description="unpaid, deposit, paid")
     deposit: float = Field(default=0, ge=0)
     final: float = Field(default=0, ge=0)
@@ -168,8 +173,13 @@ class ProjectRead(ProjectBase):
     project_code: str
     package_final_price: float
     additional_packages: List = Field(default=[])
-    payment: Dict = Field(default={})
+    # Dạng JSON cũ, ghép từ cột thanh toán và sổ ProjectPayment
+    payment: Dict = Field(default={}, validation_alias='payment_view')
+    payment_status: str = 'unpaid'
+    paid_amount: float = 0
+    balance_due: float = 0
     status: str
+    version: int = 1
     progress: Dict = Field(default={})
     milestones: List = Field(default=[])
     team: Dict = Field(default={})
@@ -197,6 +207,119 @@ class ProjectList(BaseModel):
     """Schema cho danh sách dự án."""
     total: int
     items: List[ProjectRead]
+    next_cursor: Optional[str] = None
+    count_strategy: str = 'exact'
+
+
+class ProjectSummary(BaseModel):
+    """
+    Schema rút gọn cho bảng danh sách dự án: chỉ các cột scalar, không có
+    các cột JSON (milestones, team, files, update_history, ...).
+
+    Các field ngoài `id` là optional để dùng chung cho sparse fieldset
+    (`fields=`): field không được chọn sẽ không có trong response.
+    """
+    id: UUID
+    project_code: Optional[str] = None
+    customer_name: Optional[str] = None
+    customer_phone: Optional[str] = None
+    package_name: Optional[str] = None
+    package_final_price: Optional[float] = None
+    shoot_date: Optional[date] = None
+    shoot_time: Optional[str] = None
+    location: Optional[str] = None
+    status: Optional[str] = None
+    payment_status: Optional[str] = None
+    balance_due: Optional[float] = None
+    created_at: Optional[datetime] = None
+
+
+# Cột mặc định của ProjectSummary, cũng là các cột được phép trong `fields=`
+PROJECT_SUMMARY_FIELDS = tuple(ProjectSummary.model_fields)
+
+
+class ProjectSummaryList(BaseModel):
+    """Schema cho danh sách dự án rút gọn."""
+    total: int
+    items: List[ProjectSummary]
+    next_cursor: Optional[str] = None
+    count_strategy: str = 'exact'
+
+
+class ProjectSearchHit(ProjectSummary):
+    """Kết quả tìm kiếm khách hàng: ProjectSummary kèm độ khớp."""
+    rank: Optional[float] = None
+
+
+class FieldChange(BaseModel):
+    """Giá trị trước / sau của một field."""
+    old: Any = None
+    new: Any = None
+
+
+class ProjectAuditEntry(BaseModel):
+    """Một lần cập nhật dự án trong lịch sử."""
+    id: UUID
+    changed_by_id: Optional[UUID] = None
+    changes: Dict[str, FieldChange]
+    version: int
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class ProjectHistory(BaseModel):
+    """Schema cho lịch sử thay đổi dự án."""
+    total: int
+    items: List[ProjectAuditEntry]
+    next_cursor: Optional[str] = None
+    count_strategy: str = 'exact'
+
+
+class EventStreamToken(BaseModel):
+    """Token ngắn hạn cho `GET /projects/events?token=` (EventSource)."""
+    token: str
+    expires_in: int = Field(description="Số giây token còn hiệu lực")
+
+
+class ConflictBooking(BaseModel):
+    """Một lịch đặt trong nhóm trùng lịch."""
+    project_id: UUID
+    project_code: str
+    customer_name: str
+    status: str
+    role: str
+    start_time: time
+    end_time: time
+
+
+class BookingConflict(BaseModel):
+    """Nhóm lịch giao nhau của một nhân viên trong một ngày."""
+    employee_id: UUID
+    employee_name: str
+    shoot_date: date
+    bookings: List[ConflictBooking]
+
+
+class CalendarDay(BaseModel):
+    """Số dự án trong một ngày, theo trạng thái."""
+    date: date
+    total: int
+    by_status: Dict[str, int]
+
+
+class ProjectCalendar(BaseModel):
+    """
+    Lịch chụp trong khoảng ngày. Mỗi phần tử của `bookings` là một tuple
+    theo thứ tự `fields`: (id, shoot_date, shoot_time, project_code,
+    customer_name, status).
+    """
+    from_date: date
+    to_date: date
+    fields: List[str]
+    days: List[CalendarDay]
+    bookings: List[Tuple[UUID, date, Optional[str], str, str, str]]
 
 
 class ProjectFilter(BaseModel):
@@ -0,0 +1,143 @@
+"""
+Tìm kiếm khách hàng của dự án (tên, số điện thoại).
+
+- PostgreSQL: pg_trgm, với GIN index trên UPPER(customer_name) và
+  customer_phone_digits (tạo trong migration 0012). Filter `icontains` của
+  danh sách và chế độ tìm kiếm xếp hạng (similarity) đều dùng được index này.
+- SQLite (test, USE_SQLITE): bảng ảo FTS5 `projects_search` với tokenizer
+  trigram, được giữ đồng bộ bằng trigger và xếp hạng bằng bm25.
+
+Số điện thoại được chuẩn hóa về chỉ còn chữ số ("0901 234 567",
+"+84 901 234 567" -> "0901234567") trước khi lưu và trước khi tìm.
+"""
+import re
+from django.db import connections
+
+# Trigram cần ít nhất 3 ký tự; từ khóa ngắn hơn dùng LIKE thường
+MIN_TRIGRAM_LENGTH = 3
+
+_PHONE_QUERY_RE = re.compile(r'[\d\s().+\-]+')
+
+# FTS5 external content: nội dung nằm ở bảng projects, FTS chỉ giữ index.
+# Migration dựng lại bảng projects làm mất trigger theo bảng cũ, nên sau
+# mỗi lần migrate trigger được tạo lại; chỉ rebuild index khi bảng FTS hoặc
+# trigger vừa được tạo (các ghi trong lúc thiếu trigger chưa vào index).
+# Chỉ dùng cho môi trường dev/test.
+SQLITE_TRIGGERS = ('projects_search_ai', 'projects_search_ad', 'projects_search_au')
+SQLITE_STATEMENTS = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS projects_search USING fts5(
+        customer_name, customer_phone_digits,
+        content='projects', content_rowid='rowid', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS projects_search_ai AFTER INSERT ON projects BEGIN
+        INSERT INTO projects_search(rowid, customer_name, customer_phone_digits)
+        VALUES (new.rowid, new.customer_name, new.customer_phone_digits);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS projects_search_ad AFTER DELETE ON projects BEGIN
+        INSERT INTO projects_search(projects_search, rowid, customer_name, customer_phone_digits)
+        VALUES ('delete', old.rowid, old.customer_name, old.customer_phone_digits);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS projects_search_au
+    AFTER UPDATE OF customer_name, customer_phone_digits ON projects BEGIN
+        INSERT INTO projects_search(projects_search, rowid, customer_name, customer_phone_digits)
+        VALUES ('delete', old.rowid, old.customer_name, old.customer_phone_digits);
+        INSERT INTO projects_search(rowid, customer_name, customer_phone_digits)
+        VALUES (new.rowid, new.customer_name, new.customer_phone_digits);
+    END
+    """,
+]
+SQLITE_REBUILD = "INSERT INTO projects_search(projects_search) VALUES ('rebuild')"
+
+
+def normalize_phone(value: str) -> str:
+    """Chỉ giữ chữ số; đầu số quốc tế +84 đổi về 0."""
+    digits = re.sub(r'\D', '', value or '')
+    if digits.startswith('84') and (value.strip().startswith('+') or len(digits) == 11):
+        digits = '0' + digits[2:]
+    return digits
+
+
+def phone_query(term: str) -> str:
+    """Chữ số để tìm theo số điện thoại, hoặc '' nếu từ khóa không giống số điện thoại."""
+    if not _PHONE_QUERY_RE.fullmatch(term or ''):
+        return ''
+    return normalize_phone(term)
+
+
+def search_backend(using: str = 'default') -> str:
+    """'postgresql', 'sqlite' (khi có bảng FTS5) hoặc 'like'."""
+    connection = connections[using]
+    if connection.vendor == 'postgresql':
+        return 'postgresql'
+    if connection.vendor == 'sqlite' and 'projects_search' in connection.introspection.table_names():
+        return 'sqlite'
+    return 'like'
+
+
+def install_search_index(connection) -> None:
+    """Tạo bảng FTS5 và trigger trên SQLite (idempotent); backend khác bỏ qua."""
+    if connection.vendor != 'sqlite' or 'projects' not in connection.introspection.table_names():
+        return
+    with connection.cursor() as cursor:
+        # Schema cũ hơn migration 0010 (ví dụ khi migrate lùi): chưa có cột để index
+        columns = {column.name for column in connection.introspection.get_table_description(cursor, 'projects')}
+        if 'customer_phone_digits' not in columns:
+            return
+        objects = ('projects_search',) + SQLITE_TRIGGERS
+        cursor.execute(
+            f"SELECT name FROM sqlite_master WHERE name IN ({', '.join(['%s'] * len(objects))})", objects
+        )
+        existing = {row[0] for row in cursor.fetchall()}
+        for statement in SQLITE_STATEMENTS:
+            cursor.execute(statement)
+        if existing != set(objects):
+            cursor.execute(SQLITE_REBUILD)
+
+
+def uninstall_search_index(connection) -> None:
+    """Xóa bảng FTS5 và trigger trên SQLite (reverse migration)."""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for trigger in SQLITE_TRIGGERS:
+            cursor.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+        cursor.execute('DROP TABLE IF EXISTS projects_search')
+
+
+def fts_match_expression(term: str, digits: str) -> str:
+    """Biểu thức MATCH của FTS5: từ khóa là một chuỗi nguyên văn, theo cột."""
+    def quote(value):
+        return '"' + value.replace('"', '""') + '"'
+
+    clauses = []
+    if len(term) >= MIN_TRIGRAM_LENGTH:
+        clauses.append(f'customer_name : {quote(term)}')
+    if len(digits) >= MIN_TRIGRAM_LENGTH:
+        clauses.append(f'customer_phone_digits : {quote(digits)}')
+    return ' OR '.join(clauses)
+
+
+def sqlite_ranked_ids(term: str, digits: str, limit: int, using: str = 'default') -> list:
+    """[(project id, rank)] theo bm25 (rank lớn hơn = khớp hơn)."""
+    expression = fts_match_expression(term, digits)
+    if not expression:
+        return []
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT p.id, -bm25(projects_search)
+            FROM projects_search JOIN projects p ON p.rowid = projects_search.rowid
+            WHERE projects_search MATCH %s
+            ORDER BY bm25(projects_search)
+            LIMIT %s
+            """,
+            [expression, limit],
+        )
+        return cursor.fetchall()
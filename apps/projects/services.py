@@ -1,15 +1,47 @@
 """
 Business logic services cho Project.
 """
-from typing import Optional, List
+from collections import Counter, defaultdict
+from typing import AbstractSet, Optional, List, Sequence, Tuple
 from uuid import UUID
-from datetime import date
-from django.db.models import Q
-from .models import Project
+from datetime import date, timedelta
+from decimal import Decimal
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Case, Exists, F, FloatField, OuterRef, Q, Value, When
+from django.db.models.functions import Greatest, Upper
+from django.utils import timezone
+from .assignments import build_assignments, team_employee_ids
+from .audit import audit_buffer, field_diffs, snapshot
+from .events import record as record_events
+from .expressions import JSONAppend, JSONMerge
+from .models import PAYMENT_COLUMNS, Project, ProjectAssignment, ProjectAuditLog, ProjectPayment
+from .search import MIN_TRIGRAM_LENGTH, phone_query, search_backend, sqlite_ranked_ids
 from .schemas import (
     ProjectCreate, ProjectUpdate, MilestoneSchema,
-    ProgressSchema, PaymentHistorySchema
+    ProgressSchema, PaymentHistorySchema, PROJECT_SUMMARY_FIELDS
 )
+from api.counting import invalidate_counts, write_generation
+from api.exceptions import PreconditionFailedError
+from api.pagination import CREATED_ORDERING, Page, apaginate, paginate
+
+
+# Số lần đọc-ghi lại khi dự án bị ghi đồng thời (request không có If-Match)
+UPDATE_ATTEMPTS = 3
+VERSION_CONFLICT_MESSAGE = "Dự án đã được người khác cập nhật, vui lòng tải lại"
+# Field mà thay đổi làm bảng ProjectAssignment phải ghi lại
+ASSIGNMENT_FIELDS = frozenset({'team', 'shoot_date', 'shoot_time'})
+# Phần của `payment` client gửi mà không lưu: tính từ sổ ProjectPayment
+LEDGER_PAYMENT_FIELDS = frozenset({'payment_history', 'paid', 'status'})
+# Khoảng ngày tối đa của /projects/conflicts
+MAX_CONFLICT_RANGE_DAYS = 366
+# Số phân công kiểm tra trùng lịch trong một query
+CONFLICT_QUERY_CHUNK = 200
+# Cột của mỗi lịch trong /projects/calendar (thứ tự phần tử của tuple)
+CALENDAR_BOOKING_FIELDS = ('id', 'shoot_date', 'shoot_time', 'project_code', 'customer_name', 'status')
+# Khoảng ngày tối đa của /projects/calendar
+MAX_CALENDAR_DAYS = 366
 
 
 class ProjectService:
@@ -26,21 +58,59 @@ class ProjectService:
 
         Returns:
             Project object
+
+        Raises:
+            ValueError: Dữ liệu không hợp lệ hoặc nhân viên bị trùng lịch
         """
         from apps.packages.models import Package
         from apps.employees.models import Employee
 
+        main = data.team.main_photographer if data.team else None
+        employees = Employee.objects.in_bulk([main.employee] if main and main.employee else [])
+        packages = Package.objects.in_bulk([data.package_type] if data.package_type else [])
+        project, payments = ProjectService.build_project(data, packages, employees, created_by)
+
+        with transaction.atomic():
+            project.save()
+            # Lịch sử thanh toán ban đầu vào sổ ProjectPayment
+            ProjectPayment.objects.bulk_create(payments)
+            # Photographer / ekip phải rảnh trong khung giờ chụp
+            ProjectService.sync_assignments([project], replace=False, check_conflicts=True)
+            record_events('created', [project])
+        return project
+
+    @staticmethod
+    def build_project(
+        data: ProjectCreate, packages: dict, employees: dict, created_by=None
+    ) -> Tuple[Project, List[ProjectPayment]]:
+        """
+        Kiểm tra dữ liệu và dựng Project (chưa lưu) cùng các dòng sổ thanh toán.
+
+        Dùng chung cho create_project và import hàng loạt: gói chụp và nhân
+        viên được tra trước (một query `IN` cho cả lô) và truyền vào.
+
+        Args:
+            data: Dữ liệu dự án
+            packages: {id: Package} chứa gói của dự án
+            employees: {id: Employee} chứa photographer chính
+            created_by: User tạo
+
+        Returns:
+            (Project chưa lưu, danh sách ProjectPayment chưa lưu)
+
+        Raises:
+            ValueError: Dữ liệu không hợp lệ
+        """
         # Validation 1: Phải có photographer chính
         if not data.team or not data.team.main_photographer or not data.team.main_photographer.employee:
             raise ValueError("Bắt buộc phải có Photographer chính")
 
         # Validation 2: Kiểm tra photographer chính có tồn tại và active
-        try:
-            main_photographer = Employee.objects.get(id=data.team.main_photographer.employee)
-            if not main_photographer.is_active:
-                raise ValueError("Photographer chính đã nghỉ việc, vui lòng chọn người khác")
-        except Employee.DoesNotExist:
+        main_photographer = employees.get(data.team.main_photographer.employee)
+        if main_photographer is None:
             raise ValueError("Photographer chính không tồn tại")
+        if not main_photographer.is_active:
+            raise ValueError("Photographer chính đã nghỉ việc, vui lòng chọn người khác")
 
         # Validation 3: Kiểm tra package_type
         if not data.package_type:
@@ -59,11 +129,10 @@ class ProjectService:
         )
 
         # Handle package_type ForeignKey
-        try:
-            package = Package.objects.get(id=data.package_type)
-            project_data['package_type'] = package
-        except Package.DoesNotExist:
+        package = packages.get(data.package_type)
+        if package is None:
             raise ValueError("Gói chụp không tồn tại")
+        project_data['package_type'] = package
 
         project = Project(**project_data)
 
@@ -77,34 +146,115 @@ class ProjectService:
         if data.partners:
             project.partners = data.partners.model_dump(mode='json')
 
+        history = []
         if data.payment:
-            project.payment = data.payment.model_dump(mode='json')
+            # Chỉ giữ kế hoạch (deposit, final): đã thu / trạng thái tính từ payment_history
+            project.payment = data.payment.model_dump(mode='json', exclude=LEDGER_PAYMENT_FIELDS)
+            history = data.payment.payment_history or []
 
         if created_by:
             project.created_by = created_by
             project.last_modified_by = created_by
 
-        project.save()
-        return project
+        payments = [
+            ProjectPayment(
+                project=project, amount=Decimal(str(item.amount)), date=item.date,
+                method=item.method, notes=item.notes, received_by=item.received_by,
+            )
+            for item in history
+        ]
+        # save() / _prepare_save tính balance_due, payment_status từ tổng này
+        project.paid_amount = sum((payment.amount for payment in payments), Decimal(0))
+        return project, payments
 
     @staticmethod
-    def update_project(project_id: UUID, data: ProjectUpdate, updated_by=None) -> Optional[Project]:
+    def update_project(
+        project_id: UUID,
+        data: ProjectUpdate,
+        updated_by=None,
+        if_match: Optional[AbstractSet[int]] = None
+    ) -> Optional[Project]:
         """
         Cập nhật thông tin dự án.
 
+        Ghi bằng optimistic concurrency (Project.save_versioned), không khóa
+        dòng: nếu dự án bị ghi giữa lúc đọc và lúc ghi thì đọc lại và áp lại
+        thay đổi; riêng request có If-Match thì báo lỗi 412.
+
+        Các field thay đổi được ghi vào ProjectAuditLog sau khi commit
+        (theo lô, xem apps.projects.audit).
+
         Args:
             project_id: ID dự án
             data: Dữ liệu cập nhật
             updated_by: User cập nhật
+            if_match: Các version client chấp nhận (header If-Match), None = bất kỳ
 
         Returns:
             Project object hoặc None
+
+        Raises:
+            PreconditionFailedError: Version hiện tại không nằm trong if_match
         """
-        try:
-            project = Project.objects.get(id=project_id)
-        except Project.DoesNotExist:
-            return None
+        for _ in range(UPDATE_ATTEMPTS):
+            try:
+                project = Project.objects.get(id=project_id)
+            except Project.DoesNotExist:
+                return None
+            if if_match is not None and project.version not in if_match:
+                raise PreconditionFailedError(VERSION_CONFLICT_MESSAGE)
+
+            before = snapshot(project)
+            update_data, changed = ProjectService._apply_update(project, data, updated_by)
+            # Đổi ekip / lịch, hoặc mở lại dự án đã hủy: kiểm tra trùng lịch. Đổi
+            # trạng thái khác (vd. hoàn thành) chỉ ghi lại phân công, không chặn
+            # dự án vốn đã trùng lịch.
+            reopened = before['status'] == 'cancelled' and project.status != 'cancelled'
+            rebooked = not ASSIGNMENT_FIELDS.isdisjoint(changed) or reopened
+            resync = rebooked or 'status' in changed
+            with transaction.atomic():
+                saved = project.save_versioned(changed)
+                if saved:
+                    if resync:
+                        ProjectService.sync_assignments(
+                            [project], check_conflicts=rebooked and project.status != 'cancelled'
+                        )
+                    ProjectService._record_update(project, before, updated_by)
+            if saved:
+                break
+            if if_match is not None:
+                raise PreconditionFailedError(VERSION_CONFLICT_MESSAGE)
+        else:
+            raise PreconditionFailedError(VERSION_CONFLICT_MESSAGE)
+
+        # queryset.update không phát post_save
+        invalidate_counts(Project)
+        return project
+
+    @staticmethod
+    def _record_update(project: Project, before: dict, updated_by=None):
+        """
+        Ghi nhật ký (sau commit, theo lô) và sự kiện thay đổi cho lần cập
+        nhật vừa lưu; không ghi gì nếu không field nào đổi giá trị.
+        """
+        changes = field_diffs(before, snapshot(project))
+        if not changes:
+            return
+        record_events('updated', [project], changes)
+        entry = ProjectAuditLog(
+            project_id=project.id, changed_by=updated_by, changes=changes,
+            version=project.version, created_at=timezone.now()
+        )
+        transaction.on_commit(lambda: audit_buffer.add(entry))
+
+    @staticmethod
+    def _apply_update(project: Project, data: ProjectUpdate, updated_by=None) -> Tuple[dict, set]:
+        """
+        Áp dữ liệu cập nhật lên object (chưa ghi).
 
+        Returns:
+            (field scalar client gửi lên, tập field cần ghi)
+        """
         from apps.packages.models import Package
 
         # Validate: Cannot change from 'completed' to 'cancelled'
@@ -119,6 +269,8 @@ class ProjectService:
 
         for field, value in update_data.items():
             setattr(project, field, value)
+        # Chỉ ghi các cột client gửi lên (cột dẫn xuất do Project._prepare_save thêm vào)
+        changed = set(update_data)
 
         # Handle package_type ForeignKey
         if hasattr(data, 'package_type') and data.package_type is not None:
@@ -126,38 +278,146 @@ class ProjectService:
                 try:
                     package = Package.objects.get(id=data.package_type)
                     project.package_type = package
+                    changed.add('package_type')
                 except Package.DoesNotExist:
                     pass
             else:
                 project.package_type = None
+                changed.add('package_type')
 
         # Update nested fields (only if they exist in the update schema)
         if hasattr(data, 'additional_packages') and data.additional_packages is not None:
             project.additional_packages = [pkg.model_dump(mode='json') for pkg in data.additional_packages]
+            changed.add('additional_packages')
 
         if hasattr(data, 'team') and data.team is not None:
             project.team = data.team.model_dump(mode='json')
+            changed.add('team')
 
         if hasattr(data, 'partners') and data.partners is not None:
             project.partners = data.partners.model_dump(mode='json')
+            changed.add('partners')
 
-        if hasattr(data, 'payment') and data.payment is not None:
-            project.payment = data.payment.model_dump(mode='json')
+        # payment_history thuộc sổ ProjectPayment (chỉ thêm qua add_payment):
+        # lịch sử client gửi lại bị bỏ qua để không ghi trùng. paid / status
+        # cũng tính từ sổ, client chỉ sửa được kế hoạch (deposit, final).
+        payment_changed = hasattr(data, 'payment') and data.payment is not None
+        if payment_changed:
+            project.payment = data.payment.model_dump(mode='json', exclude=LEDGER_PAYMENT_FIELDS)
+            changed.add('payment')
 
         if hasattr(data, 'progress') and data.progress is not None:
             project.progress = data.progress.model_dump()
+            changed.add('progress')
 
         if hasattr(data, 'milestones') and data.milestones is not None:
             project.milestones = [milestone.model_dump(mode='json') for milestone in data.milestones]
+            changed.add('milestones')
 
         if hasattr(data, 'files') and data.files is not None:
             project.files = [file.model_dump(mode='json') for file in data.files]
+            changed.add('files')
 
         if updated_by:
             project.last_modified_by = updated_by
+            changed.add('last_modified_by')
 
-        project.save()
-        return project
+        return update_data, changed
+
+    @staticmethod
+    def sync_assignments(
+        projects: Sequence[Project],
+        replace: bool = True,
+        check_conflicts: bool = False
+    ) -> int:
+        """
+        Ghi lại bảng ProjectAssignment của các dự án theo team, shoot_date và
+        shoot_time hiện tại. Phải gọi trong cùng transaction với lần ghi dự án.
+
+        Args:
+            projects: Dự án đã lưu
+            replace: Xóa phân công cũ trước (False khi dự án vừa được tạo)
+            check_conflicts: Từ chối nếu nhân viên đã có lịch trùng giờ ở dự án khác
+
+        Returns:
+            Số dòng phân công đã tạo
+
+        Raises:
+            ValueError: Nhân viên bị đặt trùng lịch (khi check_conflicts)
+        """
+        from apps.employees.models import Employee
+
+        # Chỉ giữ UUID nhân viên còn tồn tại (team là JSON, không có khóa ngoại)
+        employees = Employee.objects.filter(id__in=team_employee_ids(projects))
+        if check_conflicts:
+            # Khóa nhân viên tới hết transaction: hai request đặt cùng người
+            # không thể cùng qua bước kiểm tra
+            employees = employees.select_for_update()
+        names = dict(employees.values_list('id', 'name'))
+
+        assignments = build_assignments(ProjectAssignment, projects, set(names))
+        if check_conflicts:
+            conflicts = ProjectService._booking_conflicts(assignments, projects)
+            if conflicts:
+                raise ValueError('; '.join(
+                    f"{names[employee_id]} đã có lịch chụp {code} ngày {shoot_date:%d/%m/%Y} "
+                    f"({start:%H:%M}-{end:%H:%M})"
+                    for employee_id, code, shoot_date, start, end in conflicts
+                ))
+
+        if replace:
+            ProjectAssignment.objects.filter(project__in=[project.id for project in projects]).delete()
+        return len(ProjectAssignment.objects.bulk_create(assignments))
+
+    @staticmethod
+    def _booking_conflicts(assignments: List[ProjectAssignment], projects: Sequence[Project]) -> list:
+        """
+        Lịch trùng ngày và giao khung giờ với `assignments`: ở dự án khác
+        (chưa hủy) trong DB, và giữa các dự án trong cùng lô.
+
+        Mỗi phân công là một nhánh OR (employee, shoot_date, start_time < end)
+        đi theo index (employee, shoot_date, start_time): một query cho mỗi
+        CONFLICT_QUERY_CHUNK phân công.
+
+        Returns:
+            [(employee_id, project_code, shoot_date, start_time, end_time)] của lịch bị trùng
+        """
+        codes = {project.id: project.project_code for project in projects}
+        conflicts = []
+        for start in range(0, len(assignments), CONFLICT_QUERY_CHUNK):
+            overlaps = Q()
+            for assignment in assignments[start:start + CONFLICT_QUERY_CHUNK]:
+                overlaps |= Q(
+                    employee_id=assignment.employee_id,
+                    shoot_date=assignment.shoot_date,
+                    start_time__lt=assignment.end_time,
+                    end_time__gt=assignment.start_time,
+                )
+            conflicts.extend(
+                ProjectAssignment.objects.filter(overlaps)
+                .exclude(project_id__in=list(codes))
+                .exclude(project__status='cancelled')
+                .order_by('shoot_date', 'start_time')
+                .values_list('employee_id', 'project__project_code', 'shoot_date', 'start_time', 'end_time')
+                .distinct()
+            )
+
+        # Trong lô: quét theo giờ bắt đầu trên từng (nhân viên, ngày), giữ lịch
+        # kết thúc muộn nhất; khung giờ là của dự án nên mỗi dự án lấy một dòng
+        slots = defaultdict(dict)
+        for assignment in assignments:
+            slots[(assignment.employee_id, assignment.shoot_date)].setdefault(assignment.project_id, assignment)
+        for bookings in slots.values():
+            latest = None
+            for booking in sorted(bookings.values(), key=lambda b: b.start_time):
+                if latest is not None and booking.start_time < latest.end_time:
+                    conflicts.append((
+                        latest.employee_id, codes[latest.project_id],
+                        latest.shoot_date, latest.start_time, latest.end_time,
+                    ))
+                if latest is None or booking.end_time > latest.end_time:
+                    latest = booking
+        return conflicts
 
     @staticmethod
     def get_project(project_id: UUID) -> Optional[Project]:
@@ -171,10 +431,52 @@ class ProjectService:
             Project object hoặc None
         """
         try:
-            return Project.objects.select_related('package_type').get(id=project_id)
+            return Project.objects.select_related('package_type').prefetch_related('payments').get(id=project_id)
+        except Project.DoesNotExist:
+            return None
+
+    @staticmethod
+    async def aget_project(project_id: UUID) -> Optional[Project]:
+        """
+        Lấy thông tin dự án theo ID (async ORM, dùng cho view async).
+
+        Args:
+            project_id: ID dự án
+
+        Returns:
+            Project object hoặc None
+        """
+        try:
+            return await Project.objects.select_related('package_type').prefetch_related('payments').aget(id=project_id)
         except Project.DoesNotExist:
             return None
 
+    @staticmethod
+    def get_history(
+        project_id: UUID,
+        skip: int = 0,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> Optional[Page]:
+        """
+        Lịch sử thay đổi của dự án, mới nhất trước.
+
+        Args:
+            project_id: ID dự án
+            skip: Số bản ghi bỏ qua (bỏ qua nếu có cursor)
+            limit: Số bản ghi tối đa
+            cursor: Cursor trang tiếp theo (keyset trên created_at, id)
+
+        Returns:
+            Page các ProjectAuditLog, hoặc None nếu không có dự án
+        """
+        if not Project.objects.filter(id=project_id).exists():
+            return None
+        # Bản ghi còn trong bộ đệm của process này cũng phải đọc được
+        audit_buffer.flush()
+        queryset = ProjectAuditLog.objects.filter(project_id=project_id)
+        return paginate(queryset, CREATED_ORDERING, skip, limit, cursor)
+
     @staticmethod
     def list_projects(
         status: Optional[str] = None,
@@ -183,8 +485,10 @@ class ProjectService:
         to_date: Optional[date] = None,
         customer_name: Optional[str] = None,
         skip: int = 0,
-        limit: int = 20
-    ) -> tuple[List[Project], int]:
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        count: Optional[str] = None
+    ) -> Page:
         """
         Lấy danh sách dự án với filter.
 
@@ -194,12 +498,81 @@ class ProjectService:
             from_date: Từ ngày
             to_date: Đến ngày
             customer_name: Tìm kiếm theo tên khách hàng
-            skip: Số bản ghi bỏ qua
+            skip: Số bản ghi bỏ qua (bỏ qua nếu có cursor)
             limit: Số bản ghi tối đa
+            cursor: Cursor trang tiếp theo (keyset trên created_at, id)
+            count: Cách tính tổng số (exact, cached, estimate)
+
+        Returns:
+            Page (danh sách dự án, tổng số) kèm next_cursor
+        """
+        queryset = ProjectService._filter_projects(
+            status, payment_status, from_date, to_date, customer_name
+        ).prefetch_related('payments')
+        return paginate(queryset, CREATED_ORDERING, skip, limit, cursor, count)
+
+    @staticmethod
+    async def alist_projects(
+        status: Optional[str] = None,
+        payment_status: Optional[str] = None,
+        from_date: Optional[date] = None,
+        to_date: Optional[date] = None,
+        customer_name: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        count: Optional[str] = None
+    ) -> Page:
+        """
+        Lấy danh sách dự án với filter (async ORM, dùng cho view async).
+        Tham số và kết quả giống `list_projects`.
+        """
+        queryset = ProjectService._filter_projects(
+            status, payment_status, from_date, to_date, customer_name
+        ).prefetch_related('payments')
+        return await apaginate(queryset, CREATED_ORDERING, skip, limit, cursor, count)
+
+    @staticmethod
+    async def alist_project_summaries(
+        status: Optional[str] = None,
+        payment_status: Optional[str] = None,
+        from_date: Optional[date] = None,
+        to_date: Optional[date] = None,
+        customer_name: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        count: Optional[str] = None,
+        fields: Sequence[str] = PROJECT_SUMMARY_FIELDS
+    ) -> Page:
+        """
+        Lấy danh sách dự án rút gọn bằng `.values()`: chỉ SELECT các cột
+        trong `fields`, không đọc và decode các cột JSON.
+
+        Args:
+            fields: Các cột cần lấy (tập con của PROJECT_SUMMARY_FIELDS)
+            Các tham số còn lại giống `list_projects`.
 
         Returns:
-            Tuple (danh sách dự án, tổng số)
+            Page với items là dict {cột: giá trị}
         """
+        queryset = ProjectService._filter_projects(
+            status, payment_status, from_date, to_date, customer_name
+        )
+        # Cursor cần các cột khóa sắp xếp dù client không chọn
+        keys = [field.lstrip('-') for field in CREATED_ORDERING]
+        columns = list(dict.fromkeys([*fields, *keys]))
+        page = await apaginate(queryset.values(*columns), CREATED_ORDERING, skip, limit, cursor, count)
+
+        extra = set(columns) - set(fields)
+        if not extra:
+            return page
+        items = [{key: value for key, value in row.items() if key not in extra} for row in page.items]
+        return Page(items, page.total, page.next_cursor, page.count_strategy)
+
+    @staticmethod
+    def _filter_projects(status, payment_status, from_date, to_date, customer_name):
+        """Dựng queryset dự án theo các filter của danh sách."""
         queryset = Project.objects.select_related('package_type').all()
 
         # Apply filters
@@ -207,7 +580,7 @@ class ProjectService:
             queryset = queryset.filter(status=status)
 
         if payment_status:
-            queryset = queryset.filter(payment__status=payment_status)
+            queryset = queryset.filter(payment_status=payment_status)
 
         if from_date:
             queryset = queryset.filter(shoot_date__gte=from_date)
@@ -216,14 +589,132 @@ class ProjectService:
             queryset = queryset.filter(shoot_date__lte=to_date)
 
         if customer_name:
-            queryset = queryset.filter(
-                Q(customer_name__icontains=customer_name) | Q(customer_phone__icontains=customer_name)
+            # icontains trên PostgreSQL dùng GIN trigram index của UPPER(customer_name);
+            # số điện thoại so trên cột chỉ gồm chữ số ("0901 234 567" -> "0901234567")
+            match = Q(customer_name__icontains=customer_name)
+            digits = phone_query(customer_name)
+            if digits:
+                match |= Q(customer_phone_digits__contains=digits)
+            queryset = queryset.filter(match)
+
+        return queryset
+
+    @staticmethod
+    def list_conflicts(from_date: date, to_date: date) -> List[dict]:
+        """
+        Các lịch đặt trùng giờ của cùng nhân viên trong khoảng ngày (bỏ dự án đã hủy).
+
+        Một query: phân công trong khoảng ngày có tồn tại phân công khác cùng
+        nhân viên, cùng ngày, giao khung giờ (EXISTS theo index employee,
+        shoot_date, start_time); sau đó gom các lịch giao nhau thành nhóm.
+
+        Args:
+            from_date: Từ ngày
+            to_date: Đến ngày
+
+        Returns:
+            Danh sách nhóm {employee_id, employee_name, shoot_date, bookings}
+
+        Raises:
+            ValueError: Khoảng ngày không hợp lệ
+        """
+        if from_date > to_date:
+            raise ValueError("from_date phải trước hoặc bằng to_date")
+        if (to_date - from_date).days >= MAX_CONFLICT_RANGE_DAYS:
+            raise ValueError(f"Khoảng ngày tối đa {MAX_CONFLICT_RANGE_DAYS} ngày")
+
+        active = ProjectAssignment.objects.exclude(project__status='cancelled')
+        overlapping = active.filter(
+            employee_id=OuterRef('employee_id'),
+            shoot_date=OuterRef('shoot_date'),
+            start_time__lt=OuterRef('end_time'),
+            end_time__gt=OuterRef('start_time'),
+        ).exclude(project_id=OuterRef('project_id'))
+        rows = (
+            active.filter(Exists(overlapping), shoot_date__range=(from_date, to_date))
+            .order_by('shoot_date', 'employee_id', 'start_time', 'project_id')
+            .values(
+                'employee_id', 'shoot_date', 'project_id', 'role', 'start_time', 'end_time',
+                employee_name=F('employee__name'),
+                project_code=F('project__project_code'),
+                customer_name=F('project__customer_name'),
+                status=F('project__status'),
             )
+        )
 
-        total = queryset.count()
-        projects = list(queryset[skip:skip + limit])
+        # Quét theo giờ bắt đầu: lịch bắt đầu trước giờ kết thúc muộn nhất
+        # của nhóm hiện tại thì thuộc cùng nhóm
+        conflicts = []
+        group, group_end = None, None
+        for row in rows:
+            slot = (row['employee_id'], row['shoot_date'])
+            if group is None or (group['employee_id'], group['shoot_date']) != slot or row['start_time'] >= group_end:
+                group = {
+                    'employee_id': row['employee_id'],
+                    'employee_name': row['employee_name'],
+                    'shoot_date': row['shoot_date'],
+                    'bookings': [],
+                }
+                group_end = row['end_time']
+                conflicts.append(group)
+            group['bookings'].append(row)
+            group_end = max(group_end, row['end_time'])
+        return conflicts
 
-        return projects, total
+    @staticmethod
+    def search_projects(query: str, limit: int = 20) -> List[dict]:
+        """
+        Tìm dự án theo tên hoặc số điện thoại khách hàng, xếp theo độ khớp.
+
+        PostgreSQL xếp theo trigram similarity (khớp cả khi gõ sai chính tả),
+        SQLite theo bm25 của bảng FTS5; backend khác chỉ lọc LIKE.
+
+        Args:
+            query: Từ khóa (tên, hoặc số điện thoại với khoảng trắng/dấu tùy ý)
+            limit: Số kết quả tối đa
+
+        Returns:
+            Danh sách dict gồm các cột ProjectSummary và `rank`
+        """
+        term = ' '.join(query.split())
+        if not term:
+            return []
+        digits = phone_query(term)
+        columns = PROJECT_SUMMARY_FIELDS
+        backend = search_backend()
+
+        if backend == 'postgresql':
+            from django.contrib.postgres.search import TrigramSimilarity
+
+            upper_term = term.upper()
+            match = Q(customer_name_upper__contains=upper_term) | Q(customer_name_upper__trigram_similar=upper_term)
+            rank = TrigramSimilarity(Upper('customer_name'), upper_term)
+            if digits:
+                match |= Q(customer_phone_digits__contains=digits)
+                rank = Greatest(
+                    rank, Case(When(customer_phone_digits__contains=digits, then=Value(1.0)), default=Value(0.0)),
+                    output_field=FloatField()
+                )
+            return list(
+                Project.objects.alias(customer_name_upper=Upper('customer_name'))
+                .filter(match)
+                .annotate(rank=rank)
+                .order_by('-rank', *CREATED_ORDERING)
+                .values(*columns, 'rank')[:limit]
+            )
+
+        if backend == 'sqlite' and max(len(term), len(digits)) >= MIN_TRIGRAM_LENGTH:
+            ranked = dict(sqlite_ranked_ids(term, digits, limit))
+            rows = {
+                row['id']: row
+                for row in Project.objects.filter(id__in=list(ranked)).values(*columns)
+            }
+            ordered = sorted(rows.values(), key=lambda row: -ranked[row['id'].hex])
+            return [{**row, 'rank': ranked[row['id'].hex]} for row in ordered]
+
+        # Từ khóa quá ngắn cho trigram hoặc không có index: LIKE, mới nhất trước
+        rows = ProjectService._filter_projects(None, None, None, None, term).order_by(*CREATED_ORDERING)
+        return [{**row, 'rank': None} for row in rows.values(*columns)[:limit]]
 
     @staticmethod
     def delete_project(project_id: UUID) -> bool:
@@ -239,22 +730,34 @@ class ProjectService:
         Raises:
             ValueError: Nếu không thể xóa dự án
         """
-        try:
-            project = Project.objects.get(id=project_id)
+        # Một câu UPDATE có điều kiện, chỉ ghi status và updated_at
+        with transaction.atomic():
+            updated = Project.objects.filter(id=project_id).exclude(
+                status__in=['completed', 'cancelled']
+            ).update(status='cancelled', updated_at=timezone.now(), version=F('version') + 1)
+            if updated:
+                record_events('updated', ProjectService._event_rows(project_id), ['status'])
+        if updated:
+            invalidate_counts(Project)
+            return True
 
-            # Validation 1: Không cho xóa dự án đã hoàn thành
-            if project.status == 'completed':
-                raise ValueError("Không thể xóa dự án đã hoàn thành")
+        status = Project.objects.filter(id=project_id).values_list('status', flat=True).first()
+        if status is None:
+            return False
 
-            # Validation 2: Không cho xóa dự án đã bị hủy
-            if project.status == 'cancelled':
-                raise ValueError("Dự án đã bị hủy trước đó")
+        # Validation 1: Không cho xóa dự án đã hoàn thành
+        if status == 'completed':
+            raise ValueError("Không thể xóa dự án đã hoàn thành")
 
-            project.status = 'cancelled'
-            project.save()
-            return True
-        except Project.DoesNotExist:
-            return False
+        # Validation 2: Không cho xóa dự án đã bị hủy
+        raise ValueError("Dự án đã bị hủy trước đó")
+
+    @staticmethod
+    def _event_rows(project_id: UUID) -> list:
+        """Các cột của dự án cần cho sự kiện thay đổi (sau một UPDATE)."""
+        return list(
+            Project.objects.filter(id=project_id).values('id', 'project_code', 'status', 'paid_amount')
+        )
 
     @staticmethod
     def add_milestone(project_id: UUID, milestone: MilestoneSchema) -> Optional[Project]:
@@ -268,15 +771,15 @@ class ProjectService:
         Returns:
             Project object hoặc None
         """
-        try:
-            project = Project.objects.get(id=project_id)
-            if not project.milestones:
-                project.milestones = []
-            project.milestones.append(milestone.model_dump(mode='json'))
-            project.save()
-            return project
-        except Project.DoesNotExist:
+        # Nối vào mảng JSON ngay trong DB: chỉ ghi milestones và updated_at
+        updated = Project.objects.filter(id=project_id).update(
+            milestones=JSONAppend('milestones', milestone.model_dump(mode='json')),
+            updated_at=timezone.now(),
+            version=F('version') + 1,
+        )
+        if not updated:
             return None
+        return ProjectService.get_project(project_id)
 
     @staticmethod
     def update_progress(project_id: UUID, progress: ProgressSchema) -> Optional[Project]:
@@ -289,61 +792,83 @@ class ProjectService:
 
         Returns:
             Project object hoặc None
-        """
-        try:
-            project = Project.objects.get(id=project_id)
-            project.progress = progress.model_dump()
 
-            # Auto update status based on progress
-            if progress.delivered:
-                project.status = 'completed'
-            elif progress.retouch_done or progress.shooting_done:
-                project.status = 'in-progress'
-
-            project.save()
-            return project
-        except Project.DoesNotExist:
-            return None
+        Raises:
+            ValueError: Dự án đã hủy (tiến độ sẽ mở lại dự án mà không kiểm tra trùng lịch)
+        """
+        changes = {
+            'progress': JSONMerge('progress', progress.model_dump()),
+            'updated_at': timezone.now(),
+            'version': F('version') + 1,
+        }
+
+        # Auto update status based on progress
+        if progress.delivered:
+            changes['status'] = 'completed'
+        elif progress.retouch_done or progress.shooting_done:
+            changes['status'] = 'in-progress'
+
+        with transaction.atomic():
+            # Điều kiện nằm trong UPDATE: không có khe giữa kiểm tra và ghi
+            updated = Project.objects.filter(id=project_id).exclude(status='cancelled').update(**changes)
+            if not updated:
+                if Project.objects.filter(id=project_id).exists():
+                    raise ValueError("Dự án đã hủy, không thể cập nhật tiến độ")
+                return None
+            project = ProjectService.get_project(project_id)
+            record_events('progress', [project], ['progress', 'status'] if 'status' in changes else ['progress'])
+        if 'status' in changes:
+            invalidate_counts(Project)
+        return project
 
     @staticmethod
-    def add_payment(project_id: UUID, payment_item: PaymentHistorySchema) -> Optional[Project]:
+    def add_payment(project_id: UUID, payment_item: PaymentHistorySchema, received_by=None) -> Optional[Project]:
         """
         Thêm thanh toán vào dự án.
 
+        Ghi một dòng ProjectPayment và cộng dồn paid_amount bằng một lệnh
+        UPDATE ... SET paid_amount = paid_amount + x trong cùng transaction
+        ngắn: các thanh toán đồng thời không làm mất nhau và chi phí ghi
+        không tăng theo độ dài lịch sử.
+
         Args:
             project_id: ID dự án
             payment_item: Dữ liệu thanh toán
+            received_by: User nhận tiền (mặc định lấy từ payment_item)
 
         Returns:
             Project object hoặc None
         """
-        try:
-            project = Project.objects.get(id=project_id)
-            if not project.payment:
-                project.payment = {
-                    'status': 'unpaid',
-                    'deposit': 0,
-                    'final': 0,
-                    'paid': 0,
-                    'payment_history': []
-                }
-
-            # Add to history
-            project.payment['payment_history'].append(payment_item.model_dump(mode='json'))
-
-            # Update paid amount
-            project.payment['paid'] += payment_item.amount
-
-            # Update status
-            if project.payment['paid'] >= project.package_final_price:
-                project.payment['status'] = 'paid'
-            elif project.payment['paid'] > 0:
-                project.payment['status'] = 'deposit'
-
-            project.save()
-            return project
-        except Project.DoesNotExist:
-            return None
+        amount = Decimal(str(payment_item.amount))
+        with transaction.atomic():
+            # UPDATE trước: khóa dòng dự án, các thanh toán đồng thời xếp hàng tại đây.
+            # Biểu thức bên phải đọc giá trị cũ của dòng.
+            updated = Project.objects.filter(id=project_id).update(
+                paid_amount=F('paid_amount') + amount,
+                balance_due=F('balance_due') - amount,
+                payment_status=Case(
+                    When(paid_amount__gte=F('package_final_price') - amount, then=Value('paid')),
+                    When(paid_amount__gt=-amount, then=Value('deposit')),
+                    default=F('payment_status'),
+                ),
+                updated_at=timezone.now(),
+                version=F('version') + 1,
+            )
+            if not updated:
+                return None
+            # UPDATE không phát post_save: total theo payment_status có thể đã đổi
+            transaction.on_commit(lambda: invalidate_counts(Project))
+            ProjectPayment.objects.create(
+                project_id=project_id,
+                amount=amount,
+                date=payment_item.date,
+                method=payment_item.method,
+                notes=payment_item.notes,
+                received_by=payment_item.received_by or getattr(received_by, 'id', None),
+            )
+            project = ProjectService.get_project(project_id)
+            record_events('payment', [project], PAYMENT_COLUMNS)
+        return project
 
     @staticmethod
     def get_projects_by_status(status: str) -> List[Project]:
@@ -356,7 +881,91 @@ class ProjectService:
         Returns:
             Danh sách dự án
         """
-        return list(Project.objects.filter(status=status).select_related('package_type'))
+        return list(Project.objects.filter(status=status).select_related('package_type').prefetch_related('payments'))
+
+    @staticmethod
+    def get_calendar(from_date: date, to_date: date) -> dict:
+        """
+        Lịch chụp trong khoảng ngày: số dự án mỗi ngày theo trạng thái và
+        danh sách lịch rút gọn (tuple theo CALENDAR_BOOKING_FIELDS).
+        Gồm mọi trạng thái, kể cả đã hủy (client tự ẩn nếu cần).
+
+        Dữ liệu được tính và cache theo tháng; key cache chứa write
+        generation của Project nên mọi lần ghi dự án đều làm cache cũ hết hạn.
+
+        Args:
+            from_date: Từ ngày
+            to_date: Đến ngày
+
+        Returns:
+            Dict {from_date, to_date, fields, days, bookings}
+
+        Raises:
+            ValueError: Khoảng ngày không hợp lệ
+        """
+        if from_date > to_date:
+            raise ValueError("from_date phải trước hoặc bằng to_date")
+        if (to_date - from_date).days >= MAX_CALENDAR_DAYS:
+            raise ValueError(f"Khoảng ngày tối đa {MAX_CALENDAR_DAYS} ngày")
+
+        months = []
+        month = from_date.replace(day=1)
+        while month <= to_date:
+            months.append(month)
+            month = (month + timedelta(days=32)).replace(day=1)
+
+        days, bookings = {}, []
+        for month_data in ProjectService._calendar_months(months):
+            days.update(
+                (day, counts) for day, counts in month_data['days'].items() if from_date <= day <= to_date
+            )
+            # booking[1] = shoot_date (CALENDAR_BOOKING_FIELDS)
+            bookings.extend(booking for booking in month_data['bookings'] if from_date <= booking[1] <= to_date)
+
+        return {
+            'from_date': from_date,
+            'to_date': to_date,
+            'fields': list(CALENDAR_BOOKING_FIELDS),
+            'days': [
+                {'date': day, 'total': sum(counts.values()), 'by_status': counts}
+                for day, counts in sorted(days.items())
+            ],
+            'bookings': bookings,
+        }
+
+    @staticmethod
+    def _calendar_months(months: List[date]) -> List[dict]:
+        """
+        Dữ liệu lịch của từng tháng (ngày đầu tháng), đọc cache một lượt
+        (get_many); tháng chưa có được tính bằng một query `.values_list()`
+        trên khoảng shoot_date (index shoot_date).
+        """
+        cache = caches[settings.LIST_COUNT_CACHE_ALIAS]
+        generation = write_generation(Project)
+        keys = {month: f'project-calendar:{generation}:{month:%Y-%m}' for month in months}
+        cached = cache.get_many(list(keys.values()))
+
+        missing = {}
+        for month in months:
+            if keys[month] in cached:
+                continue
+            last_day = (month + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+            rows = list(
+                Project.objects.filter(shoot_date__range=(month, last_day))
+                .order_by('shoot_date', 'shoot_time', 'project_code')
+                .values_list(*CALENDAR_BOOKING_FIELDS)
+            )
+            per_day = defaultdict(Counter)
+            for _, shoot_date, _, _, _, status in rows:
+                per_day[shoot_date][status] += 1
+            missing[keys[month]] = {
+                'days': {day: dict(counts) for day, counts in per_day.items()},
+                'bookings': rows,
+            }
+        if missing:
+            cache.set_many(missing, settings.PROJECT_CALENDAR_CACHE_TTL)
+        cached.update(missing)
+        return [cached[keys[month]] for month in months]
 
     @staticmethod
     def get_upcoming_projects(days: int = 7) -> List[Project]:
@@ -376,5 +985,5 @@ class ProjectService:
                 shoot_date__lte=end_date,
                 shoot_date__gte=datetime.now().date(),
                 status='pending'
-            ).select_related('package_type').order_by('shoot_date')
+            ).select_related('package_type').prefetch_related('payments').order_by('shoot_date')
         )
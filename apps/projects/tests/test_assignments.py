@@ -0,0 +1,303 @@
+"""
+Tests cho bảng phân công ProjectAssignment và lịch / khối lượng công việc nhân viên.
+"""
+import pytest
+import json
+import uuid
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from apps.employees.models import Employee
+from apps.packages.models import Package
+from apps.projects.assignments import team_members
+from apps.projects.models import Project, ProjectAssignment
+from apps.projects.schemas import ProgressSchema, ProjectCreate, ProjectUpdate
+from apps.projects.services import ProjectService
+from apps.users.models import User
+from apps.users.services import create_jwt_token
+
+
+class AssignmentTestMixin:
+    """Package and staff shared by the assignment tests."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.package = Package.objects.create(
+            name='Wedding', category='wedding', price=Decimal('5000000'), description='Test'
+        )
+        self.photographer = Employee.objects.create(name='Photographer', role='Photo/Retouch')
+        self.assistant = Employee.objects.create(name='Assistant', role='Photo/Retouch')
+        self.makeup = Employee.objects.create(name='Makeup', role='Makeup Artist')
+
+    def _create(self, shoot_date, team=None, **extra):
+        team = team or {
+            'main_photographer': {'employee': str(self.photographer.id), 'salary': 1500000, 'bonus': 200000},
+            'assist_photographers': [{'employee': str(self.assistant.id), 'salary': 500000}],
+            'makeup_artists': [{'employee': str(self.makeup.id), 'salary': 800000}],
+        }
+        return ProjectService.create_project(ProjectCreate(
+            customer_name='Customer', customer_phone='0123456789', customer_email='customer@example.com',
+            package_type=self.package.id, package_name='Wedding', package_price=5000000,
+            shoot_date=shoot_date, team=team, **extra
+        ))
+
+    def _assignments(self, project):
+        return set(
+            ProjectAssignment.objects.filter(project=project).values_list('employee_id', 'role', 'shoot_date')
+        )
+
+
+@pytest.mark.django_db
+class TestAssignmentSync(AssignmentTestMixin, TestCase):
+    """Test suite cho đồng bộ ProjectAssignment với Project.team."""
+
+    def test_create_writes_assignments(self):
+        """Test creating a project writes one row per team member."""
+        project = self._create(date(2025, 6, 1))
+
+        self.assertEqual(self._assignments(project), {
+            (self.photographer.id, 'main_photographer', date(2025, 6, 1)),
+            (self.assistant.id, 'assist_photographer', date(2025, 6, 1)),
+            (self.makeup.id, 'makeup_artist', date(2025, 6, 1)),
+        })
+        main = ProjectAssignment.objects.get(project=project, role='main_photographer')
+        self.assertEqual((main.salary, main.bonus), (Decimal('1500000'), Decimal('200000')))
+
+    def test_team_update_replaces_assignments(self):
+        """Test changing the team rewrites the project's assignments."""
+        project = self._create(date(2025, 6, 1))
+
+        ProjectService.update_project(project.id, ProjectUpdate(team={
+            'main_photographer': {'employee': str(self.assistant.id)},
+        }))
+
+        self.assertEqual(self._assignments(project), {(self.assistant.id, 'main_photographer', date(2025, 6, 1))})
+
+    def test_shoot_date_update_moves_assignments(self):
+        """Test rescheduling a shoot moves every assignment to the new date."""
+        project = self._create(date(2025, 6, 1))
+
+        ProjectService.update_project(project.id, ProjectUpdate(shoot_date=date(2025, 7, 3)))
+
+        self.assertEqual({row[2] for row in self._assignments(project)}, {date(2025, 7, 3)})
+
+    def test_other_updates_do_not_touch_assignments(self):
+        """Test unrelated updates leave the assignment table alone."""
+        project = self._create(date(2025, 6, 1))
+
+        with CaptureQueriesContext(connection) as queries:
+            ProjectService.update_project(project.id, ProjectUpdate(location='Huế'))
+
+        self.assertFalse(any('project_assignments' in q['sql'] for q in queries.captured_queries))
+
+    def test_unknown_employees_are_skipped(self):
+        """Test UUIDs of missing employees and malformed members are ignored."""
+        project = self._create(date(2025, 6, 1), team={
+            'main_photographer': {'employee': str(self.photographer.id)},
+            'assist_photographers': [{'employee': str(uuid.uuid4())}],
+        })
+
+        self.assertEqual(self._assignments(project), {(self.photographer.id, 'main_photographer', date(2025, 6, 1))})
+        self.assertEqual(list(team_members({'makeup_artists': [{'employee': 'not-a-uuid'}, 'x']})), [])
+
+    def test_backfill_command_rebuilds_table(self):
+        """Test the backfill command rebuilds assignments from team JSON."""
+        project = self._create(date(2025, 6, 1))
+        expected = self._assignments(project)
+        ProjectAssignment.objects.all().delete()
+        out = StringIO()
+
+        call_command('backfill_project_assignments', '--batch-size', '1', stdout=out)
+
+        self.assertEqual(self._assignments(project), expected)
+        self.assertIn('Rebuilt 3 assignments for 1 projects', out.getvalue())
+
+
+@pytest.mark.django_db
+class TestEmployeeScheduleEndpoints(AssignmentTestMixin, TestCase):
+    """Test suite cho /employees/{id}/schedule và /employees/{id}/workload."""
+
+    def setUp(self):
+        """Set up test data."""
+        super().setUp()
+        self.client = Client()
+        user = User.objects.create_user(username='admin', password='admin123', role='admin')
+        self.auth = {'HTTP_AUTHORIZATION': f'Bearer {create_jwt_token(user)}'}
+        self.june_first = self._create(date(2025, 6, 1), shoot_time='08:00')
+        self.june_second = self._create(date(2025, 6, 20), team={
+            'main_photographer': {'employee': str(self.photographer.id), 'salary': 1000000},
+        })
+        self.july = self._create(date(2025, 7, 2))
+        cancelled = self._create(date(2025, 6, 5))
+        ProjectService.delete_project(cancelled.id)
+
+    def _get(self, path, **params):
+        return self.client.get(f'/api/employees/{self.photographer.id}/{path}', params, **self.auth)
+
+    def test_schedule_lists_month_shoots(self):
+        """Test the schedule lists the month's shoots in date order, without cancelled ones."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self._get('schedule', from_date='2025-06-01', to_date='2025-06-30')
+
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertEqual(
+            [item['project_code'] for item in data],
+            [self.june_first.project_code, self.june_second.project_code]
+        )
+        self.assertEqual(data[0]['role'], 'main_photographer')
+        self.assertEqual((data[0]['shoot_time'], data[0]['start_time'], data[0]['end_time']), ('08:00', '08:00:00', '12:00:00'))
+        # Auth + employee check + one indexed lookup
+        self.assertLessEqual(len(queries.captured_queries), 3)
+
+    def test_workload_totals(self):
+        """Test workload sums shoots, days and pay for the range."""
+        response = self._get('workload', from_date='2025-06-01', to_date='2025-06-30')
+
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertEqual((data['total_shoots'], data['shoot_days']), (2, 2))
+        self.assertEqual((data['total_salary'], data['total_bonus']), (2500000, 200000))
+        self.assertEqual(data['by_role'], [
+            {'role': 'main_photographer', 'shoots': 2, 'salary': 2500000, 'bonus': 200000},
+        ])
+
+    def test_invalid_range_and_unknown_employee(self):
+        """Test a reversed range is a 400 and a missing employee a 404."""
+        self.assertEqual(self._get('schedule', from_date='2025-06-30', to_date='2025-06-01').status_code, 400)
+        response = self.client.get(f'/api/employees/{uuid.uuid4()}/workload', **self.auth)
+        self.assertEqual(response.status_code, 404)
+
+
+@pytest.mark.django_db
+class TestDoubleBooking(AssignmentTestMixin, TestCase):
+    """Test suite cho kiểm tra trùng lịch khi tạo / cập nhật dự án."""
+
+    def _solo(self, employee):
+        return {'main_photographer': {'employee': str(employee.id)}}
+
+    def test_overlapping_shoot_is_rejected(self):
+        """Test booking a photographer twice in overlapping windows fails."""
+        self._create(date(2025, 6, 1), team=self._solo(self.photographer), shoot_time='08:00 - 12:00')
+
+        with self.assertRaisesMessage(ValueError, 'Photographer đã có lịch chụp'):
+            self._create(date(2025, 6, 1), team=self._solo(self.photographer), shoot_time='11h - 14h')
+
+        self.assertEqual(Project.objects.count(), 1)
+
+    def test_back_to_back_and_other_staff_allowed(self):
+        """Test adjacent windows and other employees do not conflict."""
+        self._create(date(2025, 6, 1), team=self._solo(self.photographer), shoot_time='08:00 - 12:00')
+
+        self._create(date(2025, 6, 1), team=self._solo(self.photographer), shoot_time='12:00 - 16:00')
+        self._create(date(2025, 6, 1), team=self._solo(self.assistant), shoot_time='09:00')
+
+        self.assertEqual(Project.objects.count(), 3)
+
+    def test_unknown_time_blocks_the_whole_day(self):
+        """Test a shoot without a readable time occupies the whole day."""
+        self._create(date(2025, 6, 1), team=self._solo(self.photographer))
+
+        with self.assertRaises(ValueError):
+            self._create(date(2025, 6, 1), team=self._solo(self.photographer), shoot_time='18:00')
+
+    def test_cancelled_projects_free_the_slot(self):
+        """Test a cancelled project no longer blocks, and cannot be reopened over a new booking."""
+        first = self._create(date(2025, 6, 1), team=self._solo(self.photographer), shoot_time='08:00')
+        ProjectService.delete_project(first.id)
+        self._create(date(2025, 6, 1), team=self._solo(self.photographer), shoot_time='09:00')
+
+        with self.assertRaises(ValueError):
+            ProjectService.update_project(first.id, ProjectUpdate(status='pending'))
+        first.refresh_from_db()
+        self.assertEqual(first.status, 'cancelled')
+
+    def test_status_change_of_overlapping_project_allowed(self):
+        """Test completing a project that already overlaps another booking is not blocked."""
+        self._create(date(2025, 6, 1), team=self._solo(self.photographer), shoot_time='08:00 - 12:00')
+        other = self._create(date(2025, 6, 1), team=self._solo(self.photographer), shoot_time='14:00')
+        # Legacy overlap entered before the check existed
+        Project.objects.filter(id=other.id).update(shoot_time='10:00')
+        ProjectAssignment.objects.filter(project=other).update(start_time='10:00', end_time='12:00')
+
+        project = ProjectService.update_project(other.id, ProjectUpdate(status='completed'))
+
+        self.assertEqual(project.status, 'completed')
+        with self.assertRaises(ValueError):
+            ProjectService.update_project(other.id, ProjectUpdate(shoot_time='09:00'))
+
+    def test_progress_cannot_reopen_cancelled_project(self):
+        """Test a progress update does not move a cancelled project back past the conflict check."""
+        first = self._create(date(2025, 6, 1), team=self._solo(self.photographer), shoot_time='08:00')
+        ProjectService.delete_project(first.id)
+        self._create(date(2025, 6, 1), team=self._solo(self.photographer), shoot_time='09:00')
+
+        with self.assertRaisesMessage(ValueError, 'Dự án đã hủy'):
+            ProjectService.update_progress(first.id, ProgressSchema(shooting_done=True))
+
+        first.refresh_from_db()
+        self.assertEqual((first.status, first.progress['shooting_done']), ('cancelled', False))
+
+    def test_reschedule_into_busy_slot_is_rejected(self):
+        """Test moving a shoot onto a busy window rolls the update back."""
+        self._create(date(2025, 6, 1), team=self._solo(self.photographer), shoot_time='08:00')
+        other = self._create(date(2025, 6, 1), team=self._solo(self.photographer), shoot_time='14:00')
+
+        with self.assertRaises(ValueError):
+            ProjectService.update_project(other.id, ProjectUpdate(shoot_time='10:00'))
+
+        other.refresh_from_db()
+        self.assertEqual((other.shoot_time, other.version), ('14:00', 1))
+
+
+@pytest.mark.django_db
+class TestConflictsEndpoint(AssignmentTestMixin, TestCase):
+    """Test suite cho GET /api/projects/conflicts."""
+
+    def setUp(self):
+        """Set up test data."""
+        super().setUp()
+        self.client = Client()
+        user = User.objects.create_user(username='admin', password='admin123', role='admin')
+        self.auth = {'HTTP_AUTHORIZATION': f'Bearer {create_jwt_token(user)}'}
+        solo = {'main_photographer': {'employee': str(self.photographer.id)}}
+        self.morning = self._create(date(2025, 6, 1), team=solo, shoot_time='08:00 - 12:00')
+        self.afternoon = self._create(date(2025, 6, 1), team=solo, shoot_time='13:00 - 17:00')
+        # Legacy rows entered before the check existed
+        self.overlap = self._create(date(2025, 6, 2), team=solo, shoot_time='08:00 - 12:00')
+        self.late = self._create(date(2025, 6, 2), team={
+            'main_photographer': {'employee': str(self.assistant.id)},
+            'assist_photographers': [{'employee': str(self.photographer.id)}],
+        }, shoot_time='20:00')
+        Project.objects.filter(id=self.late.id).update(shoot_time='10:00 - 11:00')
+        ProjectAssignment.objects.filter(project=self.late).update(start_time='10:00', end_time='11:00')
+
+    def test_lists_overlapping_bookings(self):
+        """Test only overlapping bookings are grouped per employee and day, in one query."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                '/api/projects/conflicts', {'from_date': '2025-06-01', 'to_date': '2025-06-30'}, **self.auth
+            )
+
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertEqual(len(data), 1)
+        self.assertEqual((data[0]['employee_name'], data[0]['shoot_date']), ('Photographer', '2025-06-02'))
+        self.assertEqual(
+            [(b['project_code'], b['role']) for b in data[0]['bookings']],
+            [(self.overlap.project_code, 'main_photographer'), (self.late.project_code, 'assist_photographer')]
+        )
+        # Auth + the conflict query
+        self.assertLessEqual(len(queries.captured_queries), 2)
+
+    def test_invalid_range_rejected(self):
+        """Test a reversed date range is a 400."""
+        response = self.client.get(
+            '/api/projects/conflicts', {'from_date': '2025-06-30', 'to_date': '2025-06-01'}, **self.auth
+        )
+
+        self.assertEqual(response.status_code, 400)
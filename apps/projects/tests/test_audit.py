@@ -0,0 +1,147 @@
+"""
+Tests cho nhật ký thay đổi dự án (ProjectAuditLog) và /projects/{id}/history.
+"""
+import pytest
+import json
+import uuid
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+from django.db import IntegrityError, connection
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from apps.packages.models import Package
+from apps.projects.audit import audit_buffer
+from apps.projects.models import Project, ProjectAuditLog
+from apps.projects.schemas import ProjectUpdate
+from apps.projects.services import ProjectService
+from apps.users.models import User
+from apps.users.services import create_jwt_token
+
+
+@pytest.mark.django_db
+class TestProjectAuditLog(TestCase):
+    """Test suite cho audit log ghi từ ProjectService.update_project."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.client = Client()
+        self.user = User.objects.create_user(username='admin', password='admin123', role='admin')
+        self.auth = {'HTTP_AUTHORIZATION': f'Bearer {create_jwt_token(self.user)}'}
+        package = Package.objects.create(
+            name='Wedding', category='wedding', price=Decimal('5000000'), description='Test'
+        )
+        self.project = Project.objects.create(
+            customer_name='Customer', customer_phone='0123456789', customer_email='customer@example.com',
+            package_type=package, package_name='Wedding', package_price=Decimal('5000000'),
+            package_discount=Decimal('0'), package_final_price=Decimal('5000000'),
+            shoot_date=date(2025, 6, 1), location='Hà Nội',
+        )
+
+    def tearDown(self):
+        """Write buffered entries while their project still exists."""
+        audit_buffer.flush()
+
+    def _update(self, **fields):
+        with self.captureOnCommitCallbacks(execute=True):
+            return ProjectService.update_project(self.project.id, ProjectUpdate(**fields), updated_by=self.user)
+
+    def test_records_field_diff(self):
+        """Test the entry holds old/new values of the changed fields only."""
+        self._update(location='Huế', package_discount=1000000)
+
+        self.assertEqual(audit_buffer.flush(), 1)
+        entry = ProjectAuditLog.objects.get(project=self.project)
+        self.assertEqual(entry.changes['location'], {'old': 'Hà Nội', 'new': 'Huế'})
+        self.assertEqual(entry.changes['package_final_price'], {'old': '5000000', 'new': '4000000'})
+        self.assertIn('balance_due', entry.changes)
+        self.assertNotIn('version', entry.changes)
+        self.assertNotIn('updated_at', entry.changes)
+        self.assertEqual((entry.version, entry.changed_by_id), (2, self.user.id))
+
+    def test_unchanged_update_writes_nothing(self):
+        """Test an update that changes no value records no entry."""
+        with self.captureOnCommitCallbacks() as callbacks:
+            ProjectService.update_project(self.project.id, ProjectUpdate(location='Hà Nội'))
+
+        self.assertEqual(callbacks, [])
+
+    def test_entry_is_buffered_after_commit(self):
+        """Test nothing is buffered until the transaction commits, and nothing inserted on the request."""
+        with self.captureOnCommitCallbacks() as callbacks:
+            ProjectService.update_project(self.project.id, ProjectUpdate(location='Huế'))
+            self.assertEqual(audit_buffer.pending(), 0)
+
+        self.assertTrue(callbacks)
+        with CaptureQueriesContext(connection) as queries:
+            for callback in callbacks:
+                callback()
+        self.assertEqual(audit_buffer.pending(), 1)
+        self.assertEqual(queries.captured_queries, [])
+        self.assertFalse(ProjectAuditLog.objects.exists())
+
+    @override_settings(PROJECT_AUDIT_FLUSH_SIZE=3)
+    def test_full_buffer_flushes_in_one_insert(self):
+        """Test the buffer is written with a single INSERT once it is full."""
+        with CaptureQueriesContext(connection) as queries:
+            for location in ('Huế', 'Đà Lạt', 'Sa Pa'):
+                self._update(location=location)
+
+        inserts = [q for q in queries.captured_queries if q['sql'].startswith('INSERT INTO "project_audit_logs"')]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(audit_buffer.pending(), 0)
+        self.assertEqual(ProjectAuditLog.objects.filter(project=self.project).count(), 3)
+
+    @override_settings(PROJECT_AUDIT_FLUSH_INTERVAL=5)
+    def test_interval_schedules_one_timer(self):
+        """Test the first pending entry starts a flush timer and flushing cancels it."""
+        with mock.patch('apps.projects.audit.threading.Timer') as timer:
+            self._update(location='Huế')
+            self._update(location='Đà Lạt')
+            audit_buffer.flush()
+
+        timer.assert_called_once()
+        self.assertEqual(timer.call_args.args[0], 5)
+        timer.return_value.cancel.assert_called_once()
+
+    def test_orphaned_entry_does_not_drop_batch(self):
+        """Test entries of a project deleted before the flush are skipped."""
+        self._update(location='Huế')
+        audit_buffer.add(ProjectAuditLog(project_id=uuid.uuid4(), changes={}, version=1))
+
+        real = ProjectAuditLog.objects.bulk_create
+        calls = []
+
+        def failing_once(entries):
+            calls.append(len(entries))
+            if len(calls) == 1:
+                raise IntegrityError('FOREIGN KEY constraint failed')
+            return real(entries)
+
+        with mock.patch.object(ProjectAuditLog.objects, 'bulk_create', failing_once):
+            self.assertEqual(audit_buffer.flush(), 1)
+
+        self.assertEqual(calls, [2, 1])
+        self.assertEqual(ProjectAuditLog.objects.get().changes['location']['new'], 'Huế')
+
+    def test_history_endpoint_paginates_newest_first(self):
+        """Test GET /projects/{id}/history pages entries by (created_at, id) descending."""
+        for location in ('Huế', 'Đà Lạt', 'Sa Pa'):
+            self._update(location=location)
+        url = f'/api/projects/{self.project.id}/history'
+
+        first = json.loads(self.client.get(url, {'limit': 2}, **self.auth).content)
+        second = json.loads(self.client.get(url, {'limit': 2, 'cursor': first['next_cursor']}, **self.auth).content)
+
+        self.assertEqual(first['total'], 3)
+        self.assertEqual([item['version'] for item in first['items']], [4, 3])
+        self.assertEqual([item['version'] for item in second['items']], [2])
+        self.assertIsNone(second['next_cursor'])
+        self.assertEqual(second['items'][0]['changes']['location'], {'old': 'Hà Nội', 'new': 'Huế'})
+        self.assertEqual(second['items'][0]['changed_by_id'], str(self.user.id))
+
+    def test_history_of_missing_project(self):
+        """Test the history of an unknown project is a 404."""
+        response = self.client.get(f'/api/projects/{uuid.uuid4()}/history', **self.auth)
+
+        self.assertEqual(response.status_code, 404)
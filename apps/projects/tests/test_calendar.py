@@ -0,0 +1,117 @@
+"""
+Tests cho lịch chụp theo ngày (/projects/calendar) và cache theo tháng.
+"""
+import pytest
+import json
+from datetime import date
+from decimal import Decimal
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from apps.packages.models import Package
+from apps.projects.models import Project
+from apps.projects.schemas import ProgressSchema
+from apps.projects.services import ProjectService
+from apps.users.models import User
+from apps.users.services import create_jwt_token
+
+LOCMEM_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'project-calendar'},
+    'auth': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'auth-tests'},
+}
+
+
+@pytest.mark.django_db
+@override_settings(CACHES=LOCMEM_CACHES)
+class TestProjectCalendar(TestCase):
+    """Test suite cho ProjectService.get_calendar và GET /api/projects/calendar."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.client = Client()
+        user = User.objects.create_user(username='admin', password='admin123', role='admin')
+        self.auth = {'HTTP_AUTHORIZATION': f'Bearer {create_jwt_token(user)}'}
+        self.package = Package.objects.create(
+            name='Wedding', category='wedding', price=Decimal('5000000'), description='Test'
+        )
+        self.first = self._create('Alice', date(2025, 6, 1), shoot_time='14:00')
+        self.second = self._create('Bob', date(2025, 6, 1), status='completed', shoot_time='08:00')
+        self._create('Carol', date(2025, 6, 15), status='cancelled')
+        self._create('Dave', date(2025, 7, 2), status='in-progress')
+
+    def tearDown(self):
+        """Drop cached calendars between tests."""
+        cache.clear()
+
+    def _create(self, name, shoot_date, status='pending', shoot_time=None):
+        return Project.objects.create(
+            customer_name=name, customer_phone='0123456789', customer_email='customer@example.com',
+            package_type=self.package, package_name='Wedding', package_price=Decimal('5000000'),
+            package_discount=Decimal('0'), package_final_price=Decimal('5000000'),
+            shoot_date=shoot_date, shoot_time=shoot_time, status=status,
+        )
+
+    def _project_queries(self, action):
+        with CaptureQueriesContext(connection) as queries:
+            result = action()
+        return result, [q for q in queries.captured_queries if 'FROM "projects"' in q['sql']]
+
+    def test_counts_every_status_per_day(self):
+        """Test per-day counts cover every status and bookings are in time order."""
+        calendar = ProjectService.get_calendar(date(2025, 6, 1), date(2025, 6, 30))
+
+        self.assertEqual(
+            [(day['date'], day['total'], day['by_status']) for day in calendar['days']],
+            [
+                (date(2025, 6, 1), 2, {'completed': 1, 'pending': 1}),
+                (date(2025, 6, 15), 1, {'cancelled': 1}),
+            ]
+        )
+        self.assertEqual(
+            [booking[4] for booking in calendar['bookings']], ['Bob', 'Alice', 'Carol']
+        )
+
+    def test_range_spans_months(self):
+        """Test a range across months is trimmed to the requested days."""
+        calendar = ProjectService.get_calendar(date(2025, 6, 10), date(2025, 7, 31))
+
+        self.assertEqual([booking[4] for booking in calendar['bookings']], ['Carol', 'Dave'])
+
+    def test_month_is_cached_until_a_write(self):
+        """Test a cached month is served without queries and refreshed after writes."""
+        june = (date(2025, 6, 1), date(2025, 6, 30))
+        _, queries = self._project_queries(lambda: ProjectService.get_calendar(*june))
+        self.assertEqual(len(queries), 1)
+
+        _, queries = self._project_queries(lambda: ProjectService.get_calendar(*june))
+        self.assertEqual(queries, [])
+
+        # Queryset update path (no post_save) must invalidate as well
+        ProjectService.update_progress(
+            self.first.id, ProgressSchema(shooting_done=True, retouch_done=False, delivered=False)
+        )
+        calendar, queries = self._project_queries(lambda: ProjectService.get_calendar(*june))
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(calendar['days'][0]['by_status'], {'completed': 1, 'in-progress': 1})
+
+    def test_endpoint_returns_compact_tuples(self):
+        """Test the endpoint returns field names and one array per booking."""
+        response = self.client.get(
+            '/api/projects/calendar', {'from_date': '2025-06-01', 'to_date': '2025-06-01'}, **self.auth
+        )
+
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertEqual(data['fields'], ['id', 'shoot_date', 'shoot_time', 'project_code', 'customer_name', 'status'])
+        self.assertEqual(data['bookings'][0], [
+            str(self.second.id), '2025-06-01', '08:00', self.second.project_code, 'Bob', 'completed'
+        ])
+
+    def test_invalid_range_rejected(self):
+        """Test a reversed date range is a 400."""
+        response = self.client.get(
+            '/api/projects/calendar', {'from_date': '2025-06-30', 'to_date': '2025-06-01'}, **self.auth
+        )
+
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,88 @@
+"""
+Tests cho ghi theo cột: các thao tác con chỉ UPDATE đúng cột chúng đổi.
+"""
+import pytest
+import re
+from datetime import date
+from decimal import Decimal
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from apps.packages.models import Package
+from apps.projects.models import Project
+from apps.projects.schemas import MilestoneSchema, ProgressSchema, ProjectUpdate
+from apps.projects.services import ProjectService
+
+
+@pytest.mark.django_db
+class TestColumnTargetedWrites(TestCase):
+    """Test suite cho các câu UPDATE của dự án."""
+
+    def setUp(self):
+        """Set up test data."""
+        package = Package.objects.create(
+            name='Wedding', category='wedding', price=Decimal('5000000'), description='Test'
+        )
+        self.project = Project.objects.create(
+            customer_name='Customer', customer_phone='0123456789', customer_email='customer@example.com',
+            package_type=package, package_name='Wedding', package_price=Decimal('5000000'),
+            package_discount=Decimal('0'), package_final_price=Decimal('5000000'),
+            shoot_date=date.today(), milestones=[{'name': 'Booked', 'stage': 'custom'}],
+        )
+
+    def _updated_columns(self, action):
+        """Run `action` and return the columns SET by each UPDATE on projects."""
+        with CaptureQueriesContext(connection) as queries:
+            result = action()
+        updates = [q['sql'] for q in queries.captured_queries if q['sql'].startswith('UPDATE "projects"')]
+        columns = [
+            set(re.findall(r'"(\w+)" = ', sql.split(' SET ', 1)[1].split(' WHERE ', 1)[0]))
+            for sql in updates
+        ]
+        return result, columns
+
+    def test_milestone_append_touches_milestones_only(self):
+        """Test add_milestone writes only milestones, updated_at and version."""
+        milestone = MilestoneSchema(name='Shoot', stage='shooting', due_date=date(2025, 5, 1))
+
+        project, columns = self._updated_columns(
+            lambda: ProjectService.add_milestone(self.project.id, milestone)
+        )
+
+        self.assertEqual(columns, [{'milestones', 'updated_at', 'version'}])
+        self.assertEqual([m['name'] for m in project.milestones], ['Booked', 'Shoot'])
+
+    def test_progress_merges_keys(self):
+        """Test update_progress writes progress, status, updated_at and version only."""
+        progress = ProgressSchema(shooting_done=True, retouch_done=False, delivered=False)
+
+        project, columns = self._updated_columns(
+            lambda: ProjectService.update_progress(self.project.id, progress)
+        )
+
+        self.assertEqual(columns, [{'progress', 'status', 'updated_at', 'version'}])
+        self.assertEqual(project.status, 'in-progress')
+        self.assertTrue(project.progress['shooting_done'])
+
+    def test_delete_is_one_conditional_update(self):
+        """Test delete_project only sets status, updated_at and version."""
+        deleted, columns = self._updated_columns(lambda: ProjectService.delete_project(self.project.id))
+
+        self.assertTrue(deleted)
+        self.assertEqual(columns, [{'status', 'updated_at', 'version'}])
+
+    def test_update_project_writes_changed_columns(self):
+        """Test update_project does not rewrite untouched JSON columns."""
+        _, columns = self._updated_columns(
+            lambda: ProjectService.update_project(self.project.id, ProjectUpdate(customer_phone='0901 234 567'))
+        )
+
+        self.assertEqual(columns, [{'customer_phone', 'customer_phone_digits', 'updated_at', 'version'}])
+
+    def test_price_update_recomputes_final_price(self):
+        """Test a discount change writes the derived price columns."""
+        project = ProjectService.update_project(self.project.id, ProjectUpdate(package_discount=1000000))
+        project.refresh_from_db()
+
+        self.assertEqual((project.package_final_price, project.balance_due), (Decimal('4000000'), Decimal('4000000')))
+        self.assertEqual(project.milestones, [{'name': 'Booked', 'stage': 'custom'}])
@@ -0,0 +1,123 @@
+"""
+Tests cho count strategy (exact / cached / estimate) của list endpoint.
+"""
+import pytest
+import json
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+from django.db import connection
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from apps.packages.models import Package
+from apps.projects.models import Project
+from apps.users.models import User
+from apps.users.services import create_jwt_token
+
+LOCMEM_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'list-counts'},
+    'auth': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'auth-tests'},
+}
+
+
+@pytest.mark.django_db
+@override_settings(CACHES=LOCMEM_CACHES)
+class TestCountStrategies(TestCase):
+    """Test suite cho count strategies."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.client = Client()
+        self.user = User.objects.create_user(username='admin', password='admin123', role='admin')
+        self.auth = {'HTTP_AUTHORIZATION': f'Bearer {create_jwt_token(self.user)}'}
+        self.package = Package.objects.create(
+            name='Wedding', category='wedding', price=Decimal('5000000'), description='Test'
+        )
+        for i in range(3):
+            self._create_project(f'Customer {i}')
+
+    def tearDown(self):
+        """Drop cached counts between tests."""
+        from django.core.cache import cache
+        cache.clear()
+
+    def _create_project(self, name, status='pending'):
+        return Project.objects.create(
+            customer_name=name, customer_phone='0123456789', customer_email='customer@example.com',
+            package_type=self.package, package_name='Wedding', package_price=Decimal('5000000'),
+            package_discount=Decimal('0'), package_final_price=Decimal('5000000'),
+            shoot_date=date.today(), status=status,
+        )
+
+    def _get(self, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/projects/', {'limit': 2, **params}, **self.auth)
+        counts = [q for q in queries.captured_queries if 'COUNT(' in q['sql'].upper()]
+        return response.status_code, json.loads(response.content), len(counts)
+
+    def test_exact_is_default(self):
+        """Test the default strategy counts exactly and says so."""
+        status, data, count_queries = self._get()
+
+        self.assertEqual(status, 200)
+        self.assertEqual((data['total'], data['count_strategy']), (3, 'exact'))
+        self.assertEqual(count_queries, 1)
+
+    def test_complete_first_page_skips_count(self):
+        """Test a first page holding every row needs no COUNT query."""
+        status, data, count_queries = self._get(limit=10, count='cached')
+
+        self.assertEqual((data['total'], data['count_strategy']), (3, 'exact'))
+        self.assertEqual(count_queries, 0)
+
+    def test_cached_count_hit(self):
+        """Test the second identical request reads the total from the cache."""
+        _, first, first_counts = self._get(count='cached')
+        _, second, second_counts = self._get(count='cached')
+
+        self.assertEqual((first['count_strategy'], first_counts), ('exact', 1))
+        self.assertEqual((second['total'], second['count_strategy'], second_counts), (3, 'cached', 0))
+
+    def test_cached_count_is_per_filter(self):
+        """Test different filters do not share a cached total."""
+        self._create_project('Other', status='completed')
+        self._get(count='cached')
+
+        _, data, count_queries = self._get(count='cached', status='completed')
+
+        self.assertEqual((data['total'], data['count_strategy'], count_queries), (1, 'exact', 0))
+
+    def test_cached_count_invalidated_on_write(self):
+        """Test saving a project makes the cached total stale."""
+        self._get(count='cached')
+
+        self._create_project('New customer')
+        _, data, count_queries = self._get(count='cached')
+
+        self.assertEqual((data['total'], data['count_strategy'], count_queries), (4, 'exact', 1))
+
+    def test_estimate_falls_back_to_exact(self):
+        """Test databases without a planner estimate count exactly."""
+        _, data, count_queries = self._get(count='estimate')
+
+        self.assertEqual((data['total'], data['count_strategy'], count_queries), (3, 'exact', 1))
+
+    def test_estimate_used_for_large_results(self):
+        """Test a large planner estimate is returned without counting."""
+        with mock.patch('api.counting._planner_estimate', return_value=250000):
+            _, data, count_queries = self._get(count='estimate')
+
+        self.assertEqual((data['total'], data['count_strategy'], count_queries), (250000, 'estimate', 0))
+
+    def test_small_estimate_counts_exactly(self):
+        """Test estimates below the threshold are replaced by an exact count."""
+        with mock.patch('api.counting._planner_estimate', return_value=40):
+            _, data, _ = self._get(count='estimate')
+
+        self.assertEqual((data['total'], data['count_strategy']), (3, 'exact'))
+
+    def test_unknown_strategy_returns_400(self):
+        """Test an unknown count strategy is rejected."""
+        status, _, _ = self._get(count='guess')
+
+        self.assertEqual(status, 400)
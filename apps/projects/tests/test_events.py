@@ -0,0 +1,278 @@
+"""
+Tests cho luồng sự kiện thay đổi dự án (/projects/events, SSE).
+"""
+import pytest
+import json
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+from asgiref.sync import async_to_sync
+from django.core.management import call_command
+from django.test import TestCase, Client, override_settings
+from django.utils import timezone
+from apps.employees.models import Employee
+from apps.packages.models import Package
+from apps.projects import events
+from apps.projects.audit import audit_buffer
+from apps.projects.models import ProjectEvent
+from apps.projects.schemas import PaymentHistorySchema, ProgressSchema, ProjectCreate, ProjectUpdate
+from apps.projects.services import ProjectService
+from apps.users.models import User
+from apps.users.services import create_jwt_token
+
+# Stream settings small enough for a test to read a whole stream
+FAST_STREAM = {'PROJECT_EVENTS_HEARTBEAT': 0.01, 'PROJECT_EVENTS_STREAM_TIMEOUT': 0.05}
+
+
+def _messages(frames):
+    """Decode the `data:` lines of SSE frames, keeping reset events as 'reset'."""
+    messages = []
+    for frame in frames:
+        if frame.startswith('id:') and 'event: reset' in frame:
+            messages.append('reset')
+        elif frame.startswith('id:'):
+            messages.append(json.loads(frame.split('data: ', 1)[1]))
+    return messages
+
+
+@pytest.mark.django_db
+@override_settings(**FAST_STREAM)
+class TestProjectEvents(TestCase):
+    """Test suite cho apps.projects.events."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.package = Package.objects.create(
+            name='Wedding', category='wedding', price=Decimal('5000000'), description='Test'
+        )
+        self.photographer = Employee.objects.create(name='Photographer', role='Photo/Retouch')
+        self.project = self._create(date(2025, 6, 1))
+
+    def tearDown(self):
+        """Write buffered audit entries while their project still exists."""
+        audit_buffer.flush()
+
+    def _create(self, shoot_date):
+        return ProjectService.create_project(ProjectCreate(
+            customer_name='Customer', customer_phone='0123456789', customer_email='customer@example.com',
+            package_type=self.package.id, package_name='Wedding', package_price=5000000, shoot_date=shoot_date,
+            team={'main_photographer': {'employee': str(self.photographer.id)}},
+        ))
+
+    def _events(self):
+        return list(ProjectEvent.objects.values_list('kind', 'fields', 'status', 'paid_amount'))
+
+    def test_every_write_records_an_event(self):
+        """Test create, update, progress, payment and cancel each record one event."""
+        ProjectService.update_project(self.project.id, ProjectUpdate(location='Huế'))
+        ProjectService.update_progress(self.project.id, ProgressSchema(shooting_done=True))
+        ProjectService.add_payment(self.project.id, PaymentHistorySchema(amount=1000000, date=date(2025, 5, 1)))
+        ProjectService.delete_project(self.project.id)
+
+        self.assertEqual(self._events(), [
+            ('created', [], 'pending', Decimal('0')),
+            ('updated', ['location'], 'pending', Decimal('0')),
+            ('progress', ['progress', 'status'], 'in-progress', Decimal('0')),
+            ('payment', ['balance_due', 'paid_amount', 'payment_status'], 'in-progress', Decimal('1000000')),
+            ('updated', ['status'], 'cancelled', Decimal('1000000')),
+        ])
+        message = ProjectEvent.objects.last().as_message()
+        self.assertEqual(message['project_code'], self.project.project_code)
+        self.assertEqual(message['paid_amount'], 1000000.0)
+
+    def test_unchanged_update_records_nothing(self):
+        """Test an update that changes no value sends no event."""
+        ProjectService.update_project(self.project.id, ProjectUpdate(customer_name='Customer'))
+
+        self.assertEqual(ProjectEvent.objects.count(), 1)
+
+    def test_broker_publishes_after_commit(self):
+        """Test subscribers only see an event once its transaction commits."""
+        subscription = events.Subscription()
+        events.broker.subscribe(subscription)
+        try:
+            with self.captureOnCommitCallbacks() as callbacks:
+                ProjectService.update_project(self.project.id, ProjectUpdate(location='Huế'))
+                self.assertEqual(subscription.get(0), [])
+            for callback in callbacks:
+                callback()
+
+            messages = subscription.get(0)
+        finally:
+            events.broker.unsubscribe(subscription)
+
+        self.assertEqual([m['type'] for m in messages], ['updated'])
+        self.assertEqual(messages[0]['fields'], ['location'])
+
+    def test_stream_replays_after_last_event_id(self):
+        """Test a resumed stream sends every event after Last-Event-ID, then keepalives."""
+        first = ProjectEvent.objects.get()
+        ProjectService.update_project(self.project.id, ProjectUpdate(location='Huế'))
+        ProjectService.update_project(self.project.id, ProjectUpdate(location='Đà Lạt'))
+
+        frames = list(events.stream(first.id))
+
+        self.assertEqual(frames[0], f'retry: {events.RETRY_MS}\n\n')
+        self.assertEqual([m['type'] for m in _messages(frames)], ['updated', 'updated'])
+        self.assertIn(': keepalive\n\n', frames)
+        ids = [m['id'] for m in _messages(frames)]
+        self.assertEqual(ids, sorted(ids))
+        self.assertGreater(ids[0], first.id)
+
+    def test_stream_without_last_event_id_starts_at_now(self):
+        """Test a fresh stream does not replay history."""
+        ProjectService.update_project(self.project.id, ProjectUpdate(location='Huế'))
+
+        self.assertEqual(_messages(events.stream()), [])
+
+    def test_stream_delivers_live_events(self):
+        """Test events published while streaming are sent once each."""
+        frames = events.stream(heartbeat=0.01, timeout=1)
+        next(frames)  # retry, subscribes
+        next(frames)  # first keepalive: start position read
+        with self.captureOnCommitCallbacks(execute=True):
+            ProjectService.update_project(self.project.id, ProjectUpdate(location='Huế'))
+        live = next(frames)
+        frames.close()
+
+        self.assertEqual(_messages([live])[0]['fields'], ['location'])
+
+    def test_lagged_stream_catches_up_from_table(self):
+        """Test a stream that missed broker messages reads them from the table."""
+        frames = events.stream(heartbeat=0.01, timeout=1)
+        next(frames)
+        next(frames)
+        # Written without reaching the broker (on_commit callbacks not run)
+        ProjectService.update_project(self.project.id, ProjectUpdate(location='Huế'))
+        events.broker.resync()
+        caught_up = next(frames)
+        frames.close()
+
+        self.assertEqual(_messages([caught_up])[0]['fields'], ['location'])
+
+    def test_lagged_stream_replays_out_of_order_commit(self):
+        """Test an event whose lower id commits after a higher one was sent is still caught up."""
+        frames = events.stream(heartbeat=0.01, timeout=1)
+        next(frames)
+        next(frames)
+        # Ids are allocated at INSERT: `late` commits after `early` was sent
+        late = ProjectEvent.objects.create(kind='updated', project_id=self.project.id, status='pending')
+        early = ProjectEvent.objects.create(kind='updated', project_id=self.project.id, status='completed')
+        events.broker.publish([early.as_message()])
+        sent_early = next(frames)
+        events.broker.resync()
+        caught_up = next(frames)
+        frames.close()
+
+        self.assertEqual(_messages([sent_early])[0]['id'], early.id)
+        # Resuming from this frame would still replay `late`
+        self.assertTrue(sent_early.startswith(f'id: {late.id - 1}\n'))
+        self.assertEqual(_messages([caught_up])[0]['id'], late.id)
+        self.assertTrue(caught_up.startswith(f'id: {early.id}\n'))
+
+    def test_low_water_gives_up_on_missing_id(self):
+        """Test an id missing longer than REORDER_WINDOW_SECONDS no longer holds the mark back."""
+        low_water = events._LowWater(5)
+
+        self.assertEqual(low_water.add(7), 5)
+        with mock.patch.object(events, 'REORDER_WINDOW_SECONDS', 0):
+            self.assertEqual(low_water.mark(), 7)
+
+    def test_resume_from_id_that_never_committed(self):
+        """Test a Last-Event-ID of a rolled-back id (a low-water mark) resumes instead of resetting."""
+        ProjectService.update_project(self.project.id, ProjectUpdate(location='Huế'))
+        ProjectService.update_project(self.project.id, ProjectUpdate(location='Đà Lạt'))
+        rolled_back, last = ProjectEvent.objects.order_by('id').values_list('id', flat=True)[1:]
+        ProjectEvent.objects.filter(id=rolled_back).delete()
+
+        messages = _messages(events.stream(rolled_back))
+
+        self.assertEqual([m['id'] for m in messages], [last])
+
+    def test_pruned_last_event_id_sends_reset(self):
+        """Test resuming from an event that no longer exists asks the client to reload."""
+        old = ProjectEvent.objects.get()
+        ProjectEvent.objects.filter(id=old.id).update(created_at=timezone.now() - timedelta(days=30))
+        out = StringIO()
+        call_command('prune_project_events', '--days', '7', stdout=out)
+
+        messages = _messages(events.stream(old.id))
+
+        self.assertIn('Deleted 1 project events', out.getvalue())
+        self.assertEqual(messages, ['reset'])
+
+    def test_async_stream_replays(self):
+        """Test the ASGI stream replays like the sync one."""
+        first = ProjectEvent.objects.get()
+        ProjectService.update_project(self.project.id, ProjectUpdate(location='Huế'))
+
+        async def read():
+            return [frame async for frame in events.astream(first.id)]
+
+        frames = async_to_sync(read)()
+
+        self.assertEqual([m['fields'] for m in _messages(frames)], [['location']])
+
+
+@pytest.mark.django_db
+@override_settings(**FAST_STREAM)
+class TestProjectEventsEndpoint(TestCase):
+    """Test suite cho GET /api/projects/events."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.client = Client()
+        self.user = User.objects.create_user(username='admin', password='admin123', role='admin')
+        self.auth = {'HTTP_AUTHORIZATION': f'Bearer {create_jwt_token(self.user)}'}
+
+    def test_streams_events_after_last_event_id(self):
+        """Test the endpoint is an event stream honouring the Last-Event-ID header."""
+        first = ProjectEvent.objects.create(kind='created', project_id='00000000-0000-0000-0000-000000000001', status='pending')
+        ProjectEvent.objects.create(kind='updated', project_id=first.project_id, status='completed', fields=['status'])
+
+        response = self.client.get('/api/projects/events', HTTP_LAST_EVENT_ID=str(first.id), **self.auth)
+        frames = [chunk.decode() for chunk in response.streaming_content]
+
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertEqual(response['Cache-Control'], 'no-cache')
+        self.assertEqual([m['status'] for m in _messages(frames)], ['completed'])
+
+    def test_invalid_last_event_id(self):
+        """Test a non-numeric Last-Event-ID is rejected."""
+        response = self.client.get('/api/projects/events', HTTP_LAST_EVENT_ID='abc', **self.auth)
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_requires_auth(self):
+        """Test the stream is not public."""
+        self.assertEqual(self.client.get('/api/projects/events').status_code, 401)
+
+    @override_settings(PROJECT_EVENTS_ALLOW_WSGI=False)
+    def test_refused_under_wsgi(self):
+        """Test a WSGI worker does not hold a thread for the stream unless allowed."""
+        response = self.client.get('/api/projects/events', **self.auth)
+
+        self.assertEqual(response.status_code, 503)
+
+    def test_event_source_token(self):
+        """Test EventSource clients connect with a short-lived ?token= instead of the Bearer header."""
+        response = self.client.post('/api/projects/events/token', **self.auth)
+        token = json.loads(response.content)['token']
+
+        stream = self.client.get('/api/projects/events', {'token': token})
+
+        self.assertEqual(json.loads(response.content)['expires_in'], 60)
+        self.assertEqual(stream.status_code, 200)
+        self.assertEqual(stream['Content-Type'], 'text/event-stream')
+        stream.close()
+
+    def test_stream_token_is_not_an_access_token(self):
+        """Test the stream token is refused as Bearer and an access token is refused as ?token=."""
+        response = self.client.post('/api/projects/events/token', **self.auth)
+        stream_token = json.loads(response.content)['token']
+
+        as_bearer = self.client.get('/api/projects/', HTTP_AUTHORIZATION=f'Bearer {stream_token}')
+        in_query = self.client.get('/api/projects/events', {'token': create_jwt_token(self.user)})
+
+        self.assertEqual((as_bearer.status_code, in_query.status_code), (401, 401))
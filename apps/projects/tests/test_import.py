@@ -0,0 +1,208 @@
+"""
+Tests cho import dự án hàng loạt từ CSV/JSONL.
+"""
+import pytest
+import itertools
+import json
+import os
+import tempfile
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from apps.employees.models import Employee
+from apps.packages.models import Package
+from apps.projects import importing
+from apps.projects.importing import import_from_lines
+from apps.projects.models import Project, ProjectAssignment, ProjectPayment
+from apps.users.models import User
+from apps.users.services import create_jwt_token
+
+
+class ImportTestMixin:
+    """Packages and photographers shared by the import tests."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.package = Package.objects.create(
+            name='Wedding', category='wedding', price=Decimal('5000000'), description='Test'
+        )
+        self.photographer = Employee.objects.create(name='Photographer', role='Photo/Retouch')
+        self.retired = Employee.objects.create(name='Retired', role='Photo/Retouch', is_active=False)
+        self.days = itertools.count()
+
+    def _csv(self, rows):
+        header = 'customer_name,customer_phone,customer_email,package_type,package_name,package_price,shoot_date,main_photographer\n'
+        return header + ''.join(f'{row}\n' for row in rows)
+
+    def _row(self, name, photographer=None, package=None, email='customer@example.com', shoot_date=None):
+        photographer = photographer or self.photographer
+        package = package or self.package
+        # A new day per row so the photographer is never double-booked
+        shoot_date = shoot_date or date(2025, 1, 1) + timedelta(days=next(self.days))
+        return f'{name},0901234567,{email},{package.id},Wedding,5000000,{shoot_date},{photographer.id}'
+
+
+@pytest.mark.django_db
+class TestProjectImport(ImportTestMixin, TestCase):
+    """Test suite cho apps.projects.importing."""
+
+    def test_csv_creates_valid_rows_and_reports_errors(self):
+        """Test valid rows are created and invalid rows are reported by line."""
+        text = self._csv([
+            self._row('Alice'),
+            self._row('Bob', email='not-an-email'),
+            self._row('Carol', photographer=self.retired),
+            self._row('Dave'),
+        ])
+
+        result = import_from_lines(StringIO(text), 'csv').as_dict()
+
+        self.assertEqual((result['created'], result['failed']), (2, 2))
+        self.assertEqual([error['row'] for error in result['errors']], [3, 4])
+        self.assertIn('customer_email', result['errors'][0]['error'])
+        self.assertIn('đã nghỉ việc', result['errors'][1]['error'])
+        self.assertEqual(
+            set(Project.objects.values_list('customer_name', flat=True)), {'Alice', 'Dave'}
+        )
+
+    def test_jsonl_with_nested_payment(self):
+        """Test JSONL rows keep nested team and payment history."""
+        rows = [
+            {
+                'customer_name': 'Alice', 'customer_phone': '0901234567', 'customer_email': 'a@example.com',
+                'package_type': str(self.package.id), 'package_name': 'Wedding', 'package_price': 5000000,
+                'shoot_date': '2025-06-01',
+                'team': {'main_photographer': {'employee': str(self.photographer.id)}},
+                'payment': {'deposit': 1000000, 'payment_history': [
+                    {'amount': 1000000, 'date': '2025-05-01', 'method': 'cash'},
+                ]},
+            },
+            'not json',
+        ]
+        text = '\n'.join(json.dumps(row) if isinstance(row, dict) else row for row in rows)
+
+        result = import_from_lines(StringIO(text), 'jsonl').as_dict()
+
+        self.assertEqual((result['created'], result['failed']), (1, 1))
+        self.assertEqual(result['errors'][0]['row'], 2)
+        project = Project.objects.get()
+        self.assertEqual(project.team['main_photographer']['employee'], str(self.photographer.id))
+        self.assertEqual(ProjectPayment.objects.filter(project=project).count(), 1)
+
+    def test_lookups_are_batched(self):
+        """Test packages and employees are fetched once per batch, not per row."""
+        other = Employee.objects.create(name='Second', role='Photo/Retouch')
+        text = self._csv([self._row(f'Customer {i}', photographer=[self.photographer, other][i % 2]) for i in range(30)])
+
+        with CaptureQueriesContext(connection) as queries:
+            result = import_from_lines(StringIO(text), 'csv')
+
+        self.assertEqual(result.created, 30)
+        self.assertEqual(ProjectAssignment.objects.count(), 30)
+        selects = [q['sql'] for q in queries.captured_queries if q['sql'].startswith('SELECT')]
+        self.assertEqual(sum('FROM "packages"' in sql for sql in selects), 1)
+        # Main photographer check, then the assignment sync
+        self.assertEqual(sum('FROM "employees"' in sql for sql in selects), 2)
+        inserts = [q['sql'] for q in queries.captured_queries if q['sql'].startswith('INSERT INTO "projects"')]
+        self.assertLess(len(inserts), 30)
+
+    def test_codes_are_allocated_in_blocks(self):
+        """Test imported projects get contiguous codes after existing ones."""
+        existing = Project.objects.create(
+            customer_name='Existing', customer_phone='0901234567', customer_email='e@example.com',
+            package_type=self.package, package_name='Wedding', package_price=Decimal('5000000'),
+            package_discount=Decimal('0'), package_final_price=Decimal('5000000'), shoot_date=date.today(),
+        )
+        text = self._csv([self._row(f'Customer {i}') for i in range(5)])
+
+        with mock.patch.object(importing, 'IMPORT_BATCH_SIZE', 2):
+            import_from_lines(StringIO(text), 'csv')
+
+        codes = list(Project.objects.exclude(id=existing.id).order_by('project_code').values_list('project_code', flat=True))
+        base = int(existing.project_code[-4:])
+        self.assertEqual(codes, [f'{existing.project_code[:-4]}{base + i:04d}' for i in range(1, 6)])
+
+    def test_double_bookings_are_reported_per_row(self):
+        """Test rows booking a busy photographer fail without dropping the rest of the batch."""
+        text = self._csv([
+            self._row('Alice', shoot_date=date(2025, 6, 1)),
+            self._row('Bob'),
+            self._row('Carol', shoot_date=date(2025, 6, 1)),
+        ])
+
+        result = import_from_lines(StringIO(text), 'csv').as_dict()
+
+        self.assertEqual((result['created'], result['failed']), (2, 1))
+        self.assertEqual(result['errors'][0]['row'], 4)
+        self.assertIn('đã có lịch chụp', result['errors'][0]['error'])
+        self.assertEqual(
+            set(Project.objects.values_list('customer_name', flat=True)), {'Alice', 'Bob'}
+        )
+
+    def test_missing_header_rejected(self):
+        """Test a CSV without the expected header is rejected."""
+        with self.assertRaises(importing.ImportFormatError):
+            import_from_lines(StringIO('a,b\n1,2\n'), 'csv')
+
+
+@pytest.mark.django_db
+class TestProjectImportEndpoint(ImportTestMixin, TestCase):
+    """Test suite cho POST /api/projects/import."""
+
+    def setUp(self):
+        """Set up test data."""
+        super().setUp()
+        self.client = Client()
+        self.manager = User.objects.create_user(username='manager', password='testpass123', role='manager')
+        self.sales = User.objects.create_user(username='sales', password='testpass123', role='sales')
+
+    def _upload(self, user, name, content):
+        return self.client.post(
+            '/api/projects/import',
+            data={'file': SimpleUploadedFile(name, content.encode())},
+            HTTP_AUTHORIZATION=f'Bearer {create_jwt_token(user)}'
+        )
+
+    def test_manager_can_import(self):
+        """Test a manager upload creates projects and records the creator."""
+        response = self._upload(self.manager, 'projects.csv', self._csv([self._row('Alice'), self._row('Bob')]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content), {'created': 2, 'failed': 0, 'errors': []})
+        self.assertEqual(Project.objects.filter(created_by=self.manager).count(), 2)
+
+    def test_other_roles_forbidden(self):
+        """Test users outside admin/manager cannot import."""
+        response = self._upload(self.sales, 'projects.csv', self._csv([self._row('Alice')]))
+
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(Project.objects.exists())
+
+    def test_unknown_format_rejected(self):
+        """Test files without a known format are rejected."""
+        response = self._upload(self.manager, 'projects.txt', self._csv([self._row('Alice')]))
+
+        self.assertEqual(response.status_code, 400)
+
+
+@pytest.mark.django_db
+class TestImportProjectsCommand(ImportTestMixin, TestCase):
+    """Test suite cho management command import_projects."""
+
+    def test_command_imports_file(self):
+        """Test the command streams a file and reports the result."""
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False, encoding='utf-8') as f:
+            f.write(self._csv([self._row('Alice'), self._row('Bob', photographer=self.retired)]))
+        self.addCleanup(os.unlink, f.name)
+        out = StringIO()
+
+        call_command('import_projects', f.name, stdout=out)
+
+        self.assertIn('Created 1 projects, 1 rows failed', out.getvalue())
+        self.assertTrue(Project.objects.filter(customer_name='Alice').exists())
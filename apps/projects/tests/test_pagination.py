@@ -0,0 +1,128 @@
+"""
+Tests cho keyset (cursor) pagination của các list endpoint.
+"""
+import pytest
+import json
+from datetime import date, timedelta
+from decimal import Decimal
+from django.test import TestCase, Client
+from django.utils import timezone
+from api.pagination import InvalidCursor, decode_cursor, encode_cursor, paginate
+from apps.employees.models import Employee
+from apps.packages.models import Package
+from apps.projects.models import Project
+from apps.salaries.models import MonthlySalary
+from apps.salaries.services import MONTHLY_SALARY_ORDERING, SalaryService
+from apps.users.models import User
+from apps.users.services import create_jwt_token
+
+
+@pytest.mark.django_db
+class TestCursorPagination(TestCase):
+    """Test suite cho cursor pagination."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.client = Client()
+        self.user = User.objects.create_user(username='admin', password='admin123', role='admin')
+        self.auth = {'HTTP_AUTHORIZATION': f'Bearer {create_jwt_token(self.user)}'}
+        self.package = Package.objects.create(
+            name='Wedding', category='wedding', price=Decimal('5000000'), description='Test'
+        )
+        self.projects = [
+            Project.objects.create(
+                customer_name=f'Customer {i}', customer_phone='0123456789',
+                customer_email='customer@example.com', package_type=self.package,
+                package_name='Wedding', package_price=Decimal('5000000'),
+                package_discount=Decimal('0'), package_final_price=Decimal('5000000'),
+                shoot_date=date.today() + timedelta(days=i),
+            )
+            for i in range(7)
+        ]
+        # Một nửa dự án trùng created_at: id phải phân định thứ tự
+        Project.objects.filter(id__in=[p.id for p in self.projects[:4]]).update(created_at=timezone.now())
+
+    def _get(self, **params):
+        response = self.client.get('/api/projects/', params, **self.auth)
+        return response.status_code, json.loads(response.content)
+
+    def test_cursor_walks_every_row_once(self):
+        """Test following next_cursor returns each project exactly once, in list order."""
+        seen, cursor = [], None
+        while True:
+            params = {'limit': 3, **({'cursor': cursor} if cursor else {})}
+            status, data = self._get(**params)
+            self.assertEqual(status, 200)
+            self.assertEqual(data['total'], 7)
+            seen += [item['id'] for item in data['items']]
+            cursor = data['next_cursor']
+            if not cursor:
+                break
+
+        expected = [str(pk) for pk in Project.objects.order_by('-created_at', '-id').values_list('id', flat=True)]
+        self.assertEqual(seen, expected)
+
+    def test_skip_mode_matches_cursor_mode(self):
+        """Test skip/limit still works and returns the same page as the cursor."""
+        _, first = self._get(limit=3)
+        _, by_skip = self._get(limit=3, skip=3)
+        _, by_cursor = self._get(limit=3, cursor=first['next_cursor'])
+
+        self.assertEqual(by_skip['items'], by_cursor['items'])
+        self.assertEqual(by_skip['next_cursor'], by_cursor['next_cursor'])
+
+    def test_last_page_has_no_cursor(self):
+        """Test next_cursor is null once the list is exhausted."""
+        _, data = self._get(limit=7)
+
+        self.assertEqual(len(data['items']), 7)
+        self.assertIsNone(data['next_cursor'])
+
+    def test_invalid_cursor_returns_400(self):
+        """Test a malformed cursor is rejected with 400."""
+        status, _ = self._get(cursor='not-a-cursor')
+
+        self.assertEqual(status, 400)
+
+    def test_cursor_round_trip(self):
+        """Test encode/decode keeps the ordering key values."""
+        project = self.projects[0]
+        cursor = encode_cursor(project, ('-created_at', '-id'))
+
+        self.assertEqual(decode_cursor(cursor, ('-created_at', '-id'))[1], str(project.id))
+        with self.assertRaises(InvalidCursor):
+            decode_cursor(cursor, ('-created_at', '-id', 'name'))
+
+    def test_monthly_salaries_keyset_on_month_and_employee(self):
+        """Test monthly salaries page in the Employee order within a month, without gaps."""
+        employees = [
+            Employee.objects.create(name=f'Employee {i}', role='Photo/Retouch', email=f'e{i}@example.com')
+            for i in range(3)
+        ]
+        # Two employees share created_at: their id breaks the tie
+        Employee.objects.filter(id__in=[e.id for e in employees[:2]]).update(created_at=timezone.now())
+        for month in ('2025-01', '2025-02'):
+            for employee in employees:
+                MonthlySalary.objects.create(employee=employee, month=month, total_amount=Decimal('1000000'))
+
+        seen, cursor = [], None
+        while True:
+            page = SalaryService.list_monthly_salaries(limit=4, cursor=cursor)
+            seen += [(salary.month, salary.employee_id) for salary in page.items]
+            cursor = page.next_cursor
+            if not cursor:
+                break
+
+        expected = list(MonthlySalary.objects.order_by(*MONTHLY_SALARY_ORDERING).values_list('month', 'employee_id'))
+        self.assertEqual(seen, expected)
+        self.assertEqual([month for month, _ in seen[:3]], ['2025-02'] * 3)
+        # Same order as before cursors: Employee's default order within a month
+        by_employee = list(Employee.objects.values_list('id', flat=True))
+        self.assertEqual([employee_id for _, employee_id in seen[:3]], by_employee)
+        self.assertEqual(seen, list(MonthlySalary.objects.values_list('month', 'employee_id')))
+
+    def test_page_unpacks_as_items_and_total(self):
+        """Test the Page result stays compatible with `items, total = ...`."""
+        items, total = paginate(Project.objects.all(), limit=2)
+
+        self.assertEqual((len(items), total), (2, 7))
@@ -0,0 +1,82 @@
+"""
+Tests cho các cột thanh toán dẫn xuất (payment_status, paid_amount, balance_due).
+"""
+import pytest
+import importlib
+from datetime import date
+from decimal import Decimal
+from django.apps import apps as django_apps
+from django.test import TestCase
+from apps.packages.models import Package
+from apps.projects.models import Project
+from apps.projects.schemas import PaymentHistorySchema
+from apps.projects.services import ProjectService
+
+
+@pytest.mark.django_db
+class TestPaymentColumns(TestCase):
+    """Test suite cho cột thanh toán."""
+
+    def setUp(self):
+        """Set up test data."""
+        package = Package.objects.create(
+            name='Wedding', category='wedding', price=Decimal('5000000'), description='Test'
+        )
+        self.project = Project.objects.create(
+            customer_name='Customer', customer_phone='0123456789', package_type=package,
+            package_name='Wedding', package_price=Decimal('5000000'), package_discount=Decimal('500000'),
+            package_final_price=Decimal('0'), shoot_date=date.today(),
+        )
+
+    def test_defaults_on_create(self):
+        """Test a new project is unpaid with the full price due."""
+        self.project.refresh_from_db()
+
+        self.assertEqual(self.project.payment_status, 'unpaid')
+        self.assertEqual(self.project.paid_amount, 0)
+        self.assertEqual(self.project.balance_due, Decimal('4500000'))
+
+    def test_add_payment_updates_columns(self):
+        """Test add_payment updates the typed columns."""
+        ProjectService.add_payment(self.project.id, PaymentHistorySchema(amount=1000000, date=date.today()))
+
+        self.project.refresh_from_db()
+        self.assertEqual(
+            (self.project.payment_status, self.project.paid_amount, self.project.balance_due),
+            ('deposit', Decimal('1000000'), Decimal('3500000'))
+        )
+
+    def test_payment_json_does_not_drive_columns(self):
+        """Test save(update_fields=['payment']) leaves the ledger-derived columns alone."""
+        self.project.payment = {**self.project.payment, 'status': 'paid', 'paid': 4500000}
+        self.project.save(update_fields=['payment'])
+
+        self.project.refresh_from_db()
+        self.assertEqual(
+            (self.project.payment_status, self.project.paid_amount, self.project.balance_due),
+            ('unpaid', 0, Decimal('4500000'))
+        )
+
+    def test_payment_status_filter_uses_column(self):
+        """Test the list filter reads the typed column."""
+        Project.objects.filter(id=self.project.id).update(payment_status='paid')
+
+        projects, total = ProjectService.list_projects(payment_status='paid')
+
+        self.assertEqual(total, 1)
+        self.assertIn('"projects"."payment_status"', str(Project.objects.filter(payment_status='paid').query))
+
+    def test_backfill_migration(self):
+        """Test the backfill derives the columns from existing payment JSON."""
+        Project.objects.filter(id=self.project.id).update(
+            payment={'status': 'deposit', 'paid': 2000000}, payment_status='unpaid', paid_amount=0, balance_due=0
+        )
+        migration = importlib.import_module('apps.projects.migrations.0007_backfill_payment_columns')
+
+        migration.backfill_payment_columns(django_apps, None)
+
+        self.project.refresh_from_db()
+        self.assertEqual(
+            (self.project.payment_status, self.project.paid_amount, self.project.balance_due),
+            ('deposit', Decimal('2000000'), Decimal('2500000'))
+        )
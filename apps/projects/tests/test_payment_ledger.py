@@ -0,0 +1,253 @@
+"""
+Tests cho sổ thanh toán ProjectPayment và add_payment nguyên tử.
+"""
+import pytest
+import importlib
+import json
+import threading
+from datetime import date
+from decimal import Decimal
+from django.apps import apps as django_apps
+from django.db import OperationalError, close_old_connections, connection
+from django.test import TestCase, TransactionTestCase, Client
+from django.test.utils import CaptureQueriesContext
+from apps.employees.models import Employee
+from apps.packages.models import Package
+from apps.projects.models import Project, ProjectPayment
+from apps.projects.schemas import PaymentHistorySchema, ProjectCreate, ProjectUpdate
+from apps.projects.services import ProjectService
+from apps.users.models import User
+from apps.users.services import create_jwt_token
+
+
+def _create_project(**kwargs):
+    package = Package.objects.create(
+        name='Wedding', category='wedding', price=Decimal('5000000'), description='Test'
+    )
+    defaults = dict(
+        customer_name='Customer', customer_phone='0123456789', customer_email='customer@example.com',
+        package_type=package,
+        package_name='Wedding', package_price=Decimal('5000000'), package_discount=Decimal('0'),
+        package_final_price=Decimal('5000000'), shoot_date=date.today(),
+    )
+    return Project.objects.create(**{**defaults, **kwargs})
+
+
+def _payment(amount, **kwargs):
+    return PaymentHistorySchema(amount=amount, date=date(2025, 3, 1), **kwargs)
+
+
+@pytest.mark.django_db
+class TestPaymentLedger(TestCase):
+    """Test suite cho ProjectPayment."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.project = _create_project()
+
+    def test_add_payment_inserts_ledger_row(self):
+        """Test a payment becomes one ledger row and bumps the totals."""
+        project = ProjectService.add_payment(self.project.id, _payment(2000000, method='cash'))
+
+        self.assertEqual(ProjectPayment.objects.filter(project=self.project).count(), 1)
+        self.assertEqual((project.paid_amount, project.balance_due), (Decimal('2000000'), Decimal('3000000')))
+        self.assertEqual(project.payment_status, 'deposit')
+
+    def test_full_payment_marks_paid(self):
+        """Test reaching the final price flips the status to paid."""
+        ProjectService.add_payment(self.project.id, _payment(3000000))
+        project = ProjectService.add_payment(self.project.id, _payment(2000000))
+
+        self.assertEqual((project.payment_status, project.balance_due), ('paid', 0))
+
+    def test_add_payment_does_not_rewrite_project_row(self):
+        """Test the write is a targeted UPDATE of the totals, not a full-row save."""
+        self.project.update_history = [{'action': 'update', 'notes': 'x' * 200}] * 50
+        self.project.save()
+
+        with CaptureQueriesContext(connection) as queries:
+            ProjectService.add_payment(self.project.id, _payment(100000))
+
+        update = next(q['sql'] for q in queries.captured_queries if q['sql'].startswith('UPDATE "projects"'))
+        self.assertIn('"projects"."paid_amount" +', update)
+        self.assertNotIn('update_history', update)
+
+    def test_missing_project_returns_none(self):
+        """Test paying into an unknown project writes nothing."""
+        import uuid
+        self.assertIsNone(ProjectService.add_payment(uuid.uuid4(), _payment(100000)))
+        self.assertEqual(ProjectPayment.objects.count(), 0)
+
+    def test_stale_full_save_keeps_paid_amount(self):
+        """Test saving a stale instance does not undo a payment made meanwhile."""
+        stale = Project.objects.get(id=self.project.id)
+        ProjectService.add_payment(self.project.id, _payment(1000000))
+
+        stale.notes = 'edited'
+        stale.save()
+
+        self.project.refresh_from_db()
+        self.assertEqual((self.project.paid_amount, self.project.notes), (Decimal('1000000'), 'edited'))
+
+    def test_price_change_recomputes_balance(self):
+        """Test updating the price keeps balance_due = final price - paid."""
+        ProjectService.add_payment(self.project.id, _payment(1000000))
+
+        project = ProjectService.update_project(self.project.id, ProjectUpdate(package_discount=500000))
+
+        self.assertEqual((project.paid_amount, project.balance_due), (Decimal('1000000'), Decimal('3500000')))
+
+    def test_patch_payment_keeps_ledger_totals(self):
+        """Test PATCHing `payment` after add_payment only changes the plan, not the totals."""
+        user = User.objects.create_user(username='admin', password='admin123', role='admin')
+        ProjectService.add_payment(self.project.id, _payment(2000000))
+
+        response = Client().patch(
+            f'/api/projects/{self.project.id}', {'payment': {'deposit': 1000000}},
+            content_type='application/json', HTTP_AUTHORIZATION=f'Bearer {create_jwt_token(user)}'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        payment = json.loads(response.content)['payment']
+        self.assertEqual((payment['deposit'], payment['paid'], payment['status']), (1000000, 2000000, 'deposit'))
+        self.project.refresh_from_db()
+        self.assertEqual(
+            (self.project.paid_amount, self.project.balance_due, self.project.payment_status),
+            (Decimal('2000000'), Decimal('3000000'), 'deposit')
+        )
+
+    def test_create_totals_come_from_history(self):
+        """Test a new project's paid amount is the sum of its payment_history, not payment.paid."""
+        employee = Employee.objects.create(name='Photographer', role='Photo/Retouch')
+        project = ProjectService.create_project(ProjectCreate(
+            customer_name='Customer', customer_phone='0123456789', customer_email='customer@example.com',
+            package_type=self.project.package_type_id,
+            package_name='Wedding', package_price=5000000, shoot_date=date(2025, 6, 1),
+            team={'main_photographer': {'employee': str(employee.id)}},
+            payment={'status': 'paid', 'paid': 5000000, 'payment_history': [
+                {'amount': 1000000, 'date': '2025-01-02'}, {'amount': 500000, 'date': '2025-01-05'},
+            ]},
+        ))
+
+        project.refresh_from_db()
+        self.assertEqual(
+            (project.paid_amount, project.balance_due, project.payment_status),
+            (Decimal('1500000'), Decimal('3500000'), 'deposit')
+        )
+        self.assertEqual(ProjectPayment.objects.filter(project=project).count(), 2)
+
+    def test_price_raise_reopens_paid_project(self):
+        """Test raising the price of a fully paid project recomputes the status, not only the balance."""
+        ProjectService.add_payment(self.project.id, _payment(5000000))
+
+        project = ProjectService.update_project(self.project.id, ProjectUpdate(package_price=8000000))
+
+        self.assertEqual(
+            (project.payment_status, project.balance_due), ('deposit', Decimal('3000000'))
+        )
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.payment_status, 'deposit')
+
+    def test_price_change_through_save(self):
+        """Test Project.save() with a new price also recomputes balance_due and payment_status."""
+        ProjectService.add_payment(self.project.id, _payment(3000000))
+        project = Project.objects.get(id=self.project.id)
+
+        project.package_discount = Decimal('2000000')
+        project.save()
+
+        project.refresh_from_db()
+        self.assertEqual(
+            (project.payment_status, project.balance_due, project.paid_amount),
+            ('paid', Decimal('0'), Decimal('3000000'))
+        )
+
+    def test_json_view_is_kept(self):
+        """Test the API still returns payment.{status, paid, payment_history}."""
+        user = User.objects.create_user(username='admin', password='admin123', role='admin')
+        ProjectService.add_payment(self.project.id, _payment(1500000, method='transfer'))
+
+        response = Client().get(
+            f'/api/projects/{self.project.id}', HTTP_AUTHORIZATION=f'Bearer {create_jwt_token(user)}'
+        )
+
+        payment = json.loads(response.content)['payment']
+        self.assertEqual((payment['status'], payment['paid']), ('deposit', 1500000))
+        self.assertEqual(payment['payment_history'], [{
+            'amount': 1500000.0, 'date': '2025-03-01', 'method': 'transfer', 'notes': None, 'received_by': None,
+        }])
+
+    def test_history_migration_moves_json_into_ledger(self):
+        """Test the data migration turns payment_history items into ledger rows."""
+        # Columns as left by the 0007 backfill from payment['paid']
+        Project.objects.filter(id=self.project.id).update(paid_amount=900000, payment={
+            'status': 'deposit', 'paid': 900000,
+            'payment_history': [{'amount': 500000, 'date': '2025-01-02'}, {'amount': 200000, 'date': '2025-01-05'}],
+        })
+        migration = importlib.import_module('apps.projects.migrations.0009_move_payment_history_to_ledger')
+
+        migration.move_history_to_ledger(django_apps, None)
+        migration.sync_payment_columns_from_ledger(django_apps, None)
+
+        self.project.refresh_from_db()
+        self.assertNotIn('payment_history', self.project.payment)
+        self.assertEqual(
+            (self.project.paid_amount, self.project.balance_due, self.project.payment_status),
+            (Decimal('700000'), Decimal('4300000'), 'deposit')
+        )
+        self.assertEqual(
+            list(ProjectPayment.objects.filter(project=self.project).values_list('amount', flat=True)),
+            [Decimal('500000'), Decimal('200000')]
+        )
+
+
+@pytest.mark.django_db
+class TestPaymentConcurrency(TransactionTestCase):
+    """Stress test: parallel payments into one project."""
+
+    THREADS = 8
+    PAYMENTS_PER_THREAD = 5
+    AMOUNT = 100000
+
+    def test_parallel_payments_are_not_lost(self):
+        """Test every concurrent payment is recorded and summed."""
+        project = _create_project()
+        barrier = threading.Barrier(self.THREADS)
+        errors = []
+
+        def pay(note):
+            while True:
+                try:
+                    # The note doubles as an idempotency key: the error may
+                    # come from the read after the payment was committed
+                    if not ProjectPayment.objects.filter(notes=note).exists():
+                        ProjectService.add_payment(project.id, _payment(self.AMOUNT, notes=note))
+                    return
+                except OperationalError:
+                    # SQLite rejects concurrent writers instead of waiting
+                    # on the row lock; retry the payment
+                    continue
+
+        def worker(index):
+            try:
+                barrier.wait()
+                for n in range(self.PAYMENTS_PER_THREAD):
+                    pay(f'{index}-{n}')
+            except Exception as e:  # pragma: no cover - reported below
+                errors.append(e)
+            finally:
+                close_old_connections()
+                connection.close()
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        total = self.THREADS * self.PAYMENTS_PER_THREAD
+        project.refresh_from_db()
+        self.assertEqual(ProjectPayment.objects.filter(project=project).count(), total)
+        self.assertEqual(project.paid_amount, total * self.AMOUNT)
+        self.assertEqual(project.balance_due, project.package_final_price - total * self.AMOUNT)
@@ -0,0 +1,145 @@
+"""
+Tests cho tìm kiếm khách hàng (chuẩn hóa số điện thoại, FTS5 trên SQLite).
+"""
+import pytest
+import json
+from datetime import date
+from decimal import Decimal
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from apps.packages.models import Package
+from apps.projects.models import Project
+from apps.projects.search import install_search_index, normalize_phone, phone_query, search_backend
+from apps.projects.services import ProjectService
+from apps.users.models import User
+from apps.users.services import create_jwt_token
+
+
+class TestPhoneNormalization(TestCase):
+    """Test suite cho chuẩn hóa số điện thoại."""
+
+    def test_normalize_phone(self):
+        """Test separators are dropped and +84 becomes a leading 0."""
+        self.assertEqual(normalize_phone('0901 234 567'), '0901234567')
+        self.assertEqual(normalize_phone('090.123.4567'), '0901234567')
+        self.assertEqual(normalize_phone('+84 901 234 567'), '0901234567')
+        self.assertEqual(normalize_phone('84901234567'), '0901234567')
+
+    def test_phone_query_ignores_names(self):
+        """Test only phone-like terms produce digits to search."""
+        self.assertEqual(phone_query('0901 234'), '0901234')
+        self.assertEqual(phone_query('Nguyen 09'), '')
+
+
+@pytest.mark.django_db
+class TestCustomerSearch(TestCase):
+    """Test suite cho filter customer_name và GET /projects/search."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.client = Client()
+        self.user = User.objects.create_user(username='admin', password='admin123', role='admin')
+        self.auth = {'HTTP_AUTHORIZATION': f'Bearer {create_jwt_token(self.user)}'}
+        self.package = Package.objects.create(
+            name='Wedding', category='wedding', price=Decimal('5000000'), description='Test'
+        )
+        self.anh = self._create_project('Nguyễn Văn Anh', '0901 234 567')
+        self.binh = self._create_project('Trần Thị Bình', '0912.888.999')
+        self.anh_binh = self._create_project('Anh Bình Studio', '+84 933 000 111')
+
+    def _create_project(self, name, phone):
+        return Project.objects.create(
+            customer_name=name, customer_phone=phone, customer_email='customer@example.com',
+            package_type=self.package, package_name='Wedding', package_price=Decimal('5000000'),
+            package_discount=Decimal('0'), package_final_price=Decimal('5000000'),
+            shoot_date=date.today(),
+        )
+
+    def _search(self, q, **params):
+        response = self.client.get('/api/projects/search', {'q': q, **params}, **self.auth)
+        return response.status_code, json.loads(response.content)
+
+    def test_phone_digits_saved(self):
+        """Test save() keeps the normalized phone column up to date."""
+        self.assertEqual(self.anh.customer_phone_digits, '0901234567')
+        self.assertEqual(self.anh_binh.customer_phone_digits, '0933000111')
+
+        self.anh.customer_phone = '0977 000 000'
+        self.anh.save(update_fields=['customer_phone'])
+        self.anh.refresh_from_db()
+        self.assertEqual(self.anh.customer_phone_digits, '0977000000')
+
+    def test_list_filter_matches_formatted_phone(self):
+        """Test the list filter finds a phone typed with different separators."""
+        page = ProjectService.list_projects(customer_name='0912 888')
+
+        self.assertEqual([project.id for project in page.items], [self.binh.id])
+
+    def test_sqlite_uses_fts(self):
+        """Test the test database has the FTS5 search table."""
+        self.assertEqual(search_backend(), 'sqlite')
+
+    def test_search_by_name(self):
+        """Test ranked search matches substrings case-insensitively."""
+        status, data = self._search('bình')
+
+        self.assertEqual(status, 200)
+        self.assertEqual({item['id'] for item in data}, {str(self.binh.id), str(self.anh_binh.id)})
+        self.assertTrue(all(item['rank'] is not None for item in data))
+
+    def test_search_ranks_better_match_first(self):
+        """Test the project matching more of the query ranks first."""
+        _, data = self._search('Anh Bình')
+
+        self.assertEqual(data[0]['id'], str(self.anh_binh.id))
+
+    def test_search_by_phone(self):
+        """Test phone search ignores separators and the +84 prefix."""
+        _, by_spaces = self._search('090 123 4567')
+        _, by_country_code = self._search('+84 933 000 111')
+
+        self.assertEqual([item['id'] for item in by_spaces], [str(self.anh.id)])
+        self.assertEqual([item['id'] for item in by_country_code], [str(self.anh_binh.id)])
+
+    def test_search_follows_updates_and_deletes(self):
+        """Test the FTS table is kept in sync by triggers."""
+        self.binh.customer_name = 'Lê Văn Cường'
+        self.binh.save()
+        self.anh.delete()
+
+        _, old_name = self._search('Trần Thị')
+        _, new_name = self._search('Cường')
+        _, deleted = self._search('Nguyễn')
+
+        self.assertEqual(old_name, [])
+        self.assertEqual([item['id'] for item in new_name], [str(self.binh.id)])
+        self.assertEqual(deleted, [])
+
+    def test_reinstall_rebuilds_only_after_missing_trigger(self):
+        """Test repeated installs (every migrate) skip the rebuild unless a trigger was missing."""
+        with CaptureQueriesContext(connection) as queries:
+            install_search_index(connection)
+        self.assertFalse(any("'rebuild'" in query['sql'] for query in queries))
+
+        # A migration that remakes the projects table drops the triggers
+        with connection.cursor() as cursor:
+            cursor.execute('DROP TRIGGER projects_search_ai')
+        missed = self._create_project('Đỗ Minh Quân', '0988 777 666')
+        install_search_index(connection)
+
+        _, data = self._search('Minh Quân')
+        self.assertEqual([item['id'] for item in data], [str(missed.id)])
+
+    def test_short_query_falls_back_to_like(self):
+        """Test terms shorter than a trigram still match, unranked."""
+        _, data = self._search('Bì')
+
+        self.assertEqual(len(data), 2)
+        self.assertIsNone(data[0]['rank'])
+
+    def test_limit_validated(self):
+        """Test out-of-range limits are rejected."""
+        status, _ = self._search('Anh', limit=0)
+
+        self.assertEqual(status, 400)
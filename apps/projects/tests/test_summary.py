@@ -0,0 +1,75 @@
+"""
+Tests cho danh sách dự án rút gọn (ProjectSummary, sparse fieldsets).
+"""
+import pytest
+import json
+from datetime import date
+from decimal import Decimal
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from apps.packages.models import Package
+from apps.projects.models import Project
+from apps.projects.schemas import PROJECT_SUMMARY_FIELDS
+from apps.users.models import User
+from apps.users.services import create_jwt_token
+
+
+@pytest.mark.django_db
+class TestProjectSummaryAPI(TestCase):
+    """Test suite cho GET /projects/summary."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.client = Client()
+        self.user = User.objects.create_user(username='admin', password='admin123', role='admin')
+        self.auth = {'HTTP_AUTHORIZATION': f'Bearer {create_jwt_token(self.user)}'}
+        package = Package.objects.create(
+            name='Wedding', category='wedding', price=Decimal('5000000'), description='Test'
+        )
+        for i in range(3):
+            Project.objects.create(
+                customer_name=f'Customer {i}', customer_phone='0123456789',
+                package_type=package, package_name='Wedding', package_price=Decimal('5000000'),
+                package_discount=Decimal('0'), package_final_price=Decimal('5000000'),
+                shoot_date=date.today(), milestones=[{'title': 'Shoot', 'notes': 'x' * 500}],
+            )
+
+    def _get(self, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/projects/summary', params, **self.auth)
+        select = next(q['sql'] for q in queries.captured_queries if 'FROM "projects"' in q['sql'])
+        return response.status_code, json.loads(response.content), select
+
+    def test_summary_returns_scalar_columns_only(self):
+        """Test the default projection has the summary fields and no JSON columns."""
+        status, data, select = self._get()
+
+        self.assertEqual(status, 200)
+        self.assertEqual(data['total'], 3)
+        self.assertEqual(set(data['items'][0]), set(PROJECT_SUMMARY_FIELDS))
+        self.assertEqual(data['items'][0]['package_final_price'], 5000000.0)
+        self.assertNotIn('milestones', select)
+        self.assertNotIn('update_history', select)
+
+    def test_sparse_fields(self):
+        """Test fields= returns only the requested columns plus id."""
+        status, data, _ = self._get(fields='customer_name,status')
+
+        self.assertEqual(status, 200)
+        self.assertEqual(set(data['items'][0]), {'id', 'customer_name', 'status'})
+
+    def test_sparse_fields_keep_cursor(self):
+        """Test cursor paging works even when created_at is not selected."""
+        _, first, _ = self._get(fields='customer_name', limit=2)
+        _, second, _ = self._get(fields='customer_name', limit=2, cursor=first['next_cursor'])
+
+        ids = [item['id'] for item in first['items'] + second['items']]
+        self.assertEqual(len(set(ids)), 3)
+        self.assertIsNone(second['next_cursor'])
+
+    def test_unknown_field_returns_400(self):
+        """Test JSON columns and unknown names are rejected."""
+        response = self.client.get('/api/projects/summary', {'fields': 'milestones'}, **self.auth)
+
+        self.assertEqual(response.status_code, 400)
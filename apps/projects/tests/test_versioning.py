@@ -0,0 +1,206 @@
+"""
+Tests cho optimistic concurrency của dự án (version, ETag, If-Match).
+"""
+import pytest
+import json
+import threading
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+from django.db import OperationalError, close_old_connections, connection
+from django.test import TestCase, TransactionTestCase, Client
+from api.etag import parse_if_match
+from api.exceptions import PreconditionFailedError
+from apps.packages.models import Package
+from apps.projects.audit import audit_buffer
+from apps.projects.models import Project
+from apps.projects.schemas import MilestoneSchema, ProjectUpdate
+from apps.projects.services import ProjectService
+from apps.users.models import User
+from apps.users.services import create_jwt_token
+
+
+def _create_project():
+    package = Package.objects.create(
+        name='Wedding', category='wedding', price=Decimal('5000000'), description='Test'
+    )
+    return Project.objects.create(
+        customer_name='Customer', customer_phone='0123456789', customer_email='customer@example.com',
+        package_type=package, package_name='Wedding', package_price=Decimal('5000000'),
+        package_discount=Decimal('0'), package_final_price=Decimal('5000000'), shoot_date=date.today(),
+    )
+
+
+class TestParseIfMatch(TestCase):
+    """Test suite cho parse_if_match."""
+
+    def test_parse_if_match(self):
+        """Test strong tags are read and weak or foreign tags are ignored."""
+        self.assertIsNone(parse_if_match(None))
+        self.assertIsNone(parse_if_match('*'))
+        self.assertEqual(parse_if_match('"3", "5"'), {3, 5})
+        self.assertEqual(parse_if_match('W/"3", "abc"'), set())
+
+
+@pytest.mark.django_db
+class TestProjectVersioning(TestCase):
+    """Test suite cho ETag / If-Match trên /projects/{id}."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.client = Client()
+        self.user = User.objects.create_user(username='admin', password='admin123', role='admin')
+        self.auth = {'HTTP_AUTHORIZATION': f'Bearer {create_jwt_token(self.user)}'}
+        self.project = _create_project()
+        self.url = f'/api/projects/{self.project.id}'
+
+    def _patch(self, body, **headers):
+        return self.client.patch(self.url, json.dumps(body), content_type='application/json', **self.auth, **headers)
+
+    def test_get_returns_etag(self):
+        """Test GET exposes the version as an ETag."""
+        response = self.client.get(self.url, **self.auth)
+
+        self.assertEqual(response['ETag'], '"1"')
+        self.assertEqual(json.loads(response.content)['version'], 1)
+
+    def test_matching_if_match_updates(self):
+        """Test a current If-Match succeeds and returns the new ETag."""
+        response = self._patch({'location': 'Hội An'}, HTTP_IF_MATCH='"1"')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['ETag'], '"2"')
+
+    def test_stale_if_match_returns_412(self):
+        """Test a stale If-Match is rejected and nothing is written."""
+        self._patch({'location': 'Hội An'}, HTTP_IF_MATCH='"1"')
+
+        response = self._patch({'location': 'Đà Lạt'}, HTTP_IF_MATCH='"1"')
+
+        self.assertEqual(response.status_code, 412)
+        self.project.refresh_from_db()
+        self.assertEqual((self.project.location, self.project.version), ('Hội An', 2))
+
+    def test_put_honours_if_match(self):
+        """Test PUT checks If-Match too."""
+        response = self.client.put(
+            self.url, json.dumps({'location': 'Huế'}), content_type='application/json',
+            HTTP_IF_MATCH='"7"', **self.auth
+        )
+
+        self.assertEqual(response.status_code, 412)
+
+    def test_update_without_if_match(self):
+        """Test clients that send no If-Match keep working."""
+        response = self._patch({'location': 'Huế'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['ETag'], '"2"')
+
+    def test_sub_resource_writes_bump_version(self):
+        """Test milestone writes change the ETag as well."""
+        ProjectService.add_milestone(self.project.id, MilestoneSchema(name='Shoot', stage='shooting'))
+
+        response = self._patch({'location': 'Huế'}, HTTP_IF_MATCH='"1"')
+
+        self.assertEqual(response.status_code, 412)
+
+    def test_sub_resource_endpoints_return_etag(self):
+        """Test milestone, progress and payment responses carry the new ETag for the next If-Match."""
+        writes = [
+            ('post', 'milestones', {'milestone': {'name': 'Shoot', 'stage': 'shooting'}}),
+            ('put', 'progress', {'progress': {'shooting_done': True}}),
+            ('post', 'payments', {'payment_item': {'amount': 1000000, 'date': '2024-01-15', 'method': 'cash'}}),
+        ]
+        etags = []
+        for method, path, body in writes:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = getattr(self.client, method)(
+                    f'{self.url}/{path}', json.dumps(body), content_type='application/json', **self.auth
+                )
+            self.assertEqual(response.status_code, 200)
+            etags.append(response['ETag'])
+
+        self.assertEqual(etags, ['"2"', '"3"', '"4"'])
+        self.assertEqual(self._patch({'location': 'Huế'}, HTTP_IF_MATCH=etags[-1]).status_code, 200)
+
+    def test_stale_instance_does_not_write(self):
+        """Test save_versioned refuses to overwrite a newer row."""
+        stale = Project.objects.get(id=self.project.id)
+        ProjectService.update_project(self.project.id, ProjectUpdate(location='Huế'))
+
+        stale.location = 'Sa Pa'
+        self.assertFalse(stale.save_versioned({'location'}))
+        self.project.refresh_from_db()
+        self.assertEqual((self.project.location, stale.version), ('Huế', 1))
+
+    def test_concurrent_write_is_retried_without_if_match(self):
+        """Test update_project re-reads and re-applies after losing a race."""
+        save_versioned = Project.save_versioned
+        raced = []
+
+        def racing_save(project, update_fields):
+            if not raced:
+                raced.append(True)
+                Project.objects.filter(id=project.id).update(location='Vũng Tàu', version=project.version + 1)
+            return save_versioned(project, update_fields)
+
+        with mock.patch.object(Project, 'save_versioned', racing_save):
+            project = ProjectService.update_project(self.project.id, ProjectUpdate(notes='Gọi lại'))
+
+        self.assertEqual((project.notes, project.location, project.version), ('Gọi lại', 'Vũng Tàu', 3))
+
+    def test_concurrent_write_with_if_match_fails(self):
+        """Test a lost race with If-Match raises instead of retrying."""
+        def racing_save(project, update_fields):
+            Project.objects.filter(id=project.id).update(version=project.version + 1)
+            return False
+
+        with mock.patch.object(Project, 'save_versioned', racing_save):
+            with self.assertRaises(PreconditionFailedError):
+                ProjectService.update_project(self.project.id, ProjectUpdate(notes='x'), if_match={1})
+
+
+@pytest.mark.django_db
+class TestVersionConcurrency(TransactionTestCase):
+    """Stress test: parallel If-Match updates of one version."""
+
+    THREADS = 8
+
+    def test_only_one_writer_wins(self):
+        """Test exactly one of N writers holding the same ETag succeeds."""
+        project = _create_project()
+        barrier = threading.Barrier(self.THREADS)
+        results = []
+
+        def worker(index):
+            try:
+                barrier.wait()
+                while True:
+                    try:
+                        ProjectService.update_project(
+                            project.id, ProjectUpdate(notes=f'writer {index}'), if_match={1}
+                        )
+                        results.append('ok')
+                        return
+                    except PreconditionFailedError:
+                        results.append('412')
+                        return
+                    except OperationalError:
+                        # SQLite rejects concurrent writers instead of waiting; retry
+                        continue
+            finally:
+                close_old_connections()
+                connection.close()
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(results), ['412'] * (self.THREADS - 1) + ['ok'])
+        project.refresh_from_db()
+        self.assertEqual(project.version, 2)
+        # Write pending audit entries before the tables are flushed
+        audit_buffer.flush()
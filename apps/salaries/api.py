@@ -6,6 +6,7 @@ from uuid import UUID
 from datetime import date
 from ninja import Router, Query
 from ninja.errors import HttpError
+from api.dependencies import get_current_user
 from .schemas import (
     SalaryCreate, SalaryUpdate, SalaryRead, SalaryList,
     MonthlySalaryCreate, MonthlySalaryUpdate, MonthlySalaryRead, MonthlySalaryList,
@@ -32,8 +33,7 @@ def create_monthly_salary(request, payload: MonthlySalaryCreate):
     - **status**: Trạng thái (pending/paid/cancelled)
     """
     try:
-        # Pass authenticated user or None
-        created_by = request.user if request.user.is_authenticated else None
+        created_by = get_current_user(request)
         monthly_salary = SalaryService.create_monthly_salary(payload, created_by=created_by)
         return 201, monthly_salary
     except Exception as e:
@@ -49,22 +49,28 @@ def list_monthly_salaries(request):
     - **status**: Filter theo trạng thái (pending/paid/cancelled)
     - **skip**: Phân trang - bỏ qua
     - **limit**: Phân trang - giới hạn
+    - **cursor**: Phân trang keyset - `next_cursor` của trang trước (thay cho skip)
+    - **count**: Cách tính total - exact (mặc định), cached, estimate
     """
     month = request.GET.get('month', None)
     status = request.GET.get('status', None)
     skip = int(request.GET.get('skip', 0))
     limit = int(request.GET.get('limit', 20))
+    cursor = request.GET.get('cursor', None)
+    count = request.GET.get('count', None)
 
-    salaries, total = SalaryService.list_monthly_salaries(
+    page = SalaryService.list_monthly_salaries(
         month=month,
         status=status,
         skip=skip,
-        limit=limit
+        limit=limit,
+        cursor=cursor,
+        count=count
     )
 
     # Convert to response format
     results = []
-    for salary in salaries:
+    for salary in page.items:
         results.append({
             'id': salary.id,
             'employee': {
@@ -85,7 +91,12 @@ def list_monthly_salaries(request):
             'updated_at': salary.updated_at
         })
 
-    return {"total": total, "results": results}
+    return {
+        "total": page.total,
+        "results": results,
+        "next_cursor": page.next_cursor,
+        "count_strategy": page.count_strategy,
+    }
 
 
 @router.get("/{salary_id}", response=MonthlySalaryRead, summary="Lấy thông tin bảng lương")
@@ -141,7 +152,7 @@ def create_salary(request, payload: SalaryCreate):
     - **work_type**: Loại công việc (bắt buộc)
     """
     try:
-        salary = SalaryService.create_salary(payload, created_by=request.user)
+        salary = SalaryService.create_salary(payload, created_by=get_current_user(request))
         return 201, salary
     except Exception as e:
         raise HttpError(400, f"Không thể tạo salary: {str(e)}")
@@ -158,6 +169,8 @@ def list_salaries(request):
     - **is_paid**: Filter theo trạng thái thanh toán
     - **skip**: Phân trang - bỏ qua
     - **limit**: Phân trang - giới hạn
+    - **cursor**: Phân trang keyset - `next_cursor` của trang trước (thay cho skip)
+    - **count**: Cách tính total - exact (mặc định), cached, estimate
     """
     # Extract parameters manually from request.GET
     employee = request.GET.get('employee', None)
@@ -166,16 +179,25 @@ def list_salaries(request):
     is_paid = request.GET.get('is_paid', None)
     skip = int(request.GET.get('skip', 0))
     limit = int(request.GET.get('limit', 20))
+    cursor = request.GET.get('cursor', None)
+    count = request.GET.get('count', None)
 
-    salaries, total = SalaryService.list_salaries(
+    page = SalaryService.list_salaries(
         employee=employee,
         project=project,
         month=month,
         is_paid=is_paid,
         skip=skip,
-        limit=limit
+        limit=limit,
+        cursor=cursor,
+        count=count
     )
-    return {"total": total, "items": salaries}
+    return {
+        "total": page.total,
+        "items": page.items,
+        "next_cursor": page.next_cursor,
+        "count_strategy": page.count_strategy,
+    }
 
 
 @router.get("/project-salary/{salary_id}", response=SalaryRead, summary="Lấy thông tin lương dự án")
@@ -230,7 +252,7 @@ def calculate_monthly_salary(request, payload: CalculateSalaryRequest):
         monthly_salary = SalaryService.calculate_monthly_salary(
             employee_id=payload.employee,
             month=payload.month,
-            created_by=request.user
+            created_by=get_current_user(request)
         )
         return monthly_salary
     except Exception as e:
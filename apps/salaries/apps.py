@@ -5,3 +5,8 @@ class SalariesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.salaries'
     verbose_name = 'Salaries'
+
+    def ready(self):
+        from api.counting import track_counts
+        track_counts(self.get_model('Salary'))
+        track_counts(self.get_model('MonthlySalary'))
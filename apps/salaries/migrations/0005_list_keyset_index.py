@@ -0,0 +1,29 @@
+# Generated by Django 5.0.1 on 2026-10-17 01:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0003_list_keyset_index'),
+        ('projects', '0005_list_keyset_index'),
+        ('salaries', '0004_alter_monthlysalary_payment_method'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='salary',
+            options={'ordering': ['-created_at', '-id'], 'verbose_name': 'Lương', 'verbose_name_plural': 'Lương'},
+        ),
+        migrations.AddIndex(
+            model_name='monthlysalary',
+            index=models.Index(fields=['-month', 'employee'], name='monthly_sal_month_96f618_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='salary',
+            index=models.Index(fields=['-created_at', '-id'], name='salaries_created_1a568b_idx'),
+        ),
+    ]
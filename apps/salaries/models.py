@@ -87,8 +87,9 @@ class Salary(models.Model):
         db_table = 'salaries'
         verbose_name = 'Lương'
         verbose_name_plural = 'Lương'
-        ordering = ['-created_at']
+        ordering = ['-created_at', '-id']
         indexes = [
+            models.Index(fields=['-created_at', '-id']),
             models.Index(fields=['employee', 'month']),
             models.Index(fields=['project']),
             models.Index(fields=['month']),
@@ -194,6 +195,7 @@ class MonthlySalary(models.Model):
         ordering = ['-month', 'employee']
         unique_together = [['employee', 'month']]
         indexes = [
+            models.Index(fields=['-month', 'employee']),
             models.Index(fields=['month']),
             models.Index(fields=['employee', 'month']),
             models.Index(fields=['status']),
@@ -60,6 +60,8 @@ class SalaryList(BaseModel):
     """Schema cho danh sách salary."""
     total: int
     items: List[SalaryRead]
+    next_cursor: Optional[str] = None
+    count_strategy: str = 'exact'
 
 
 class EmployeeMinimal(BaseModel):
@@ -140,6 +142,8 @@ class MonthlySalaryList(BaseModel):
     """Schema cho danh sách monthly salary."""
     total: int
     results: List[Dict]  # Use Dict to match manual serialization in API
+    next_cursor: Optional[str] = None
+    count_strategy: str = 'exact'
 
 
 class SalaryFilter(BaseModel):
@@ -8,6 +8,12 @@ from django.db.models import Sum, Q
 from .models import Salary, MonthlySalary
 from .schemas import SalaryCreate, SalaryUpdate, MonthlySalaryCreate, MonthlySalaryUpdate
 from apps.employees.models import Employee
+from api.pagination import CREATED_ORDERING, Page, paginate
+
+# Khóa keyset của lương tháng: khớp MonthlySalary.Meta.ordering (thứ tự
+# Employee trong một tháng). Khóa đi qua join tới employees nên index
+# (-month, employee) chỉ thu hẹp theo tháng, không phục vụ trọn keyset.
+MONTHLY_SALARY_ORDERING = ('-month', '-employee__created_at', '-employee_id')
 
 
 class SalaryService:
@@ -81,8 +87,10 @@ class SalaryService:
         month: Optional[str] = None,
         is_paid: Optional[bool] = None,
         skip: int = 0,
-        limit: int = 20
-    ) -> tuple[List[Salary], int]:
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        count: Optional[str] = None
+    ) -> Page:
         """
         Lấy danh sách salary với filter.
 
@@ -91,11 +99,13 @@ class SalaryService:
             project: Filter theo dự án
             month: Filter theo tháng
             is_paid: Filter theo trạng thái thanh toán
-            skip: Số bản ghi bỏ qua
+            skip: Số bản ghi bỏ qua (bỏ qua nếu có cursor)
             limit: Số bản ghi tối đa
+            cursor: Cursor trang tiếp theo (keyset trên created_at, id)
+            count: Cách tính tổng số (exact, cached, estimate)
 
         Returns:
-            Tuple (danh sách salary, tổng số)
+            Page (danh sách salary, tổng số) kèm next_cursor
         """
         queryset = Salary.objects.select_related('employee', 'project').all()
 
@@ -111,10 +121,7 @@ class SalaryService:
         if is_paid is not None:
             queryset = queryset.filter(is_paid=is_paid)
 
-        total = queryset.count()
-        salaries = list(queryset[skip:skip + limit])
-
-        return salaries, total
+        return paginate(queryset, CREATED_ORDERING, skip, limit, cursor, count)
 
     @staticmethod
     def delete_salary(salary_id: UUID) -> bool:
@@ -211,19 +218,23 @@ class SalaryService:
         month: Optional[str] = None,
         status: Optional[str] = None,
         skip: int = 0,
-        limit: int = 20
-    ) -> tuple[List[MonthlySalary], int]:
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        count: Optional[str] = None
+    ) -> Page:
         """
         Lấy danh sách monthly salary.
 
         Args:
             month: Filter theo tháng
             status: Filter theo trạng thái
-            skip: Số bản ghi bỏ qua
+            skip: Số bản ghi bỏ qua (bỏ qua nếu có cursor)
             limit: Số bản ghi tối đa
+            cursor: Cursor trang tiếp theo (keyset trên month, employee.created_at, employee)
+            count: Cách tính tổng số (exact, cached, estimate)
 
         Returns:
-            Tuple (danh sách monthly salary, tổng số)
+            Page (danh sách monthly salary, tổng số) kèm next_cursor
         """
         queryset = MonthlySalary.objects.select_related('employee').all()
 
@@ -233,10 +244,7 @@ class SalaryService:
         if status:
             queryset = queryset.filter(status=status)
 
-        total = queryset.count()
-        salaries = list(queryset[skip:skip + limit])
-
-        return salaries, total
+        return paginate(queryset, MONTHLY_SALARY_ORDERING, skip, limit, cursor, count)
 
     @staticmethod
     def delete_monthly_salary(salary_id: UUID) -> bool:
@@ -0,0 +1,3 @@
+"""
+Code sequence allocation app.
+"""
@@ -0,0 +1,7 @@
+from django.apps import AppConfig
+
+
+class SequencesConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.sequences'
+    verbose_name = 'Sequences'
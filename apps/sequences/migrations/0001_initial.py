@@ -0,0 +1,27 @@
+# Generated by Django 5.0.1 on 2026-10-17 01:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CodeSequence',
+            fields=[
+                ('key', models.CharField(max_length=20, primary_key=True, serialize=False, verbose_name='Khóa')),
+                ('value', models.PositiveBigIntegerField(default=0, verbose_name='Giá trị hiện tại')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Ngày cập nhật')),
+            ],
+            options={
+                'verbose_name': 'Bộ đếm mã',
+                'verbose_name_plural': 'Bộ đếm mã',
+                'db_table': 'code_sequences',
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+"""
+Models cho bộ cấp phát mã (project_code, package_id, partner_id).
+"""
+from django.db import models
+
+
+class CodeSequence(models.Model):
+    """
+    Bộ đếm cho một loại mã, ví dụ 'PKG', 'PTN' hoặc 'PRJ2510' (theo tháng).
+    `value` là số thứ tự đã cấp gần nhất.
+    """
+
+    key = models.CharField(max_length=20, primary_key=True, verbose_name="Khóa")
+    value = models.PositiveBigIntegerField(default=0, verbose_name="Giá trị hiện tại")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Ngày cập nhật")
+
+    class Meta:
+        db_table = 'code_sequences'
+        verbose_name = 'Bộ đếm mã'
+        verbose_name_plural = 'Bộ đếm mã'
+
+    def __str__(self):
+        return f"{self.key}: {self.value}"
@@ -0,0 +1,97 @@
+"""
+Business logic cho cấp phát mã tuần tự.
+
+Mỗi loại mã có một dòng trong bảng `code_sequences`. Cấp số mới là một lệnh
+UPDATE value = value + 1: lệnh này khóa dòng (row-level lock) đến hết
+transaction, nên các INSERT đồng thời nhận số khác nhau mà không cần COUNT.
+
+Hàm cấp số phải được gọi trong cùng transaction với lệnh INSERT dùng mã đó:
+nếu INSERT lỗi thì bộ đếm cũng được rollback, nên dãy mã không bị hổng số.
+"""
+from typing import Callable, List, Optional
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+from .models import CodeSequence
+
+
+class SequenceService:
+    """Service cấp phát mã tuần tự."""
+
+    @staticmethod
+    def next_value(key: str, start: Optional[Callable[[], int]] = None, count: int = 1) -> int:
+        """
+        Cấp số tiếp theo cho bộ đếm `key`.
+
+        Args:
+            key: Tên bộ đếm (ví dụ 'PKG', 'PRJ2510')
+            start: Hàm trả về số đã dùng lớn nhất, chỉ gọi khi bộ đếm chưa tồn tại
+            count: Số lượng số cần cấp liên tiếp (một lệnh UPDATE cho cả khối)
+
+        Returns:
+            Số cuối cùng vừa cấp (khối là last - count + 1 .. last)
+        """
+        # savepoint=False: bên trong transaction của caller thì rollback cùng INSERT
+        with transaction.atomic(savepoint=False):
+            updated = CodeSequence.objects.filter(key=key).update(
+                value=F('value') + count, updated_at=timezone.now()
+            )
+            if not updated:
+                initial = start() if start else 0
+                try:
+                    with transaction.atomic():
+                        CodeSequence.objects.create(key=key, value=initial + count)
+                    return initial + count
+                except IntegrityError:
+                    # Transaction khác vừa tạo bộ đếm: dùng dòng đó
+                    CodeSequence.objects.filter(key=key).update(
+                        value=F('value') + count, updated_at=timezone.now()
+                    )
+            return CodeSequence.objects.values_list('value', flat=True).get(key=key)
+
+    @staticmethod
+    def next_code(prefix: str, width: int, model, field: str) -> str:
+        """
+        Cấp mã tiếp theo dạng prefix + số (đệm 0 đến `width` chữ số).
+
+        Lần đầu dùng một prefix, bộ đếm bắt đầu sau mã lớn nhất đang có
+        trong `model.field`, nên dữ liệu cũ không bị trùng mã.
+
+        Args:
+            prefix: Tiền tố mã, cũng là tên bộ đếm
+            width: Số chữ số tối thiểu
+            model: Model chứa mã
+            field: Tên field chứa mã
+
+        Returns:
+            Mã mới
+        """
+        value = SequenceService.next_value(
+            prefix, start=lambda: SequenceService._max_existing(model, field, prefix)
+        )
+        return f"{prefix}{str(value).zfill(width)}"
+
+    @staticmethod
+    def next_codes(prefix: str, width: int, model, field: str, count: int) -> List[str]:
+        """
+        Cấp một khối `count` mã liên tiếp (dùng cho import hàng loạt).
+
+        Giống `next_code` nhưng chỉ một lệnh UPDATE cho cả khối; phải gọi
+        trong cùng transaction với bulk_create dùng các mã này.
+
+        Returns:
+            Danh sách mã theo thứ tự tăng dần
+        """
+        if count <= 0:
+            return []
+        last = SequenceService.next_value(
+            prefix, start=lambda: SequenceService._max_existing(model, field, prefix), count=count
+        )
+        return [f"{prefix}{str(value).zfill(width)}" for value in range(last - count + 1, last + 1)]
+
+    @staticmethod
+    def _max_existing(model, field: str, prefix: str) -> int:
+        """Số lớn nhất đang dùng trong các mã có `prefix`."""
+        codes = model.objects.filter(**{f'{field}__startswith': prefix}).values_list(field, flat=True)
+        numbers = (code[len(prefix):] for code in codes)
+        return max((int(number) for number in numbers if number.isdigit()), default=0)
@@ -0,0 +1,134 @@
+"""
+Unit tests cho SequenceService.
+"""
+import pytest
+import threading
+from datetime import datetime
+from decimal import Decimal
+from django.db import OperationalError, close_old_connections, connection
+from django.test import TestCase, TransactionTestCase
+from apps.packages.models import Package
+from apps.partners.models import Partner
+from apps.projects.models import Project
+from apps.sequences.models import CodeSequence
+from apps.sequences.services import SequenceService
+
+
+def _create_package(name):
+    return Package.objects.create(
+        name=name, category='wedding', price=Decimal('5000000'), description='Test'
+    )
+
+
+@pytest.mark.django_db
+class TestSequenceService(TestCase):
+    """Test cases for SequenceService."""
+
+    def test_next_value_increments(self):
+        """Test counters start at 1 and increment by one."""
+        values = [SequenceService.next_value('TEST') for _ in range(3)]
+
+        self.assertEqual(values, [1, 2, 3])
+        self.assertEqual(CodeSequence.objects.get(key='TEST').value, 3)
+
+    def test_next_codes_allocates_a_block(self):
+        """Test a block of codes costs one counter update and continues the sequence."""
+        SequenceService.next_value('BLK')
+
+        with self.assertNumQueries(2):
+            # UPDATE counter, SELECT value
+            codes = SequenceService.next_codes('BLK', 3, Package, 'package_id', 4)
+
+        self.assertEqual(codes, ['BLK002', 'BLK003', 'BLK004', 'BLK005'])
+        self.assertEqual(SequenceService.next_value('BLK'), 6)
+
+    def test_counter_seeded_from_existing_codes(self):
+        """Test a new counter continues after the highest existing code."""
+        Package.objects.bulk_create([
+            Package(package_id='PKG00007', name='Old 7', category='wedding', price=1),
+            Package(package_id='PKG00003', name='Old 3', category='wedding', price=1),
+        ])
+
+        package = _create_package('New')
+
+        self.assertEqual(package.package_id, 'PKG00008')
+
+    def test_allocation_does_not_count_rows(self):
+        """Test allocating a code is O(1): no COUNT over the table."""
+        _create_package('First')
+
+        with self.assertNumQueries(5):
+            # SAVEPOINT, UPDATE counter, SELECT value, INSERT, RELEASE
+            _create_package('Second')
+
+    def test_failed_insert_rolls_back_counter(self):
+        """Test a failed insert does not leave a gap in the sequence."""
+        _create_package('First')
+
+        with self.assertRaises(Exception):
+            Package.objects.create(name='Broken', category='wedding', price=None)
+
+        self.assertEqual(_create_package('Second').package_id, 'PKG00002')
+
+    def test_partner_codes(self):
+        """Test partner ids use their own counter."""
+        partner = Partner.objects.create(name='Flower Shop', type='flower', cost='100000')
+
+        self.assertEqual(partner.partner_id, 'PTN00001')
+
+    def test_project_codes_scoped_per_month(self):
+        """Test project codes restart per YYMM prefix."""
+        package = _create_package('Wedding')
+        prefix = f"PRJ{datetime.now():%y%m}"
+        CodeSequence.objects.create(key='PRJ0001', value=42)
+
+        project = Project.objects.create(
+            customer_name='Customer', customer_phone='0123456789', package_type=package,
+            package_name='Wedding', package_price=Decimal('5000000'), package_discount=Decimal('0'),
+            package_final_price=Decimal('5000000'), shoot_date=datetime.now().date(),
+        )
+
+        self.assertEqual(project.project_code, f'{prefix}0001')
+
+
+@pytest.mark.django_db
+class TestSequenceConcurrency(TransactionTestCase):
+    """Stress test: many threads inserting at once."""
+
+    THREADS = 16
+    INSERTS_PER_THREAD = 10
+
+    def test_concurrent_inserts_get_unique_gap_free_codes(self):
+        """Test concurrent inserts get collision-free, gap-free codes."""
+        barrier = threading.Barrier(self.THREADS)
+        errors = []
+
+        def worker(index):
+            try:
+                barrier.wait()
+                for n in range(self.INSERTS_PER_THREAD):
+                    while True:
+                        try:
+                            _create_package(f'Package {index}-{n}')
+                            break
+                        except OperationalError:
+                            # SQLite rejects concurrent writers instead of
+                            # waiting on the row lock; retry the insert
+                            continue
+            except Exception as e:  # pragma: no cover - reported below
+                errors.append(e)
+            finally:
+                close_old_connections()
+                connection.close()
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        total = self.THREADS * self.INSERTS_PER_THREAD
+        codes = sorted(Package.objects.values_list('package_id', flat=True))
+        self.assertEqual(codes, [f'PKG{n:05d}' for n in range(1, total + 1)])
+        self.assertEqual(CodeSequence.objects.get(key='PKG').value, total)
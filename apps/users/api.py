@@ -1,9 +1,13 @@
 """
 User authentication API endpoints.
 """
-from ninja import Router
+from ninja import File, Router
+from ninja.files import UploadedFile
 from ninja.errors import HttpError
 from django.contrib.auth import authenticate
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
 from .schemas import (
     LoginSchema,
     TokenSchema,
@@ -11,8 +15,32 @@ from .schemas import (
     PasswordChangeSchema,
     UserCreate,
 )
-from .services import create_jwt_token, verify_jwt_token
-from api.main import AuthBearer
+from .cache import principal_cache
+from .hashing import HashingPoolBusy, check_password, hash_password
+from .provisioning import (
+    MAX_ROWS_PER_REQUEST,
+    ProvisioningError,
+    ProvisioningResult,
+    detect_format,
+    parse_rows,
+    provision_users,
+)
+from .services import (
+    authenticate_credentials,
+    create_jwt_token,
+    verify_jwt_token,
+    revoke_jwt_claims,
+    serialize_user,
+    user_etag,
+)
+from .throttling import (
+    LoginThrottled,
+    check_login_throttle,
+    get_client_ip,
+    reset_login_throttle,
+)
+from api.dependencies import auth_bearer, get_current_user as get_auth_user
+from api.permissions import require_roles
 
 router = Router()
 
@@ -33,14 +61,20 @@ def register(request, payload: UserCreate):
     if payload.email and User.objects.filter(email=payload.email).exists():
         raise HttpError(400, "Email already exists")
 
-    # Create user
-    user = User.objects.create_user(
+    # Create user (password hashed on the bounded hashing pool)
+    try:
+        password_hash = hash_password(payload.password)
+    except HashingPoolBusy:
+        raise HttpError(503, "Server is busy, please try again")
+
+    user = User(
         username=payload.username,
         email=payload.email,
-        password=payload.password,
         full_name=payload.full_name,
         role=payload.role,
     )
+    user.password = password_hash
+    user.save()
 
     # Generate token
     token = create_jwt_token(user)
@@ -49,16 +83,7 @@ def register(request, payload: UserCreate):
         "success": True,
         "token": token,
         "message": "Registration successful",
-        "user": {
-            "id": str(user.id),
-            "username": user.username,
-            "email": user.email,
-            "full_name": user.full_name,
-            "role": user.role,
-            "is_active": user.is_active,
-            "created_at": user.created_at.isoformat(),
-            "updated_at": user.updated_at.isoformat(),
-        }
+        "user": serialize_user(user)
     }
 
 
@@ -68,70 +93,120 @@ def login(request, payload: LoginSchema):
     User login endpoint.
     Returns JWT token on successful authentication.
     """
-    from .models import User
+    try:
+        check_login_throttle(payload.username, get_client_ip(request))
+    except LoginThrottled:
+        raise HttpError(429, "Too many login attempts, please try again later")
 
     try:
-        user = User.objects.get(username=payload.username)
-        if user.check_password(payload.password):
-            token = create_jwt_token(user)
-            return {
-                "success": True,
-                "token": token,
-                "message": "Login successful",
-                "user": {
-                    "id": str(user.id),
-                    "username": user.username,
-                    "email": user.email,
-                    "full_name": user.full_name,
-                    "role": user.role,
-                    "is_active": user.is_active,
-                    "created_at": user.created_at.isoformat(),
-                    "updated_at": user.updated_at.isoformat(),
-                }
-            }
-    except User.DoesNotExist:
-        pass
+        user = authenticate_credentials(payload.username, payload.password)
+    except HashingPoolBusy:
+        raise HttpError(503, "Server is busy, please try again")
+
+    if user is not None:
+        reset_login_throttle(payload.username)
+        token = create_jwt_token(user)
+        return {
+            "success": True,
+            "token": token,
+            "message": "Login successful",
+            "user": serialize_user(user)
+        }
 
     raise HttpError(401, "Invalid credentials")
 
 
-@router.get("/me", auth=AuthBearer())
-def get_current_user(request):
+@router.get("/me", auth=auth_bearer)
+def get_current_user(request, response: HttpResponse):
     """
     Get current authenticated user.
+    Sends a strong ETag; a matching `If-None-Match` gets 304 with no body.
     """
     user = request.auth
-    return {
-        "id": str(user.id),
-        "username": user.username,
-        "email": user.email,
-        "full_name": user.full_name,
-        "role": user.role,
-        "is_active": user.is_active,
-        "created_at": user.created_at.isoformat(),
-        "updated_at": user.updated_at.isoformat(),
-    }
+    etag = user_etag(user)
+
+    if _etag_matches(request.headers.get('If-None-Match', ''), etag):
+        not_modified = HttpResponseNotModified()
+        _set_profile_cache_headers(not_modified, etag)
+        return not_modified
+
+    _set_profile_cache_headers(response, etag)
+    return serialize_user(user)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match uses weak comparison, so a W/ prefix still matches."""
+    etags = parse_etags(if_none_match)
+    return '*' in etags or any(tag.removeprefix('W/') == etag for tag in etags)
+
 
+def _set_profile_cache_headers(response, etag: str):
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    patch_vary_headers(response, ['Authorization'])
 
-@router.post("/change-password", auth=AuthBearer())
+
+@router.post("/change-password", auth=auth_bearer)
 def change_password(request, payload: PasswordChangeSchema):
     """
     Change user password.
+    Revokes every previously issued token and returns a fresh one.
     """
-    user = request.auth
+    user = get_auth_user(request)
 
-    if not user.check_password(payload.old_password):
-        raise HttpError(400, "Invalid old password")
-
-    user.set_password(payload.new_password)
+    try:
+        is_correct, _ = check_password(payload.old_password, user.password)
+        if not is_correct:
+            raise HttpError(400, "Invalid old password")
+        user.password = hash_password(payload.new_password)
+    except HashingPoolBusy:
+        raise HttpError(503, "Server is busy, please try again")
+
+    user.rotate_token_version()
     user.save()
 
-    return {"message": "Password changed successfully"}
+    return {"message": "Password changed successfully", "token": create_jwt_token(user)}
 
 
-@router.post("/logout", auth=AuthBearer())
+@router.post("/logout", auth=auth_bearer)
 def logout(request):
     """
-    Logout endpoint (token invalidation handled on client side).
+    Logout endpoint.
+    Revokes the presented token until it expires.
     """
+    revoke_jwt_claims(request.auth_claims)
     return {"message": "Logged out successfully"}
+
+
+@router.post("/users/bulk", auth=auth_bearer)
+@require_roles('admin')
+def bulk_provision_users(request, file: UploadedFile = File(...), format: str = None):
+    """
+    Create many users from an uploaded CSV or JSONL file (admin only).
+    Columns/keys: username, password, email, full_name, role.
+    Invalid or conflicting rows are reported per row; the rest are created.
+    """
+    fmt = format or detect_format(file.name)
+    try:
+        text = file.read().decode('utf-8-sig')
+    except UnicodeDecodeError:
+        raise HttpError(400, "File must be UTF-8 encoded")
+
+    result = ProvisioningResult()
+    try:
+        rows = parse_rows(text, fmt, result)
+    except ProvisioningError as e:
+        raise HttpError(400, str(e))
+    if len(rows) > MAX_ROWS_PER_REQUEST:
+        raise HttpError(400, f"Too many rows (max {MAX_ROWS_PER_REQUEST} per request)")
+
+    return provision_users(rows, result).as_dict()
+
+
+@router.get("/cache-stats", auth=auth_bearer)
+@require_roles('admin')
+def principal_cache_stats(request):
+    """
+    Principal cache hit/miss counters for the current process.
+    """
+    return principal_cache.stats()
@@ -0,0 +1,173 @@
+"""
+Two-tier caches for authentication lookups.
+
+Tier 1 is an in-process LRU with a short TTL (no network hop).
+Tier 2 is the configured Django cache backend (Redis in production).
+"""
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import cache
+
+_MISSING = object()
+
+
+class LocalLRUCache:
+    """Thread-safe in-process LRU cache with per-entry TTL."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=_MISSING):
+        """Return the cached value or `default` if missing/expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        """Store a value, evicting the least recently used entry if full."""
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        """Remove a key if present."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class TwoTierCache:
+    """
+    Read-through cache: local LRU -> shared cache backend -> loader.
+
+    Negative results (loader returned None) are cached as well, so a token
+    for a deleted/inactive user does not hit the database on every call.
+    """
+
+    def __init__(self, namespace: str, local_maxsize: int, local_ttl: float, shared_ttl: int):
+        self.namespace = namespace
+        self.shared_ttl = shared_ttl
+        self.local = LocalLRUCache(local_maxsize, local_ttl)
+        self._counter_lock = threading.Lock()
+        self.reset_stats()
+
+    def _shared_key(self, key) -> str:
+        return f"{self.namespace}:{key}"
+
+    def _count(self, counter: str):
+        with self._counter_lock:
+            self._stats[counter] += 1
+
+    def get(self, key, loader):
+        """
+        Return the value for `key`, calling `loader(key)` on a full miss.
+        """
+        key = str(key)
+
+        value = self.local.get(key)
+        if value is not _MISSING:
+            self._count('local_hits')
+            return value
+
+        value = cache.get(self._shared_key(key), _MISSING)
+        if value is not _MISSING:
+            self._count('shared_hits')
+            self.local.set(key, value)
+            return value
+
+        self._count('misses')
+        value = loader(key)
+        self.set(key, value)
+        return value
+
+    async def aget(self, key, loader):
+        """
+        Async variant of `get`; `loader(key)` must be a coroutine function.
+        """
+        key = str(key)
+
+        value = self.local.get(key)
+        if value is not _MISSING:
+            self._count('local_hits')
+            return value
+
+        value = await cache.aget(self._shared_key(key), _MISSING)
+        if value is not _MISSING:
+            self._count('shared_hits')
+            self.local.set(key, value)
+            return value
+
+        self._count('misses')
+        value = await loader(key)
+        self.local.set(key, value)
+        await cache.aset(self._shared_key(key), value, self.shared_ttl)
+        return value
+
+    def set(self, key, value):
+        """Write a value to both tiers."""
+        key = str(key)
+        self.local.set(key, value)
+        cache.set(self._shared_key(key), value, self.shared_ttl)
+
+    def invalidate(self, key):
+        """Drop a key from both tiers."""
+        key = str(key)
+        self.local.delete(key)
+        cache.delete(self._shared_key(key))
+
+    def clear_local(self):
+        """Drop every entry from the in-process tier."""
+        self.local.clear()
+
+    def reset_stats(self):
+        """Reset hit/miss counters."""
+        with self._counter_lock:
+            self._stats = {'local_hits': 0, 'shared_hits': 0, 'misses': 0}
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and the overall hit ratio."""
+        with self._counter_lock:
+            stats = dict(self._stats)
+        lookups = stats['local_hits'] + stats['shared_hits'] + stats['misses']
+        stats['lookups'] = lookups
+        stats['hit_ratio'] = (
+            (stats['local_hits'] + stats['shared_hits']) / lookups if lookups else 0.0
+        )
+        stats['local_size'] = len(self.local)
+        return stats
+
+
+principal_cache = TwoTierCache(
+    namespace='auth:principal',
+    local_maxsize=settings.PRINCIPAL_CACHE_LOCAL_MAXSIZE,
+    local_ttl=settings.PRINCIPAL_CACHE_LOCAL_TTL,
+    shared_ttl=settings.PRINCIPAL_CACHE_TTL,
+)
+
+token_version_cache = TwoTierCache(
+    namespace='auth:token_version',
+    local_maxsize=settings.TOKEN_VERSION_CACHE_LOCAL_MAXSIZE,
+    local_ttl=settings.PRINCIPAL_CACHE_LOCAL_TTL,
+    shared_ttl=settings.PRINCIPAL_CACHE_TTL,
+)
@@ -0,0 +1,24 @@
+"""
+Password hashers with work factors taken from settings.
+
+Algorithm names are unchanged, so existing hashes keep verifying and are
+upgraded on the next login when the configured work factor changes.
+"""
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """pbkdf2_sha256 with `PASSWORD_PBKDF2_ITERATIONS` iterations."""
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_PBKDF2_ITERATIONS
+
+
+class BCryptSHA256PasswordHasher(hashers.BCryptSHA256PasswordHasher):
+    """bcrypt_sha256 with `PASSWORD_BCRYPT_ROUNDS` rounds."""
+
+    @property
+    def rounds(self):
+        return settings.PASSWORD_BCRYPT_ROUNDS
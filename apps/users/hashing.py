@@ -0,0 +1,163 @@
+"""
+Bounded worker pool for password hashing.
+
+PBKDF2/bcrypt release the GIL, so hashing on a small dedicated pool caps
+how many CPU-bound hashes run at once. Callers still wait for the result,
+but at most `PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE_DEPTH` request
+threads can be tied up in hashing; anything beyond that fails fast with
+`HashingPoolBusy` (surfaced as HTTP 503) instead of queueing behind it.
+
+Only pure hashing runs on the pool; no database access happens there.
+
+Bulk provisioning hashes many passwords at once on a separate process
+pool (`PASSWORD_HASH_PROCESSES`) so a large batch uses every core.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher, make_password, verify_password
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+
+class HashingPoolBusy(Exception):
+    """Raised when the hashing pool has no free slot."""
+
+
+class HashingPool:
+    """ThreadPoolExecutor with a hard limit on in-flight + queued jobs."""
+
+    def __init__(self, workers: int, queue_depth: int, timeout: float):
+        self.workers = workers
+        self.queue_depth = queue_depth
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(workers + queue_depth)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+
+    def run(self, fn, *args):
+        """Run `fn(*args)` on the pool and wait for its result."""
+        if not self._slots.acquire(blocking=False):
+            raise HashingPoolBusy("Password hashing pool is saturated")
+        try:
+            future = self._executor.submit(self._run_job, fn, args)
+        except BaseException:
+            self._slots.release()
+            raise
+
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            raise HashingPoolBusy("Password hashing timed out")
+
+    def _run_job(self, fn, args):
+        # Free the slot before the result is published to the waiting caller
+        try:
+            return fn(*args)
+        finally:
+            self._slots.release()
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+
+_pool = None
+_process_pool = None
+_pool_lock = threading.Lock()
+_dummy_hashes = {}
+
+
+def get_hashing_pool() -> HashingPool:
+    """Return the process-wide pool, created lazily (after worker fork)."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = HashingPool(
+                    workers=settings.PASSWORD_HASH_WORKERS,
+                    queue_depth=settings.PASSWORD_HASH_QUEUE_DEPTH,
+                    timeout=settings.PASSWORD_HASH_TIMEOUT,
+                )
+    return _pool
+
+
+def _init_hashing_process(settings_module: str):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    import django
+    django.setup()
+
+
+def get_process_hashing_pool() -> ProcessPoolExecutor:
+    """Return the process pool for bulk hashing, created lazily."""
+    global _process_pool
+    if _process_pool is None:
+        with _pool_lock:
+            if _process_pool is None:
+                # spawn: forking a process that holds DB/cache connections and
+                # lock-holding threads is unsafe
+                _process_pool = ProcessPoolExecutor(
+                    max_workers=settings.PASSWORD_HASH_PROCESSES,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_hashing_process,
+                    initargs=(os.environ.get('DJANGO_SETTINGS_MODULE', settings.SETTINGS_MODULE),),
+                )
+    return _process_pool
+
+
+def _dummy_hash() -> str:
+    """A hash made with the preferred hasher, used for unknown usernames."""
+    hasher = get_hasher()
+    encoded = _dummy_hashes.get(hasher.algorithm)
+    if encoded is None or hasher.must_update(encoded):
+        encoded = make_password('dummy-password-for-timing')
+        _dummy_hashes[hasher.algorithm] = encoded
+    return encoded
+
+
+def hash_password(raw_password: str) -> str:
+    """Hash a password with the preferred hasher on the pool."""
+    return get_hashing_pool().run(make_password, raw_password)
+
+
+def hash_passwords(raw_passwords: list[str]) -> list[str]:
+    """
+    Hash many passwords with the preferred hasher, in input order.
+    Uses the process pool unless `PASSWORD_HASH_PROCESSES` is 0.
+    """
+    if not raw_passwords:
+        return []
+    if settings.PASSWORD_HASH_PROCESSES <= 0:
+        return [make_password(raw) for raw in raw_passwords]
+
+    pool = get_process_hashing_pool()
+    chunksize = max(1, len(raw_passwords) // (settings.PASSWORD_HASH_PROCESSES * 4))
+    return list(pool.map(make_password, raw_passwords, chunksize=chunksize))
+
+
+def check_password(raw_password: str, encoded) -> tuple[bool, bool]:
+    """
+    Verify a password on the pool.
+
+    Returns (is_correct, must_update). When `encoded` is None (unknown user)
+    a dummy hash is verified instead so the response time stays the same.
+    """
+    if encoded is None:
+        get_hashing_pool().run(verify_password, raw_password, _dummy_hash())
+        return False, False
+    return get_hashing_pool().run(verify_password, raw_password, encoded)
+
+
+@receiver(setting_changed)
+def reset_hashing_pool(*, setting, **kwargs):
+    """Recreate the pools / dummy hash when related settings change (tests)."""
+    global _pool, _process_pool
+    if setting.startswith('PASSWORD_HASH'):
+        with _pool_lock:
+            if _pool is not None:
+                _pool.shutdown()
+            if _process_pool is not None:
+                _process_pool.shutdown(wait=False)
+            _pool = None
+            _process_pool = None
+        _dummy_hashes.clear()
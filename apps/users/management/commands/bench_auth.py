@@ -0,0 +1,85 @@
+"""
+Management command to benchmark per-request authentication overhead.
+
+The 'auth' cache holds the live token denylist, so the benchmark runs
+against the same backend under a separate key prefix and deletes its
+entries afterwards.
+"""
+import time
+import jwt
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import override_settings
+from apps.users.models import User
+from apps.users.revocation import token_denylist
+from apps.users.services import authenticate_token, create_jwt_token
+
+BENCH_CACHE_ALIAS = 'bench-auth'
+BENCH_REVOCATIONS = 1000
+
+
+class Command(BaseCommand):
+    help = 'Benchmark auth overhead per request (token denylist before/after)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20000)
+
+    def handle(self, *args, **options):
+        auth_cache = settings.CACHES[settings.AUTH_CACHE_ALIAS]
+        bench_cache = {**auth_cache, 'KEY_PREFIX': f"{auth_cache.get('KEY_PREFIX', '')}bench"}
+        token_denylist.reset()
+        try:
+            with override_settings(
+                CACHES={**settings.CACHES, BENCH_CACHE_ALIAS: bench_cache},
+                AUTH_CACHE_ALIAS=BENCH_CACHE_ALIAS,
+            ):
+                try:
+                    self._run(options['iterations'])
+                finally:
+                    self._cleanup()
+        finally:
+            # Do not keep the benchmark's filter in this process
+            token_denylist.reset()
+
+    def _cleanup(self):
+        """Delete the benchmark's denylist entries (only its own prefix)."""
+        seq = caches[BENCH_CACHE_ALIAS].get(token_denylist._seq_key()) or 0
+        caches[BENCH_CACHE_ALIAS].delete_many(
+            [token_denylist._jti_key(f'bench-{i}') for i in range(BENCH_REVOCATIONS)]
+            + [token_denylist._entry_key(n) for n in range(1, seq + 1)]
+            + [token_denylist._seq_key()]
+        )
+
+    def _run(self, iterations):
+        with transaction.atomic():
+            user = User.objects.create_user(username='__bench_auth__', password='bench-password')
+            token = create_jwt_token(user)
+            legacy_payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+            legacy_payload.pop('jti')
+            legacy_token = jwt.encode(legacy_payload, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+
+            # Some unrelated revocations so the filter is not empty
+            for i in range(BENCH_REVOCATIONS):
+                token_denylist.revoke(f'bench-{i}', time.time() + 60)
+            token_denylist.reset()
+
+            cases = [
+                ('before: no jti / no denylist', legacy_token, {}),
+                ('denylist, cache lookup per request', token, {'TOKEN_DENYLIST_BLOOM': False}),
+                ('denylist + bloom filter', token, {'TOKEN_DENYLIST_BLOOM': True}),
+            ]
+
+            backend = settings.CACHES[settings.AUTH_CACHE_ALIAS]['BACKEND']
+            self.stdout.write(f'Iterations: {iterations}, auth cache: {backend}')
+            for label, case_token, overrides in cases:
+                with override_settings(**overrides):
+                    authenticate_token(case_token)  # warm caches
+                    started = time.perf_counter()
+                    for _ in range(iterations):
+                        authenticate_token(case_token)
+                    elapsed = time.perf_counter() - started
+                self.stdout.write(f'  {label:<40} {elapsed / iterations * 1e6:8.1f} us/request')
+
+            transaction.set_rollback(True)
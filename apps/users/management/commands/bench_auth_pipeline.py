@@ -0,0 +1,66 @@
+"""
+Management command to benchmark auth + permission overhead per call.
+"""
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import RequestFactory
+from api.dependencies import auth_bearer
+from api.permissions import require_roles
+from apps.users.models import User
+from apps.users.services import create_jwt_token
+
+
+@require_roles('admin', 'manager')
+def _protected(request):
+    return None
+
+
+class Command(BaseCommand):
+    help = 'Benchmark auth + permission overhead per call'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20000)
+
+    def _time(self, label, fn, iterations):
+        fn()  # warm caches
+        started = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f'  {label:<45} {elapsed / iterations * 1e6:8.2f} us/call')
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        factory = RequestFactory()
+
+        with transaction.atomic():
+            user = User.objects.create_user(username='__bench_pipeline__', password='bench-password', role='manager')
+            header = f'Bearer {create_jwt_token(user)}'
+
+            def authenticated_request():
+                request = factory.get('/api/projects/', HTTP_AUTHORIZATION=header)
+                request.auth = auth_bearer(request)
+                return request
+
+            def full_pipeline():
+                _protected(authenticated_request())
+
+            memoized = authenticated_request()
+
+            def repeated_auth():
+                auth_bearer(memoized)
+
+            def permission_only():
+                _protected(memoized)
+
+            def request_only():
+                factory.get('/api/projects/', HTTP_AUTHORIZATION=header)
+
+            self.stdout.write(f'Iterations: {iterations}')
+            self._time('request construction only (baseline)', request_only, iterations)
+            self._time('request + decode + principal + permission', full_pipeline, iterations)
+            self._time('repeated auth on same request (memoized)', repeated_auth, iterations)
+            self._time('require_roles check', permission_only, iterations)
+
+            transaction.set_rollback(True)
@@ -0,0 +1,84 @@
+"""
+Management command to benchmark per-request middleware overhead on /api/
+with the stock browser middleware versus the lean profile.
+"""
+import time
+from django.core.handlers.base import BaseHandler
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import RequestFactory, override_settings
+from apps.users.models import User
+from apps.users.services import create_jwt_token
+
+STOCK_MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    'corsheaders.middleware.CorsMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+LEAN_MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    'corsheaders.middleware.CorsMiddleware',
+    'api.middleware.LeanSessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'api.middleware.LeanCsrfViewMiddleware',
+    'api.middleware.LeanAuthenticationMiddleware',
+    'api.middleware.LeanMessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+
+class Command(BaseCommand):
+    help = 'Benchmark per-request middleware overhead: stock vs lean profile'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=5000)
+
+    def _handler(self, middleware):
+        with override_settings(MIDDLEWARE=middleware):
+            handler = BaseHandler()
+            handler.load_middleware()
+        return handler
+
+    def _time(self, handler, make_request, iterations):
+        handler.get_response(make_request())  # warm caches
+        started = time.perf_counter()
+        for _ in range(iterations):
+            response = handler.get_response(make_request())
+            response.close()
+        return (time.perf_counter() - started) / iterations * 1e6
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        factory = RequestFactory()
+
+        # RequestFactory requests carry the 'testserver' host
+        with transaction.atomic(), override_settings(ALLOWED_HOSTS=['testserver']):
+            user = User.objects.create_user(username='__bench_middleware__', password='bench-password', role='admin')
+            header = f'Bearer {create_jwt_token(user)}'
+
+            cases = [
+                ('GET /api/health', lambda: factory.get('/api/health')),
+                ('GET /api/auth/me (bearer)', lambda: factory.get('/api/auth/me', HTTP_AUTHORIZATION=header)),
+                ('GET /api/auth/me (bearer + session cookie)', lambda: factory.get(
+                    '/api/auth/me', HTTP_AUTHORIZATION=header, HTTP_COOKIE='sessionid=stale; csrftoken=x'
+                )),
+            ]
+            stock = self._handler(STOCK_MIDDLEWARE)
+            lean = self._handler(LEAN_MIDDLEWARE)
+
+            self.stdout.write(f'Iterations: {iterations}')
+            self.stdout.write(f"  {'case':<45} {'stock us':>10} {'lean us':>10} {'saved':>8}")
+            for label, make_request in cases:
+                stock_us = self._time(stock, make_request, iterations)
+                lean_us = self._time(lean, make_request, iterations)
+                self.stdout.write(
+                    f'  {label:<45} {stock_us:10.1f} {lean_us:10.1f} {stock_us - lean_us:8.1f}'
+                )
+
+            transaction.set_rollback(True)
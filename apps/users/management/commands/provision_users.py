@@ -0,0 +1,36 @@
+"""
+Management command to create users in bulk from a CSV or JSONL file.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from apps.users.provisioning import FORMATS, ProvisioningError, detect_format, provision_from_text
+
+
+class Command(BaseCommand):
+    help = 'Create users in bulk from a CSV or JSONL file (username, password, email, full_name, role)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or JSONL file')
+        parser.add_argument('--format', choices=FORMATS, help='Input format (default: from file extension)')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or detect_format(path)
+        if fmt is None:
+            raise CommandError('Cannot tell the format from the file name, pass --format')
+
+        try:
+            with open(path, encoding='utf-8-sig') as f:
+                text = f.read()
+        except OSError as e:
+            raise CommandError(str(e))
+
+        try:
+            result = provision_from_text(text, fmt).as_dict()
+        except ProvisioningError as e:
+            raise CommandError(str(e))
+
+        for error in result['errors']:
+            self.stdout.write(self.style.WARNING(f"  row {error['row']}: {error['error']}"))
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {result['created']} users, {result['failed']} rows failed"
+        ))
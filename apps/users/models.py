@@ -5,6 +5,9 @@ import uuid
 from django.db import models
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
 
+# Changing any of these revokes every token issued before (see User.save)
+TOKEN_REVOKING_FIELDS = ('role', 'password', 'is_active')
+
 
 class UserManager(BaseUserManager):
     """Custom user manager."""
@@ -53,6 +56,9 @@ class User(AbstractBaseUser, PermissionsMixin):
     is_staff = models.BooleanField(default=False)
     is_superuser = models.BooleanField(default=False)
 
+    # Bumped to revoke every JWT issued before (e.g. on password change)
+    token_version = models.PositiveIntegerField(default=0)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -79,3 +85,40 @@ class User(AbstractBaseUser, PermissionsMixin):
     def is_manager(self):
         """Check if user is manager or admin."""
         return self.role in ['admin', 'manager'] or self.is_superuser
+
+    def rotate_token_version(self):
+        """Invalidate all previously issued tokens (persisted on next save)."""
+        self.token_version += 1
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        user = super().from_db(db, field_names, values)
+        user._loaded_credentials = user._credential_values()
+        return user
+
+    def _credential_values(self) -> dict:
+        """Loaded values of token_version and TOKEN_REVOKING_FIELDS (deferred ones skipped)."""
+        return {
+            name: self.__dict__[name]
+            for name in ('token_version', *TOKEN_REVOKING_FIELDS)
+            if name in self.__dict__
+        }
+
+    def save(self, *args, **kwargs):
+        """
+        Save, rotating token_version when role, password or is_active changed
+        (unless the caller already rotated it): with AUTH_STATELESS the role
+        is trusted from the token, so old tokens must stop verifying.
+        """
+        loaded = getattr(self, '_loaded_credentials', None)
+        if loaded and 'token_version' in loaded and self.token_version == loaded['token_version']:
+            changed = any(
+                self.__dict__.get(name, value) != value
+                for name, value in loaded.items() if name != 'token_version'
+            )
+            if changed:
+                self.rotate_token_version()
+                if kwargs.get('update_fields') is not None:
+                    kwargs['update_fields'] = {*kwargs['update_fields'], 'token_version'}
+        super().save(*args, **kwargs)
+        self._loaded_credentials = self._credential_values()
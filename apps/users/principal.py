@@ -0,0 +1,55 @@
+"""
+Lightweight authenticated principal built from JWT claims.
+"""
+from uuid import UUID
+
+
+class Principal:
+    """
+    Claims-only principal used in stateless auth mode.
+
+    Exposes `id`, `username`, `role` and `token_version` straight from the
+    token. Any other attribute (e.g. `check_password`, `email`) loads the
+    full `User` on first access and is delegated to it.
+    """
+
+    __slots__ = ('id', 'username', 'role', 'token_version', '_user')
+
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, user_id, username: str, role: str, token_version: int = 0):
+        self.id = user_id if isinstance(user_id, UUID) else UUID(str(user_id))
+        self.username = username
+        self.role = role
+        self.token_version = token_version
+        self._user = None
+
+    @property
+    def pk(self):
+        return self.id
+
+    @property
+    def user(self):
+        """The full `User` model, loaded on first access."""
+        if self._user is None:
+            from .models import User
+            from .services import get_cached_user
+
+            user = get_cached_user(self.id)
+            if user is None:
+                raise User.DoesNotExist(f"User {self.id} no longer active")
+            self._user = user
+        return self._user
+
+    def __getattr__(self, name):
+        # Only reached for attributes that are not slots/class attributes.
+        if name.startswith('__') or name in Principal.__slots__:
+            raise AttributeError(name)
+        return getattr(self.user, name)
+
+    def __str__(self):
+        return self.username
+
+    def __repr__(self):
+        return f"<Principal {self.username} ({self.role})>"
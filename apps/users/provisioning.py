@@ -0,0 +1,200 @@
+"""
+Bulk user provisioning from CSV or JSONL.
+
+Rows are validated with `UserCreate`, checked for username/email conflicts
+against the batch itself and the database (one `IN` query), hashed on the
+process pool and inserted with `bulk_create`. Invalid rows are reported
+per row and skipped; the rest of the batch is still created.
+"""
+import csv
+import io
+import json
+from dataclasses import dataclass, field
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from pydantic import ValidationError
+from .hashing import hash_passwords
+from .models import User
+from .schemas import UserCreate
+
+FORMATS = ('csv', 'jsonl')
+BULK_CREATE_BATCH_SIZE = 500
+MAX_ROWS_PER_REQUEST = 5000
+OPTIONAL_FIELDS = ('email', 'full_name')
+
+
+class ProvisioningError(Exception):
+    """Raised when the input as a whole cannot be read."""
+
+
+@dataclass
+class ProvisioningResult:
+    """Outcome of a provisioning run; `row` is the line number in the input."""
+    created: list = field(default_factory=list)
+    errors: list = field(default_factory=list)
+
+    def add_error(self, row: int, error: str):
+        self.errors.append({'row': row, 'error': error})
+
+    def as_dict(self) -> dict:
+        return {
+            'created': len(self.created),
+            'failed': len(self.errors),
+            'users': self.created,
+            'errors': sorted(self.errors, key=lambda e: e['row']),
+        }
+
+
+def detect_format(filename: str):
+    """Guess the input format from a file name ('csv', 'jsonl' or None)."""
+    name = (filename or '').lower()
+    if name.endswith('.csv'):
+        return 'csv'
+    if name.endswith(('.jsonl', '.ndjson')):
+        return 'jsonl'
+    return None
+
+
+def parse_rows(text: str, fmt: str, result: ProvisioningResult) -> list[tuple[int, dict]]:
+    """
+    Parse the input into (line number, row dict) pairs.
+    Unparseable lines are recorded on `result` and skipped.
+    """
+    if fmt == 'csv':
+        reader = csv.DictReader(io.StringIO(text))
+        if not reader.fieldnames or 'username' not in reader.fieldnames:
+            raise ProvisioningError("CSV header must include 'username' and 'password'")
+        rows = []
+        for row in reader:
+            data = {key: (value or '').strip() for key, value in row.items() if key}
+            for name in OPTIONAL_FIELDS:
+                if data.get(name) == '':
+                    data[name] = None
+            if not data.get('role'):
+                data.pop('role', None)
+            rows.append((reader.line_num, data))
+        return rows
+
+    if fmt == 'jsonl':
+        rows = []
+        for line_num, line in enumerate(text.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+            except ValueError as e:
+                result.add_error(line_num, f"Invalid JSON: {e}")
+                continue
+            if not isinstance(data, dict):
+                result.add_error(line_num, "Expected a JSON object")
+                continue
+            rows.append((line_num, data))
+        return rows
+
+    raise ProvisioningError(f"Unsupported format, expected one of: {', '.join(FORMATS)}")
+
+
+def _validation_message(exc: ValidationError) -> str:
+    return '; '.join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+
+def provision_users(rows: list[tuple[int, dict]], result: ProvisioningResult = None) -> ProvisioningResult:
+    """
+    Create users from parsed rows, collecting per-row errors on the result.
+    """
+    result = result or ProvisioningResult()
+
+    # 1. Validate, and reject duplicates inside the batch itself
+    valid = []
+    seen_usernames, seen_emails = set(), set()
+    for row_num, data in rows:
+        try:
+            payload = UserCreate(**data)
+        except ValidationError as e:
+            result.add_error(row_num, _validation_message(e))
+            continue
+
+        if payload.username in seen_usernames:
+            result.add_error(row_num, "Duplicate username in input")
+            continue
+        if payload.email and payload.email in seen_emails:
+            result.add_error(row_num, "Duplicate email in input")
+            continue
+        seen_usernames.add(payload.username)
+        if payload.email:
+            seen_emails.add(payload.email)
+        valid.append((row_num, payload))
+
+    # 2. One query for conflicts with existing accounts
+    taken_usernames, taken_emails = set(), set()
+    if valid:
+        existing = User.objects.filter(
+            Q(username__in=seen_usernames) | Q(email__in=seen_emails)
+        ).values_list('username', 'email')
+        for username, email in existing:
+            taken_usernames.add(username)
+            if email:
+                taken_emails.add(email)
+
+    pending = []
+    for row_num, payload in valid:
+        if payload.username in taken_usernames:
+            result.add_error(row_num, "Username already exists")
+        elif payload.email and payload.email in taken_emails:
+            result.add_error(row_num, "Email already exists")
+        else:
+            pending.append((row_num, payload))
+
+    # 3. Hash on the process pool, then insert in bulk
+    hashes = hash_passwords([payload.password for _, payload in pending])
+    users = []
+    for (row_num, payload), password_hash in zip(pending, hashes):
+        user = User(
+            username=payload.username,
+            email=payload.email,
+            full_name=payload.full_name or '',
+            role=payload.role,
+        )
+        user.password = password_hash
+        users.append((row_num, user))
+
+    _insert(users, result)
+    return result
+
+
+def _insert(users: list, result: ProvisioningResult):
+    """
+    Insert with `bulk_create`. If a concurrent insert claimed a username
+    after the conflict check, fall back to row-by-row inserts so only the
+    clashing rows fail.
+    """
+    if not users:
+        return
+
+    try:
+        with transaction.atomic():
+            User.objects.bulk_create([user for _, user in users], batch_size=BULK_CREATE_BATCH_SIZE)
+        inserted = users
+    except IntegrityError:
+        inserted = []
+        for row_num, user in users:
+            try:
+                with transaction.atomic():
+                    user.save(force_insert=True)
+            except IntegrityError:
+                result.add_error(row_num, "Username already exists")
+            else:
+                inserted.append((row_num, user))
+
+    for row_num, user in inserted:
+        result.created.append({'row': row_num, 'id': str(user.id), 'username': user.username})
+
+
+def provision_from_text(text: str, fmt: str) -> ProvisioningResult:
+    """Parse CSV/JSONL text and provision every valid row."""
+    result = ProvisioningResult()
+    rows = parse_rows(text, fmt, result)
+    return provision_users(rows, result)
@@ -0,0 +1,205 @@
+"""
+Token denylist for logout, with an in-process Bloom filter in front.
+
+Revoked `jti`s are stored in the 'auth' cache with a timeout equal to the
+token's remaining lifetime. Every revocation is also appended to a
+sequence-numbered log (`seq` counter + one key per entry) so that each
+process can pull new revocations incrementally into its Bloom filter.
+
+`revoke()` publishes the sequence number (`incr`) before it writes the entry,
+so a concurrent pull can see seq N while entry N is still missing. Entries
+that were missing when their number was first pulled are read again on the
+next `PENDING_PULLS` pulls instead of being skipped until the next rebuild.
+
+A `jti` that is not in the Bloom filter is definitely not revoked and is
+answered without a network hop; a Bloom hit is confirmed against the cache.
+Revocations made by another process become visible here after at most
+`TOKEN_DENYLIST_REFRESH_SECONDS`.
+"""
+import hashlib
+import math
+import threading
+import time
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+
+REFRESH_BATCH_SIZE = 1000
+# Pulls that re-read an entry whose number was published but not yet written
+PENDING_PULLS = 3
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (double hashing on blake2b)."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, item: str):
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class TokenDenylist:
+    """Shared denylist of revoked token ids."""
+
+    prefix = 'denylist'
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bloom = None
+        self._last_seq = 0
+        self._floor_seq = 1
+        # Published sequence numbers with no entry yet -> pulls left to retry
+        self._pending = {}
+        self._refreshed_at = 0.0
+        self._rebuilt_at = 0.0
+
+    @property
+    def cache(self):
+        return caches[settings.AUTH_CACHE_ALIAS]
+
+    def _jti_key(self, jti: str) -> str:
+        return f'{self.prefix}:jti:{jti}'
+
+    def _entry_key(self, seq: int) -> str:
+        return f'{self.prefix}:entry:{seq}'
+
+    def _seq_key(self) -> str:
+        return f'{self.prefix}:seq'
+
+    def revoke(self, jti: str, expires_at: float):
+        """
+        Revoke a token id until `expires_at` (unix timestamp).
+        Tokens that already expired are ignored.
+        """
+        ttl = int(math.ceil(expires_at - time.time()))
+        if ttl <= 0:
+            return
+
+        cache = self.cache
+        cache.set(self._jti_key(jti), 1, ttl)
+
+        cache.add(self._seq_key(), 0, None)
+        seq = cache.incr(self._seq_key())
+        cache.set(self._entry_key(seq), jti, ttl)
+
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.add(jti)
+
+    def is_revoked(self, jti: str) -> bool:
+        """Return True if the token id has been revoked."""
+        if settings.TOKEN_DENYLIST_BLOOM:
+            self._maybe_refresh()
+            if jti not in self._bloom:
+                return False
+        return self.cache.get(self._jti_key(jti)) is not None
+
+    async def ais_revoked(self, jti: str) -> bool:
+        """
+        Async variant of `is_revoked`. A due filter refresh (cache reads)
+        runs in a worker thread and a filter hit is confirmed with the async
+        cache API, so the event loop never blocks on the cache.
+        """
+        if settings.TOKEN_DENYLIST_BLOOM:
+            if self._refresh_due():
+                await sync_to_async(self._maybe_refresh, thread_sensitive=False)()
+            if jti not in self._bloom:
+                return False
+        return await self.cache.aget(self._jti_key(jti)) is not None
+
+    def _refresh_due(self) -> bool:
+        return (
+            self._bloom is None
+            or time.monotonic() - self._refreshed_at >= settings.TOKEN_DENYLIST_REFRESH_SECONDS
+        )
+
+    def _maybe_refresh(self):
+        if not self._refresh_due():
+            return
+        now = time.monotonic()
+
+        with self._lock:
+            if self._bloom is not None and now - self._refreshed_at < settings.TOKEN_DENYLIST_REFRESH_SECONDS:
+                return
+            rebuild = (
+                self._bloom is None
+                or now - self._rebuilt_at >= settings.TOKEN_DENYLIST_REBUILD_SECONDS
+                or self._bloom.count >= self._bloom.capacity
+            )
+            if rebuild:
+                self._rebuild(now)
+            else:
+                self._pull(self._last_seq + 1, self._bloom)
+            self._refreshed_at = now
+
+    def _rebuild(self, now: float):
+        """Start a fresh filter so expired ids stop causing false positives."""
+        bloom = BloomFilter(
+            settings.TOKEN_DENYLIST_BLOOM_CAPACITY,
+            settings.TOKEN_DENYLIST_BLOOM_ERROR_RATE,
+        )
+        self._floor_seq = self._pull(self._floor_seq, bloom)
+        self._bloom = bloom
+        self._rebuilt_at = now
+
+    def _pull(self, start: int, bloom: BloomFilter) -> int:
+        """
+        Load log entries [start, seq], and the pending ones below `start`,
+        into `bloom`.
+        Returns the lowest sequence number that is still alive.
+        """
+        cache = self.cache
+        seq = cache.get(self._seq_key()) or 0
+        lowest_alive = seq + 1
+
+        numbers = sorted(n for n in self._pending if n < start) + list(range(start, seq + 1))
+        loaded = set()
+        for batch_start in range(0, len(numbers), REFRESH_BATCH_SIZE):
+            keys = [self._entry_key(n) for n in numbers[batch_start:batch_start + REFRESH_BATCH_SIZE]]
+            found = cache.get_many(keys)
+            for key, jti in found.items():
+                bloom.add(jti)
+                n = int(key.rsplit(':', 1)[1])
+                loaded.add(n)
+                lowest_alive = min(lowest_alive, n)
+
+        # Newly published numbers without an entry may still be being written;
+        # older misses are expired entries
+        pending = {n: PENDING_PULLS for n in range(max(start, self._last_seq + 1), seq + 1) if n not in loaded}
+        for n, pulls_left in self._pending.items():
+            if n not in loaded and n not in pending and pulls_left > 1:
+                pending[n] = pulls_left - 1
+        self._pending = pending
+        if pending:
+            lowest_alive = min(lowest_alive, min(pending))
+
+        self._last_seq = max(self._last_seq, seq)
+        return lowest_alive
+
+    def reset(self):
+        """Drop the in-process filter (next check reloads from the cache)."""
+        with self._lock:
+            self._bloom = None
+            self._last_seq = 0
+            self._floor_seq = 1
+            self._pending = {}
+
+
+token_denylist = TokenDenylist()
@@ -1,22 +1,78 @@
 """
 User authentication services.
 """
+import hashlib
 import jwt
+import uuid
 from datetime import datetime, timedelta
+from typing import Optional
 from django.conf import settings
+from .cache import principal_cache, token_version_cache
+from .hashing import check_password, hash_password
 from .models import User
+from .principal import Principal
+from .revocation import token_denylist
+
+# Fields kept in the principal cache. The password hash is deliberately left
+# out; it is loaded on demand as a deferred field (e.g. by change-password).
+PRINCIPAL_CACHE_FIELDS = [
+    field.attname for field in User._meta.concrete_fields
+    if field.attname != 'password'
+]
+
+
+def serialize_user(user) -> dict:
+    """
+    Public representation of a user (register, login and /me responses).
+    """
+    return {
+        "id": str(user.id),
+        "username": user.username,
+        "email": user.email,
+        "full_name": user.full_name,
+        "role": user.role,
+        "is_active": user.is_active,
+        "created_at": user.created_at.isoformat(),
+        "updated_at": user.updated_at.isoformat(),
+    }
+
+
+def user_etag(user) -> str:
+    """
+    Strong ETag for a user's profile, derived from `id` + `updated_at`.
+    Every save bumps `updated_at`, so the tag changes with the profile.
+    """
+    version = f"{user.id}:{user.updated_at.isoformat()}"
+    return '"%s"' % hashlib.blake2b(version.encode(), digest_size=16).hexdigest()
 
 
 def create_jwt_token(user: User) -> str:
     """
     Create JWT token for user.
     """
+    return _encode_token(user, timedelta(days=settings.JWT_EXPIRATION_DAYS))
+
+
+def create_scoped_token(user: User, scope: str, lifetime: timedelta) -> str:
+    """
+    Create a short-lived JWT accepted only where `scope` is asked for
+    (`decode_jwt_token(token, scope=...)`), e.g. a query-string token for
+    clients that cannot send an Authorization header. It is not an access
+    token: Bearer auth rejects it.
+    """
+    return _encode_token(user, lifetime, scope=scope)
+
+
+def _encode_token(user: User, lifetime: timedelta, **claims) -> str:
     payload = {
         'user_id': str(user.id),
         'username': user.username,
         'role': user.role,
-        'exp': datetime.utcnow() + timedelta(days=settings.JWT_EXPIRATION_DAYS),
+        'token_version': user.token_version,
+        'jti': uuid.uuid4().hex,
+        'exp': datetime.utcnow() + lifetime,
         'iat': datetime.utcnow(),
+        **claims,
     }
 
     token = jwt.encode(
@@ -28,24 +84,277 @@ def create_jwt_token(user: User) -> str:
     return token
 
 
-def verify_jwt_token(token: str):
+def authenticate_credentials(username: str, password: str):
     """
-    Verify JWT token and return user.
-    Returns None if token is invalid.
+    Check username/password with hashing on the bounded pool.
+
+    Unknown usernames still cost one (dummy) hash so timing does not reveal
+    which accounts exist. Hashes made with an outdated hasher or work factor
+    are upgraded on successful login.
+    Returns the user, or None for invalid credentials.
+
+    Raises:
+        HashingPoolBusy: If the hashing pool is saturated
+    """
+    user = User.objects.filter(username=username).first()
+    encoded = user.password if user is not None else None
+
+    is_correct, must_update = check_password(password, encoded)
+    if not is_correct:
+        return None
+
+    if must_update:
+        # Same password, new hash: not a credential change, so no save()
+        # (which would rotate token_version and log out other sessions)
+        user.password = hash_password(password)
+        User.objects.filter(pk=user.pk).update(password=user.password)
+    return user
+
+
+def _load_principal(user_id: str):
+    """Load the cacheable fields of an active user, or None."""
+    return (
+        User.objects.filter(id=user_id, is_active=True)
+        .values(*PRINCIPAL_CACHE_FIELDS)
+        .first()
+    )
+
+
+def get_cached_user(user_id: str):
+    """
+    Return an active user by id through the principal cache.
+    Returns None if the user does not exist or is inactive.
     """
+    data = principal_cache.get(user_id, _load_principal)
+    if data is None:
+        return None
+    return User.from_db(
+        'default',
+        PRINCIPAL_CACHE_FIELDS,
+        [data[name] for name in PRINCIPAL_CACHE_FIELDS],
+    )
+
+
+async def _aload_principal(user_id: str):
+    """Async variant of `_load_principal`."""
+    try:
+        return await User.objects.values(*PRINCIPAL_CACHE_FIELDS).aget(id=user_id, is_active=True)
+    except User.DoesNotExist:
+        return None
+
+
+async def aget_cached_user(user_id: str):
+    """
+    Async variant of `get_cached_user` (for ASGI views).
+    Returns None if the user does not exist or is inactive.
+    """
+    data = await principal_cache.aget(user_id, _aload_principal)
+    if data is None:
+        return None
+    return User.from_db(
+        'default',
+        PRINCIPAL_CACHE_FIELDS,
+        [data[name] for name in PRINCIPAL_CACHE_FIELDS],
+    )
+
+
+def invalidate_cached_user(user_id):
+    """Drop a user from the principal and token-version caches."""
+    principal_cache.invalidate(user_id)
+    token_version_cache.invalidate(user_id)
+
+
+def _load_token_version(user_id: str):
+    """Current token version of an active user, or None if revoked."""
+    return (
+        User.objects.filter(id=user_id, is_active=True)
+        .values_list('token_version', flat=True)
+        .first()
+    )
+
+
+def get_token_version(user_id: str):
+    """
+    Return the current token version through the token-version cache.
+    Returns None if the user does not exist or is inactive.
+    """
+    return token_version_cache.get(user_id, _load_token_version)
+
+
+async def _aload_token_version(user_id: str):
+    """Async variant of `_load_token_version`."""
+    try:
+        user = await User.objects.only('token_version').aget(id=user_id, is_active=True)
+    except User.DoesNotExist:
+        return None
+    return user.token_version
+
+
+async def aget_token_version(user_id: str):
+    """Async variant of `get_token_version`."""
+    return await token_version_cache.aget(user_id, _aload_token_version)
+
+
+def decode_jwt_token(token: str, scope: Optional[str] = None):
+    """
+    Decode and validate a JWT.
+    Returns the claims dict, or None if the token is invalid, expired,
+    revoked (logged out) or not of the given `scope` (None = access token).
+    """
+    payload = _decode_claims(token, scope)
+    if payload is None:
+        return None
+    jti = payload.get('jti')
+    if jti and token_denylist.is_revoked(jti):
+        return None
+    return payload
+
+
+async def adecode_jwt_token(token: str):
+    """Async variant of `decode_jwt_token` (denylist cache I/O off the event loop)."""
+    payload = _decode_claims(token)
+    if payload is None:
+        return None
+    jti = payload.get('jti')
+    if jti and await token_denylist.ais_revoked(jti):
+        return None
+    return payload
+
+
+def _decode_claims(token: str, scope: Optional[str] = None):
+    """Signature, expiry and scope check only (CPU); None if invalid."""
     try:
         payload = jwt.decode(
             token,
             settings.JWT_SECRET_KEY,
             algorithms=[settings.JWT_ALGORITHM]
         )
+    except (jwt.ExpiredSignatureError, jwt.InvalidTokenError):
+        return None
+
+    if not payload.get('user_id') or payload.get('scope') != scope:
+        return None
+    return payload
+
+
+def revoke_jwt_token(token: str) -> bool:
+    """
+    Revoke a token until its expiry (logout).
+    Returns False if the token is invalid or carries no `jti`.
+    """
+    payload = decode_jwt_token(token)
+    if payload is None:
+        return False
+    return revoke_jwt_claims(payload)
+
+
+def revoke_jwt_claims(payload: dict) -> bool:
+    """
+    Revoke an already decoded token until its expiry.
+    Returns False if the token carries no `jti`.
+    """
+    if not payload.get('jti'):
+        return False
+    token_denylist.revoke(payload['jti'], payload['exp'])
+    return True
+
+
+def user_from_claims(payload: dict):
+    """
+    Resolve decoded claims to the (cached) `User`.
+    Returns None if the user is inactive or the token version is stale.
+    """
+    user = get_cached_user(payload['user_id'])
+    if user is None or payload.get('token_version', 0) != user.token_version:
+        return None
+    return user
+
+
+def principal_from_claims(payload: dict):
+    """
+    Build a claims-only `Principal` from decoded claims.
+    The only lookup is the token-version check (cached).
+    Returns None if the token version is stale or the user inactive.
+    """
+    token_version = payload.get('token_version', 0)
+    if get_token_version(payload['user_id']) != token_version:
+        return None
 
-        user_id = payload.get('user_id')
-        if not user_id:
-            return None
+    return Principal(
+        user_id=payload['user_id'],
+        username=payload.get('username', ''),
+        role=payload.get('role'),
+        token_version=token_version,
+    )
+
+
+def resolve_principal(payload: dict):
+    """
+    Resolve decoded claims to a principal.
+    Uses claims-only mode when `AUTH_STATELESS` is enabled.
+    """
+    if settings.AUTH_STATELESS:
+        return principal_from_claims(payload)
+    return user_from_claims(payload)
+
+
+async def auser_from_claims(payload: dict):
+    """Async variant of `user_from_claims`."""
+    user = await aget_cached_user(payload['user_id'])
+    if user is None or payload.get('token_version', 0) != user.token_version:
+        return None
+    return user
+
+
+async def aprincipal_from_claims(payload: dict):
+    """Async variant of `principal_from_claims`."""
+    token_version = payload.get('token_version', 0)
+    if await aget_token_version(payload['user_id']) != token_version:
+        return None
+
+    return Principal(
+        user_id=payload['user_id'],
+        username=payload.get('username', ''),
+        role=payload.get('role'),
+        token_version=token_version,
+    )
+
+
+async def aresolve_principal(payload: dict):
+    """Async variant of `resolve_principal`."""
+    if settings.AUTH_STATELESS:
+        return await aprincipal_from_claims(payload)
+    return await auser_from_claims(payload)
 
-        user = User.objects.get(id=user_id, is_active=True)
-        return user
 
-    except (jwt.ExpiredSignatureError, jwt.InvalidTokenError, User.DoesNotExist):
+def verify_jwt_token(token: str):
+    """
+    Verify JWT token and return user.
+    Returns None if token is invalid.
+    """
+    payload = decode_jwt_token(token)
+    if payload is None:
+        return None
+    return user_from_claims(payload)
+
+
+def verify_jwt_claims(token: str):
+    """
+    Verify JWT token and return a claims-only `Principal`.
+    Returns None if token is invalid or revoked.
+    """
+    payload = decode_jwt_token(token)
+    if payload is None:
+        return None
+    return principal_from_claims(payload)
+
+
+def authenticate_token(token: str):
+    """
+    Resolve a bearer token to a principal.
+    Uses claims-only mode when `AUTH_STATELESS` is enabled.
+    """
+    payload = decode_jwt_token(token)
+    if payload is None:
         return None
+    return resolve_principal(payload)
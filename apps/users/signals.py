@@ -0,0 +1,27 @@
+"""
+Signal handlers for the users app.
+"""
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import User
+from .services import invalidate_cached_user
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, **kwargs):
+    """
+    Drop the cached principal whenever a user is saved (incl. deactivation).
+
+    Deferred to commit: dropped earlier, a concurrent request could re-cache
+    the old row for PRINCIPAL_CACHE_TTL.
+    """
+    pk = instance.pk
+    transaction.on_commit(lambda: invalidate_cached_user(pk))
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    """Drop the cached principal when a user is deleted (after commit)."""
+    pk = instance.pk
+    transaction.on_commit(lambda: invalidate_cached_user(pk))
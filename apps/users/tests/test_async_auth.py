@@ -0,0 +1,102 @@
+"""
+Tests cho async authentication (ASGI path).
+"""
+import pytest
+import json
+from unittest import mock
+from django.test import TestCase, AsyncClient, override_settings
+from api.dependencies import async_auth_bearer
+from apps.users.cache import principal_cache, token_version_cache
+from apps.users.models import User
+from apps.users.principal import Principal
+from apps.users.revocation import token_denylist
+from apps.users.services import create_jwt_token, revoke_jwt_token
+
+
+class _Request:
+    """Minimal request object for calling the bearer directly."""
+
+
+@pytest.mark.django_db
+class TestAsyncAuthBearer(TestCase):
+    """Test suite cho AsyncAuthBearer."""
+
+    def setUp(self):
+        """Set up test data."""
+        principal_cache.clear_local()
+        token_version_cache.clear_local()
+        self.user = User.objects.create_user(
+            username='asyncuser',
+            email='async@test.com',
+            password='testpass123',
+            role='admin'
+        )
+        self.token = create_jwt_token(self.user)
+
+    async def test_authenticates_valid_token(self):
+        """Test a valid token resolves to the user via the async ORM."""
+        request = _Request()
+
+        user = await async_auth_bearer.authenticate(request, self.token)
+
+        self.assertEqual(user.id, self.user.id)
+        self.assertEqual(request.auth_claims['user_id'], str(self.user.id))
+
+    async def test_rejects_invalid_token(self):
+        """Test an invalid token is rejected."""
+        user = await async_auth_bearer.authenticate(_Request(), 'not-a-jwt')
+
+        self.assertIsNone(user)
+
+    async def test_rejects_stale_token_version(self):
+        """Test tokens issued before a token_version bump are rejected."""
+        self.user.token_version = 1
+        await self.user.asave(update_fields=['token_version'])
+
+        user = await async_auth_bearer.authenticate(_Request(), self.token)
+
+        self.assertIsNone(user)
+
+    async def test_rejects_inactive_user(self):
+        """Test tokens of deactivated users are rejected."""
+        self.user.is_active = False
+        await self.user.asave(update_fields=['is_active'])
+
+        user = await async_auth_bearer.authenticate(_Request(), self.token)
+
+        self.assertIsNone(user)
+
+    async def test_revoked_token_rejected_without_sync_cache_io(self):
+        """Test the denylist check on the async path never uses the blocking cache API."""
+        revoke_jwt_token(self.token)
+        token_denylist.reset()
+
+        with mock.patch.object(token_denylist, 'is_revoked', side_effect=AssertionError('sync path')):
+            user = await async_auth_bearer.authenticate(_Request(), self.token)
+
+        self.assertIsNone(user)
+
+    @override_settings(AUTH_STATELESS=True)
+    async def test_stateless_mode_returns_principal(self):
+        """Test claims-only mode builds a Principal asynchronously."""
+        principal = await async_auth_bearer.authenticate(_Request(), self.token)
+
+        self.assertIsInstance(principal, Principal)
+        self.assertEqual(principal.role, 'admin')
+
+    async def test_async_endpoint_end_to_end(self):
+        """Test async list endpoint authenticates and responds."""
+        client = AsyncClient()
+
+        response = await client.get('/api/projects/', headers={'Authorization': f'Bearer {self.token}'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content)['total'], 0)
+
+    async def test_async_endpoint_requires_token(self):
+        """Test async list endpoint rejects anonymous requests."""
+        client = AsyncClient()
+
+        response = await client.get('/api/employees/')
+
+        self.assertEqual(response.status_code, 401)
@@ -0,0 +1,54 @@
+"""
+Tests cho unified auth pipeline.
+"""
+import pytest
+from unittest import mock
+from django.test import TestCase, RequestFactory
+from ninja.errors import HttpError
+from api import dependencies
+from api.dependencies import auth_bearer
+from api.permissions import require_roles
+from apps.users.models import User
+from apps.users.services import create_jwt_token
+
+
+@pytest.mark.django_db
+class TestAuthPipeline(TestCase):
+    """Test suite cho AuthBearer + permissions."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.factory = RequestFactory()
+        self.user = User.objects.create_user(
+            username='pipeline',
+            password='testpass123',
+            role='sales'
+        )
+        self.header = f'Bearer {create_jwt_token(self.user)}'
+
+    def _request(self):
+        request = self.factory.get('/api/projects/', HTTP_AUTHORIZATION=self.header)
+        request.auth = auth_bearer(request)
+        return request
+
+    def test_token_decoded_once_per_request(self):
+        """Test repeated authentication reuses the memoized principal."""
+        with mock.patch.object(dependencies, 'decode_jwt_token', wraps=dependencies.decode_jwt_token) as decode:
+            request = self._request()
+            auth_bearer(request)
+            auth_bearer(request)
+
+        self.assertEqual(decode.call_count, 1)
+        self.assertEqual(request.auth.id, self.user.id)
+        self.assertEqual(request.auth_claims['user_id'], str(self.user.id))
+
+    def test_require_roles_membership(self):
+        """Test require_roles allows listed roles and rejects others."""
+        allowed = require_roles('admin', 'sales')(lambda request: 'ok')
+        denied = require_roles('admin', 'manager')(lambda request: 'ok')
+        request = self._request()
+
+        self.assertEqual(allowed(request), 'ok')
+        with self.assertRaises(HttpError) as ctx:
+            denied(request)
+        self.assertEqual(ctx.exception.status_code, 403)
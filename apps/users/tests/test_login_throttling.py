@@ -0,0 +1,119 @@
+"""
+Tests cho login throttling.
+"""
+import pytest
+import json
+from unittest import mock
+from django.core.cache import caches
+from django.test import TestCase, Client, RequestFactory, override_settings
+from apps.users import hashing
+from apps.users.models import User
+from apps.users.throttling import LoginThrottled, SlidingWindowThrottle, check_login_throttle, get_client_ip
+
+
+@pytest.mark.django_db
+@override_settings(LOGIN_THROTTLE_USERNAME_LIMIT=5, LOGIN_THROTTLE_IP_LIMIT=20)
+class TestLoginThrottling(TestCase):
+    """Test suite cho login throttling."""
+
+    def setUp(self):
+        """Set up test data."""
+        caches['auth'].clear()
+        self.client = Client()
+        User.objects.create_user(username='victim', password='correctpass')
+
+    def tearDown(self):
+        """Clean up throttle counters."""
+        caches['auth'].clear()
+
+    def _login(self, username, password, ip='10.0.0.1'):
+        return self.client.post(
+            '/api/auth/login',
+            data=json.dumps({'username': username, 'password': password}),
+            content_type='application/json',
+            REMOTE_ADDR=ip
+        )
+
+    def test_username_limit_returns_429(self):
+        """Test attempts beyond the per-username limit are rejected."""
+        for i in range(5):
+            self.assertEqual(self._login('victim', 'wrong', ip=f'10.0.1.{i}').status_code, 401)
+
+        response = self._login('victim', 'correctpass', ip='10.0.2.1')
+        self.assertEqual(response.status_code, 429)
+
+    def test_successful_login_resets_username_counter(self):
+        """Test a successful login clears the per-username counter."""
+        for _ in range(4):
+            self._login('victim', 'wrong')
+        self.assertEqual(self._login('victim', 'correctpass').status_code, 200)
+
+        self.assertEqual(self._login('victim', 'wrong').status_code, 401)
+
+    @override_settings(LOGIN_THROTTLE_TRUST_X_FORWARDED_FOR=True, LOGIN_THROTTLE_TRUSTED_PROXIES=1)
+    def test_spoofed_forwarded_for_shares_the_proxy_bucket(self):
+        """Test rotating the client-supplied X-Forwarded-For entry does not give a fresh IP bucket."""
+        request = RequestFactory().post(
+            '/api/auth/login', HTTP_X_FORWARDED_FOR='6.6.6.6, 203.0.113.7', REMOTE_ADDR='10.0.0.2'
+        )
+        self.assertEqual(get_client_ip(request), '203.0.113.7')
+
+        with override_settings(LOGIN_THROTTLE_IP_LIMIT=3):
+            statuses = [
+                self.client.post(
+                    '/api/auth/login', data=json.dumps({'username': f'user{i}', 'password': 'x'}),
+                    content_type='application/json', HTTP_X_FORWARDED_FOR=f'6.6.6.{i}, 203.0.113.7',
+                ).status_code
+                for i in range(4)
+            ]
+        self.assertEqual(statuses, [401, 401, 401, 429])
+
+    def test_concurrent_attempts_cannot_all_pass(self):
+        """Test the limit holds when every attempt reads the window before any records a hit."""
+        results = []
+        # Every racing attempt sees the window as it was before the others recorded
+        with mock.patch.object(SlidingWindowThrottle, 'count', return_value=0):
+            for i in range(8):
+                try:
+                    check_login_throttle('victim', f'10.3.0.{i}')
+                    results.append(True)
+                except LoginThrottled:
+                    results.append(False)
+
+        self.assertEqual(results, [True] * 5 + [False] * 3)
+
+    @pytest.mark.slow
+    def test_hash_computations_bounded_under_stuffing(self):
+        """Test 10k stuffing attempts cost a bounded number of hashes."""
+        with mock.patch('apps.users.hashing.verify_password', wraps=hashing.verify_password) as verify:
+            statuses = set()
+            for i in range(10000):
+                # Half from one IP with many usernames, half for one username from many IPs
+                if i % 2:
+                    response = self._login(f'user{i}', 'guess', ip='10.9.9.9')
+                else:
+                    response = self._login('victim', 'guess', ip=f'10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}')
+                statuses.add(response.status_code)
+
+        self.assertEqual(statuses, {401, 429})
+        # 20 for the single IP + 5 for the single username
+        self.assertLessEqual(verify.call_count, 25)
+
+
+class TestSlidingWindowThrottle(TestCase):
+    """Test suite cho SlidingWindowThrottle."""
+
+    def setUp(self):
+        """Set up test data."""
+        caches['auth'].clear()
+        self.throttle = SlidingWindowThrottle('test', limit=10, window=60)
+
+    def test_previous_bucket_weighted_by_overlap(self):
+        """Test attempts from the previous window decay as it slides."""
+        for _ in range(10):
+            self.throttle.hit('key', now=59)
+
+        self.assertFalse(self.throttle.allow('key', now=60))
+        self.assertEqual(self.throttle.count('key', now=90), 5)
+        self.assertTrue(self.throttle.allow('key', now=90))
+        self.assertEqual(self.throttle.count('key', now=120), 0)
@@ -0,0 +1,92 @@
+"""
+Tests cho bounded password hashing pool.
+"""
+import pytest
+import json
+import threading
+from unittest import mock
+from django.contrib.auth.hashers import make_password
+from django.test import TestCase, Client, override_settings
+from apps.users import hashing
+from apps.users.hashing import HashingPool, HashingPoolBusy
+from apps.users.models import User
+
+PBKDF2_FIRST = [
+    'apps.users.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.MD5PasswordHasher',
+]
+
+
+class TestHashingPool(TestCase):
+    """Test suite cho HashingPool."""
+
+    def test_rejects_when_saturated(self):
+        """Test jobs beyond workers + queue depth fail fast."""
+        pool = HashingPool(workers=1, queue_depth=0, timeout=5)
+        started = threading.Event()
+        release = threading.Event()
+
+        def blocker():
+            started.set()
+            release.wait()
+
+        thread = threading.Thread(target=pool.run, args=(blocker,))
+        thread.start()
+        started.wait()
+
+        with self.assertRaises(HashingPoolBusy):
+            pool.run(lambda: None)
+
+        release.set()
+        thread.join()
+        self.assertEqual(pool.run(lambda: 'done'), 'done')
+        pool.shutdown()
+
+
+@pytest.mark.django_db
+class TestLoginHashing(TestCase):
+    """Test suite cho login/register hashing."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.client = Client()
+
+    def _login(self, username, password):
+        return self.client.post(
+            '/api/auth/login',
+            data=json.dumps({'username': username, 'password': password}),
+            content_type='application/json'
+        )
+
+    def test_login_returns_503_when_pool_busy(self):
+        """Test saturated hashing pool answers 503."""
+        User.objects.create_user(username='busy', password='testpass123')
+
+        with mock.patch.object(HashingPool, 'run', side_effect=HashingPoolBusy()):
+            response = self._login('busy', 'testpass123')
+
+        self.assertEqual(response.status_code, 503)
+
+    def test_unknown_username_still_hashes(self):
+        """Test unknown usernames verify a dummy hash for constant timing."""
+        with mock.patch('apps.users.hashing.verify_password', wraps=hashing.verify_password) as verify:
+            response = self._login('nobody', 'whatever')
+
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(verify.call_count, 1)
+
+    @override_settings(PASSWORD_HASHERS=PBKDF2_FIRST, PASSWORD_PBKDF2_ITERATIONS=1000)
+    def test_rehash_on_login_when_work_factor_changes(self):
+        """Test hashes are upgraded to the configured hasher and work factor."""
+        user = User.objects.create_user(username='legacy', password='testpass123')
+        user.password = make_password('testpass123', hasher='md5')
+        user.save()
+
+        self.assertEqual(self._login('legacy', 'testpass123').status_code, 200)
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith('pbkdf2_sha256$1000$'))
+
+        with self.settings(PASSWORD_PBKDF2_ITERATIONS=2000):
+            self.assertEqual(self._login('legacy', 'testpass123').status_code, 200)
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith('pbkdf2_sha256$2000$'))
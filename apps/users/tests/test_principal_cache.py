@@ -0,0 +1,78 @@
+"""
+Tests cho principal cache.
+"""
+import pytest
+from django.test import TestCase
+from apps.users.cache import principal_cache
+from apps.users.models import User
+from apps.users.services import create_jwt_token, verify_jwt_token
+
+
+@pytest.mark.django_db
+class TestPrincipalCache(TestCase):
+    """Test suite cho principal cache."""
+
+    def setUp(self):
+        """Set up test data."""
+        principal_cache.clear_local()
+        principal_cache.reset_stats()
+        self.user = User.objects.create_user(
+            username='cached',
+            email='cached@test.com',
+            password='testpass123',
+            role='manager'
+        )
+        self.token = create_jwt_token(self.user)
+
+    def test_second_lookup_skips_database(self):
+        """Test repeated verification is served from cache."""
+        verify_jwt_token(self.token)
+
+        with self.assertNumQueries(0):
+            user = verify_jwt_token(self.token)
+
+        self.assertEqual(user.id, self.user.id)
+        self.assertEqual(user.role, 'manager')
+        stats = principal_cache.stats()
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['local_hits'], 1)
+
+    def test_save_invalidates_cache(self):
+        """Test saving a user drops the cached principal."""
+        verify_jwt_token(self.token)
+
+        self.user.full_name = 'Renamed'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+
+        self.assertEqual(verify_jwt_token(self.token).full_name, 'Renamed')
+
+    def test_deactivation_revokes_access(self):
+        """Test deactivated users are no longer authenticated."""
+        verify_jwt_token(self.token)
+
+        self.user.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+
+        self.assertIsNone(verify_jwt_token(self.token))
+
+    def test_invalidation_waits_for_commit(self):
+        """Test the cached principal is dropped on commit, not on save."""
+        verify_jwt_token(self.token)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.user.full_name = 'Renamed'
+            self.user.save()
+            # Not yet committed: a reader re-caching now would get the old row
+            self.assertEqual(verify_jwt_token(self.token).full_name, '')
+
+        for callback in callbacks:
+            callback()
+        self.assertEqual(verify_jwt_token(self.token).full_name, 'Renamed')
+
+    def test_password_is_loaded_on_demand(self):
+        """Test cached principal can still check its password."""
+        user = verify_jwt_token(self.token)
+
+        self.assertTrue(user.check_password('testpass123'))
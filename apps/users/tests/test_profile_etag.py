@@ -0,0 +1,80 @@
+"""
+Tests cho ETag caching của /auth/me.
+"""
+import pytest
+import json
+from django.test import TestCase, Client
+from apps.users.cache import principal_cache, token_version_cache
+from apps.users.models import User
+from apps.users.services import create_jwt_token, serialize_user
+
+
+@pytest.mark.django_db
+class TestProfileETag(TestCase):
+    """Test suite cho conditional GET trên /auth/me."""
+
+    def setUp(self):
+        """Set up test data."""
+        principal_cache.clear_local()
+        token_version_cache.clear_local()
+        self.client = Client()
+        self.user = User.objects.create_user(
+            username='etaguser',
+            email='etag@test.com',
+            password='testpass123',
+            full_name='ETag User',
+            role='employee'
+        )
+        self.auth = {'HTTP_AUTHORIZATION': f'Bearer {create_jwt_token(self.user)}'}
+
+    def test_me_returns_strong_etag(self):
+        """Test /me sends a strong ETag and revalidation headers."""
+        response = self.client.get('/api/auth/me', **self.auth)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['ETag'].startswith('"'))
+        self.assertIn('no-cache', response['Cache-Control'])
+        self.assertIn('Authorization', response['Vary'])
+
+    def test_matching_if_none_match_returns_304(self):
+        """Test a matching If-None-Match gets 304 without a body."""
+        etag = self.client.get('/api/auth/me', **self.auth)['ETag']
+
+        response = self.client.get('/api/auth/me', HTTP_IF_NONE_MATCH=etag, **self.auth)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['ETag'], etag)
+
+    def test_weak_validator_matches(self):
+        """Test If-None-Match uses weak comparison."""
+        etag = self.client.get('/api/auth/me', **self.auth)['ETag']
+
+        response = self.client.get('/api/auth/me', HTTP_IF_NONE_MATCH=f'"other", W/{etag}', **self.auth)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_profile_change_invalidates_etag(self):
+        """Test updating the user changes the ETag."""
+        etag = self.client.get('/api/auth/me', **self.auth)['ETag']
+        self.user.full_name = 'Renamed'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+
+        response = self.client.get('/api/auth/me', HTTP_IF_NONE_MATCH=etag, **self.auth)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(json.loads(response.content)['full_name'], 'Renamed')
+
+    def test_login_and_me_share_user_representation(self):
+        """Test login and /me return the same user dict."""
+        login = self.client.post(
+            '/api/auth/login',
+            data=json.dumps({'username': 'etaguser', 'password': 'testpass123'}),
+            content_type='application/json'
+        )
+        me = self.client.get('/api/auth/me', **self.auth)
+
+        self.assertEqual(json.loads(login.content)['user'], json.loads(me.content))
+        self.assertEqual(json.loads(me.content), serialize_user(User.objects.get(id=self.user.id)))
@@ -0,0 +1,147 @@
+"""
+Tests cho bulk user provisioning.
+"""
+import pytest
+import json
+import os
+import tempfile
+from io import StringIO
+from django.contrib.auth.hashers import check_password
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from apps.users.hashing import hash_passwords
+from apps.users.models import User
+from apps.users.provisioning import provision_from_text
+from apps.users.services import create_jwt_token
+
+CSV_INPUT = """username,password,email,full_name,role
+alice,alicepass1,alice@test.com,Alice,sales
+bob,bobpass12,,Bob,
+existing,otherpass1,new@test.com,Dup,employee
+carol,short,carol@test.com,Carol,employee
+dave,davepass1,taken@test.com,Dave,employee
+alice,alicepass2,alice2@test.com,Alice Again,employee
+erin,erinpass1,erin@test.com,Erin,superhero
+"""
+
+
+@pytest.mark.django_db
+class TestProvisioning(TestCase):
+    """Test suite cho provisioning service."""
+
+    def setUp(self):
+        """Set up test data."""
+        User.objects.create_user(username='existing', email='taken@test.com', password='testpass123')
+
+    def test_csv_creates_valid_rows_and_reports_errors(self):
+        """Test valid rows are created and invalid rows reported per row."""
+        result = provision_from_text(CSV_INPUT, 'csv').as_dict()
+
+        self.assertEqual(result['created'], 2)
+        self.assertEqual([u['username'] for u in result['users']], ['alice', 'bob'])
+        errors = {e['row']: e['error'] for e in result['errors']}
+        self.assertEqual(errors[4], 'Username already exists')
+        self.assertIn('password', errors[5])
+        self.assertEqual(errors[6], 'Email already exists')
+        self.assertEqual(errors[7], 'Duplicate username in input')
+        self.assertIn('role', errors[8])
+
+        bob = User.objects.get(username='bob')
+        self.assertIsNone(bob.email)
+        self.assertEqual(bob.role, 'employee')
+        self.assertTrue(check_password('bobpass12', bob.password))
+
+    def test_conflicts_checked_in_one_query(self):
+        """Test the whole batch costs one conflict query plus the insert."""
+        rows = '\n'.join(
+            json.dumps({'username': f'user{i}', 'password': 'password1', 'email': f'user{i}@test.com'})
+            for i in range(50)
+        )
+
+        with CaptureQueriesContext(connection) as ctx:
+            result = provision_from_text(rows, 'jsonl')
+
+        statements = [q['sql'].split()[0].upper() for q in ctx.captured_queries]
+        self.assertEqual(statements.count('SELECT'), 1)
+        self.assertEqual(statements.count('INSERT'), 1)
+        self.assertEqual(len(result.created), 50)
+
+    def test_jsonl_reports_bad_lines(self):
+        """Test malformed JSONL lines do not abort the batch."""
+        text = '{"username": "frank", "password": "frankpass1"}\nnot json\n[1, 2]\n'
+
+        result = provision_from_text(text, 'jsonl').as_dict()
+
+        self.assertEqual(result['created'], 1)
+        self.assertEqual([e['row'] for e in result['errors']], [2, 3])
+
+    def test_management_command(self):
+        """Test provisioning from a file via the management command."""
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as f:
+            f.write(CSV_INPUT)
+        out = StringIO()
+        try:
+            call_command('provision_users', f.name, stdout=out)
+        finally:
+            os.unlink(f.name)
+
+        self.assertIn('Created 2 users, 5 rows failed', out.getvalue())
+
+
+@pytest.mark.django_db
+class TestProvisioningEndpoint(TestCase):
+    """Test suite cho POST /api/auth/users/bulk."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.client = Client()
+        self.admin = User.objects.create_user(username='admin', password='testpass123', role='admin')
+        self.manager = User.objects.create_user(username='manager', password='testpass123', role='manager')
+        User.objects.create_user(username='existing', email='taken@test.com', password='testpass123')
+
+    def _upload(self, user, name, content):
+        return self.client.post(
+            '/api/auth/users/bulk',
+            data={'file': SimpleUploadedFile(name, content.encode())},
+            HTTP_AUTHORIZATION=f'Bearer {create_jwt_token(user)}'
+        )
+
+    def test_admin_can_provision(self):
+        """Test admin upload creates users and returns per-row results."""
+        response = self._upload(self.admin, 'users.csv', CSV_INPUT)
+
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertEqual(data['created'], 2)
+        self.assertEqual(data['failed'], 5)
+
+    def test_non_admin_forbidden(self):
+        """Test non-admin users cannot provision."""
+        response = self._upload(self.manager, 'users.csv', CSV_INPUT)
+
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(User.objects.filter(username='alice').exists())
+
+    def test_unknown_format_rejected(self):
+        """Test files without a known format are rejected."""
+        response = self._upload(self.admin, 'users.txt', CSV_INPUT)
+
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(PASSWORD_HASH_PROCESSES=2)
+class TestProcessPoolHashing(TestCase):
+    """Test hashing on the process pool."""
+
+    def test_hashes_in_order(self):
+        """Test process-pool hashes verify against their inputs."""
+        passwords = [f'password{i}' for i in range(8)]
+
+        hashes = hash_passwords(passwords)
+
+        self.assertEqual(len(hashes), 8)
+        for raw, encoded in zip(passwords, hashes):
+            self.assertTrue(check_password(raw, encoded))
@@ -0,0 +1,105 @@
+"""
+Tests cho stateless (claims-only) authentication.
+"""
+import pytest
+import json
+from django.test import TestCase, Client, override_settings
+from apps.users.cache import principal_cache, token_version_cache
+from apps.users.models import User
+from apps.users.principal import Principal
+from apps.users.services import create_jwt_token, verify_jwt_claims, verify_jwt_token
+
+
+@pytest.mark.django_db
+@override_settings(AUTH_STATELESS=True)
+class TestStatelessAuthentication(TestCase):
+    """Test suite cho claims-only authentication mode."""
+
+    def setUp(self):
+        """Set up test data."""
+        principal_cache.clear_local()
+        token_version_cache.clear_local()
+        self.client = Client()
+        self.user = User.objects.create_user(
+            username='stateless',
+            email='stateless@test.com',
+            password='oldpass123',
+            role='sales'
+        )
+        self.token = create_jwt_token(self.user)
+
+    def test_principal_built_from_claims(self):
+        """Test principal carries claims without loading the model."""
+        verify_jwt_claims(self.token)
+
+        with self.assertNumQueries(0):
+            principal = verify_jwt_claims(self.token)
+
+        self.assertIsInstance(principal, Principal)
+        self.assertEqual(principal.id, self.user.id)
+        self.assertEqual(principal.role, 'sales')
+
+    def test_full_user_loaded_lazily(self):
+        """Test non-claim attributes are resolved from the User model."""
+        response = self.client.get('/api/auth/me', HTTP_AUTHORIZATION=f'Bearer {self.token}')
+
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertEqual(data['email'], 'stateless@test.com')
+
+    def test_password_change_revokes_old_tokens(self):
+        """Test changing password bumps token_version and revokes old tokens."""
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                '/api/auth/change-password',
+                data=json.dumps({'old_password': 'oldpass123', 'new_password': 'newpass456'}),
+                content_type='application/json',
+                HTTP_AUTHORIZATION=f'Bearer {self.token}'
+            )
+        self.assertEqual(response.status_code, 200)
+        new_token = json.loads(response.content)['token']
+
+        self.assertIsNone(verify_jwt_claims(self.token))
+        self.assertIsNone(verify_jwt_token(self.token))
+        self.assertIsNotNone(verify_jwt_claims(new_token))
+
+    def test_demotion_revokes_old_tokens(self):
+        """Test a role change revokes tokens carrying the old role claim."""
+        self.assertEqual(verify_jwt_claims(self.token).role, 'sales')
+
+        self.user.role = 'employee'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+
+        self.assertIsNone(verify_jwt_claims(self.token))
+        self.assertEqual(verify_jwt_claims(create_jwt_token(self.user)).role, 'employee')
+
+    def test_set_password_revokes_old_tokens(self):
+        """Test set_password outside the API (admin, shell) revokes old tokens."""
+        verify_jwt_claims(self.token)
+
+        user = User.objects.get(pk=self.user.pk)
+        user.set_password('shellpass789')
+        with self.captureOnCommitCallbacks(execute=True):
+            user.save()
+
+        self.assertIsNone(verify_jwt_claims(self.token))
+
+    def test_profile_change_keeps_tokens(self):
+        """Test saving non-credential fields does not revoke tokens."""
+        self.user.full_name = 'Renamed'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save(update_fields=['full_name'])
+
+        self.assertIsNotNone(verify_jwt_claims(self.token))
+
+    def test_deactivation_revokes_tokens(self):
+        """Test deactivated user tokens are rejected."""
+        verify_jwt_claims(self.token)
+
+        self.user.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+
+        response = self.client.get('/api/auth/me', HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        self.assertEqual(response.status_code, 401)
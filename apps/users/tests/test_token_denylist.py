@@ -0,0 +1,100 @@
+"""
+Tests cho token denylist (logout).
+"""
+import pytest
+import time
+from django.core.cache import caches
+from django.test import TestCase, Client, override_settings
+from apps.users.models import User
+from apps.users.revocation import BloomFilter, token_denylist
+from apps.users.services import create_jwt_token, decode_jwt_token, verify_jwt_token
+
+
+@pytest.mark.django_db
+class TestTokenDenylist(TestCase):
+    """Test suite cho token denylist."""
+
+    def setUp(self):
+        """Set up test data."""
+        caches['auth'].clear()
+        token_denylist.reset()
+        self.client = Client()
+        self.user = User.objects.create_user(
+            username='logout',
+            email='logout@test.com',
+            password='testpass123'
+        )
+        self.token = create_jwt_token(self.user)
+
+    def test_logout_revokes_token(self):
+        """Test token is rejected after logout."""
+        auth = {'HTTP_AUTHORIZATION': f'Bearer {self.token}'}
+
+        response = self.client.post('/api/auth/logout', **auth)
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.get('/api/auth/me', **auth)
+        self.assertEqual(response.status_code, 401)
+        self.assertIsNone(verify_jwt_token(self.token))
+
+    def test_logout_keeps_other_tokens_valid(self):
+        """Test revoking one token does not affect other sessions."""
+        other_token = create_jwt_token(self.user)
+
+        self.client.post('/api/auth/logout', HTTP_AUTHORIZATION=f'Bearer {self.token}')
+
+        self.assertIsNotNone(verify_jwt_token(other_token))
+
+    def test_revocation_visible_after_refresh(self):
+        """Test a fresh process picks up revocations from the shared cache."""
+        payload = decode_jwt_token(self.token)
+        token_denylist.revoke(payload['jti'], payload['exp'])
+
+        # Simulate another worker process starting with an empty filter
+        token_denylist.reset()
+
+        self.assertTrue(token_denylist.is_revoked(payload['jti']))
+
+    @override_settings(TOKEN_DENYLIST_REFRESH_SECONDS=0)
+    def test_entry_written_after_seq_is_pulled_later(self):
+        """Test a pull that sees a seq before its entry is written picks the entry up next time."""
+        cache = caches['auth']
+        token_denylist.is_revoked('warm-up')  # loads the filter
+        payload = decode_jwt_token(self.token)
+        # Another process: seq published, entry not written yet
+        cache.set(f"denylist:jti:{payload['jti']}", 1, 60)
+        cache.add('denylist:seq', 0, None)
+        seq = cache.incr('denylist:seq')
+
+        self.assertFalse(token_denylist.is_revoked(payload['jti']))
+        cache.set(f'denylist:entry:{seq}', payload['jti'], 60)
+
+        self.assertTrue(token_denylist.is_revoked(payload['jti']))
+
+    def test_expired_tokens_are_not_stored(self):
+        """Test revoking an already expired token is a no-op."""
+        token_denylist.revoke('expired-jti', time.time() - 10)
+
+        self.assertIsNone(caches['auth'].get('denylist:jti:expired-jti'))
+
+
+class TestBloomFilter(TestCase):
+    """Test suite cho Bloom filter."""
+
+    def test_no_false_negatives(self):
+        """Test every added item is reported as present."""
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        items = [f'jti-{i}' for i in range(1000)]
+        for item in items:
+            bloom.add(item)
+
+        self.assertTrue(all(item in bloom for item in items))
+
+    def test_false_positive_rate_bounded(self):
+        """Test false positive rate stays near the configured target."""
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        for i in range(1000):
+            bloom.add(f'jti-{i}')
+
+        false_positives = sum(f'other-{i}' in bloom for i in range(10000))
+        self.assertLess(false_positives, 300)
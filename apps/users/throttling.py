@@ -0,0 +1,151 @@
+"""
+Sliding-window login throttling.
+
+Counters live in the 'auth' cache (Redis in production, locmem for
+USE_SQLITE and tests) so every worker shares them. Each window is split
+into the current and previous fixed bucket; the previous bucket is
+weighted by how much of it still overlaps the sliding window.
+
+Attempts are counted before the user lookup and the password hash, so
+rejected attempts cost a few cache round trips and no hashing. An attempt
+is recorded with an atomic `incr` and judged on the count it returns, so
+concurrent attempts cannot all pass the same check; a rejected attempt is
+taken back.
+"""
+import time
+from django.conf import settings
+from django.core.cache import caches
+
+
+class LoginThrottled(Exception):
+    """Raised when a login attempt exceeds the throttle limits."""
+
+
+class SlidingWindowThrottle:
+    """Approximate sliding-window counter over two fixed buckets."""
+
+    def __init__(self, scope: str, limit: int, window: int):
+        self.scope = scope
+        self.limit = limit
+        self.window = window
+
+    @property
+    def cache(self):
+        return caches[settings.AUTH_CACHE_ALIAS]
+
+    def _bucket_key(self, key: str, bucket: int) -> str:
+        return f'throttle:{self.scope}:{key}:{bucket}'
+
+    def count(self, key: str, now: float = None) -> float:
+        """Estimated number of attempts within the last `window` seconds."""
+        now = time.time() if now is None else now
+        bucket = int(now // self.window)
+        elapsed = (now % self.window) / self.window
+
+        counts = self.cache.get_many([
+            self._bucket_key(key, bucket),
+            self._bucket_key(key, bucket - 1),
+        ])
+        current = counts.get(self._bucket_key(key, bucket), 0)
+        previous = counts.get(self._bucket_key(key, bucket - 1), 0)
+        return previous * (1 - elapsed) + current
+
+    def allow(self, key: str, now: float = None) -> bool:
+        """Return True if another attempt is allowed right now."""
+        return self.count(key, now) < self.limit
+
+    def hit(self, key: str, now: float = None) -> int:
+        """Record an attempt; returns the current bucket's count including it."""
+        now = time.time() if now is None else now
+        bucket_key = self._bucket_key(key, int(now // self.window))
+        # Buckets are read for two windows (current + previous)
+        self.cache.add(bucket_key, 0, self.window * 2)
+        try:
+            return self.cache.incr(bucket_key)
+        except ValueError:
+            # Expired between add() and incr()
+            self.cache.set(bucket_key, 1, self.window * 2)
+            return 1
+
+    def attempt(self, key: str, now: float = None) -> bool:
+        """Record an attempt; True if it is within the limit, otherwise it is taken back."""
+        now = time.time() if now is None else now
+        bucket = int(now // self.window)
+        elapsed = (now % self.window) / self.window
+
+        current = self.hit(key, now)
+        previous = self.cache.get(self._bucket_key(key, bucket - 1), 0)
+        if previous * (1 - elapsed) + current <= self.limit:
+            return True
+        self.release(key, now)
+        return False
+
+    def release(self, key: str, now: float = None):
+        """Take back one attempt recorded at `now`."""
+        now = time.time() if now is None else now
+        try:
+            self.cache.decr(self._bucket_key(key, int(now // self.window)))
+        except ValueError:
+            # Bucket already expired
+            pass
+
+    def reset(self, key: str, now: float = None):
+        """Forget recorded attempts for `key`."""
+        now = time.time() if now is None else now
+        bucket = int(now // self.window)
+        self.cache.delete_many([
+            self._bucket_key(key, bucket),
+            self._bucket_key(key, bucket - 1),
+        ])
+
+
+def get_client_ip(request) -> str:
+    """
+    Client address, honouring X-Forwarded-For only behind trusted proxies.
+
+    Each of the LOGIN_THROTTLE_TRUSTED_PROXIES proxies appends the address
+    it received from, so the client is the entry that many places from the
+    end; anything before it is client-supplied and ignored.
+    """
+    proxies = settings.LOGIN_THROTTLE_TRUSTED_PROXIES
+    if settings.LOGIN_THROTTLE_TRUST_X_FORWARDED_FOR and proxies > 0:
+        forwarded = [
+            address.strip() for address in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',')
+            if address.strip()
+        ]
+        if len(forwarded) >= proxies:
+            return forwarded[-proxies]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def _throttles():
+    window = settings.LOGIN_THROTTLE_WINDOW
+    return (
+        SlidingWindowThrottle('login:user', settings.LOGIN_THROTTLE_USERNAME_LIMIT, window),
+        SlidingWindowThrottle('login:ip', settings.LOGIN_THROTTLE_IP_LIMIT, window),
+    )
+
+
+def check_login_throttle(username: str, ip: str):
+    """
+    Record the attempt against the username and the IP; reject it (and
+    record nothing) if either is over its limit.
+
+    Raises:
+        LoginThrottled: If either limit is exceeded
+    """
+    user_throttle, ip_throttle = _throttles()
+    username = username.lower()
+    now = time.time()
+
+    if not user_throttle.attempt(username, now):
+        raise LoginThrottled("Too many login attempts")
+    if not ip_throttle.attempt(ip, now):
+        user_throttle.release(username, now)
+        raise LoginThrottled("Too many login attempts")
+
+
+def reset_login_throttle(username: str):
+    """Clear the per-username counter after a successful login."""
+    user_throttle, _ = _throttles()
+    user_throttle.reset(username.lower())
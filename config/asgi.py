@@ -1,5 +1,20 @@
 """
 ASGI config for Studio Management System.
+
+Run with e.g. `uvicorn config.asgi:application --workers 4`. The read-heavy
+endpoints (project get/list, employee list, package list) and their auth are
+async, so they run on the event loop without a thread hop.
+
+The project change stream (GET /api/projects/events) needs this entry point:
+under WSGI every open stream holds a worker thread for up to
+PROJECT_EVENTS_STREAM_TIMEOUT seconds, so it answers 503 there unless
+PROJECT_EVENTS_ALLOW_WSGI is set. When the rest of the API stays on gunicorn
+(config.wsgi, see the Dockerfile), run a separate ASGI process and route
+/api/projects/events to it, e.g.
+
+    uvicorn config.asgi:application --port 8001 --workers 2
+
+with nginx `proxy_buffering off` on that location.
 """
 import os
 from django.core.asgi import get_asgi_application
@@ -27,6 +27,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 
     # Third party
     'corsheaders',
@@ -39,18 +40,22 @@ INSTALLED_APPS = [
     'apps.partners',
     'apps.salaries',
     'apps.finance',
+    'apps.sequences',
 ]
 
+# Session/CSRF/auth/message middleware only run outside LEAN_MIDDLEWARE_PATHS:
+# the JWT API never uses them, the admin does.
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
+    'api.middleware.LeanSessionMiddleware',
     'django.middleware.common.CommonMiddleware',
-    'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
+    'api.middleware.LeanCsrfViewMiddleware',
+    'api.middleware.LeanAuthenticationMiddleware',
+    'api.middleware.LeanMessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
+LEAN_MIDDLEWARE_PATHS = ['/api/']
 
 ROOT_URLCONF = 'config.urls'
 
@@ -86,20 +91,67 @@ DATABASES = {
     }
 
 # Redis Cache (skip in dev)
+# The 'auth' alias holds state that must not be dropped (token denylist,
+# login throttling), so it falls back to locmem instead of DummyCache.
 if os.getenv('USE_SQLITE') == 'True':
     CACHES = {
         'default': {
             'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
-        }
+        },
+        'auth': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'auth',
+        },
     }
 else:
     CACHES = {
         'default': {
             'BACKEND': 'django.core.cache.backends.redis.RedisCache',
             'LOCATION': os.getenv('REDIS_URL', 'redis://localhost:6379/0'),
-        }
+        },
+        'auth': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL', 'redis://localhost:6379/0'),
+            'KEY_PREFIX': 'auth',
+        },
     }
 
+# Password hashing
+# PASSWORD_HASHER picks the preferred hasher ('pbkdf2' or 'bcrypt'); the other
+# stays listed so existing hashes verify and are upgraded on next login, as
+# are hashes whose work factor differs from the configured one.
+PASSWORD_HASHER = os.getenv('PASSWORD_HASHER', 'pbkdf2')
+PASSWORD_PBKDF2_ITERATIONS = int(os.getenv('PASSWORD_PBKDF2_ITERATIONS', 720000))
+PASSWORD_BCRYPT_ROUNDS = int(os.getenv('PASSWORD_BCRYPT_ROUNDS', 12))
+_PASSWORD_HASHERS = {
+    'pbkdf2': 'apps.users.hashers.PBKDF2PasswordHasher',
+    'bcrypt': 'apps.users.hashers.BCryptSHA256PasswordHasher',
+}
+PASSWORD_HASHERS = [_PASSWORD_HASHERS[PASSWORD_HASHER]] + [
+    path for name, path in _PASSWORD_HASHERS.items() if name != PASSWORD_HASHER
+] + [
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+]
+
+# Dedicated pool for password hashing on /auth/login and /auth/register.
+# Requests beyond WORKERS + QUEUE_DEPTH concurrent hashes get HTTP 503.
+PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', 2))
+PASSWORD_HASH_QUEUE_DEPTH = int(os.getenv('PASSWORD_HASH_QUEUE_DEPTH', 4))
+PASSWORD_HASH_TIMEOUT = float(os.getenv('PASSWORD_HASH_TIMEOUT', 10))
+
+# Process pool for bulk user provisioning (0 hashes inline on the caller).
+PASSWORD_HASH_PROCESSES = int(os.getenv('PASSWORD_HASH_PROCESSES', os.cpu_count() or 2))
+
+# Login throttling (sliding window, counters in the 'auth' cache).
+# Excess attempts get HTTP 429 before any user lookup or password hash.
+LOGIN_THROTTLE_WINDOW = int(os.getenv('LOGIN_THROTTLE_WINDOW', 300))
+LOGIN_THROTTLE_USERNAME_LIMIT = int(os.getenv('LOGIN_THROTTLE_USERNAME_LIMIT', 10))
+LOGIN_THROTTLE_IP_LIMIT = int(os.getenv('LOGIN_THROTTLE_IP_LIMIT', 50))
+LOGIN_THROTTLE_TRUST_X_FORWARDED_FOR = os.getenv('LOGIN_THROTTLE_TRUST_X_FORWARDED_FOR', 'False') == 'True'
+# Reverse proxies in front of the app that append to X-Forwarded-For; the
+# client address is that many entries from the end (earlier ones are spoofable)
+LOGIN_THROTTLE_TRUSTED_PROXIES = int(os.getenv('LOGIN_THROTTLE_TRUSTED_PROXIES', 1))
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -159,6 +211,59 @@ JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', SECRET_KEY)
 JWT_ALGORITHM = os.getenv('JWT_ALGORITHM', 'HS256')
 JWT_EXPIRATION_DAYS = int(os.getenv('JWT_EXPIRATION_DAYS', 7))
 
+# Principal cache (authenticated user lookups)
+# Local tier is per-process and only invalidated in the writing process,
+# so keep its TTL short; the shared tier is invalidated on every User write.
+PRINCIPAL_CACHE_LOCAL_TTL = int(os.getenv('PRINCIPAL_CACHE_LOCAL_TTL', 5))
+PRINCIPAL_CACHE_LOCAL_MAXSIZE = int(os.getenv('PRINCIPAL_CACHE_LOCAL_MAXSIZE', 1024))
+PRINCIPAL_CACHE_TTL = int(os.getenv('PRINCIPAL_CACHE_TTL', 300))
+TOKEN_VERSION_CACHE_LOCAL_MAXSIZE = int(os.getenv('TOKEN_VERSION_CACHE_LOCAL_MAXSIZE', 10000))
+
+# Stateless auth: build the principal from JWT claims only and load the
+# User model lazily, checking `token_version` against a small cache.
+AUTH_STATELESS = os.getenv('AUTH_STATELESS', 'False') == 'True'
+
+# Token denylist (logout). Revoked jti's live in the 'auth' cache until the
+# token expires; an in-process Bloom filter answers "not revoked" locally and
+# is refreshed from the cache every TOKEN_DENYLIST_REFRESH_SECONDS.
+AUTH_CACHE_ALIAS = 'auth'
+TOKEN_DENYLIST_BLOOM = os.getenv('TOKEN_DENYLIST_BLOOM', 'True') == 'True'
+TOKEN_DENYLIST_BLOOM_CAPACITY = int(os.getenv('TOKEN_DENYLIST_BLOOM_CAPACITY', 100000))
+TOKEN_DENYLIST_BLOOM_ERROR_RATE = float(os.getenv('TOKEN_DENYLIST_BLOOM_ERROR_RATE', 0.001))
+TOKEN_DENYLIST_REFRESH_SECONDS = int(os.getenv('TOKEN_DENYLIST_REFRESH_SECONDS', 5))
+TOKEN_DENYLIST_REBUILD_SECONDS = int(os.getenv('TOKEN_DENYLIST_REBUILD_SECONDS', 3600))
+
+# List totals (api.counting). `cached` counts live in this cache alias and
+# are invalidated on model writes; `estimate` uses the planner estimate only
+# when it is at least LIST_COUNT_ESTIMATE_THRESHOLD rows, else counts exactly.
+LIST_COUNT_CACHE_ALIAS = 'default'
+LIST_COUNT_CACHE_TTL = int(os.getenv('LIST_COUNT_CACHE_TTL', 300))
+LIST_COUNT_ESTIMATE_THRESHOLD = int(os.getenv('LIST_COUNT_ESTIMATE_THRESHOLD', 10000))
+
+# Project calendar (GET /api/projects/calendar): per-month aggregates cached
+# in LIST_COUNT_CACHE_ALIAS, keyed by the projects write generation.
+PROJECT_CALENDAR_CACHE_TTL = int(os.getenv('PROJECT_CALENDAR_CACHE_TTL', 3600))
+
+# Project audit log (apps.projects.audit): entries are buffered in-process and
+# written in one bulk insert per PROJECT_AUDIT_FLUSH_SIZE entries, or at most
+# PROJECT_AUDIT_FLUSH_INTERVAL seconds after the first pending one (0 = only
+# on size, before history reads and at exit).
+PROJECT_AUDIT_FLUSH_SIZE = int(os.getenv('PROJECT_AUDIT_FLUSH_SIZE', 100))
+PROJECT_AUDIT_FLUSH_INTERVAL = float(os.getenv('PROJECT_AUDIT_FLUSH_INTERVAL', 2))
+
+# Project change stream (GET /api/projects/events, apps.projects.events):
+# keepalive comment interval, stream lifetime before the client reconnects with
+# Last-Event-ID, and how long events stay resumable (prune_project_events).
+PROJECT_EVENTS_HEARTBEAT = float(os.getenv('PROJECT_EVENTS_HEARTBEAT', 15))
+PROJECT_EVENTS_STREAM_TIMEOUT = float(os.getenv('PROJECT_EVENTS_STREAM_TIMEOUT', 300))
+PROJECT_EVENT_RETENTION_DAYS = int(os.getenv('PROJECT_EVENT_RETENTION_DAYS', 7))
+# Under WSGI each open stream holds a worker thread for the whole stream
+# lifetime, so the endpoint answers 503 there unless this is set (runserver,
+# tests). Serve it from an ASGI process instead (config/asgi.py).
+PROJECT_EVENTS_ALLOW_WSGI = os.getenv('PROJECT_EVENTS_ALLOW_WSGI', 'False') == 'True'
+# Lifetime (seconds) of the ?token= that EventSource clients connect with
+PROJECT_EVENTS_TOKEN_TTL = int(os.getenv('PROJECT_EVENTS_TOKEN_TTL', 60))
+
 # Studio Settings
 STUDIO_NAME = os.getenv('STUDIO_NAME', 'Studio Manager')
 FIXED_MONTHLY_RENT = int(os.getenv('FIXED_MONTHLY_RENT', 20700000))
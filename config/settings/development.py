@@ -7,6 +7,9 @@ DEBUG = True
 #     'django_extensions',
 # ]
 
+# runserver is WSGI: allow the project event stream anyway (one thread each)
+PROJECT_EVENTS_ALLOW_WSGI = True
+
 # Security settings for development
 SECURE_SSL_REDIRECT = False
 SESSION_COOKIE_SECURE = False
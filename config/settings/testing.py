@@ -25,10 +25,21 @@ MIGRATION_MODULES = DisableMigrations()
 PASSWORD_HASHERS = [
     'django.contrib.auth.hashers.MD5PasswordHasher',
 ]
+PASSWORD_HASH_PROCESSES = 0
 
 # Disable cache for tests
 CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
-    }
+    },
+    'auth': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'auth-tests',
+    },
 }
+
+# The test client is WSGI
+PROJECT_EVENTS_ALLOW_WSGI = True
+
+# Flush the project audit buffer explicitly in tests (no timer thread)
+PROJECT_AUDIT_FLUSH_INTERVAL = 0